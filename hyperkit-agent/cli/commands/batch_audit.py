@@ -24,8 +24,10 @@ def batch_audit_group():
               default='json', 
               help='Output format')
 @click.option('--batch-name', '-n', help='Name for this batch audit')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=None,
+              help='Number of contracts audited concurrently (default: min(4, CPU count))')
 @click.pass_context
-def audit_contracts(ctx, files: tuple, directory: str, output: str, format: str, batch_name: str):
+def audit_contracts(ctx, files: tuple, directory: str, output: str, format: str, batch_name: str, workers: int):
     """
     Audit multiple contracts in batch.
     
@@ -39,6 +41,7 @@ def audit_contracts(ctx, files: tuple, directory: str, output: str, format: str,
         hyperagent batch-audit contracts -f Contract1.sol -f Contract2.sol
         hyperagent batch-audit contracts -d contracts/ --format all
         hyperagent batch-audit contracts -f *.sol --format excel -n "Q4 Audit"
+        hyperagent batch-audit contracts -d contracts/ --workers 8
     """
     verbose = ctx.obj.get('verbose', False) if ctx.obj else False
     debug = ctx.obj.get('debug', False) if ctx.obj else False
@@ -49,7 +52,6 @@ def audit_contracts(ctx, files: tuple, directory: str, output: str, format: str,
     show_command_warning('batch-audit')
     try:
         from services.audit.batch_auditor import BatchAuditor
-        from services.audit.report_aggregator import ReportAggregator
         from services.audit.exporters import (
             JSONExporter, MarkdownExporter, HTMLExporter, 
             CSVExporter, PDFExporter, ExcelExporter
@@ -76,11 +78,18 @@ def audit_contracts(ctx, files: tuple, directory: str, output: str, format: str,
         auditor = BatchAuditor()
         
         # Run batch audit
-        results = asyncio.run(auditor.audit_batch(contract_files))
-        
-        # Aggregate results
-        aggregator = ReportAggregator()
-        report = aggregator.aggregate(results, batch_name=batch_name)
+        contracts = [{'name': path.stem, 'path': str(path)} for path in contract_files]
+        results = asyncio.run(auditor.audit_batch(contracts, max_workers=workers))
+        
+        # Summary of the successful audits (absent if none succeeded); keep
+        # batch-level counts alongside
+        report = dict(results.get('summary', {}))
+        report.update({
+            'batch_name': batch_name,
+            'total_contracts': results['total_contracts'],
+            'successful_audits': results['successful'],
+            'failed_audits': results['failed'],
+        })
         
         # Create output directory
         output_dir = Path(output)
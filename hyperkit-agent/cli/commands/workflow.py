@@ -194,6 +194,107 @@ hype    [OK] FIXED: Deployment validation has been added - workflow properly fai
             import traceback
             console.print(f"\n[red]{traceback.format_exc()}[/red]")
 
+@workflow_group.command(name='batch')
+@click.argument('prompts_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--concurrency', '-j', type=click.IntRange(min=1), default=None, help='Workflows run at once (default: config workflow_batch_concurrency, else 4)')
+@click.option('--no-verify', is_flag=True, help='Skip contract verification stage')
+@click.option('--test-only', is_flag=True, help='Generate and audit only (no deployment)')
+@click.option('--allow-insecure', is_flag=True, help='Deploy even with high-severity audit issues')
+@click.option('--rag-scope', type=click.Choice(['official-only', 'opt-in-community']), default='official-only', help='RAG fetch scope for every workflow')
+@click.option('--output', '-o', default=None, help='Write batch results JSON to this file')
+@click.pass_context
+def run_workflow_batch(ctx, prompts_file, concurrency, no_verify, test_only, allow_insecure, rag_scope, output):
+    """
+    Run workflows for every prompt in a file, several at a time
+
+    All workflows share one agent (LLM connections, RAG index, caches,
+    compiler); each keeps its own workflow ID, contract file and
+    diagnostics.
+
+    \b
+    PROMPTS_FILE formats:
+        .txt    one prompt per line (# comments and blank lines skipped)
+        .json   list of prompts or {"prompt": ..., "test_only": true} objects
+        .jsonl  one prompt string or object per line
+
+    \b
+    Examples:
+        hyperagent workflow batch prompts.txt --test-only
+        hyperagent workflow batch prompts.jsonl -j 8 -o batch_results.json
+    """
+    from core.agent.main import HyperKitAgent
+    from core.config.loader import get_config
+    from core.workflow.batch_runner import load_prompts
+
+    debug = ctx.obj.get('debug', False) if ctx.obj else False
+
+    try:
+        prompts = load_prompts(prompts_file)
+    except (ValueError, OSError) as e:
+        console.print(f"\n[red bold]Cannot read prompts file: {e}[/red bold]")
+        ctx.exit(1)
+    if not prompts:
+        console.print(f"[yellow]No prompts found in {prompts_file}[/yellow]")
+        ctx.exit(1)
+
+    try:
+        console.print(f"\n[yellow]Initializing HyperAgent for {len(prompts)} workflows...[/yellow]")
+        config = get_config().to_dict()
+        agent = HyperKitAgent(config)
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+            task = progress.add_task(f"[cyan]Running {len(prompts)} workflows...", total=None)
+            summary = asyncio.run(agent.run_workflow_batch(
+                prompts,
+                max_concurrency=concurrency,
+                output_path=output,
+                network="hyperion",  # Hardcoded - Hyperion only
+                auto_verification=not no_verify,
+                test_only=test_only,
+                allow_insecure=allow_insecure,
+                rag_scope=rag_scope
+            ))
+            progress.update(task, completed=True)
+
+        table = Table(title=f"Workflow Batch ({summary['concurrency']} concurrent, {summary['duration_s']}s)")
+        table.add_column("#", style="dim")
+        table.add_column("Prompt")
+        table.add_column("Status")
+        table.add_column("Workflow ID", style="cyan")
+        table.add_column("Time (s)", justify="right")
+        status_styles = {"success": "green", "completed_with_errors": "yellow"}
+        for index, result in enumerate(summary['results'], 1):
+            status = result.get('status', 'unknown')
+            style = status_styles.get(status, "red")
+            table.add_row(
+                str(index),
+                result['prompt'][:60],
+                f"[{style}]{status}[/{style}]",
+                result.get('workflow_id', '-'),
+                f"{result.get('duration_s', 0):.1f}"
+            )
+        console.print(table)
+        console.print(
+            f"[green]{summary['successful']} succeeded[/green], "
+            f"[yellow]{summary['completed_with_errors']} with errors[/yellow], "
+            f"[red]{summary['failed']} failed[/red]"
+        )
+        if output:
+            console.print(f"[dim]Results saved to {output}[/dim]")
+
+    except Exception as e:
+        console.print(f"\n[red bold]Workflow batch error: {e}[/red bold]")
+        if debug:
+            import traceback
+            console.print(f"\n[red]{traceback.format_exc()}[/red]")
+        ctx.exit(1)
+
+    ctx.exit(1 if summary['failed'] else 0)
+
 def _display_success_results(result: dict, network: str, test_only: bool, verbose: bool):
     """Display workflow results (success, partial success, or errors)"""
     # Create results table
@@ -633,7 +734,7 @@ def workflow_inspect(workflow_id):
     """
     Inspect detailed workflow state and logs.
     
-    Displays the complete workflow_state.yaml and workflow_log.md for a workflow.
+    Displays the complete workflow state (as YAML) and workflow_log.md for a workflow.
     
     If no workflow_id is provided, shows the latest workflow.
     """
@@ -698,17 +799,14 @@ def workflow_inspect(workflow_id):
     else:
         console.print(f"[yellow]Log file not found: {log_path}[/yellow]")
     
-    # Display state YAML
-    state_path = state_persistence.get_state_path(workflow_id)
-    if state_path.exists():
-        import yaml
-        with open(state_path, 'r', encoding='utf-8') as f:
-            state_yaml = f.read()
-        console.print(Panel(
-            Syntax(state_yaml, "yaml", theme="monokai", line_numbers=True),
-            title=f"[bold]Workflow State: {workflow_id}[/bold]",
-            border_style="blue"
-        ))
+    # Display state YAML (rendered from the loaded snapshot)
+    import yaml
+    state_yaml = yaml.dump(state.to_dict(), default_flow_style=False, sort_keys=False, allow_unicode=True)
+    console.print(Panel(
+        Syntax(state_yaml, "yaml", theme="monokai", line_numbers=True),
+        title=f"[bold]Workflow State: {workflow_id}[/bold]",
+        border_style="blue"
+    ))
 
 
 # Removed duplicate status command - using enhanced version above
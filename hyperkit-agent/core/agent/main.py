@@ -16,6 +16,7 @@ from services.debug.edb_integration import EDBIntegration
 from services.audit.public_contract_auditor import public_contract_auditor
 from services.monitoring.enhanced_monitor import enhanced_monitor, MonitorConfig, MonitorType
 from services.defi.primitives_generator import defi_primitives_generator, DeFiPrimitive
+from services.compilation.solc_backend import SolcNotFoundError
 from services.core.ai_agent import HyperKitAIAgent
 from core.validation.production_validator import enforce_production_mode, is_production_mode
 
@@ -175,6 +176,14 @@ class HyperKitAgent:
             logger.warning(f"IPFS RAG initialization failed: {e}")
             self.rag = None
         
+        # Initialize prompt -> contract generation cache
+        try:
+            from services.generation.generation_cache import GenerationCache
+            self.generation_cache = GenerationCache.from_config(self.config)
+        except Exception as e:
+            logger.warning(f"Generation cache initialization failed: {e}")
+            self.generation_cache = None
+        
         # Scaffolder removed - focusing on smart contracts only
         
         # Initialize Alith SDK AI Agent (only AI integration - no LazAI)
@@ -231,7 +240,11 @@ class HyperKitAgent:
         logger.info("HyperKit Agent initialized successfully")
 
     @safe_operation("generate_contract")
-    async def generate_contract(self, prompt: str, context: str = "") -> Dict[str, Any]:
+    async def generate_contract(
+        self, prompt: str, context: str = "",
+        on_stream_event: Optional[Callable[[Any], Any]] = None,
+        run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Generate a smart contract based on natural language prompt.
         Uses Alith SDK (PRIMARY AI agent) with Gemini model by default, OpenAI as fallback.
@@ -240,6 +253,13 @@ class HyperKitAgent:
         Args:
             prompt: Natural language description of the contract
             context: Additional context from RAG system
+            on_stream_event: Optional callback (sync or async) receiving
+                StreamEvents (pragma, imports, contract names, code lines)
+                while the router streams the response (only when the
+                'llm_streaming' config option is enabled)
+            run_id: Optional workflow run ID; the organized copy of the
+                contract is saved under it so concurrent runs generating
+                the same contract name do not overwrite each other
 
         Returns:
             Dictionary containing generated contract code and metadata
@@ -248,6 +268,12 @@ class HyperKitAgent:
         enforce_production_mode("Contract Generation")
         
         try:
+            # Reuse a contract generated for an equivalent request, if any
+            generation_models = self._generation_model_ids(prompt, context)
+            cached = await self._lookup_generation(prompt, context, generation_models, run_id)
+            if cached:
+                return cached
+            
             # PRIORITY 1: Use Alith SDK (PRIMARY AI agent - integrated by default)
             # Alith SDK uses Gemini model by default, falls back to OpenAI if Gemini unavailable
             if self.ai_agent and self.ai_agent.alith_configured:
@@ -263,7 +289,10 @@ class HyperKitAgent:
                     result = await self.ai_agent.generate_contract(requirements)
                     if result:
                         # Process result using shared processing method
-                        return await self._process_generated_contract(result, prompt, method="alith", provider="Alith SDK (Gemini/OpenAI)")
+                        processed = await self._process_generated_contract(
+                            result, prompt, method="alith", provider="Alith SDK (Gemini/OpenAI)", run_id=run_id
+                        )
+                        return self._remember_generation(prompt, context, generation_models[0], processed)
                 except Exception as e:
                     logger.error(f"Alith SDK generation failed: {e}")
                     # Fall through to router fallback
@@ -281,25 +310,20 @@ class HyperKitAgent:
                     expected_output_length = 2500
                     
                     # Route with intelligent selection - will prefer Gemini Flash-Lite
-                    # Note: router.route is synchronous, so we need to run it in executor if needed
-                    import asyncio
-                    loop = asyncio.get_event_loop()
-                    if asyncio.iscoroutinefunction(self.llm_router.route):
-                        result = await self.llm_router.route(
+                    # Streaming is opt-in: once output has started, a dropped
+                    # stream fails instead of falling back to another provider
+                    streamed = self.config.get('llm_streaming', False)
+                    if streamed:
+                        result = await self._stream_router_generation(
+                            full_prompt, expected_output_length, on_stream_event
+                        )
+                    else:
+                        # aroute uses pooled async HTTP clients, so no executor thread is needed
+                        result = await self.llm_router.aroute(
                             prompt=full_prompt,
                             task_type="code",  # Contract generation is code task
                             expected_output_length=expected_output_length
                         )
-                    else:
-                        # Run synchronous route in executor to avoid blocking
-                        result = await loop.run_in_executor(
-                            None,
-                            lambda: self.llm_router.route(
-                                prompt=full_prompt,
-                                task_type="code",
-                                expected_output_length=expected_output_length
-                            )
-                        )
                     
                     # Log what the router returned for debugging
                     if result:
@@ -309,7 +333,14 @@ class HyperKitAgent:
                     if result and len(result.strip()) > 100:  # Valid contract generated
                         logger.info("✅ Generated contract using intelligent model selector (fallback)")
                         # Process result same way as Alith path
-                        return await self._process_generated_contract(result, prompt, method="intelligent_router", provider="Gemini/ModelSelector")
+                        processed = await self._process_generated_contract(
+                            result, prompt, method="intelligent_router", provider="Gemini/ModelSelector", cleaned=streamed,
+                            run_id=run_id
+                        )
+                        # Key by the router model even when Alith was tried first
+                        return self._remember_generation(
+                            prompt, context, self._router_model_id(prompt, context), processed
+                        )
                     else:
                         logger.warning(f"⚠️ Router returned invalid/empty result (length: {len(result) if result else 0})")
                 except ValueError as router_error:
@@ -341,13 +372,121 @@ class HyperKitAgent:
             error_handler = ErrorHandler()
             return error_handler.handle_error(e, f"Contract generation failed: {e}")
 
-    async def _process_generated_contract(self, result: str, prompt: str, method: str = "intelligent_router", provider: str = "Gemini") -> Dict[str, Any]:
-        """Process generated contract code (extract name, save files, etc.)"""
-        from core.tools.utils import extract_contract_info
-        from services.generation.contract_namer import ContractNamer
-        from core.config.paths import PathManager
+    def _generation_model_ids(self, prompt: str, context: str = "") -> List[str]:
+        """
+        Identify the generation paths and models a request may be served by,
+        in order of preference.
+        
+        With Alith configured a request is generated under "alith", but when
+        Alith fails the router fallback is cached under the router model, so
+        that key is listed too.
+        """
+        models = []
+        if self.ai_agent and self.ai_agent.alith_configured:
+            models.append("alith")
+            if not (self.llm_router and self.llm_router.gemini_available):
+                return models
+        models.append(self._router_model_id(prompt, context))
+        return models
+
+    def _router_model_id(self, prompt: str, context: str = "") -> str:
+        """Identify the router model that serves a request."""
+        full_prompt = f"{context}\n\nUser Request: {prompt}" if context else prompt
+        model_name, _, _ = self.llm_router.model_selector.auto_select_for_prompt(
+            prompt=full_prompt, expected_output_length=2500, task_type="code"
+        )
+        return f"router:{model_name}"
+
+    async def _lookup_generation(self, prompt: str, context: str, models: List[str],
+                                 run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Serve a request from the generation cache (first model key that hits); None on a miss."""
+        if not self.generation_cache:
+            return None
+        cached = None
+        for model in models:
+            try:
+                cached = self.generation_cache.lookup(prompt, model, context)
+            except Exception as e:
+                logger.warning(f"Generation cache lookup failed: {e}")
+                return None
+            if cached:
+                break
+        if not cached:
+            return None
+        
+        # The stored code is already cleaned; processing names and saves it
+        try:
+            processed = await self._process_generated_contract(
+                cached.contract_code, prompt, method="generation_cache", provider=cached.provider, run_id=run_id
+            )
+        except ValueError as e:
+            logger.warning(f"Discarding invalid cached generation: {e}")
+            return None
+        processed["metadata"]["generation_cache"] = {
+            "hit": True,
+            "refilled": cached.refilled,
+            "original_method": cached.method
+        }
+        return processed
+
+    def _remember_generation(self, prompt: str, context: str, model: str, processed: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a successful generation in the generation cache."""
+        if self.generation_cache and processed.get("status") == "success":
+            try:
+                self.generation_cache.store(
+                    prompt, model, context, processed["contract_code"],
+                    method=processed.get("method", "unknown"),
+                    provider=processed.get("provider", "unknown")
+                )
+            except Exception as e:
+                logger.warning(f"Generation cache store failed: {e}")
+        return processed
+
+    async def _stream_router_generation(
+        self, full_prompt: str, expected_output_length: int,
+        on_stream_event: Optional[Callable[[Any], Any]] = None
+    ) -> str:
+        """
+        Stream a contract from the router through the incremental extractor.
+
+        Extractor events are delivered to ``on_stream_event`` as soon as their
+        line arrives, so callers can start work (e.g. dependency installs)
+        before generation finishes. Callback errors are logged, not raised.
+
+        Returns:
+            The Solidity source cleaned by the extractor
+        """
+        from core.llm.stream_extractor import SolidityStreamExtractor
+
+        extractor = SolidityStreamExtractor()
+
+        async def dispatch(events) -> None:
+            if not on_stream_event:
+                return
+            for event in events:
+                try:
+                    outcome = on_stream_event(event)
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+                except Exception as e:
+                    logger.warning(f"Stream event callback failed for {event.kind}: {e}")
+
+        async for chunk in self.llm_router.astream(
+            prompt=full_prompt,
+            task_type="code",
+            expected_output_length=expected_output_length
+        ):
+            await dispatch(extractor.feed(chunk))
+        await dispatch(extractor.finish())
+
+        if extractor.contract_name:
+            logger.info(f"📡 Streamed contract {extractor.contract_name} ({len(extractor.code)} chars of code)")
+        return extractor.code
+
+    @staticmethod
+    def _clean_generated_code(result: str) -> str:
+        """Strip markdown fences and explanation text from a model response."""
         import re
-        from pathlib import Path
         
         # CRITICAL: Clean markdown formatting from AI-generated code
         # AI models often wrap code in markdown code blocks (```solidity ... ```)
@@ -389,7 +528,25 @@ class HyperKitAgent:
         contract_code = re.sub(r'\n?\s*```\s*$', '', contract_code, flags=re.MULTILINE)
         # Remove any standalone ``` lines
         contract_code = re.sub(r'^```[\w]*$', '', contract_code, flags=re.MULTILINE)
-        contract_code = contract_code.strip()
+        return contract_code.strip()
+
+    async def _process_generated_contract(self, result: str, prompt: str, method: str = "intelligent_router", provider: str = "Gemini",
+                                          cleaned: bool = False, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process generated contract code (extract name, save files, etc.)
+        
+        Args:
+            cleaned: ``result`` is already plain Solidity (e.g. from the
+                streaming extractor), so markdown cleaning is skipped
+            run_id: Workflow run ID to save the organized copy under
+        """
+        from core.tools.utils import extract_contract_info
+        from services.generation.contract_namer import ContractNamer
+        from core.config.paths import PathManager
+        import re
+        from pathlib import Path
+        
+        contract_code = result.strip() if cleaned else self._clean_generated_code(result)
         
         # Validate we have actual Solidity code
         if not contract_code or len(contract_code) < 50:
@@ -437,9 +594,11 @@ class HyperKitAgent:
         path_manager = PathManager(command_type="workflow")
         workflow_dir = path_manager.get_workflow_dir()
         category_dir = workflow_dir / category
+        if run_id:
+            category_dir = category_dir / run_id
         category_dir.mkdir(parents=True, exist_ok=True)
         
-        # PRIMARY: Save to organized location: artifacts/workflows/{category}/
+        # PRIMARY: Save to organized location: artifacts/workflows/{category}/[{run_id}/]
         organized_file = category_dir / f"{contract_name}.sol"
         try:
             organized_file.write_text(contract_code, encoding="utf-8")
@@ -463,8 +622,13 @@ class HyperKitAgent:
                 raise OSError(f"Failed to create contracts directory: {foundry_contracts_dir}")
             
             foundry_contract_file = foundry_contracts_dir / f"{contract_name}.sol"
-            foundry_contract_file.write_text(contract_code, encoding="utf-8")
-            logger.info(f"✅ Contract also saved for Foundry compilation: {foundry_contract_file.resolve()}")
+            if self.contract_lock(contract_name).locked():
+                # Another workflow is compiling/deploying this contract name;
+                # our workflow writes its copy once it holds the lock
+                logger.info(f"contracts/{contract_name}.sol is in use by another workflow, not overwriting")
+            else:
+                foundry_contract_file.write_text(contract_code, encoding="utf-8")
+                logger.info(f"✅ Contract also saved for Foundry compilation: {foundry_contract_file.resolve()}")
         except (OSError, IOError) as e:
             logger.warning(f"⚠️ Could not save to foundry directory (non-fatal): {e}")
             # Don't raise - organized location is primary
@@ -536,24 +700,11 @@ Return JSON with structure:
 }}"""
                     
                     # Route with intelligent selection - will prefer Gemini Flash-Lite
-                    import asyncio
-                    loop = asyncio.get_event_loop()
-                    if asyncio.iscoroutinefunction(self.llm_router.route):
-                        audit_response = await self.llm_router.route(
-                            prompt=audit_prompt,
-                            task_type="analysis",  # Audit is analysis task
-                            expected_output_length=2000  # Audit reports are typically longer
-                        )
-                    else:
-                        # Run synchronous route in executor to avoid blocking
-                        audit_response = await loop.run_in_executor(
-                            None,
-                            lambda: self.llm_router.route(
-                                prompt=audit_prompt,
-                                task_type="analysis",
-                                expected_output_length=2000
-                            )
-                        )
+                    audit_response = await self.llm_router.aroute(
+                        prompt=audit_prompt,
+                        task_type="analysis",  # Audit is analysis task
+                        expected_output_length=2000  # Audit reports are typically longer
+                    )
                     
                     if audit_response and len(audit_response.strip()) > 50:
                         # Parse JSON response
@@ -664,6 +815,49 @@ Return JSON with structure:
         # Try PATH
         return ["forge"]
     
+    def contract_lock(self, contract_name: str) -> asyncio.Lock:
+        """
+        Lock guarding contracts/<contract_name>.sol and its build output.
+
+        Concurrent workflows share the Foundry project, so a workflow holds
+        this lock from the moment it writes its contract file until it has
+        finished compiling, testing, deploying and verifying it.
+        """
+        locks = getattr(self, "_contract_locks", None)
+        if locks is None:
+            locks = self._contract_locks = {}
+        return locks.setdefault(contract_name, asyncio.Lock())
+
+    def _get_orchestrator(self):
+        """Shared workflow orchestrator (created on first use)."""
+        orchestrator = getattr(self, "_orchestrator", None)
+        if orchestrator is None:
+            from core.workflow.workflow_orchestrator import WorkflowOrchestrator
+            workspace_dir = Path(__file__).parent.parent.parent
+            orchestrator = self._orchestrator = WorkflowOrchestrator(self, workspace_dir)
+        return orchestrator
+
+    def _get_compiler(self, foundry_project_dir: Path):
+        """Shared incremental compiler for the Foundry project (created on first use)."""
+        compiler = getattr(self, "_compiler", None)
+        if compiler is None or compiler.project_dir != foundry_project_dir.resolve():
+            from services.compilation import IncrementalCompiler, SolcStandardJsonBackend
+            timeout = self.config.get('compile_timeout', 120)
+            backend = None
+            # "solc" drives a local solc binary via standard JSON instead of forge
+            if self.config.get('compile_backend', 'forge') == 'solc':
+                backend = SolcStandardJsonBackend(
+                    foundry_project_dir, solc_path=self.config.get('solc_path'), timeout=timeout
+                )
+            compiler = IncrementalCompiler(
+                foundry_project_dir,
+                forge_cmd=self._find_forge_executable(),
+                timeout=timeout,
+                backend=backend
+            )
+            self._compiler = compiler
+        return compiler
+
     async def _compile_contract(self, contract_name: str, contract_code: str) -> Dict[str, Any]:
         """
         Compile contract with Foundry before deployment.
@@ -777,10 +971,8 @@ Return JSON with structure:
                 
                 if contracts_dir_exists:
                     try:
-                        sol_files = list(contracts_dir.rglob("*.sol"))
-                        has_sol_files = len(sol_files) > 0
-                        if has_sol_files:
-                            logger.debug(f"   Found {len(sol_files)} Solidity files in OpenZeppelin contracts")
+                        # Stop at the first match instead of walking the whole tree
+                        has_sol_files = next(contracts_dir.rglob("*.sol"), None) is not None
                     except Exception as e:
                         logger.warning(f"   Error checking for .sol files: {e}")
                 
@@ -967,140 +1159,36 @@ Return JSON with structure:
                     logger.info(f"✅ OpenZeppelin dependencies installed successfully at {openzeppelin_dir}")
                     logger.debug(f"   Contracts available at: {contracts_dir_check}")
             
-            # Contract is already in foundry project directory (contracts/)
-            # CRITICAL: Clean stale contracts before compilation to avoid conflicts
-            # Keep only the current contract file to ensure compilation succeeds
-            if contract_file and contract_file.exists():
-                import shutil
-                # Backup and remove other .sol files (except the current one)
-                for old_file in foundry_contracts_dir.glob("*.sol"):
-                    if old_file != contract_file:
-                        # Create backup in artifacts/cleanup/ before removing
-                        backup_dir = foundry_project_dir / "artifacts" / "cleanup"
-                        backup_dir.mkdir(parents=True, exist_ok=True)
-                        try:
-                            shutil.move(str(old_file), str(backup_dir / old_file.name))
-                            logger.info(f"🧹 Moved stale contract to cleanup: {old_file.name}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ Could not move stale contract {old_file.name}: {e}")
-                            # If move fails, try delete as fallback
-                            try:
-                                old_file.unlink()
-                                logger.info(f"🗑️ Deleted stale contract: {old_file.name}")
-                            except Exception:
-                                pass
-            
-            # Run forge build from foundry project directory
+            # Compile only this contract and its imports; unchanged sources are
+            # served from the build cache without invoking forge
             logger.info(f"Building contract with Foundry from {foundry_project_dir}...")
-            logger.debug(f"   Contract file: {contract_file}")
             logger.debug(f"   Foundry remappings should resolve @openzeppelin/contracts/ to {openzeppelin_dir / 'contracts'}")
-            
-            # Verify remappings are correct before building
-            if needs_openzeppelin and openzeppelin_dir.exists():
-                remapping_file = foundry_project_dir / "remappings.txt"
-                if remapping_file.exists():
-                    logger.debug(f"   Found remappings.txt: {remapping_file}")
-                else:
-                    logger.debug(f"   Using foundry.toml remappings (remappings.txt not found)")
-            
-            forge_cmd = self._find_forge_executable()
-            result = subprocess.run(
-                forge_cmd + ["build"],
-                cwd=str(foundry_project_dir),
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode != 0:
-                error_output = result.stderr or result.stdout
-                return {
-                    "success": False,
-                    "error": f"Foundry compilation failed: {error_output[:500]}",
-                    "suggestions": [
-                        "Check contract syntax errors",
-                        "Verify all imports are available",
-                        f"Check foundry.toml configuration at: {foundry_toml}",
-                        f"Run 'cd {foundry_project_dir} && forge build' manually to see full error",
-                        "Verify contract is in contracts/ directory"
-                    ],
-                    "forge_output": error_output,
-                    "foundry_project_path": str(foundry_project_dir)
-                }
-            
-            # Verify artifact was created - check foundry project's out/ directory
-            artifact_path = foundry_project_dir / "out" / f"{contract_name}.sol" / f"{contract_name}.json"
-            if not artifact_path.exists():
-                # Try alternative paths (contract name might vary)
-                alternative_paths = [
-                    foundry_project_dir / "out" / f"{contract_name}.json",
-                    foundry_project_dir / "out" / contract_name / f"{contract_name}.json",
-                    # Also check root out/ in case of symlink setup
-                    project_root / "out" / f"{contract_name}.sol" / f"{contract_name}.json",
+            result = await self._get_compiler(foundry_project_dir).compile(contract_file, contract_name)
+            
+            if not result.get("success"):
+                result["suggestions"] = [
+                    "Check contract syntax errors",
+                    "Verify all imports are available",
+                    f"Check foundry.toml configuration at: {foundry_toml}",
+                    f"Run 'cd {foundry_project_dir} && forge build {contract_file.name}' manually to see full error",
+                    f"Check if contract name in code matches '{contract_name}' exactly"
                 ]
-                for alt_path in alternative_paths:
-                    if alt_path.exists():
-                        artifact_path = alt_path
-                        break
-                
-            if not artifact_path.exists():
-                # List actual artifacts found to help debug
-                out_dir = foundry_project_dir / "out"
-                found_artifacts = []
-                if out_dir.exists():
-                    for json_file in out_dir.rglob("*.json"):
-                        # Only show contract artifacts, not test artifacts
-                        if "Test" not in json_file.name:
-                            found_artifacts.append(str(json_file.relative_to(foundry_project_dir)))
-                # Also check root out/ as fallback
-                root_out_dir = project_root / "out"
-                if root_out_dir.exists():
-                    for json_file in root_out_dir.rglob("*.json"):
-                        if "Test" not in json_file.name:
-                            found_artifacts.append(str(json_file.relative_to(project_root)))
-                
-                error_msg = (
-                    f"Artifact not found after compilation\n"
-                    f"  Expected: out/{contract_name}.sol/{contract_name}.json\n"
-                    f"  Or: out/{contract_name}.json\n"
-                    f"  Contract name: {contract_name}"
-                )
-                
-                if found_artifacts:
-                    error_msg += f"\n  \n  Actual artifacts found in out/:\n"
-                    for artifact in found_artifacts[:10]:  # Show first 10
-                        error_msg += f"    - {artifact}\n"
-                    if len(found_artifacts) > 10:
-                        error_msg += f"    ... and {len(found_artifacts) - 10} more"
-                else:
-                    error_msg += "\n  No artifacts found in out/ directory"
-                
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "expected_path": f"out/{contract_name}.sol/{contract_name}.json",
-                    "contract_name": contract_name,
-                    "found_artifacts": found_artifacts,
-                    "suggestions": [
-                        f"Check if contract name in code matches '{contract_name}' exactly",
-                        "Verify foundry.toml output configuration",
-                        "Check compilation output for errors",
-                        "Run 'forge build' manually to see full compilation log",
-                        f"Expected artifact paths:\n"
-                        f"  - out/{contract_name}.sol/{contract_name}.json\n"
-                        f"  - out/{contract_name}.json"
-                    ]
-                }
+                result["foundry_project_path"] = str(foundry_project_dir)
+                return result
             
-            logger.info(f"✅ Artifact created at: {artifact_path}")
+            logger.info(f"✅ Artifact created at: {result['artifact_path']}")
+            return result
             
+        except SolcNotFoundError as e:
             return {
-                "success": True,
-                "artifact_path": str(artifact_path),
-                "contract_name": contract_name,
-                "forge_output": result.stdout
+                "success": False,
+                "error": str(e),
+                "suggestions": [
+                    "Install the compiler: svm install <version> (or solc-select install <version>)",
+                    "Set solc_path in config to an existing solc binary",
+                    "Or set compile_backend: forge to compile with Foundry"
+                ]
             }
-            
         except FileNotFoundError:
             return {
                 "success": False,
@@ -1382,12 +1470,7 @@ Return JSON with structure:
         # Use new self-healing orchestrator if enabled
         if use_orchestrator:
             try:
-                from core.workflow.workflow_orchestrator import WorkflowOrchestrator
-                from pathlib import Path
-                
-                # Get workspace directory
-                workspace_dir = Path(__file__).parent.parent.parent
-                orchestrator = WorkflowOrchestrator(self, workspace_dir)
+                orchestrator = self._get_orchestrator()
                 
                 logger.info("🚀 Using self-healing workflow orchestrator")
                 return await orchestrator.run_complete_workflow(
@@ -1634,6 +1717,30 @@ Return JSON with structure:
             logger.error(f"5-stage workflow execution failed: {e}")
             return {"status": "error", "error": str(e), "workflow": "failed"}
 
+    async def run_workflow_batch(
+        self,
+        prompts: List[Any],
+        max_concurrency: Optional[int] = None,
+        output_path: Optional[str] = None,
+        **workflow_options
+    ) -> Dict[str, Any]:
+        """
+        Run the self-healing workflow for many prompts concurrently.
+
+        Args:
+            prompts: Prompt strings, or dicts with 'prompt' and per-prompt options
+            max_concurrency: Maximum workflows running at once
+            output_path: Optional JSON file for the batch results
+            **workflow_options: Options for every run (network, test_only, rag_scope, ...)
+
+        Returns:
+            Batch summary with per-prompt workflow results in input order
+        """
+        from core.workflow.batch_runner import WorkflowBatchRunner
+
+        runner = WorkflowBatchRunner(self, max_concurrency=max_concurrency)
+        return await runner.run_batch(prompts, output_path=output_path, **workflow_options)
+
     def _estimate_gas(self, contract_code: str) -> Dict[str, Any]:
         """Estimate gas usage for contract functions."""
         try:
@@ -3,9 +3,15 @@ Cloud-Based LLM Router with Intelligent Model Selection
 Routes requests to Google Gemini and OpenAI with automatic model selection based on token optimization.
 """
 
+import asyncio
+import json
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+
+import httpx
+
+from services.common.http_pool import LoopBoundClients
 
 from .model_selector import ModelSelector
 
@@ -15,12 +21,26 @@ logger = logging.getLogger(__name__)
 class HybridLLMRouter:
     """Routes requests to cloud-based AI providers: Google Gemini and OpenAI."""
 
+    GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta"
+    OPENAI_API_URL = "https://api.openai.com/v1"
+    GEMINI_FALLBACK_MODELS = ["gemini-2.5-flash-lite", "gemini-2.0-flash-lite", "gemini-1.5-flash"]
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize cloud-based AI clients with intelligent model selection."""
         self.config = config or {}
         self.gemini_available = False
         self.openai_available = False
         self.alith_available = False
+
+        # Async path: pooled HTTP clients and per-provider concurrency limits,
+        # created lazily on the running event loop
+        self.request_timeout = float(self.config.get("llm_timeout", 120))
+        self.max_concurrency = int(self.config.get("llm_max_concurrency", 4))
+        self._async_clients = LoopBoundClients()
+        self._provider_limits: Dict[str, asyncio.Semaphore] = {}
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._google_key: Optional[str] = None
+        self._openai_key: Optional[str] = None
         
         # Initialize intelligent model selector
         self.model_selector = ModelSelector(config)
@@ -49,6 +69,7 @@ class HybridLLMRouter:
                 import google.generativeai as genai
 
                 genai.configure(api_key=google_key)
+                self._google_key = google_key
                 self.gemini_available = True
                 logger.info(f"✅ Google Gemini client initialized (key found in config: {bool(self.config.get('GOOGLE_API_KEY') or self.config.get('ai_providers', {}).get('google', {}).get('api_key'))})")
             except Exception as e:
@@ -83,6 +104,7 @@ class HybridLLMRouter:
             try:
                 import openai
                 self.openai_client = openai.OpenAI(api_key=openai_key)
+                self._openai_key = openai_key
                 self.openai_available = True
                 logger.info("OpenAI client initialized")
             except Exception as e:
@@ -244,18 +266,261 @@ class HybridLLMRouter:
     
     def _query_openai_with_model(self, prompt: str, model_name: str, task_type: str) -> str:
         """Query OpenAI API with specific model."""
-        # Estimate max tokens based on model limits
-        model_spec = self.model_selector.available_models.get(model_name)
-        max_tokens = model_spec.output_tokens if model_spec else 4000
-        
         response = self.openai_client.chat.completions.create(
             model=model_name,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=min(max_tokens, 16000),  # Cap at reasonable limit
+            max_tokens=self._openai_max_tokens(model_name),
             temperature=0.7
         )
         return response.choices[0].message.content
 
+    async def aroute(
+        self, prompt: str, task_type: str = "general", prefer_local: bool = False,
+        expected_output_length: Optional[int] = None
+    ) -> str:
+        """
+        Async variant of route() using pooled HTTP connections.
+
+        Requests share one keep-alive HTTP client per provider and are
+        limited to ``llm_max_concurrency`` in flight per provider. Each
+        request is bounded by ``llm_timeout`` seconds, and cancelling the
+        awaiting task cancels the HTTP request.
+
+        Args:
+            prompt: The input prompt
+            task_type: Type of task (code, reasoning, general)
+            prefer_local: Ignored (cloud-based only)
+            expected_output_length: Expected output length in characters (for token estimation)
+
+        Returns:
+            Generated response from available AI provider
+        """
+        model_name, model_spec, token_estimates = self.model_selector.auto_select_for_prompt(
+            prompt=prompt,
+            expected_output_length=expected_output_length,
+            task_type=task_type
+        )
+
+        if not model_name or not model_spec:
+            logger.error("❌ No suitable model found, falling back to basic selection")
+            return await self._aroute_fallback(prompt, task_type)
+
+        logger.info(
+            f"📊 Token estimates: {token_estimates['input_tokens']} input / "
+            f"{token_estimates['output_tokens']} output (total: {token_estimates['total_tokens']})"
+        )
+
+        try:
+            if model_spec.provider == "google":
+                response = await self._aquery_gemini(prompt, model_name)
+            elif model_spec.provider == "openai":
+                response = await self._aquery_openai(prompt, model_name, self._openai_max_tokens(model_name))
+            else:
+                return await self._aroute_fallback(prompt, task_type)
+        except Exception as e:
+            logger.warning(f"❌ Model {model_name} failed: {e}, trying fallback")
+            return await self._aroute_fallback(prompt, task_type)
+
+        self.model_selector.record_usage(
+            model_name,
+            token_estimates['input_tokens'],
+            self.model_selector.estimate_tokens(response)
+        )
+        return response
+
+    async def _aroute_fallback(self, prompt: str, task_type: str) -> str:
+        """Async fallback routing when model selection fails"""
+        if self.gemini_available:
+            primary = "gemini-2.5-pro" if task_type == "code" else "gemini-2.5-flash"
+            for model_name in [primary] + self.GEMINI_FALLBACK_MODELS:
+                try:
+                    return await self._aquery_gemini(prompt, model_name)
+                except Exception as e:
+                    logger.warning(f"Google Gemini model {model_name} failed: {e}")
+
+        if self.openai_available:
+            model_name = "gpt-4o-mini" if task_type == "code" else "gpt-3.5-turbo"
+            try:
+                return await self._aquery_openai(prompt, model_name, 4000)
+            except Exception as e:
+                logger.warning(f"OpenAI failed: {e}")
+
+        raise Exception("No cloud-based AI providers available. Please check your API keys.")
+
+    async def astream(
+        self, prompt: str, task_type: str = "general",
+        expected_output_length: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text chunks while the provider generates it.
+
+        Uses the same model selection and fallback order as aroute(). A
+        fallback model is only tried while nothing has been yielded yet;
+        once output has started, a failure is raised to the caller.
+
+        Args:
+            prompt: The input prompt
+            task_type: Type of task (code, reasoning, general)
+            expected_output_length: Expected output length in characters (for token estimation)
+
+        Yields:
+            Response text chunks in order
+        """
+        model_name, model_spec, token_estimates = self.model_selector.auto_select_for_prompt(
+            prompt=prompt,
+            expected_output_length=expected_output_length,
+            task_type=task_type
+        )
+
+        last_error: Optional[Exception] = None
+        for provider, candidate in self._stream_candidates(model_name, model_spec, task_type):
+            produced: List[str] = []
+            try:
+                async for chunk in self._astream_provider(provider, prompt, candidate):
+                    produced.append(chunk)
+                    yield chunk
+            except Exception as e:
+                if produced:
+                    raise
+                logger.warning(f"❌ Streaming from {candidate} failed: {e}, trying fallback")
+                last_error = e
+                continue
+
+            if token_estimates and candidate == model_name:
+                self.model_selector.record_usage(
+                    model_name,
+                    token_estimates['input_tokens'],
+                    self.model_selector.estimate_tokens("".join(produced))
+                )
+            return
+
+        if last_error is not None:
+            raise last_error
+        raise Exception("No cloud-based AI providers available. Please check your API keys.")
+
+    def _stream_candidates(self, model_name: Optional[str], model_spec: Any, task_type: str) -> List[Tuple[str, str]]:
+        """Ordered (provider, model) pairs to try for a streamed request."""
+        candidates: List[Tuple[str, str]] = []
+        if model_name and model_spec and model_spec.provider in ("google", "openai"):
+            candidates.append((model_spec.provider, model_name))
+        if self.gemini_available:
+            primary = "gemini-2.5-pro" if task_type == "code" else "gemini-2.5-flash"
+            candidates.extend(("google", name) for name in [primary] + self.GEMINI_FALLBACK_MODELS)
+        if self.openai_available:
+            candidates.append(("openai", "gpt-4o-mini" if task_type == "code" else "gpt-3.5-turbo"))
+        return list(dict.fromkeys(candidates))
+
+    async def _astream_provider(self, provider: str, prompt: str, model_name: str) -> AsyncIterator[str]:
+        """Stream one model's response over server-sent events."""
+        if provider == "google":
+            url = f"{self.GEMINI_API_URL}/models/{model_name}:streamGenerateContent?alt=sse"
+            headers = {"x-goog-api-key": self._google_key}
+            payload: Dict[str, Any] = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        else:
+            url = f"{self.OPENAI_API_URL}/chat/completions"
+            headers = {"Authorization": f"Bearer {self._openai_key}"}
+            payload = {
+                "model": model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": self._openai_max_tokens(model_name),
+                "temperature": 0.7,
+                "stream": True
+            }
+
+        client, limit = self._async_resources(provider)
+        async with limit:
+            async with client.stream("POST", url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                async for event in self._iter_sse(response):
+                    if provider == "google":
+                        candidates = event.get("candidates") or []
+                        parts = candidates[0].get("content", {}).get("parts", []) if candidates else []
+                        text = "".join(part.get("text", "") for part in parts)
+                    else:
+                        choices = event.get("choices") or []
+                        text = (choices[0].get("delta", {}).get("content") or "") if choices else ""
+                    if text:
+                        yield text
+
+    @staticmethod
+    async def _iter_sse(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+        """Decode the JSON payloads of a server-sent event stream."""
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                return
+            if data:
+                yield json.loads(data)
+
+    def _openai_max_tokens(self, model_name: str) -> int:
+        model_spec = self.model_selector.available_models.get(model_name)
+        max_tokens = model_spec.output_tokens if model_spec else 4000
+        return min(max_tokens, 16000)  # Cap at reasonable limit
+
+    def _async_resources(self, provider: str):
+        """Pooled client and concurrency limit for a provider on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # Semaphores are bound to the loop that created them (the client
+            # pool closes the previous loop's clients itself)
+            self._provider_limits = {}
+            self._async_loop = loop
+
+        client = self._async_clients.get(provider, lambda: httpx.AsyncClient(
+            timeout=httpx.Timeout(self.request_timeout, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        ))
+        limit = self._provider_limits.setdefault(provider, asyncio.Semaphore(self.max_concurrency))
+        return client, limit
+
+    async def _apost(self, provider: str, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        client, limit = self._async_resources(provider)
+        async with limit:
+            response = await asyncio.wait_for(
+                client.post(url, headers=headers, json=payload),
+                timeout=self.request_timeout
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def _aquery_gemini(self, prompt: str, model_name: str) -> str:
+        """Query Google Gemini REST API with a specific model."""
+        data = await self._apost(
+            "google",
+            f"{self.GEMINI_API_URL}/models/{model_name}:generateContent",
+            {"x-goog-api-key": self._google_key},
+            {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        )
+        candidates = data.get("candidates") or []
+        if not candidates:
+            raise ValueError(f"Gemini returned no candidates: {data.get('promptFeedback', {})}")
+        parts: List[Dict[str, Any]] = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+    async def _aquery_openai(self, prompt: str, model_name: str, max_tokens: int) -> str:
+        """Query OpenAI chat completions REST API with a specific model."""
+        data = await self._apost(
+            "openai",
+            f"{self.OPENAI_API_URL}/chat/completions",
+            {"Authorization": f"Bearer {self._openai_key}"},
+            {
+                "model": model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": 0.7
+            }
+        )
+        return data["choices"][0]["message"]["content"]
+
+    async def aclose(self) -> None:
+        """Close pooled async HTTP clients."""
+        await self._async_clients.aclose()
+
     def get_available_models(self) -> Dict[str, bool]:
         """Get status of available models."""
         return {
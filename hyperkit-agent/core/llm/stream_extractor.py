@@ -0,0 +1,140 @@
+"""
+Incremental Solidity Extractor for Streamed LLM Output
+Strips markdown fences and detects pragma, import and contract boundaries as
+chunks arrive, so downstream work can start before the response is complete.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+_FENCE_RE = re.compile(r"^\s*```\s*([\w+-]*)\s*$")
+_CODE_START_RE = re.compile(r"^\s*(//\s*SPDX|pragma\s|import\s|(abstract\s+)?(contract|library|interface)\s)")
+_PRAGMA_RE = re.compile(r"^\s*pragma\s+solidity\s+([^;]+);")
+_IMPORT_RE = re.compile(r"""^\s*import\s+(?:[^"']*\bfrom\s+)?["']([^"']+)["']""")
+_DECLARATION_RE = re.compile(r"^\s*(?:abstract\s+)?(contract|library|interface)\s+([A-Za-z_]\w*)")
+
+# Fence languages treated as Solidity ("" covers a bare ``` fence)
+SOLIDITY_LANGUAGES = {"", "solidity", "sol"}
+
+
+class StreamEvent(NamedTuple):
+    """
+    Event produced while extracting streamed Solidity.
+
+    kind is one of "code" (a cleaned source line), "pragma" (compiler
+    version), "import" (import path), "contract" (declared contract,
+    library or interface name) or "complete" (end of the code block).
+    """
+    kind: str
+    value: str
+
+
+class SolidityStreamExtractor:
+    """
+    Line-based state machine over streamed model output.
+
+    Explanation text before the code is skipped. Code starts at a Solidity
+    (or bare) fence, or at the first line that looks like Solidity when the
+    model does not use fences. Code ends at the closing fence. Blocks fenced
+    with another language are skipped. A line is processed once its newline
+    arrives, so fence lines are never emitted as code.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._state = "preamble"  # preamble | code | skip_block | done
+        self._raw: List[str] = []
+        self._lines: List[str] = []
+        self.pragma: Optional[str] = None
+        self.imports: List[str] = []
+        self.declarations: List[Tuple[str, str]] = []
+
+    @property
+    def raw(self) -> str:
+        """Full unprocessed model output received so far."""
+        return "".join(self._raw)
+
+    @property
+    def code(self) -> str:
+        """Cleaned Solidity source extracted so far."""
+        return "\n".join(self._lines).strip()
+
+    @property
+    def complete(self) -> bool:
+        return self._state == "done"
+
+    @property
+    def contract_name(self) -> Optional[str]:
+        """Name of the last declared contract, else of the first declaration."""
+        contracts = [name for kind, name in self.declarations if kind == "contract"]
+        if contracts:
+            return contracts[-1]
+        return self.declarations[0][1] if self.declarations else None
+
+    def feed(self, chunk: str) -> List[StreamEvent]:
+        """
+        Process a chunk of model output.
+
+        Returns:
+            Events for the lines completed by this chunk
+        """
+        self._raw.append(chunk)
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        events: List[StreamEvent] = []
+        for line in lines:
+            self._process_line(line, events)
+        return events
+
+    def finish(self) -> List[StreamEvent]:
+        """Flush the last partial line and mark the stream complete."""
+        events: List[StreamEvent] = []
+        if self._pending:
+            line, self._pending = self._pending, ""
+            self._process_line(line, events)
+        if self._state != "done":
+            self._state = "done"
+            events.append(StreamEvent("complete", ""))
+        return events
+
+    def _process_line(self, line: str, events: List[StreamEvent]) -> None:
+        if self._state == "done":
+            return
+
+        line = line.rstrip("\r")
+        fence = _FENCE_RE.match(line)
+
+        if self._state == "skip_block":
+            if fence:
+                self._state = "preamble"
+            return
+
+        if self._state == "preamble":
+            if fence:
+                self._state = "code" if fence.group(1).lower() in SOLIDITY_LANGUAGES else "skip_block"
+                return
+            if not _CODE_START_RE.match(line):
+                return
+            self._state = "code"
+
+        if fence:
+            self._state = "done"
+            events.append(StreamEvent("complete", ""))
+            return
+
+        self._lines.append(line)
+        events.append(StreamEvent("code", line + "\n"))
+
+        if self.pragma is None:
+            pragma = _PRAGMA_RE.match(line)
+            if pragma:
+                self.pragma = pragma.group(1).strip()
+                events.append(StreamEvent("pragma", self.pragma))
+        imported = _IMPORT_RE.match(line)
+        if imported:
+            self.imports.append(imported.group(1))
+            events.append(StreamEvent("import", imported.group(1)))
+        declaration = _DECLARATION_RE.match(line)
+        if declaration:
+            self.declarations.append((declaration.group(1), declaration.group(2)))
+            events.append(StreamEvent("contract", declaration.group(2)))
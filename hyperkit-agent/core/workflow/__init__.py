@@ -6,10 +6,11 @@ from .error_handler import (
     SelfHealingErrorHandler, ParsedError, ErrorType, handle_error_with_retry
 )
 from .workflow_orchestrator import WorkflowOrchestrator
+from .batch_runner import WorkflowBatchRunner, load_prompts
 
 __all__ = [
     'ContextManager', 'WorkflowContext', 'PipelineStage', 'StageResult',
     'SelfHealingErrorHandler', 'ParsedError', 'ErrorType', 'handle_error_with_retry',
-    'WorkflowOrchestrator'
+    'WorkflowOrchestrator', 'WorkflowBatchRunner', 'load_prompts'
 ]
 
@@ -5,11 +5,15 @@ Comprehensive logging of all workflow events for debugging and regression analys
 
 import json
 import logging
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from enum import Enum
 
+from services.common.batch_writer import BatchWriter
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,8 +45,20 @@ class AuditEventType(Enum):
 class AuditTrail:
     """
     Comprehensive audit trail system for tracking all workflow events.
+    
+    Events are stored in an SQLite database (logs/audit_trail.sqlite3)
+    indexed by workflow ID, event type and stage, so queries read only the
+    matching events, newest first, however large the trail grows. Events
+    from a legacy logs/audit_trail.jsonl are imported on first use.
+    
+    Logging an event only queues it; a background writer inserts events in
+    batches, so workflow stages never wait on disk I/O.
+    
+    Thread-safe; the database may also be shared by several processes.
     """
     
+    _INSERT = "INSERT INTO events (timestamp, event_type, workflow_id, stage, event) VALUES (?, ?, ?, ?, ?)"
+    
     def __init__(self, workspace_dir: Path):
         """
         Initialize audit trail system.
@@ -52,10 +68,95 @@ class AuditTrail:
         """
         self.workspace_dir = Path(workspace_dir)
         self.logs_dir = self.workspace_dir / "logs"
-        self.audit_log_file = self.logs_dir / "audit_trail.jsonl"
+        self.audit_db_file = self.logs_dir / "audit_trail.sqlite3"
+        self.audit_log_file = self.logs_dir / "audit_trail.jsonl"  # legacy format, imported
         
         # Ensure logs directory exists
         self.logs_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.audit_db_file), timeout=30, check_same_thread=False)
+        self._init_schema()
+        self._import_legacy_log()
+        
+        # Events are inserted in batches from a background thread; queries
+        # flush first, so they always see every logged event
+        self._writer = BatchWriter(self._insert_rows, name="audit-trail")
+    
+    def _init_schema(self):
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                workflow_id TEXT,
+                stage TEXT,
+                event TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_workflow ON events (workflow_id, id);
+            CREATE INDEX IF NOT EXISTS events_type ON events (event_type, id);
+            CREATE INDEX IF NOT EXISTS events_stage ON events (stage, id);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+    
+    def _import_legacy_log(self):
+        """Import events appended to audit_trail.jsonl since the last import"""
+        if not self.audit_log_file.exists():
+            return
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT value FROM meta WHERE key = 'jsonl_offset'").fetchone()
+                offset = int(row[0]) if row else 0
+                if self.audit_log_file.stat().st_size <= offset:
+                    return
+                
+                rows = []
+                with open(self.audit_log_file, 'rb') as f:
+                    f.seek(offset)
+                    for raw in f:
+                        if not raw.endswith(b'\n'):
+                            break  # partially written line; import it next time
+                        offset += len(raw)
+                        try:
+                            rows.append(self._row(json.loads(raw)))
+                        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                            continue
+                
+                self._conn.executemany(self._INSERT, rows)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('jsonl_offset', ?)", (str(offset),)
+                )
+                self._conn.commit()
+            logger.info(f"Imported {len(rows)} events from {self.audit_log_file.name}")
+        except Exception as e:
+            logger.warning(f"Failed to import legacy audit trail: {e}")
+    
+    @staticmethod
+    def _row(event: Dict[str, Any]) -> tuple:
+        return (
+            event.get("timestamp") or "",
+            event.get("event_type") or "unknown",
+            event.get("workflow_id"),
+            event.get("stage"),
+            json.dumps(event),
+        )
+    
+    def _insert_rows(self, rows: List[tuple]):
+        """Insert a batch of events in one transaction"""
+        with self._lock:
+            self._conn.executemany(self._INSERT, rows)
+            self._conn.commit()
+    
+    def flush(self):
+        """Write buffered events to the database"""
+        self._writer.flush()
     
     def log_event(
         self,
@@ -88,15 +189,28 @@ class AuditTrail:
                 "metadata": metadata or {}
             }
             
-            # Write to JSONL file (one JSON object per line)
-            with open(self.audit_log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event) + '\n')
+            self._writer.write(self._row(event))
             
             logger.debug(f"Audit event logged: {event_type.value} for workflow {workflow_id}")
             
         except Exception as e:
             logger.warning(f"Failed to log audit event: {e}")
     
+    @staticmethod
+    def _filters(workflow_id: Optional[str], event_type: Optional[AuditEventType],
+                 stage: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if workflow_id:
+            clauses.append("workflow_id = ?")
+            params.append(workflow_id)
+        if event_type:
+            clauses.append("event_type = ?")
+            params.append(event_type.value)
+        if stage:
+            clauses.append("stage = ?")
+            params.append(stage)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
     def query_events(
         self,
         workflow_id: Optional[str] = None,
@@ -114,37 +228,16 @@ class AuditTrail:
             limit: Maximum number of results
             
         Returns:
-            List of matching events
+            List of the most recent matching events, newest first
         """
-        if not self.audit_log_file.exists():
-            return []
-        
-        results = []
+        where, params = self._filters(workflow_id, event_type, stage)
+        self._writer.flush()
         try:
-            with open(self.audit_log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        event = json.loads(line)
-                        
-                        # Apply filters
-                        if workflow_id and event.get('workflow_id') != workflow_id:
-                            continue
-                        if event_type and event.get('event_type') != event_type.value:
-                            continue
-                        if stage and event.get('stage') != stage:
-                            continue
-                        
-                        results.append(event)
-                        if len(results) >= limit:
-                            break
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Return most recent first
-            return list(reversed(results))
-            
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT event FROM events{where} ORDER BY id DESC LIMIT ?", (*params, limit)
+                ).fetchall()
+            return [json.loads(row[0]) for row in rows]
         except Exception as e:
             logger.warning(f"Failed to query audit trail: {e}")
             return []
@@ -159,9 +252,18 @@ class AuditTrail:
         Returns:
             Dictionary with statistics
         """
-        events = self.query_events(workflow_id=workflow_id, limit=1000)
+        where, params = self._filters(workflow_id, None, None)
+        self._writer.flush()
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT event_type, COUNT(*) FROM events{where} GROUP BY event_type", params
+                ).fetchall()
+        except Exception as e:
+            logger.warning(f"Failed to read audit trail statistics: {e}")
+            rows = []
         
-        if not events:
+        if not rows:
             return {
                 "total_events": 0,
                 "event_counts": {},
@@ -169,24 +271,20 @@ class AuditTrail:
                 "success_count": 0
             }
         
-        event_counts = {}
-        error_count = 0
-        success_count = 0
-        
-        for event in events:
-            event_type = event.get('event_type', 'unknown')
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-            
-            if 'error' in event_type or 'failed' in event_type:
-                error_count += 1
-            elif 'success' in event_type:
-                success_count += 1
+        event_counts = dict(rows)
+        error_count = sum(n for t, n in rows if 'error' in t or 'failed' in t)
+        success_count = sum(n for t, n in rows if 'success' in t and not ('error' in t or 'failed' in t))
         
         return {
-            "total_events": len(events),
+            "total_events": sum(event_counts.values()),
             "event_counts": event_counts,
             "error_count": error_count,
             "success_count": success_count,
             "success_rate": success_count / (success_count + error_count) if (success_count + error_count) > 0 else 0.0
         }
-
+    
+    def close(self):
+        """Flush buffered events and close the audit database"""
+        self._writer.close()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,154 @@
+"""
+Workflow Batch Runner
+Runs many workflow prompts concurrently through one shared agent and orchestrator.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+# Options a prompts file may set per entry (everything else is ignored)
+WORKFLOW_OPTIONS = ("network", "auto_verification", "test_only", "allow_insecure", "upload_scope", "rag_scope")
+
+
+def load_prompts(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Load workflow prompts from a file.
+
+    Supported formats:
+    - .json: a list of prompt strings or objects ({"prompt": ..., "test_only": ...})
+    - .jsonl: one prompt string or object per line
+    - anything else: one prompt per line; blank lines and lines starting with # are skipped
+
+    Args:
+        path: Prompts file
+
+    Returns:
+        List of entries, each a dict with at least a 'prompt' key
+
+    Raises:
+        ValueError: If an entry has no prompt
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix == ".json":
+        raw = json.loads(text)
+    elif path.suffix == ".jsonl":
+        raw = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        raw = [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+    entries = []
+    for index, item in enumerate(raw, 1):
+        entry = {"prompt": item} if isinstance(item, str) else dict(item)
+        if not str(entry.get("prompt") or "").strip():
+            raise ValueError(f"{path}: entry {index} has no prompt")
+        entries.append(entry)
+    return entries
+
+
+class WorkflowBatchRunner:
+    """
+    Runs a batch of workflows with a global concurrency limit.
+
+    All runs share the agent (LLM router and its connection pool, RAG
+    index, generation cache, incremental compiler) and one orchestrator
+    (tool registry, preflight results, dependency manager). Each run still
+    gets its own workflow ID, isolated temp environment, context and
+    diagnostic bundle, and holds its contract's file lock while it
+    compiles and deploys it.
+    """
+
+    def __init__(self, agent, max_concurrency: Optional[int] = None):
+        """
+        Initialize the batch runner.
+
+        Args:
+            agent: HyperKitAgent instance shared by all runs
+            max_concurrency: Maximum workflows running at once
+                (default: config 'workflow_batch_concurrency', else 4)
+        """
+        self.agent = agent
+        config = getattr(agent, "config", None) or {}
+        if max_concurrency is None:
+            max_concurrency = config.get("workflow_batch_concurrency") or DEFAULT_CONCURRENCY
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    async def run_batch(
+        self,
+        prompts: Sequence[Union[str, Dict[str, Any]]],
+        output_path: Optional[Union[str, Path]] = None,
+        **workflow_options
+    ) -> Dict[str, Any]:
+        """
+        Run a workflow for every prompt.
+
+        A failing workflow never affects the others; its error is recorded
+        in its result entry.
+
+        Args:
+            prompts: Prompt strings or entries as returned by load_prompts()
+            output_path: Optional JSON file to write the batch results to
+            **workflow_options: Defaults passed to run_complete_workflow
+                (network, test_only, ...); entries may override them
+
+        Returns:
+            Batch summary with per-prompt results in input order
+        """
+        entries = [{"prompt": p} if isinstance(p, str) else dict(p) for p in prompts]
+        workers = min(self.max_concurrency, max(len(entries), 1))
+        logger.info(f"Starting workflow batch: {len(entries)} prompts, {workers} concurrent")
+
+        orchestrator = self.agent._get_orchestrator()
+        semaphore = asyncio.Semaphore(workers)
+        batch_start = time.time()
+
+        async def run_one(index: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                options = {**workflow_options, **{k: entry[k] for k in WORKFLOW_OPTIONS if k in entry}}
+                start = time.time()
+                logger.info(f"[{index}/{len(entries)}] Starting workflow: {entry['prompt'][:80]}")
+                try:
+                    result = await orchestrator.run_complete_workflow(user_prompt=entry["prompt"], **options)
+                except Exception as e:
+                    logger.error(f"[{index}/{len(entries)}] Workflow crashed: {e}")
+                    result = {"status": "error", "error": str(e), "error_type": type(e).__name__}
+                result["prompt"] = entry["prompt"]
+                result["duration_s"] = round(time.time() - start, 3)
+                logger.info(f"[{index}/{len(entries)}] Workflow finished: {result.get('status')}")
+                return result
+
+        results = await asyncio.gather(*(run_one(i, entry) for i, entry in enumerate(entries, 1)))
+
+        summary = {
+            "timestamp": datetime.now().isoformat(),
+            "total": len(results),
+            "successful": sum(1 for r in results if r.get("status") == "success"),
+            "completed_with_errors": sum(1 for r in results if r.get("status") == "completed_with_errors"),
+            "failed": sum(1 for r in results if r.get("status") not in ("success", "completed_with_errors")),
+            "concurrency": workers,
+            "duration_s": round(time.time() - batch_start, 3),
+            "results": list(results),
+        }
+
+        if output_path:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps(summary, indent=2, default=str), encoding="utf-8")
+            logger.info(f"Batch results saved to: {output_path}")
+
+        logger.info(
+            f"Workflow batch complete: {summary['successful']} succeeded, "
+            f"{summary['completed_with_errors']} with errors, {summary['failed']} failed "
+            f"in {summary['duration_s']}s"
+        )
+        return summary
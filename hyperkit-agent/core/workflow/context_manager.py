@@ -128,6 +128,39 @@ class WorkflowContext:
             if len(self.error_history) > 50:
                 self.error_history.pop(0)  # Remove oldest error
     
+    def result_checkpoint(self) -> Tuple[int, int]:
+        """Mark the current end of the stage results and error log"""
+        return len(self.stages), len(self.errors)
+
+    def order_results_since(self, checkpoint: Tuple[int, int], stage_order: List[PipelineStage]):
+        """
+        Put results recorded since a checkpoint into pipeline order.
+
+        Stages that ran concurrently append their results in completion
+        order; this restores the order a sequential run would have produced.
+        The sort is stable, so several results from one stage keep their
+        relative order.
+
+        Args:
+            checkpoint: Value returned by result_checkpoint() before the stages ran
+            stage_order: Stages in pipeline order
+        """
+        rank = {stage.value: i for i, stage in enumerate(stage_order)}
+
+        def key(stage) -> int:
+            value = stage.value if isinstance(stage, Enum) else stage
+            return rank.get(value, len(rank))
+
+        stages_mark, errors_mark = checkpoint
+        self.stages[stages_mark:] = sorted(self.stages[stages_mark:], key=lambda r: key(r.stage))
+        new_errors = len(self.errors) - errors_mark
+        if new_errors > 0:
+            self.errors[errors_mark:] = sorted(self.errors[errors_mark:], key=lambda e: key(e["stage"]))
+            # error_history holds the same entries (it is capped, so only
+            # its tail can be reordered)
+            tail = min(new_errors, len(self.error_history))
+            self.error_history[-tail:] = sorted(self.error_history[-tail:], key=lambda e: key(e["stage"]))
+
     def get_last_stage_result(self) -> Optional[StageResult]:
         """Get the most recent stage result"""
         return self.stages[-1] if self.stages else None
@@ -895,20 +895,8 @@ class SelfHealingErrorHandler:
                         context["contract_code"] = updated_code
                         logger.info(f"✅ Updated contract pragma: ^0.8.{required_minor}")
                 
-                # Clear Foundry cache after version update
-                try:
-                    import subprocess
-                    from pathlib import Path
-                    foundry_project_dir = context.get("workspace_dir") or Path(__file__).parent.parent.parent
-                    subprocess.run(
-                        ["forge", "clean"],
-                        cwd=foundry_project_dir,
-                        capture_output=True,
-                        timeout=30
-                    )
-                    logger.info("🧹 Cleared Foundry cache after Solidity version update")
-                except Exception as e:
-                    logger.warning(f"⚠️  Could not clear Foundry cache: {e}")
+                # No cache clearing needed: forge and the build cache both key
+                # artifacts by compiler settings, so the new version recompiles
                 
                 return True, f"Updated Solidity version to {required_version} and retrying"
         
@@ -1,59 +1,180 @@
 """
 Workflow State Persistence
-Handles YAML serialization for structured state and Markdown journaling for human-readable logs.
+Handles snapshot/delta serialization for structured state and Markdown journaling for human-readable logs.
 """
 
+import copy
+import json
 import logging
+import os
+import threading
+import uuid
 import yaml
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
-from core.workflow.workflow_state import WorkflowState, LoopStep
+from core.workflow.workflow_state import WorkflowState, LoopStep, to_plain
+from services.common.batch_writer import BatchWriter
 
 logger = logging.getLogger(__name__)
 
 
+# Snapshot layout per workflow directory: a full JSON snapshot plus an
+# append-only log of deltas against it. Each delta carries the ID of the
+# snapshot it extends, so deltas left over from an older snapshot (e.g. a
+# crash during compaction) are ignored on load.
+SNAPSHOT_FILE = "workflow_state.json"
+DELTAS_FILE = "workflow_state.deltas.jsonl"
+YAML_FILE = "workflow_state.yaml"
+SNAPSHOT_FORMAT = 1
+
+# Fields that only ever grow by appending; deltas carry just the new items
+APPEND_ONLY_FIELDS = ("reasoning_history", "tool_invocations")
+
+# Deltas written before the next save rewrites a full snapshot
+COMPACT_AFTER_DELTAS = 64
+
+
+@dataclass
+class _PersistedState:
+    """What this instance last wrote for a workflow"""
+    snapshot_id: str
+    values: Dict[str, Any]   # plain values of the replaceable fields
+    lengths: Dict[str, int]  # lengths of the append-only fields
+    deltas: int
+    files: Tuple[Any, ...]   # (mtime_ns, size) of snapshot and deltas files
+
+
 class StatePersistence:
-    """Handles persistence of workflow state in YAML and Markdown formats"""
+    """
+    Handles persistence of workflow state and Markdown journaling.
     
-    def __init__(self, workspace_dir: Path):
+    State is stored as a JSON snapshot plus append-only JSON deltas, so a
+    save writes only what changed since the previous save (new reasoning
+    steps and tool invocations, updated fields). Every COMPACT_AFTER_DELTAS
+    saves the deltas are folded into a fresh snapshot. YAML is available
+    as a human-readable export (export_yaml, or yaml_export=True to keep a
+    YAML copy up to date); states saved as YAML by older versions still load.
+    """
+    
+    def __init__(self, workspace_dir: Path, yaml_export: bool = False):
         """
         Initialize state persistence.
         
         Args:
             workspace_dir: Base workspace directory
+            yaml_export: Also write workflow_state.yaml on every save
         """
         self.workspace_dir = Path(workspace_dir)
         self.states_dir = self.workspace_dir / ".workflow_states"
         self.states_dir.mkdir(exist_ok=True, parents=True)
+        self.yaml_export = yaml_export
+        self._persisted: Dict[str, _PersistedState] = {}
+        self._state_lock = threading.Lock()
+        # Markdown log entries are appended in batches by a background writer
+        self._log_writer = BatchWriter(self._append_log_batch, name="workflow-log")
         logger.info(f"StatePersistence initialized - states dir: {self.states_dir}")
     
     def save_state(self, state: WorkflowState) -> Path:
         """
-        Save workflow state to YAML file.
+        Save workflow state, appending a delta when possible.
+        
+        A full snapshot is written instead when this instance has not
+        written the workflow before, the files were changed by someone
+        else, an append-only list shrank, or enough deltas have piled up.
         
         Args:
             state: WorkflowState to save
             
         Returns:
-            Path to saved YAML file
+            Path to the state snapshot file
         """
         workflow_dir = self.states_dir / state.workflow_id
-        workflow_dir.mkdir(exist_ok=True, parents=True)
+        snapshot_path = workflow_dir / SNAPSHOT_FILE
+        
+        with self._state_lock:
+            persisted = self._persisted.get(state.workflow_id)
+            delta = None
+            if (persisted and persisted.deltas < COMPACT_AFTER_DELTAS
+                    and self._file_stats(workflow_dir) == persisted.files):
+                delta = self._diff(state, persisted)
+            
+            if delta is None:
+                self._write_snapshot(state, workflow_dir)
+            elif delta["set"] or delta["append"]:
+                with open(workflow_dir / DELTAS_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(delta, separators=(',', ':')) + '\n')
+                persisted.values.update(delta["set"])
+                for name, items in delta["append"].items():
+                    persisted.lengths[name] += len(items)
+                persisted.deltas += 1
+                persisted.files = self._file_stats(workflow_dir)
         
-        yaml_path = workflow_dir / "workflow_state.yaml"
+        if self.yaml_export:
+            self.export_yaml(state)
         
-        # Convert to dict and save as YAML
+        logger.debug(f"💾 Workflow state saved to: {snapshot_path}")
+        return snapshot_path
+    
+    def _diff(self, state: WorkflowState, persisted: _PersistedState) -> Optional[Dict[str, Any]]:
+        """Delta from the persisted state to ``state`` (None if a full snapshot is needed)"""
+        delta = {"snapshot_id": persisted.snapshot_id, "set": {}, "append": {}}
+        for name in APPEND_ONLY_FIELDS:
+            items = getattr(state, name)
+            known = persisted.lengths[name]
+            if len(items) < known:
+                return None
+            if len(items) > known:
+                delta["append"][name] = [to_plain(item) for item in items[known:]]
+        for f in fields(WorkflowState):
+            if f.name in APPEND_ONLY_FIELDS:
+                continue
+            value = to_plain(getattr(state, f.name))
+            if value != persisted.values.get(f.name):
+                delta["set"][f.name] = value
+        return delta
+    
+    def _write_snapshot(self, state: WorkflowState, workflow_dir: Path):
+        """Write a full snapshot atomically and start a new delta log"""
+        workflow_dir.mkdir(exist_ok=True, parents=True)
         state_dict = state.to_dict()
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(state_dict, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        snapshot_id = uuid.uuid4().hex
         
-        logger.debug(f"💾 Workflow state saved to: {yaml_path}")
-        return yaml_path
+        tmp_path = workflow_dir / f".{SNAPSHOT_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": SNAPSHOT_FORMAT, "snapshot_id": snapshot_id, "state": state_dict},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, workflow_dir / SNAPSHOT_FILE)
+        # Old deltas no longer match the snapshot ID; drop them
+        (workflow_dir / DELTAS_FILE).unlink(missing_ok=True)
+        
+        self._remember(state.workflow_id, snapshot_id, state_dict, 0, workflow_dir)
+    
+    def _remember(self, workflow_id: str, snapshot_id: str, state_dict: Dict[str, Any],
+                  deltas: int, workflow_dir: Path):
+        self._persisted[workflow_id] = _PersistedState(
+            snapshot_id=snapshot_id,
+            values={k: v for k, v in state_dict.items() if k not in APPEND_ONLY_FIELDS},
+            lengths={k: len(state_dict.get(k) or []) for k in APPEND_ONLY_FIELDS},
+            deltas=deltas,
+            files=self._file_stats(workflow_dir),
+        )
+    
+    @staticmethod
+    def _file_stats(workflow_dir: Path) -> Tuple[Any, ...]:
+        stats = []
+        for name in (SNAPSHOT_FILE, DELTAS_FILE):
+            try:
+                st = os.stat(workflow_dir / name)
+                stats.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
     
     def load_state(self, workflow_id: str) -> Optional[WorkflowState]:
         """
-        Load workflow state from YAML file.
+        Load workflow state (snapshot plus deltas, or a legacy YAML file).
         
         Args:
             workflow_id: Workflow ID to load
@@ -67,14 +188,19 @@ class StatePersistence:
         if workflow_id is None:
             return None
         
-        yaml_path = self.states_dir / workflow_id / "workflow_state.yaml"
-        
-        if not yaml_path.exists():
-            return None
+        workflow_dir = self.states_dir / workflow_id
+        snapshot_path = workflow_dir / SNAPSHOT_FILE
+        yaml_path = workflow_dir / YAML_FILE
         
         try:
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                state_dict = yaml.safe_load(f)
+            if snapshot_path.exists():
+                with self._state_lock:
+                    state_dict = self._read_snapshot(workflow_id, workflow_dir)
+            elif yaml_path.exists():
+                with open(yaml_path, 'r', encoding='utf-8') as f:
+                    state_dict = yaml.safe_load(f)
+            else:
+                return None
             
             if not state_dict:
                 return None
@@ -84,6 +210,54 @@ class StatePersistence:
             logger.error(f"Failed to load workflow state: {e}")
             return None
     
+    def _read_snapshot(self, workflow_id: str, workflow_dir: Path) -> Dict[str, Any]:
+        """Read a snapshot and apply its deltas"""
+        files = self._file_stats(workflow_dir)
+        with open(workflow_dir / SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        snapshot_id = snapshot["snapshot_id"]
+        state_dict = snapshot["state"]
+        
+        applied = 0
+        deltas_path = workflow_dir / DELTAS_FILE
+        if deltas_path.exists():
+            with open(deltas_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write: appending after it would corrupt the next
+                        # delta too, so make the next save a full snapshot
+                        applied = COMPACT_AFTER_DELTAS
+                        break
+                    if delta.get("snapshot_id") != snapshot_id:
+                        continue
+                    state_dict.update(delta.get("set", {}))
+                    for name, items in delta.get("append", {}).items():
+                        state_dict.setdefault(name, []).extend(items)
+                    applied += 1
+        
+        self._remember(workflow_id, snapshot_id, copy.deepcopy(state_dict), applied, workflow_dir)
+        self._persisted[workflow_id].files = files
+        return state_dict
+    
+    def export_yaml(self, state: WorkflowState) -> Path:
+        """
+        Write the state as human-readable YAML (workflow_state.yaml).
+        
+        Args:
+            state: WorkflowState to export
+            
+        Returns:
+            Path to the YAML file
+        """
+        workflow_dir = self.states_dir / state.workflow_id
+        workflow_dir.mkdir(exist_ok=True, parents=True)
+        yaml_path = workflow_dir / YAML_FILE
+        with open(yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(state.to_dict(), f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        return yaml_path
+    
     def append_log_entry(self, state: WorkflowState, entry_type: str, 
                         content: str, metadata: dict = None):
         """
@@ -95,10 +269,7 @@ class StatePersistence:
             content: Log content
             metadata: Additional metadata
         """
-        workflow_dir = self.states_dir / state.workflow_id
-        workflow_dir.mkdir(exist_ok=True, parents=True)
-        
-        log_path = workflow_dir / "workflow_log.md"
+        log_path = self.states_dir / state.workflow_id / "workflow_log.md"
         
         # Create or append to log file
         timestamp = datetime.utcnow().isoformat()
@@ -116,9 +287,23 @@ class StatePersistence:
                 log_entry += f"- {key}: {value}\n"
             log_entry += "\n"
         
-        # Append to file
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        # Queued; written to the file by the background writer
+        self._log_writer.write((log_path, log_entry))
+    
+    @staticmethod
+    def _append_log_batch(entries: List[Tuple[Path, str]]):
+        """Append queued entries, opening each log file once per batch"""
+        grouped: Dict[Path, List[str]] = {}
+        for log_path, log_entry in entries:
+            grouped.setdefault(log_path, []).append(log_entry)
+        for log_path, log_entries in grouped.items():
+            log_path.parent.mkdir(exist_ok=True, parents=True)
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write("".join(log_entries))
+    
+    def flush(self):
+        """Write queued log entries to their files"""
+        self._log_writer.flush()
     
     def generate_full_log(self, state: WorkflowState) -> str:
         """
@@ -231,6 +416,9 @@ class StatePersistence:
         log_path = workflow_dir / "workflow_log.md"
         log_content = self.generate_full_log(state)
         
+        # Write queued entries first so none lands after the regenerated log
+        self._log_writer.flush()
+        
         with open(log_path, 'w', encoding='utf-8') as f:
             f.write(log_content)
         
@@ -238,13 +426,13 @@ class StatePersistence:
         return log_path
     
     def get_state_path(self, workflow_id: str) -> Path:
-        """Get path to state YAML file"""
+        """Get path to state snapshot file"""
         # Validate workflow_id using centralized utility
         from cli.utils.sentinel_validator import validate_string_param
         validated_id = validate_string_param(workflow_id, "workflow_id")
         if validated_id is None:
             raise ValueError("Invalid workflow_id: cannot be None or Sentinel")
-        return self.states_dir / validated_id / "workflow_state.yaml"
+        return self.states_dir / validated_id / SNAPSHOT_FILE
     
     def get_log_path(self, workflow_id: str) -> Path:
         """Get path to log Markdown file"""
@@ -253,5 +441,6 @@ class StatePersistence:
         validated_id = validate_string_param(workflow_id, "workflow_id")
         if validated_id is None:
             raise ValueError("Invalid workflow_id: cannot be None or Sentinel")
+        self._log_writer.flush()
         return self.states_dir / validated_id / "workflow_log.md"
 
@@ -10,7 +10,7 @@ import time
 import uuid
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 # CRITICAL: PipelineStage MUST be imported at module level only - never locally
@@ -29,6 +29,7 @@ if not hasattr(PipelineStage, "GENERATION"):
 from core.workflow.error_handler import SelfHealingErrorHandler, handle_error_with_retry
 from core.workflow.environment_manager import EnvironmentManager
 from services.dependencies.dependency_manager import DependencyManager
+from services.common.process_runner import run_process
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +66,34 @@ except ImportError:
     logger.debug("Audit trail system not available")
 
 
+# Pipeline stages in sequential order, used to resume runs and to keep
+# stage results ordered when stages run concurrently
+STAGE_ORDER: List[PipelineStage] = [
+    PipelineStage.INPUT_PARSING,
+    PipelineStage.GENERATION,
+    PipelineStage.DEPENDENCY_RESOLUTION,
+    PipelineStage.COMPILATION,
+    PipelineStage.TESTING,
+    PipelineStage.AUDITING,
+    PipelineStage.DEPLOYMENT,
+    PipelineStage.VERIFICATION,
+    PipelineStage.OUTPUT,
+]
+
+# Stages each build stage needs finished before it can start. Testing and
+# auditing both only need the compiled contract, so they run side by side.
+# (Dependency installs already start during generation, as soon as the
+# streamed code reveals its imports.)
+STAGE_DEPENDENCIES: Dict[PipelineStage, Tuple[PipelineStage, ...]] = {
+    PipelineStage.INPUT_PARSING: (),
+    PipelineStage.GENERATION: (PipelineStage.INPUT_PARSING,),
+    PipelineStage.DEPENDENCY_RESOLUTION: (PipelineStage.GENERATION,),
+    PipelineStage.COMPILATION: (PipelineStage.DEPENDENCY_RESOLUTION,),
+    PipelineStage.TESTING: (PipelineStage.COMPILATION,),
+    PipelineStage.AUDITING: (PipelineStage.COMPILATION,),
+}
+
+
 class WorkflowOrchestrator:
     """
     Self-healing workflow orchestrator that manages the complete pipeline.
@@ -87,6 +116,11 @@ class WorkflowOrchestrator:
         self.state_persistence = StatePersistence(self.workspace_dir)
         self.error_handler = SelfHealingErrorHandler()
         self.dep_manager = DependencyManager(self.workspace_dir)
+        # Dependency installs started from streamed imports, keyed by workflow ID
+        self._dependency_prefetch: Dict[str, asyncio.Task] = {}
+        # Preflight tool checks, run once and shared by all workflows
+        self._preflight_results: Optional[Dict[str, Any]] = None
+        self._preflight_lock = asyncio.Lock()
         self.env_manager: Optional[EnvironmentManager] = None
         
         # Initialize tool registry (Phase 2)
@@ -148,24 +182,31 @@ class WorkflowOrchestrator:
         
         logger.info("WorkflowOrchestrator initialized with self-healing capabilities")
     
-    async def _read_workflow_state(self, context: WorkflowContext) -> WorkflowState:
+    def _load_workflow_state(self, context: WorkflowContext) -> WorkflowState:
+        """Load the persisted workflow state, creating it if not found"""
+        workflow_state = self.state_persistence.load_state(context.workflow_id)
+        if not workflow_state:
+            workflow_state = WorkflowState(
+                workflow_id=context.workflow_id,
+                user_goal=context.user_prompt,
+                current_step=LoopStep.READ
+            )
+        return workflow_state
+    
+    async def _read_workflow_state(self, context: WorkflowContext,
+                                   shared_state: Optional[WorkflowState] = None) -> WorkflowState:
         """
         READ step: Load workflow state, context, and RAG results.
         
         Args:
             context: Current workflow context
+            shared_state: State object already in use by concurrently running
+                stages; used instead of reloading so their updates are not lost
             
         Returns:
             WorkflowState with current state loaded
         """
-        workflow_state = self.state_persistence.load_state(context.workflow_id)
-        if not workflow_state:
-            # Create new state if not found
-            workflow_state = WorkflowState(
-                workflow_id=context.workflow_id,
-                user_goal=context.user_prompt,
-                current_step=LoopStep.READ
-            )
+        workflow_state = shared_state or self._load_workflow_state(context)
         
         # Update context snapshot from WorkflowContext
         workflow_state.update_context_snapshot({
@@ -296,8 +337,12 @@ class WorkflowOrchestrator:
                 await tool_to_stage_method[action_plan.tool_name]()
                 duration_ms = (time.time() - start_time) * 1000
                 
-                # Get the last stage result
-                last_result = context.get_last_stage_result()
+                # Get this stage's result (other stages may be running concurrently)
+                stage = action_plan.parameters.get("stage")
+                last_result = (
+                    context.get_stage_result(PipelineStage(stage)) if stage
+                    else context.get_last_stage_result()
+                )
                 success = last_result.status == "success" if last_result else False
                 
                 # Record tool invocation
@@ -345,7 +390,8 @@ class WorkflowOrchestrator:
                 duration_ms=duration_ms
             )
             
-            state.record_error(error_msg, type(e).__name__, state.current_stage)
+            state.record_error(error_msg, type(e).__name__,
+                               action_plan.parameters.get("stage", state.current_stage))
             
             result = ActionResult(
                 success=False,
@@ -399,9 +445,8 @@ class WorkflowOrchestrator:
                 state.next_action = None
                 state.has_error = True
         
-        # Save state and log
+        # Save state; the full Markdown log is only regenerated when the workflow ends
         self.state_persistence.save_state(state)
-        self.state_persistence.save_full_log(state)
         
         self.state_persistence.append_log_entry(
             state,
@@ -412,19 +457,21 @@ class WorkflowOrchestrator:
         
         return state
     
-    async def _autonomous_loop(self, context: WorkflowContext, stage: PipelineStage) -> bool:
+    async def _autonomous_loop(self, context: WorkflowContext, stage: PipelineStage,
+                               shared_state: Optional[WorkflowState] = None) -> bool:
         """
         Execute autonomous read/plan/act/update loop for a stage.
         
         Args:
             context: Workflow context
             stage: Pipeline stage to execute
+            shared_state: Workflow state shared with concurrently running stages
             
         Returns:
             True if stage completed successfully, False otherwise
         """
         # READ: Load workflow state
-        state = await self._read_workflow_state(context)
+        state = await self._read_workflow_state(context, shared_state)
         
         # PLAN: Determine next action
         action_plan = await self._plan_next_action(state, context, stage)
@@ -437,6 +484,52 @@ class WorkflowOrchestrator:
         
         return action_result.success
     
+    async def _run_stage_graph(self, context: WorkflowContext, stages: List[PipelineStage]):
+        """
+        Run pipeline stages in dependency order, overlapping independent ones.
+        
+        Stages run in waves: every stage whose dependencies (STAGE_DEPENDENCIES)
+        have finished starts together with the others that are ready, and the
+        next wave starts when the whole wave is done. Dependencies outside
+        ``stages`` (e.g. already completed before a resume) count as met.
+        Stage results of a concurrent wave are put back into pipeline order
+        afterwards, so the context and diagnostic bundles look exactly like
+        those of a sequential run.
+        
+        Args:
+            context: Workflow context
+            stages: Stages to run
+        """
+        pending = [stage for stage in STAGE_ORDER if stage in stages]
+        done = set()
+        
+        while pending:
+            wave = [
+                stage for stage in pending
+                if all(dep in done or dep not in stages for dep in STAGE_DEPENDENCIES.get(stage, ()))
+            ]
+            if not wave:
+                raise RuntimeError(f"Unsatisfiable stage dependencies: {[s.value for s in pending]}")
+            pending = [stage for stage in pending if stage not in wave]
+            
+            if len(wave) == 1:
+                await self._autonomous_loop(context, wave[0])
+            else:
+                logger.info(f"⚡ Running stages concurrently: {', '.join(s.value for s in wave)}")
+                checkpoint = context.result_checkpoint()
+                shared_state = self._load_workflow_state(context)
+                outcomes = await asyncio.gather(
+                    *(self._autonomous_loop(context, stage, shared_state) for stage in wave),
+                    return_exceptions=True
+                )
+                context.order_results_since(checkpoint, STAGE_ORDER)
+                # Surface failures as a sequential run would: the first
+                # failing stage in pipeline order
+                for outcome in outcomes:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+            done.update(wave)
+    
     async def run_complete_workflow(
         self,
         user_prompt: str,
@@ -457,8 +550,8 @@ class WorkflowOrchestrator:
         3. Contract generation
         4. Dependency resolution & installation
         5. Compilation
-        6. Testing (optional)
-        7. Auditing
+        6. Testing (optional)     } run concurrently
+        7. Auditing               }
         8. Deployment (if not test-only)
         9. Verification (if deployed)
         10. Output & diagnostics
@@ -591,9 +684,10 @@ class WorkflowOrchestrator:
         # Ensure workflow_id is available
         workflow_id = context.workflow_id
         
-        # Create isolated environment
-        self.env_manager = EnvironmentManager(self.workspace_dir, workflow_id)
-        temp_dir = self.env_manager.create_isolated_environment()
+        # Create isolated environment (kept in a local: this orchestrator
+        # may be running other workflows concurrently)
+        env_manager = self.env_manager = EnvironmentManager(self.workspace_dir, workflow_id)
+        temp_dir = env_manager.create_isolated_environment()
         context.temp_dir = str(temp_dir)
         context.metadata["temp_dir"] = str(temp_dir)
         
@@ -609,6 +703,7 @@ class WorkflowOrchestrator:
         logger.info(f"📁 Isolated environment: {temp_dir}")
         
         had_errors = False
+        contract_lock: Optional[asyncio.Lock] = None
         
         # Determine resume point if resuming from diagnostic bundle
         last_successful_stage = context.get_last_successful_stage() if resume_path_str else None
@@ -637,39 +732,30 @@ class WorkflowOrchestrator:
             context.metadata['rag_scope'] = rag_scope
             context.metadata['allow_insecure'] = allow_insecure
             
+            def should_run(stage: PipelineStage) -> bool:
+                # When resuming, rerun from the last successful stage onwards
+                if not resume_path_str or not last_successful_stage or last_successful_stage not in STAGE_ORDER:
+                    return True
+                return STAGE_ORDER.index(last_successful_stage) <= STAGE_ORDER.index(stage)
+            
             # Stage 0: Preflight checks (skip if resuming past generation)
-            if not resume_path_str or not last_successful_stage or last_successful_stage.value == 'input_parsing':
+            if should_run(PipelineStage.INPUT_PARSING):
                 await self._stage_preflight(context)
             
-            # Stage 1: Input parsing & RAG context (skip if resuming past this)
-            if not resume_path_str or not last_successful_stage or last_successful_stage.value == 'input_parsing':
-                await self._autonomous_loop(context, PipelineStage.INPUT_PARSING)
-            
-            # Stage 2: Contract generation (skip if resuming past this)
-            if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['generation', 'input_parsing']:
-                await self._autonomous_loop(context, PipelineStage.GENERATION)
-            
-            # Stage 3: Dependency resolution (skip if resuming past this)
-            if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['dependency_resolution', 'generation', 'input_parsing']:
-                await self._autonomous_loop(context, PipelineStage.DEPENDENCY_RESOLUTION)
-            
-            # Stage 4: Compilation (skip if resuming past this)
-            if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['compilation', 'dependency_resolution', 'generation', 'input_parsing']:
-                await self._autonomous_loop(context, PipelineStage.COMPILATION)
-            
-            # Stage 5: Testing (skip if resuming past this)
-            if not test_only:
-                if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['testing', 'compilation', 'dependency_resolution', 'generation', 'input_parsing']:
-                    await self._autonomous_loop(context, PipelineStage.TESTING)
-            
-            # Stage 6: Auditing (skip if resuming past this)
-            if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['auditing', 'testing', 'compilation', 'dependency_resolution', 'generation', 'input_parsing']:
-                await self._autonomous_loop(context, PipelineStage.AUDITING)
+            # Stages 1-6: Input parsing, generation, dependency resolution,
+            # compilation, then testing and auditing side by side
+            build_stages = [stage for stage in STAGE_DEPENDENCIES if should_run(stage)]
+            if test_only:
+                build_stages = [stage for stage in build_stages if stage != PipelineStage.TESTING]
+            generation_stages = [PipelineStage.INPUT_PARSING, PipelineStage.GENERATION]
+            await self._run_stage_graph(context, [s for s in build_stages if s in generation_stages])
+            contract_lock = await self._claim_contract_files(context)
+            await self._run_stage_graph(context, [s for s in build_stages if s not in generation_stages])
             
             # Stage 7: Deployment (skip if resuming past this)
             deployment_success = False
             if not test_only:
-                if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['deployment', 'auditing', 'testing', 'compilation', 'dependency_resolution', 'generation', 'input_parsing']:
+                if should_run(PipelineStage.DEPLOYMENT):
                     try:
                         await self._autonomous_loop(context, PipelineStage.DEPLOYMENT)
                         # Check if deployment actually succeeded
@@ -684,7 +770,7 @@ class WorkflowOrchestrator:
             
             # Stage 8: Verification & Artifact Storage (only if deployment succeeded)
             if not test_only and auto_verification and deployment_success and context.deployment_address:
-                if not resume_path_str or not last_successful_stage or last_successful_stage.value in ['verification', 'deployment', 'auditing', 'testing', 'compilation', 'dependency_resolution', 'generation', 'input_parsing']:
+                if should_run(PipelineStage.VERIFICATION):
                     try:
                         await self._autonomous_loop(context, PipelineStage.VERIFICATION)
                     except Exception as verify_error:
@@ -779,9 +865,9 @@ class WorkflowOrchestrator:
                     # Non-fatal - continue
             
             # Clean up environment (preserve on critical errors, cleanup on success/warnings)
-            if self.env_manager:
+            if env_manager:
                 had_errors = critical_failures or context.has_error()
-                self.env_manager.cleanup(preserve_on_error=bool(critical_failures), had_errors=had_errors)
+                env_manager.cleanup(preserve_on_error=bool(critical_failures), had_errors=had_errors)
             
             logger.info(f"📊 Workflow completed: {result['status']} (workflow_id: {workflow_id})")
             return result
@@ -816,18 +902,18 @@ class WorkflowOrchestrator:
                 logger.warning("⚠️ No context available for error handling - exception occurred very early")
             
             # Preserve environment for debugging
-            if self.env_manager:
+            if env_manager:
                 try:
-                    self.env_manager.preserve_for_debugging()
-                    self.env_manager.cleanup(preserve_on_error=True, had_errors=True)
+                    env_manager.preserve_for_debugging()
+                    env_manager.cleanup(preserve_on_error=True, had_errors=True)
                 except Exception as env_error:
                     logger.error(f"Failed to cleanup environment: {env_error}")
             
             logger.error(f"❌ Workflow failed: {e}")
             if diagnostic_path:
                 logger.info(f"📋 Diagnostic bundle saved: {diagnostic_path}")
-            if self.env_manager and hasattr(self.env_manager, 'temp_dir') and self.env_manager.temp_dir:
-                logger.info(f"📁 Temp environment preserved: {self.env_manager.temp_dir}")
+            if env_manager and hasattr(env_manager, 'temp_dir') and env_manager.temp_dir:
+                logger.info(f"📁 Temp environment preserved: {env_manager.temp_dir}")
             
             # Build error result safely
             error_result = {
@@ -839,8 +925,8 @@ class WorkflowOrchestrator:
             if diagnostic_path:
                 error_result["diagnostic_bundle"] = str(diagnostic_path)
             
-            if self.env_manager and hasattr(self.env_manager, 'temp_dir') and self.env_manager.temp_dir:
-                error_result["temp_dir"] = str(self.env_manager.temp_dir)
+            if env_manager and hasattr(env_manager, 'temp_dir') and env_manager.temp_dir:
+                error_result["temp_dir"] = str(env_manager.temp_dir)
             
             if 'context' in locals() and context is not None:
                 try:
@@ -855,6 +941,88 @@ class WorkflowOrchestrator:
             ]
             
             return error_result
+        
+        finally:
+            if contract_lock and contract_lock.locked():
+                contract_lock.release()
+            # Installs still running for a workflow that stopped early are not needed
+            self._cancel_dependency_prefetch(context.workflow_id)
+    
+    async def _claim_contract_files(self, context: WorkflowContext) -> Optional[asyncio.Lock]:
+        """
+        Take exclusive use of the generated contract's file in contracts/.
+        
+        Workflows running concurrently share the Foundry project, and two
+        of them may generate contracts with the same name. The workflow
+        waits for the agent's lock for its contract name, then writes its
+        own code to contracts/<name>.sol, and keeps the lock until the run
+        ends, so compilation, tests, deployment and verification all see
+        this workflow's code.
+        
+        Args:
+            context: Workflow context (after generation)
+            
+        Returns:
+            The acquired lock (the caller releases it), or None if there
+            is no generated contract
+        """
+        if not context.contract_name or not hasattr(self.agent, "contract_lock"):
+            return None
+        
+        lock = self.agent.contract_lock(context.contract_name)
+        if lock.locked():
+            logger.info(f"⏳ Waiting for contracts/{context.contract_name}.sol (in use by another workflow)")
+        await lock.acquire()
+        
+        if context.contract_code:
+            foundry_contracts_dir = Path(__file__).parent.parent.parent / "contracts"
+            try:
+                foundry_contracts_dir.mkdir(parents=True, exist_ok=True)
+                contract_file = foundry_contracts_dir / f"{context.contract_name}.sol"
+                contract_file.write_text(context.contract_code, encoding="utf-8")
+            except Exception as write_err:
+                logger.warning(f"⚠️ Could not write contracts/ file: {write_err}")
+        return lock
+    
+    def _run_preflight_checks(self) -> Dict[str, Any]:
+        """Run the doctor script (with auto-fix) and the tool availability checks"""
+        # Run comprehensive doctor/preflight checks (hardened validation)
+        try:
+            import sys
+            scripts_path = Path(__file__).parent.parent.parent / "scripts"
+            if str(scripts_path) not in sys.path:
+                sys.path.insert(0, str(scripts_path))
+            
+            from doctor import doctor as run_doctor
+            doctor_workspace = Path(__file__).parent.parent.parent
+            logger.info("🔬 Running Doctor preflight checks...")
+            doctor_result = run_doctor(workspace_dir=doctor_workspace, auto_fix=True)
+            if not doctor_result:
+                logger.warning("⚠️  Doctor preflight found issues, but continuing with workflow")
+            else:
+                logger.info("✅ Doctor preflight checks passed")
+        except ImportError as e:
+            logger.debug(f"Doctor script not available ({e}), using basic preflight")
+        except Exception as e:
+            logger.warning(f"⚠️  Doctor preflight error: {e}, falling back to basic checks")
+        
+        return self.dep_manager.preflight_check()
+    
+    async def _preflight_checks(self) -> Dict[str, Any]:
+        """
+        Tool checks shared by all workflows of this orchestrator.
+        
+        The checks run in a worker thread, as they shell out to each tool.
+        Once the required tools have been found, later workflows reuse the
+        result instead of checking again.
+        """
+        async with self._preflight_lock:
+            if self._preflight_results is not None:
+                return self._preflight_results
+            checks = await asyncio.to_thread(self._run_preflight_checks)
+            if checks.get("forge") and checks.get("python"):
+                self._preflight_results = checks
+            return checks
     
     async def _stage_preflight(self, context: WorkflowContext):
         """Stage 0: Preflight checks (hardened validation)"""
@@ -862,27 +1030,7 @@ class WorkflowOrchestrator:
         logger.info("🔍 Stage 0: Preflight Checks (Doctor)")
         
         try:
-            # Run comprehensive doctor/preflight checks (hardened validation)
-            try:
-                import sys
-                scripts_path = Path(__file__).parent.parent.parent / "scripts"
-                if str(scripts_path) not in sys.path:
-                    sys.path.insert(0, str(scripts_path))
-                
-                from doctor import doctor as run_doctor
-                doctor_workspace = Path(__file__).parent.parent.parent
-                logger.info("🔬 Running Doctor preflight checks...")
-                doctor_result = run_doctor(workspace_dir=doctor_workspace, auto_fix=True)
-                if not doctor_result:
-                    logger.warning("⚠️  Doctor preflight found issues, but continuing with workflow")
-                else:
-                    logger.info("✅ Doctor preflight checks passed")
-            except ImportError as e:
-                logger.debug(f"Doctor script not available ({e}), using basic preflight")
-            except Exception as e:
-                logger.warning(f"⚠️  Doctor preflight error: {e}, falling back to basic checks")
-            
-            checks = self.dep_manager.preflight_check()
+            checks = await self._preflight_checks()
             
             # Required tools (workflow will fail if missing) - per ideal workflow
             required_tools = ["forge", "python"]
@@ -1110,7 +1258,11 @@ class WorkflowOrchestrator:
                     )
                 
                 # Use enhanced prompt for generation
-                generation_result = await self.agent.generate_contract(enhanced_prompt, rag_context)
+                generation_result = await self.agent.generate_contract(
+                    enhanced_prompt, rag_context,
+                    on_stream_event=self._dependency_prefetcher(context),
+                    run_id=context.workflow_id
+                )
                 
                 # Track model/provider info for diagnostic bundles
                 model_provider = generation_result.get('provider_used', 'unknown')
@@ -1191,16 +1343,8 @@ class WorkflowOrchestrator:
                         if sanitized != context.contract_code:
                             context.contract_code = sanitized
                             logger.info("🔧 Applied post-generation sanitizer to contract code")
-                            # CRITICAL: Write sanitized code back to contracts/ directory
-                            from pathlib import Path
-                            foundry_project_dir = Path(__file__).parent.parent.parent
-                            foundry_contracts_dir = foundry_project_dir / "contracts"
-                            foundry_contract_file = foundry_contracts_dir / f"{context.contract_name}.sol"
-                            try:
-                                foundry_contract_file.write_text(sanitized, encoding="utf-8")
-                                logger.info(f"✅ Updated contracts/ file with sanitized code: {foundry_contract_file}")
-                            except Exception as write_err:
-                                logger.warning(f"⚠️ Could not update contracts/ file: {write_err}")
+                            # The sanitized code reaches contracts/ when the
+                            # workflow claims the contract file (_claim_contract_files)
                     except Exception as _:
                         # Non-fatal if sanitizer fails
                         pass
@@ -1262,6 +1406,7 @@ class WorkflowOrchestrator:
                     await asyncio.sleep(1)  # Brief delay before retry
                     continue
                 else:
+                    self._cancel_dependency_prefetch(context.workflow_id)
                     duration = (time.time() - stage_start) * 1000
                     context.add_stage_result(
                         PipelineStage.GENERATION,
@@ -1272,12 +1417,58 @@ class WorkflowOrchestrator:
                     )
                     raise
     
+    def _dependency_prefetcher(self, context: WorkflowContext):
+        """
+        Build a stream callback that installs dependencies as imports stream in.
+
+        Installs run in one background task per workflow, chained so each
+        dependency is installed once; the dependency stage awaits the task
+        before its own (idempotent) detection and install pass. The install
+        tools run as async subprocesses, so the stream keeps flowing, and the
+        task is cancelled if the workflow stops before that stage.
+        """
+        seen: set = set()
+
+        def on_event(event) -> None:
+            if event.kind != "import":
+                return
+            deps = [
+                dep for dep in self.dep_manager.detect_dependencies(f'import "{event.value}";')
+                if dep.source_type == "solidity" and dep.name not in seen
+            ]
+            if not deps:
+                return
+            seen.update(dep.name for dep in deps)
+            logger.info(f"📦 Prefetching dependencies from streamed import: {[d.name for d in deps]}")
+
+            previous = self._dependency_prefetch.get(context.workflow_id)
+
+            async def install() -> None:
+                if previous is not None:
+                    await asyncio.gather(previous, return_exceptions=True)
+                await self.dep_manager.install_all_dependencies(deps)
+
+            self._dependency_prefetch[context.workflow_id] = asyncio.create_task(install())
+
+        return on_event
+
+    def _cancel_dependency_prefetch(self, workflow_id: str) -> None:
+        """Drop a workflow's prefetch task, cancelling it if it is still installing"""
+        prefetch = self._dependency_prefetch.pop(workflow_id, None)
+        if prefetch is not None and not prefetch.done():
+            prefetch.cancel()
+
     async def _stage_dependency_resolution(self, context: WorkflowContext):
         """Stage 3: Dependency detection and installation"""
         stage_start = time.time()
         logger.info("📦 Stage 3: Dependency Resolution")
         
         try:
+            prefetch = self._dependency_prefetch.pop(context.workflow_id, None)
+            if prefetch is not None:
+                # Installs started during generation; failures are retried below
+                await asyncio.gather(prefetch, return_exceptions=True)
+
             if not context.contract_code:
                 raise ValueError("No contract code available for dependency detection")
             
@@ -1521,15 +1712,8 @@ class WorkflowOrchestrator:
                             try:
                                 foundry_contract_file.write_text(fix_context["contract_code"], encoding="utf-8")
                                 logger.info(f"✅ Updated contracts/ file with fixed code: {foundry_contract_file}")
-                                # Clear Foundry cache before retry
-                                import subprocess
-                                subprocess.run(
-                                    ["forge", "clean"],
-                                    cwd=foundry_project_dir,
-                                    capture_output=True,
-                                    timeout=30
-                                )
-                                logger.info("🧹 Cleared Foundry cache before retry")
+                                # No cache clearing needed: the build cache is keyed by
+                                # source hash, so the fixed file is rebuilt on retry
                             except Exception as write_err:
                                 logger.warning(f"⚠️ Could not update contracts/ file: {write_err}")
                         context.increment_retry(PipelineStage.COMPILATION)
@@ -1589,14 +1773,9 @@ class WorkflowOrchestrator:
                 try:
                     # Run forge test for this specific contract
                     # Note: Foundry runs all tests by default, but we can filter
+                    # Runs without blocking the loop, as auditing proceeds concurrently
                     test_cmd = ["forge", "test", "--match-contract", context.contract_name, "-vv"]
-                    result = subprocess.run(
-                        test_cmd,
-                        cwd=foundry_project_dir,
-                        capture_output=True,
-                        text=True,
-                        timeout=120
-                    )
+                    result = await run_process(test_cmd, timeout=120, cwd=str(foundry_project_dir))
                     
                     test_results["foundry_tests_run"] = True
                     test_results["test_output"] = result.stdout + result.stderr
@@ -1624,7 +1803,8 @@ class WorkflowOrchestrator:
             sanity_checks = {
                 "contract_compiled": context.compilation_success,
                 "contract_has_code": bool(context.contract_code),
-                "deployment_ready": context.compilation_success and context.audit_results
+                # Audit results are not known yet: auditing runs alongside testing
+                "deployment_ready": context.compilation_success
             }
             test_results["sanity_checks"] = sanity_checks
             
@@ -2146,7 +2326,9 @@ class WorkflowOrchestrator:
             try:
                 # Use PathManager for robust path resolution
                 path_manager = PathManager(command_type="verify")
-                artifacts_dir = path_manager.get_artifacts_dir() / "deploy" / network
+                # Per-run directory so concurrent runs of the same contract name
+                # do not overwrite each other's ABI and metadata
+                artifacts_dir = path_manager.get_artifacts_dir() / "deploy" / network / context.workflow_id
                 artifacts_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Validate artifacts directory was created
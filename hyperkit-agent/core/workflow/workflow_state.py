@@ -4,7 +4,7 @@ Tracks autonomous agent loop state (read/plan/act/update) with reasoning and too
 """
 
 import logging
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, is_dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Dict, Any, Optional, List
@@ -68,6 +68,20 @@ class ActionResult:
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
+def to_plain(value: Any) -> Any:
+    """Convert a state value (dataclasses, Enums, containers) to plain serializable data"""
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    else:
+        return value
+
+
 @dataclass
 class WorkflowState:
     """
@@ -199,20 +213,7 @@ class WorkflowState:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        data = asdict(self)
-        # Convert Enums to strings
-        def convert_enums(obj):
-            if isinstance(obj, LoopStep):
-                return obj.value
-            elif isinstance(obj, dict):
-                return {k: convert_enums(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_enums(item) for item in obj]
-            elif isinstance(obj, Enum):
-                return obj.value
-            else:
-                return obj
-        return convert_enums(data)
+        return to_plain(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WorkflowState':
@@ -236,6 +237,22 @@ class WorkflowState:
             else:
                 return obj
         
+        def restore_plan(obj):
+            if not isinstance(obj, dict):
+                return obj
+            return ActionPlan(**{**obj, "fallback_plan": restore_plan(obj.get("fallback_plan"))})
+        
         data = restore_enums(data)
+        # Rebuild nested records so a reloaded state behaves like the original
+        data["reasoning_history"] = [
+            AgentReasoning(**r) if isinstance(r, dict) else r for r in data.get("reasoning_history") or []
+        ]
+        if isinstance(data.get("current_reasoning"), dict):
+            data["current_reasoning"] = AgentReasoning(**data["current_reasoning"])
+        data["tool_invocations"] = [
+            ToolInvocation(**t) if isinstance(t, dict) else t for t in data.get("tool_invocations") or []
+        ]
+        data["next_action"] = restore_plan(data.get("next_action"))
+        data["action_queue"] = [restore_plan(a) for a in data.get("action_queue") or []]
         return cls(**data)
 
@@ -8,14 +8,23 @@ import json
 import logging
 import subprocess
 import tempfile
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 # Import the new contract fetcher
 from services.blockchain.contract_fetcher import ContractFetcher
+from services.common.process_runner import run_process
+from . import slither_parser
+from .pattern_scanner import scan_source
+from .result_cache import AuditResultCache
 
 logger = logging.getLogger(__name__)
 
+# Version of the detection rules applied by this module (Slither output
+# mapping and custom patterns). Bump whenever they change so cached audit
+# results produced by older rules are not reused.
+PATTERN_SET_VERSION = "3"
+
 
 class SmartContractAuditor:
     """
@@ -31,7 +40,17 @@ class SmartContractAuditor:
             config: Configuration dictionary for audit tools
         """
         self.config = config or {}
+        self.tool_timeout = self.config.get("tool_timeout", 120)
+        self.tool_versions: Dict[str, str] = {"custom": "builtin"}
         self.tools_available = self._check_tools_availability()
+
+        # Per-tool result cache keyed by source hash and tool/pattern versions
+        self.result_cache = None
+        if self.config.get("audit_cache_enabled", True):
+            self.result_cache = AuditResultCache(
+                cache_dir=self.config.get("audit_cache_dir"),
+                max_bytes=int(self.config.get("audit_cache_max_mb", 256)) * 1024 * 1024,
+            )
         self.contract_fetcher = ContractFetcher()
         self.severity_weights = {
             "critical": 10,
@@ -82,6 +101,7 @@ class SmartContractAuditor:
                 ["slither", "--version"], capture_output=True, text=True, timeout=10
             )
             tools["slither"] = result.returncode == 0
+            self.tool_versions["slither"] = result.stdout.strip()
         except (subprocess.TimeoutExpired, FileNotFoundError):
             tools["slither"] = False
 
@@ -91,6 +111,7 @@ class SmartContractAuditor:
                 ["myth", "version"], capture_output=True, text=True, timeout=10
             )
             tools["mythril"] = result.returncode == 0
+            self.tool_versions["mythril"] = result.stdout.strip()
         except (subprocess.TimeoutExpired, FileNotFoundError):
             tools["mythril"] = False
 
@@ -100,6 +121,7 @@ class SmartContractAuditor:
                 ["edb", "--version"], capture_output=True, text=True, timeout=10
             )
             tools["edb"] = result.returncode == 0
+            self.tool_versions["edb"] = result.stdout.strip()
         except (subprocess.TimeoutExpired, FileNotFoundError):
             tools["edb"] = False
 
@@ -109,11 +131,11 @@ class SmartContractAuditor:
         """
         Perform comprehensive audit of a smart contract.
         
-        Execution Order (CRITICAL - must follow this order):
-        1. Slither (static analysis) - fastest, catches syntax/structure issues
-        2. Mythril (symbolic execution) - deeper analysis, requires Slither to pass
-        3. Custom pattern analysis - lightweight, always runs
-        4. Alith AI analysis - AI-powered insights, requires previous tools to complete
+        Execution Order:
+        1-3. Slither (static analysis), Mythril (symbolic execution) and custom
+             pattern analysis run concurrently; results are merged in that
+             fixed order so reports stay deterministic
+        4. Alith AI analysis - AI-powered insights, runs once the tools finish
         
         At least ONE tool (Slither, Mythril, or Alith AI) must be available.
         
@@ -144,12 +166,24 @@ class SmartContractAuditor:
                 logger.error(error_msg)
                 raise RuntimeError(error_msg)
 
-            # Create temporary file for contract with UTF-8 encoding
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".sol", delete=False, encoding='utf-8'
-            ) as f:
-                f.write(contract_code)
-                temp_file = f.name
+            stage_tools = [
+                tool for tool in ("slither", "mythril") if self.tools_available[tool]
+            ] + ["custom"]
+            source_hash = AuditResultCache.hash_source(contract_code)
+            cache_keys = {tool: self._cache_key(tool, source_hash) for tool in stage_tools}
+
+            # Temporary contract file for the external tools, only written
+            # once a tool actually has to run (i.e. on a cache miss)
+            temp_files: List[str] = []
+
+            def contract_file() -> str:
+                if not temp_files:
+                    with tempfile.NamedTemporaryFile(
+                        mode="w", suffix=".sol", delete=False, encoding='utf-8'
+                    ) as f:
+                        f.write(contract_code)
+                        temp_files.append(f.name)
+                return temp_files[0]
 
             audit_results = {
                 "timestamp": asyncio.get_event_loop().time(),
@@ -157,40 +191,41 @@ class SmartContractAuditor:
                 "tools_used": [],
                 "findings": [],
                 "severity": "unknown",
-                "execution_order": []
+                "execution_order": [],
+                "source_hash": source_hash,
+                "cached_tools": []
             }
 
-            # Run all available tools in correct order and collect results
+            # Run all available tools and collect results
             tool_results = {}
             
-            # STAGE 1: Run Slither analysis (static analysis - fastest)
-            if self.tools_available["slither"]:
-                logger.info("Running Slither static analysis (Stage 1/4)")
-                slither_results = await self._run_slither(temp_file)
-                audit_results["slither"] = slither_results
-                audit_results["tools_used"].append("slither")
-                audit_results["execution_order"].append("slither")
-                tool_results["slither"] = slither_results.get("findings", [])
-                audit_results["findings"].extend(slither_results.get("findings", []))
-
-            # STAGE 2: Run Mythril analysis (symbolic execution - deeper analysis)
-            if self.tools_available["mythril"]:
-                logger.info("Running Mythril symbolic execution (Stage 2/4)")
-                mythril_results = await self._run_mythril(temp_file)
-                audit_results["mythril"] = mythril_results
-                audit_results["tools_used"].append("mythril")
-                audit_results["execution_order"].append("mythril")
-                tool_results["mythril"] = mythril_results.get("findings", [])
-                audit_results["findings"].extend(mythril_results.get("findings", []))
-
-            # STAGE 3: Run custom pattern analysis (lightweight, always runs)
-            logger.info("Running custom pattern analysis (Stage 3/4)")
-            custom_results = await self._run_custom_patterns(contract_code)
-            audit_results["custom"] = custom_results
-            audit_results["tools_used"].append("custom")
-            audit_results["execution_order"].append("custom")
-            tool_results["custom"] = custom_results.get("findings", [])
-            audit_results["findings"].extend(custom_results.get("findings", []))
+            # STAGES 1-3: Slither, Mythril and custom patterns are independent
+            # of each other, so they run concurrently on the event loop
+            runners = {
+                "slither": lambda: self._run_slither(contract_file()),
+                "mythril": lambda: self._run_mythril(contract_file()),
+                "custom": lambda: self._run_custom_patterns(contract_code),
+            }
+            
+            logger.info(f"Running {', '.join(stage_tools)} analysis concurrently (Stages 1-3/4)")
+            try:
+                stage_outputs = await asyncio.gather(*(
+                    self._run_cached_stage(tool, cache_keys[tool], runners[tool])
+                    for tool in stage_tools
+                ))
+            finally:
+                # Clean up temporary file
+                for temp_file in temp_files:
+                    Path(temp_file).unlink(missing_ok=True)
+            
+            for tool_name, (tool_output, from_cache) in zip(stage_tools, stage_outputs):
+                if from_cache:
+                    audit_results["cached_tools"].append(tool_name)
+                audit_results[tool_name] = tool_output
+                audit_results["tools_used"].append(tool_name)
+                audit_results["execution_order"].append(tool_name)
+                tool_results[tool_name] = tool_output.get("findings", [])
+                audit_results["findings"].extend(tool_output.get("findings", []))
             
             # STAGE 4: Run Alith AI analysis (AI-powered insights - runs last)
             if self.tools_available.get("alith") and self.alith_agent:
@@ -234,9 +269,6 @@ class SmartContractAuditor:
             audit_results["accuracy_estimate"] = self._get_accuracy_estimate(audit_results["consensus_score"])
             audit_results["disclaimer"] = self._get_audit_disclaimer(audit_results["consensus_score"])
 
-            # Clean up temporary file
-            Path(temp_file).unlink(missing_ok=True)
-
             logger.info(f"Audit completed with severity: {audit_results['severity']}")
             return audit_results
 
@@ -244,6 +276,36 @@ class SmartContractAuditor:
             logger.error(f"Audit failed: {e}")
             return {"status": "error", "error": str(e), "severity": "critical"}
 
+    def _cache_key(self, tool: str, source_hash: str) -> str:
+        """Content address of one tool's result for one source."""
+        return AuditResultCache.make_key(
+            source_hash, tool, self.tool_versions.get(tool, "unknown"), PATTERN_SET_VERSION
+        )
+
+    async def _run_cached_stage(self, tool: str, cache_key: str, runner) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return a tool's cached result, or run the tool and cache a successful result.
+
+        Returns:
+            Tuple of (tool result, whether it came from the cache)
+        """
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached {tool} result")
+                return cached, True
+
+        result = await runner()
+        if self.result_cache is not None and result.get("status") == "success":
+            self.result_cache.set(cache_key, result)
+        return result, False
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get audit result cache statistics"""
+        if self.result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.result_cache.get_stats()}
+
     async def audit_deployed_contract(self, contract_address: str, network: str, api_key: str = None) -> Dict[str, Any]:
         """
         Audit a deployed contract with confidence tracking and source verification.
@@ -381,42 +443,72 @@ class SmartContractAuditor:
         
         return audit_result
 
+    @staticmethod
+    def _finding_keys(finding: Dict[str, Any]) -> List[tuple]:
+        """
+        Identity keys of a finding for cross-tool deduplication.
+
+        Located findings are keyed by (type, file, line) for every line they
+        cover, so a Slither detector spanning a function matches a custom
+        pattern hit inside it. Findings without locations fall back to
+        (type, location, description prefix).
+        """
+        finding_type = finding.get("type") or finding.get("pattern") or "unknown"
+        lines = finding.get("lines") or [
+            loc["line"] for loc in finding.get("locations", []) if loc.get("line")
+        ]
+        if not lines and finding.get("line"):
+            lines = [finding["line"]]
+        if lines:
+            return [(finding_type, finding.get("file"), line) for line in lines]
+        return [(finding_type, finding.get("location", "unknown"), finding.get("description", "")[:50])]
+
     def _deduplicate_and_score(self, all_findings: List[Dict[str, Any]], tool_results: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """Score findings based on agreement between tools"""
-        consensus = {}
+        groups: List[Dict[str, Any]] = []
+        key_index: Dict[tuple, int] = {}
         
         for finding in all_findings:
-            # Create unique identifier for the finding
-            issue_id = f"{finding.get('type', 'unknown')}_{finding.get('location', 'unknown')}_{finding.get('description', '')[:50]}"
+            keys = self._finding_keys(finding)
+            group_idx = next((key_index[k] for k in keys if k in key_index), None)
             
-            if issue_id not in consensus:
-                consensus[issue_id] = {
+            if group_idx is None:
+                group_idx = len(groups)
+                groups.append({
                     "finding": finding,
-                    "tool_agreement": 0,
                     "tools_found": [],
                     "severity_scores": []
-                }
-            
-            consensus[issue_id]["tool_agreement"] += 1
-            consensus[issue_id]["tools_found"].append(finding.get("tool", "unknown"))
-            consensus[issue_id]["severity_scores"].append(finding.get("severity", "info"))
+                })
+            group = groups[group_idx]
+            for key in keys:
+                key_index.setdefault(key, group_idx)
+            
+            # Represent the group by its most severe finding
+            if self.severity_weights.get(finding.get("severity"), 0) > \
+                    self.severity_weights.get(group["finding"].get("severity"), 0):
+                group["finding"] = finding
+            tool = finding.get("tool", "unknown")
+            if tool not in group["tools_found"]:
+                group["tools_found"].append(tool)
+            group["severity_scores"].append(finding.get("severity", "info"))
         
         # Only keep findings agreed on by 2+ tools or high-confidence single tool findings
         high_confidence = []
-        for issue_id, data in consensus.items():
-            if data["tool_agreement"] >= 2:
+        for group in groups:
+            tool_agreement = len(group["tools_found"])
+            if tool_agreement >= 2:
                 # Multi-tool consensus - high confidence
-                finding = data["finding"].copy()
+                finding = group["finding"].copy()
                 finding["consensus_confidence"] = 0.9
-                finding["tool_agreement"] = data["tool_agreement"]
-                finding["tools_found"] = data["tools_found"]
+                finding["tool_agreement"] = tool_agreement
+                finding["tools_found"] = group["tools_found"]
                 high_confidence.append(finding)
-            elif data["tool_agreement"] == 1 and data["finding"].get("severity") in ["critical", "high"]:
+            elif tool_agreement == 1 and group["finding"].get("severity") in ["critical", "high"]:
                 # Single tool but high severity - medium confidence
-                finding = data["finding"].copy()
+                finding = group["finding"].copy()
                 finding["consensus_confidence"] = 0.6
                 finding["tool_agreement"] = 1
-                finding["tools_found"] = data["tools_found"]
+                finding["tools_found"] = group["tools_found"]
                 high_confidence.append(finding)
         
         return high_confidence
@@ -597,96 +689,43 @@ class SmartContractAuditor:
             logger.error(f"Bytecode analysis failed: {e}")
             return {"status": "error", "error": str(e), "severity": "critical"}
 
+    @staticmethod
+    def _tool_logger(tool: str):
+        """Build a line callback that streams a tool's output to the debug log."""
+        def log_line(line: str):
+            if line.strip():
+                logger.debug(f"[{tool}] {line}")
+        return log_line
+
     async def _run_slither(self, contract_file: str) -> Dict[str, Any]:
         """Run Slither static analysis on the contract."""
         try:
-            # Use more comprehensive Slither options
+            # Detector results only, as JSON on stdout; logs go to stderr
             cmd = [
                 "slither", 
                 contract_file, 
                 "--json", "-",
+                "--json-types", "detectors",
                 "--disable-color",
-                "--print-json-summary"
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120, encoding='utf-8')
-
-            findings = []
-            
-            # Parse both stdout and stderr for findings
-            output = result.stdout + result.stderr
-            
-            # Look for specific vulnerability patterns in output
-            vulnerability_patterns = {
-                "reentrancy": {
-                    "patterns": ["reentrancy", "Reentrancy", "REENTRANCY"],
-                    "severity": "high",
-                    "description": "Reentrancy vulnerability detected"
-                },
-                "integer_overflow": {
-                    "patterns": ["integer-overflow", "IntegerOverflow", "INTEGER_OVERFLOW"],
-                    "severity": "medium", 
-                    "description": "Integer overflow/underflow vulnerability"
-                },
-                "unchecked_call": {
-                    "patterns": ["unchecked-transfer", "UncheckedTransfer", "UNCHECKED_TRANSFER"],
-                    "severity": "medium",
-                    "description": "Unchecked external call return value"
-                },
-                "tx_origin": {
-                    "patterns": ["tx-origin", "TxOrigin", "TX_ORIGIN"],
-                    "severity": "medium",
-                    "description": "Use of tx.origin for authorization"
-                },
-                "block_timestamp": {
-                    "patterns": ["timestamp", "Timestamp", "TIMESTAMP"],
-                    "severity": "low",
-                    "description": "Use of block.timestamp for randomness"
-                },
-                "suicidal": {
-                    "patterns": ["suicidal", "Suicidal", "SUICIDAL"],
-                    "severity": "critical",
-                    "description": "Suicidal contract vulnerability"
-                },
-                "delegatecall": {
-                    "patterns": ["delegatecall", "DelegateCall", "DELEGATECALL"],
-                    "severity": "high",
-                    "description": "Unsafe delegatecall usage"
-                }
-            }
+            result = await run_process(
+                cmd, timeout=self.tool_timeout, on_stderr_line=self._tool_logger("slither")
+            )
 
-            for vuln_name, vuln_info in vulnerability_patterns.items():
-                for pattern in vuln_info["patterns"]:
-                    if pattern in output:
-                        findings.append({
-                            "tool": "slither",
-                            "severity": vuln_info["severity"],
-                            "confidence": "high",
-                            "description": vuln_info["description"],
-                            "pattern": vuln_name,
-                            "details": f"Found pattern: {pattern}"
-                        })
-                        break  # Only add once per vulnerability type
-
-            # Also try to parse JSON if available
             try:
-                slither_data = json.loads(result.stdout)
-                for detector in slither_data.get("results", {}).get("detectors", []):
-                    finding = {
-                        "tool": "slither",
-                        "severity": detector.get("impact", "unknown").lower(),
-                        "confidence": detector.get("confidence", "unknown").lower(),
-                        "description": detector.get("description", ""),
-                        "elements": detector.get("elements", []),
-                    }
-                    findings.append(finding)
-            except json.JSONDecodeError:
-                pass  # Continue with pattern-based detection
+                findings = slither_parser.parse_output(result.stdout, contract_file)
+            except slither_parser.SlitherOutputError as e:
+                return {
+                    "status": "error",
+                    "error": f"Slither analysis failed: {e}",
+                    "raw_output": result.stderr[-4000:],
+                }
 
             return {
                 "status": "success",
                 "findings": findings,
-                "raw_output": output,
+                "raw_output": result.stderr[-4000:],
             }
 
         except subprocess.TimeoutExpired:
@@ -709,7 +748,12 @@ class SmartContractAuditor:
                 "10",
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120, encoding='utf-8')
+            result = await run_process(
+                cmd,
+                timeout=self.tool_timeout,
+                on_stdout_line=self._tool_logger("mythril"),
+                on_stderr_line=self._tool_logger("mythril"),
+            )
 
             findings = []
 
@@ -745,178 +789,8 @@ class SmartContractAuditor:
             return {"status": "error", "error": f"Mythril execution failed: {e}"}
 
     async def _run_custom_patterns(self, contract_code: str) -> Dict[str, Any]:
-        """Run custom security pattern analysis."""
-        findings = []
-
-        # Enhanced vulnerability patterns with more comprehensive detection
-        vulnerability_patterns = {
-            "reentrancy": {
-                "patterns": [
-                    r"\.call\s*\(",
-                    r"\.transfer\s*\(",
-                    r"\.send\s*\(",
-                    r"external\s+.*\s+payable",
-                    r"function\s+\w+.*external.*payable"
-                ],
-                "severity": "high",
-                "description": "Potential reentrancy vulnerability detected",
-            },
-            "integer_overflow": {
-                "patterns": [
-                    r"(\+|\*|\-|\/)\s*\w+",
-                    r"uint\d*\s*\+\s*uint\d*",
-                    r"uint\d*\s*\*\s*uint\d*",
-                    r"uint\d*\s*-\s*uint\d*"
-                ],
-                "severity": "medium",
-                "description": "Potential integer overflow/underflow",
-            },
-            "unchecked_call": {
-                "patterns": [
-                    r"\.call\([^)]*\)(?!\s*;)",
-                    r"\.transfer\([^)]*\)(?!\s*;)",
-                    r"\.send\([^)]*\)(?!\s*;)",
-                    r"external\s+.*\s+call"
-                ],
-                "severity": "medium",
-                "description": "Unchecked external call return value",
-            },
-            "tx_origin": {
-                "patterns": [
-                    r"tx\.origin",
-                    r"require\s*\(\s*tx\.origin",
-                    r"if\s*\(\s*tx\.origin"
-                ],
-                "severity": "medium",
-                "description": "Use of tx.origin for authorization",
-            },
-            "block_timestamp": {
-                "patterns": [
-                    r"block\.timestamp",
-                    r"now\s*[+\-*/]",
-                    r"block\.timestamp\s*[+\-*/]"
-                ],
-                "severity": "low",
-                "description": "Use of block.timestamp for randomness",
-            },
-            "suicidal": {
-                "patterns": [
-                    r"selfdestruct\s*\(",
-                    r"suicide\s*\(",
-                    r"\.kill\s*\(",
-                    r"function\s+.*suicide"
-                ],
-                "severity": "critical",
-                "description": "Suicidal contract vulnerability",
-            },
-            "delegatecall": {
-                "patterns": [
-                    r"\.delegatecall\s*\(",
-                    r"assembly\s*\{.*delegatecall",
-                    r"function\s+.*delegatecall"
-                ],
-                "severity": "high",
-                "description": "Unsafe delegatecall usage",
-            },
-            "uninitialized_storage": {
-                "patterns": [
-                    r"mapping\s*\(\s*address\s*=>\s*uint256\s*\)\s+\w+;",
-                    r"struct\s+\w+\s*\{[^}]*\}\s*\w+;"
-                ],
-                "severity": "medium",
-                "description": "Uninitialized storage variables",
-            },
-            "unprotected_ether": {
-                "patterns": [
-                    r"function\s+\w+.*payable.*\{[^}]*\w+\.transfer",
-                    r"function\s+\w+.*payable.*\{[^}]*\w+\.send",
-                    r"function\s+\w+.*payable.*\{[^}]*\w+\.call"
-                ],
-                "severity": "high",
-                "description": "Unprotected ether withdrawal",
-            },
-            "front_running": {
-                "patterns": [
-                    r"block\.timestamp\s*[+\-]\s*\d+",
-                    r"block\.number\s*[+\-]\s*\d+",
-                    r"now\s*[+\-]\s*\d+"
-                ],
-                "severity": "medium",
-                "description": "Potential front-running vulnerability",
-            },
-            "gas_limit": {
-                "patterns": [
-                    r"for\s*\([^)]*\)\s*\{[^}]*\w+\.transfer",
-                    r"for\s*\([^)]*\)\s*\{[^}]*\w+\.send",
-                    r"for\s*\([^)]*\)\s*\{[^}]*\w+\.call"
-                ],
-                "severity": "medium",
-                "description": "Potential gas limit vulnerability",
-            }
-        }
-
-        import re
-
-        for vuln_name, vuln_info in vulnerability_patterns.items():
-            total_matches = 0
-            matched_patterns = []
-            
-            for pattern in vuln_info["patterns"]:
-                matches = re.findall(pattern, contract_code, re.IGNORECASE | re.MULTILINE)
-                if matches:
-                    total_matches += len(matches)
-                    matched_patterns.append(pattern)
-            
-            if total_matches > 0:
-                findings.append(
-                    {
-                        "tool": "custom",
-                        "severity": vuln_info["severity"],
-                        "description": vuln_info["description"],
-                        "pattern": vuln_name,
-                        "matches": total_matches,
-                        "matched_patterns": matched_patterns,
-                        "confidence": "high" if total_matches > 1 else "medium"
-                    }
-                )
-
-        # Check for best practices
-        best_practices = {
-            "has_nat_spec": {
-                "pattern": r"/\*\*.*?\*/",
-                "severity": "info",
-                "description": "NatSpec documentation found",
-            },
-            "has_events": {
-                "pattern": r"event\s+\w+",
-                "severity": "info",
-                "description": "Events defined for logging",
-            },
-            "has_modifiers": {
-                "pattern": r"modifier\s+\w+",
-                "severity": "info",
-                "description": "Custom modifiers defined",
-            },
-            "uses_openzeppelin": {
-                "pattern": r"@openzeppelin",
-                "severity": "info",
-                "description": "OpenZeppelin libraries imported",
-            },
-        }
-
-        for practice_name, practice_info in best_practices.items():
-            matches = re.findall(practice_info["pattern"], contract_code)
-            if matches:
-                findings.append(
-                    {
-                        "tool": "custom",
-                        "severity": practice_info["severity"],
-                        "description": practice_info["description"],
-                        "pattern": practice_name,
-                        "matches": len(matches),
-                    }
-                )
-
+        """Run custom security pattern analysis (precompiled single-pass scan)."""
+        findings = scan_source(contract_code)
         return {"status": "success", "findings": findings}
 
     def _calculate_severity(self, findings: List[Dict[str, Any]]) -> str:
@@ -989,7 +863,7 @@ class SmartContractAuditor:
         try:
             cmd = ["edb", "--rpc-urls", rpc_url, "replay", tx_hash]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = await run_process(cmd, timeout=60)
 
             return {
                 "status": "success",
@@ -3,14 +3,16 @@ Batch Audit System with Multi-Format Export
 
 Handles batch auditing of multiple contracts with:
 - Per-contract error handling
+- Concurrent auditing with a bounded worker pool
 - Report aggregation
 - Multi-format export (JSON, HTML, Markdown, CSV, PDF, Excel)
 """
 
 import asyncio
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import json
 
@@ -43,7 +45,6 @@ class BatchAuditor:
         """
         self.config = config or {}
         self.auditor = SmartContractAuditor(config)
-        self.aggregator = ReportAggregator()
         
         # Initialize exporters
         self.exporters = {
@@ -62,21 +63,30 @@ class BatchAuditor:
         contracts: List[Dict[str, str]],
         export_formats: List[str] = ['json', 'html'],
         output_dir: Optional[str] = None,
-        aggregate: bool = True
+        aggregate: bool = True,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Audit multiple contracts with error handling and export.
         
+        Contracts are audited concurrently by a bounded pool of workers.
+        Each result is exported and fed into the aggregator as soon as it
+        completes; a failing contract never affects the others.
+        
         Args:
             contracts: List of dicts with 'name' and 'code' or 'path'
             export_formats: List of export formats (json, html, markdown, csv, pdf, excel)
             output_dir: Directory for output files
             aggregate: Whether to create aggregated summary report
+            max_workers: Maximum number of contracts audited at once
+                (default: config 'batch_workers', else min(4, CPU count)).
+                Use 1 for strictly sequential auditing.
             
         Returns:
             Batch audit results with success/failure counts
         """
-        logger.info(f"Starting batch audit of {len(contracts)} contracts")
+        workers = self._resolve_workers(max_workers, len(contracts))
+        logger.info(f"Starting batch audit of {len(contracts)} contracts ({workers} workers)")
         
         # Setup output directory
         if output_dir is None:
@@ -93,70 +103,56 @@ class BatchAuditor:
             'total_contracts': len(contracts),
             'successful': 0,
             'failed': 0,
+            'workers': workers,
             'contracts': [],
             'failures': [],
             'summary': {}
         }
         
-        # Process each contract with error handling
-        for idx, contract_info in enumerate(contracts, 1):
-            contract_name = contract_info.get('name', f'contract_{idx}')
-            logger.info(f"[{idx}/{len(contracts)}] Auditing: {contract_name}")
-            
-            try:
-                # Load contract code
-                if 'code' in contract_info:
-                    contract_code = contract_info['code']
-                elif 'path' in contract_info:
-                    contract_path = Path(contract_info['path'])
-                    if not contract_path.exists():
-                        raise FileNotFoundError(f"Contract file not found: {contract_path}")
-                    contract_code = contract_path.read_text(encoding='utf-8')
-                else:
-                    raise ValueError(f"Contract must have 'code' or 'path': {contract_name}")
-                
-                # Run audit
-                audit_result = await self.auditor.audit(contract_code)
-                
-                # Add metadata
-                audit_result['contract_name'] = contract_name
-                audit_result['success'] = True
-                audit_result['error'] = None
-                
-                results['contracts'].append(audit_result)
-                results['successful'] += 1
-                
-                # Export individual contract report
-                await self._export_contract_report(
-                    audit_result,
-                    contract_name,
-                    export_formats,
-                    output_dir
-                )
-                
-                logger.info(f"✓ {contract_name}: {audit_result.get('severity', 'unknown')} severity")
-                
-            except Exception as e:
-                logger.error(f"✗ {contract_name}: {str(e)}")
-                
-                # Record failure but continue
-                failure_record = {
-                    'contract_name': contract_name,
-                    'success': False,
-                    'error': str(e),
-                    'error_type': type(e).__name__
-                }
+        # Per-call aggregator so overlapping batches on one auditor stay separate
+        aggregator = ReportAggregator()
+        semaphore = asyncio.Semaphore(workers)
+        
+        async def bounded_audit(idx: int, contract_info: Dict[str, str]):
+            async with semaphore:
+                return await self._audit_one(idx, len(contracts), contract_info)
+        
+        tasks = [
+            asyncio.ensure_future(bounded_audit(idx, contract_info))
+            for idx, contract_info in enumerate(contracts, 1)
+        ]
+        
+        # Collect results as they complete, keeping input order for the report
+        ordered: Dict[int, Dict[str, Any]] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                idx, record = await next_done
+                ordered[idx] = record
                 
-                results['contracts'].append(failure_record)
-                results['failures'].append(failure_record)
-                results['failed'] += 1
+                if record['success']:
+                    results['successful'] += 1
+                    aggregator.add_result(record)
+                    
+                    # Export individual contract report
+                    await self._export_contract_report(
+                        record,
+                        record['contract_name'],
+                        export_formats,
+                        output_dir
+                    )
+                else:
+                    results['failures'].append(record)
+                    results['failed'] += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        results['contracts'] = [ordered[idx] for idx in sorted(ordered)]
         
         # Generate aggregated summary
         if aggregate and results['successful'] > 0:
             logger.info("Generating aggregated summary report")
-            results['summary'] = self.aggregator.aggregate(
-                [c for c in results['contracts'] if c.get('success', False)]
-            )
+            results['summary'] = aggregator.aggregate()
             
             # Export aggregated report
             await self._export_aggregated_report(
@@ -175,6 +171,61 @@ class BatchAuditor:
         
         return results
     
+    def _resolve_workers(self, max_workers: Optional[int], total: int) -> int:
+        """Determine the worker pool size for a batch"""
+        if max_workers is None:
+            max_workers = self.config.get('batch_workers') or min(4, os.cpu_count() or 1)
+        return max(1, min(int(max_workers), max(total, 1)))
+    
+    async def _audit_one(
+        self,
+        idx: int,
+        total: int,
+        contract_info: Dict[str, str]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Audit a single contract of a batch.
+        
+        Never raises: any error is captured in a failure record so one bad
+        contract cannot abort the rest of the batch.
+        """
+        contract_name = contract_info.get('name', f'contract_{idx}')
+        logger.info(f"[{idx}/{total}] Auditing: {contract_name}")
+        
+        try:
+            # Load contract code
+            if 'code' in contract_info:
+                contract_code = contract_info['code']
+            elif 'path' in contract_info:
+                contract_path = Path(contract_info['path'])
+                if not contract_path.exists():
+                    raise FileNotFoundError(f"Contract file not found: {contract_path}")
+                contract_code = contract_path.read_text(encoding='utf-8')
+            else:
+                raise ValueError(f"Contract must have 'code' or 'path': {contract_name}")
+            
+            # Run audit
+            audit_result = await self.auditor.audit(contract_code)
+            
+            # Add metadata
+            audit_result['contract_name'] = contract_name
+            audit_result['success'] = True
+            audit_result['error'] = None
+            
+            logger.info(f"✓ {contract_name}: {audit_result.get('severity', 'unknown')} severity")
+            return idx, audit_result
+            
+        except Exception as e:
+            logger.error(f"✗ {contract_name}: {str(e)}")
+            
+            # Record failure but continue
+            return idx, {
+                'contract_name': contract_name,
+                'success': False,
+                'error': str(e),
+                'error_type': type(e).__name__
+            }
+    
     async def _export_contract_report(
         self,
         audit_result: Dict[str, Any],
@@ -0,0 +1,260 @@
+"""
+Precompiled Single-Pass Vulnerability Pattern Scanner
+
+Custom security patterns used by SmartContractAuditor. All regular
+expressions are compiled once at import. Scanning makes a single pass over
+the source with one combined regex that finds anchor tokens (the leading
+token of each pattern, such as ``.call`` or ``selfdestruct``); only the
+patterns registered for that token are then matched, anchored at its
+position. Cost is therefore proportional to the source size rather than
+to the number of patterns.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+# Maximum number of locations reported per finding
+MAX_LOCATIONS = 25
+
+# Rule registry. Every pattern is paired with the anchor token it starts
+# with; the scanner finds anchor tokens, then tries only the patterns
+# registered for that token, at that exact position.
+VULNERABILITY_RULES: Dict[str, Dict[str, Any]] = {
+    "reentrancy": {
+        "patterns": [
+            (".call", r"\.call\s*(\{[^}]*\}\s*)?\("),
+            (".transfer", r"\.transfer\s*\("),
+            (".send", r"\.send\s*\("),
+            ("external", r"external\s+.*\s+payable"),
+            ("function", r"function\s+\w+.*external.*payable"),
+        ],
+        "severity": "high",
+        "description": "Potential reentrancy vulnerability detected",
+    },
+    "integer_overflow": {
+        "patterns": [
+            # Solidity >=0.8 reverts on overflow, except inside unchecked blocks
+            ("unchecked", r"unchecked\s*\{[^}]*?[\w)\]]\s*(\+|\*|-|/)=?\s*\w+"),
+            ("uint", r"uint\d*\s*(\+|\*|-)\s*uint\d*"),
+        ],
+        "severity": "medium",
+        "description": "Potential integer overflow/underflow",
+    },
+    "unchecked_call": {
+        "patterns": [
+            (".call", r"\.call(\{[^}]*\})?\([^)]*\)(?!\s*;)"),
+            (".transfer", r"\.transfer\([^)]*\)(?!\s*;)"),
+            (".send", r"\.send\([^)]*\)(?!\s*;)"),
+            ("external", r"external\s+.*\s+call"),
+        ],
+        "severity": "medium",
+        "description": "Unchecked external call return value",
+    },
+    "tx_origin": {
+        "patterns": [
+            ("tx.origin", r"tx\.origin"),
+        ],
+        "severity": "medium",
+        "description": "Use of tx.origin for authorization",
+    },
+    "block_timestamp": {
+        "patterns": [
+            ("block.timestamp", r"block\.timestamp"),
+            ("now", r"now\s*[+\-*/]"),
+        ],
+        "severity": "low",
+        "description": "Use of block.timestamp for randomness",
+    },
+    "suicidal": {
+        "patterns": [
+            ("selfdestruct", r"selfdestruct\s*\("),
+            ("suicide", r"suicide\s*\("),
+            (".kill", r"\.kill\s*\("),
+            ("function", r"function\s+.*suicide"),
+        ],
+        "severity": "critical",
+        "description": "Suicidal contract vulnerability",
+    },
+    "delegatecall": {
+        "patterns": [
+            (".delegatecall", r"\.delegatecall\s*\("),
+            ("assembly", r"assembly\s*\{.*delegatecall"),
+            ("function", r"function\s+.*delegatecall"),
+        ],
+        "severity": "high",
+        "description": "Unsafe delegatecall usage",
+    },
+    "uninitialized_storage": {
+        "patterns": [
+            ("mapping", r"mapping\s*\(\s*address\s*=>\s*uint256\s*\)\s+\w+;"),
+            ("struct", r"struct\s+\w+\s*\{[^}]*\}\s*\w+;"),
+        ],
+        "severity": "medium",
+        "description": "Uninitialized storage variables",
+    },
+    "unprotected_ether": {
+        "patterns": [
+            ("function", r"function\s+\w+.*payable.*\{[^}]*\w+\.(transfer|send|call)"),
+        ],
+        "severity": "high",
+        "description": "Unprotected ether withdrawal",
+    },
+    "front_running": {
+        "patterns": [
+            ("block.timestamp", r"block\.timestamp\s*[+\-]\s*\d+"),
+            ("block.number", r"block\.number\s*[+\-]\s*\d+"),
+            ("now", r"now\s*[+\-]\s*\d+"),
+        ],
+        "severity": "medium",
+        "description": "Potential front-running vulnerability",
+    },
+    "gas_limit": {
+        "patterns": [
+            ("for", r"for\s*\([^)]*\)\s*\{[^}]*\w+\.(transfer|send|call)"),
+        ],
+        "severity": "medium",
+        "description": "Potential gas limit vulnerability",
+    },
+}
+
+BEST_PRACTICE_RULES: Dict[str, Dict[str, Any]] = {
+    "has_nat_spec": {
+        "patterns": [("/**", r"/\*\*.*?\*/")],
+        "severity": "info",
+        "description": "NatSpec documentation found",
+    },
+    "has_events": {
+        "patterns": [("event", r"event\s+\w+")],
+        "severity": "info",
+        "description": "Events defined for logging",
+    },
+    "has_modifiers": {
+        "patterns": [("modifier", r"modifier\s+\w+")],
+        "severity": "info",
+        "description": "Custom modifiers defined",
+    },
+    "uses_openzeppelin": {
+        "patterns": [("@openzeppelin", r"@openzeppelin")],
+        "severity": "info",
+        "description": "OpenZeppelin libraries imported",
+    },
+}
+
+
+@dataclass(frozen=True)
+class _CompiledPattern:
+    rule: str
+    source: str
+    regex: "re.Pattern[str]"
+
+
+def _compile_registry() -> Tuple["re.Pattern[str]", Dict[str, List[_CompiledPattern]]]:
+    """Compile all rules into one anchor-token scanner plus a dispatch table."""
+    dispatch: Dict[str, List[_CompiledPattern]] = {}
+    for rules, flags in (
+        (VULNERABILITY_RULES, re.IGNORECASE | re.MULTILINE),
+        (BEST_PRACTICE_RULES, re.DOTALL),
+    ):
+        for rule_name, rule in rules.items():
+            for anchor, pattern in rule["patterns"]:
+                dispatch.setdefault(anchor.lower(), []).append(
+                    _CompiledPattern(rule_name, pattern, re.compile(pattern, flags))
+                )
+
+    # Identifier-like anchors (optionally dotted, e.g. ".call", "tx.origin")
+    # share one word alternation; a trailing digit run lets "uint" match
+    # "uint256". Anything else (e.g. "/**") is matched literally.
+    words = sorted(
+        (a for a in dispatch if re.fullmatch(r"\.?\w+(\.\w+)?", a)), key=len, reverse=True
+    )
+    others = sorted((a for a in dispatch if a not in words), key=len, reverse=True)
+    word_alternation = "|".join(re.escape(w.lstrip(".")) for w in words)
+    scanner = re.compile(
+        "|".join([rf"\.?\b(?:{word_alternation})\d*\b"] + [re.escape(o) for o in others]),
+        re.IGNORECASE,
+    )
+    return scanner, dispatch
+
+
+_SCANNER, _DISPATCH = _compile_registry()
+
+
+def _anchor_key(token: str) -> str:
+    return token.lower().rstrip("0123456789")
+
+
+def _line_starts(source: str) -> List[int]:
+    starts = [0]
+    find = source.find
+    pos = find("\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = find("\n", pos + 1)
+    return starts
+
+
+def scan_source(source: str) -> List[Dict[str, Any]]:
+    """
+    Scan Solidity source for custom vulnerability and best-practice patterns.
+
+    Args:
+        source: Solidity contract code
+
+    Returns:
+        One finding per matched rule, with match counts and 1-based
+        line/column locations
+    """
+    hits: Dict[str, Dict[str, Any]] = {}
+    line_starts = None
+
+    for anchor_match in _SCANNER.finditer(source):
+        candidates = _DISPATCH.get(_anchor_key(anchor_match.group(0)))
+        if not candidates:
+            continue
+        pos = anchor_match.start()
+        for candidate in candidates:
+            match = candidate.regex.match(source, pos)
+            if not match:
+                continue
+
+            if line_starts is None:
+                line_starts = _line_starts(source)
+            line = bisect_right(line_starts, pos)
+            hit = hits.setdefault(
+                candidate.rule, {"matches": 0, "matched_patterns": [], "locations": []}
+            )
+            hit["matches"] += 1
+            if candidate.source not in hit["matched_patterns"]:
+                hit["matched_patterns"].append(candidate.source)
+            if len(hit["locations"]) < MAX_LOCATIONS:
+                hit["locations"].append({
+                    "line": line,
+                    "column": pos - line_starts[line - 1] + 1,
+                    "snippet": match.group(0).split("\n", 1)[0][:80],
+                })
+
+    findings = []
+    for rules, is_vulnerability in ((VULNERABILITY_RULES, True), (BEST_PRACTICE_RULES, False)):
+        for rule_name, rule in rules.items():
+            hit = hits.get(rule_name)
+            if not hit:
+                continue
+            finding = {
+                "tool": "custom",
+                "type": rule_name,
+                "severity": rule["severity"],
+                "description": rule["description"],
+                "pattern": rule_name,
+                "matches": hit["matches"],
+                "line": hit["locations"][0]["line"],
+                "column": hit["locations"][0]["column"],
+                "locations": hit["locations"],
+            }
+            if is_vulnerability:
+                finding["matched_patterns"] = hit["matched_patterns"]
+                finding["confidence"] = "high" if hit["matches"] > 1 else "medium"
+            findings.append(finding)
+
+    return findings
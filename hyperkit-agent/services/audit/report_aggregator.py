@@ -5,7 +5,7 @@ Aggregates multiple audit results into summary statistics and insights.
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -14,54 +14,81 @@ logger = logging.getLogger(__name__)
 class ReportAggregator:
     """Aggregates multiple audit reports into summary statistics"""
     
-    def aggregate(self, audit_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def __init__(self):
+        self._stream: Dict[str, Any] = {}
+        self.reset()
+    
+    def reset(self):
+        """Clear the streaming aggregation state before a new batch."""
+        self._stream = {
+            'count': 0,
+            'severity_counts': defaultdict(int),
+            'finding_severity_counts': defaultdict(int),
+            'tool_usage': defaultdict(int),
+            'finding_types': defaultdict(int),
+            'total_findings': 0,
+        }
+    
+    def add_result(self, result: Dict[str, Any]):
+        """
+        Fold a single audit result into the streaming aggregation.
+        
+        Used by the batch auditor to feed results as soon as each contract
+        finishes, so the final summary does not need to hold or rescan
+        every finding.
+        
+        Args:
+            result: Individual (successful) audit result
+        """
+        state = self._stream
+        state['count'] += 1
+        
+        # Count contracts by overall severity
+        state['severity_counts'][result.get('severity', 'unknown')] += 1
+        
+        # Count tools used
+        for tool in result.get('tools_used', []):
+            state['tool_usage'][tool] += 1
+        
+        # Aggregate findings and count finding types
+        findings = result.get('findings', [])
+        state['total_findings'] += len(findings)
+        for finding in findings:
+            state['finding_types'][finding.get('type', 'unknown')] += 1
+            state['finding_severity_counts'][finding.get('severity', 'unknown')] += 1
+    
+    def aggregate(self, audit_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Aggregate multiple audit results into summary.
         
         Args:
-            audit_results: List of individual audit results
+            audit_results: List of individual audit results. When omitted,
+                the results streamed in through add_result() are summarized.
             
         Returns:
             Aggregated summary with statistics and insights
         """
-        if not audit_results:
+        if audit_results is not None:
+            self.reset()
+            for result in audit_results:
+                self.add_result(result)
+        
+        state = self._stream
+        total_contracts = state['count']
+        if not total_contracts:
             return {
                 'total_contracts': 0,
                 'message': 'No audit results to aggregate'
             }
         
-        logger.info(f"Aggregating {len(audit_results)} audit results")
+        logger.info(f"Aggregating {total_contracts} audit results")
         
-        # Initialize aggregation structures
-        severity_counts = defaultdict(int)
-        tool_usage = defaultdict(int)
-        finding_types = defaultdict(int)
-        total_findings = 0
-        all_findings = []
-        
-        # Aggregate data
-        for result in audit_results:
-            # Count severity levels
-            severity = result.get('severity', 'unknown')
-            severity_counts[severity] += 1
-            
-            # Count tools used
-            tools_used = result.get('tools_used', [])
-            for tool in tools_used:
-                tool_usage[tool] += 1
-            
-            # Aggregate findings
-            findings = result.get('findings', [])
-            total_findings += len(findings)
-            all_findings.extend(findings)
-            
-            # Count finding types
-            for finding in findings:
-                finding_type = finding.get('type', 'unknown')
-                finding_types[finding_type] += 1
+        severity_counts = state['severity_counts']
+        finding_types = state['finding_types']
+        total_findings = state['total_findings']
         
         # Calculate statistics
-        avg_findings_per_contract = total_findings / len(audit_results)
+        avg_findings_per_contract = total_findings / total_contracts
         
         # Identify most common issues
         top_issues = sorted(
@@ -81,30 +108,31 @@ class ReportAggregator:
         }
         
         # Calculate overall risk score
-        risk_score = self._calculate_risk_score(risk_distribution, len(audit_results))
+        risk_score = self._calculate_risk_score(risk_distribution, total_contracts)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
             severity_counts,
             finding_types,
-            len(audit_results)
+            total_contracts
         )
         
         summary = {
-            'total_contracts': len(audit_results),
+            'total_contracts': total_contracts,
             'total_findings': total_findings,
             'avg_findings_per_contract': round(avg_findings_per_contract, 2),
             'severity_distribution': dict(severity_counts),
+            'findings_by_severity': dict(state['finding_severity_counts']),
             'risk_distribution': risk_distribution,
             'risk_score': risk_score,
-            'tool_usage': dict(tool_usage),
+            'tool_usage': dict(state['tool_usage']),
             'top_issues': [
                 {'type': issue, 'count': count} 
                 for issue, count in top_issues
             ],
             'recommendations': recommendations,
             'summary_text': self._generate_summary_text(
-                len(audit_results),
+                total_contracts,
                 risk_distribution,
                 risk_score
             )
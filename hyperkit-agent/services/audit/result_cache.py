@@ -0,0 +1,202 @@
+"""
+Content-Addressed Audit Result Cache
+
+Persists per-tool audit results on disk, keyed by the SHA-256 of the
+normalized contract source plus the tool name, tool version and pattern-set
+version. Re-auditing identical source (workflow retries, popular deployed
+addresses) returns stored results instead of re-running Slither/Mythril.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / ".cache" / "audit"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MiB
+
+
+class AuditResultCache:
+    """
+    On-disk cache of per-tool audit results with size-bounded LRU eviction.
+
+    Entries are JSON files stored as ``<dir>/<key[:2]>/<key>.json``. Reads
+    bump the file mtime, and when the total size exceeds ``max_bytes`` the
+    least recently used entries are removed first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Initialize audit result cache.
+
+        Args:
+            cache_dir: Directory for cache entries (default: hyperkit-agent/.cache/audit)
+            max_bytes: Maximum total size of cached entries in bytes
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def normalize_source(source: str) -> str:
+        """Normalize source so formatting-only differences share an entry."""
+        lines = source.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).rstrip("\n")
+
+    @classmethod
+    def hash_source(cls, source: str) -> str:
+        """SHA-256 of the normalized contract source."""
+        return hashlib.sha256(cls.normalize_source(source).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_key(source_hash: str, tool: str, tool_version: str, pattern_version: str) -> str:
+        """Build the content address for one tool's result on one source."""
+        material = "\0".join([source_hash, tool, tool_version or "unknown", pattern_version])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def contains(self, key: str) -> bool:
+        """Check for an entry without touching hit/miss statistics."""
+        return self._entry_path(key).exists()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached tool result.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached result or None on miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            with self.lock:
+                self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable audit cache entry {key[:12]}: {e}")
+            path.unlink(missing_ok=True)
+            with self.lock:
+                self.stats["misses"] += 1
+                self._total_bytes = None
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+
+        with self.lock:
+            self.stats["hits"] += 1
+        logger.debug(f"Audit cache hit: {key[:12]}")
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> bool:
+        """
+        Store a tool result, evicting old entries if over the size budget.
+
+        Args:
+            key: Key from make_key()
+            value: JSON-serializable tool result
+
+        Returns:
+            True if stored, False otherwise
+        """
+        path = self._entry_path(key)
+        try:
+            data = json.dumps(value, default=str).encode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write atomically so concurrent readers never see partial files
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            previous_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_name, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Audit cache write failed for {key[:12]}: {e}")
+            return False
+
+        with self.lock:
+            self.stats["writes"] += 1
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - previous_size
+            self._evict_if_needed()
+        return True
+
+    def _scan_total_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*/*.json"))
+
+    def _evict_if_needed(self):
+        """Remove least recently used entries until under max_bytes (lock held)."""
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_total_bytes()
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = []
+        for p in self.cache_dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+                entries.append((st.st_mtime, st.st_size, p))
+            except FileNotFoundError:
+                continue
+        entries.sort(key=lambda entry: entry[0])
+
+        for _, size, p in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+
+    def clear(self) -> bool:
+        """Remove all cache entries"""
+        try:
+            for p in self.cache_dir.glob("*/*.json"):
+                p.unlink(missing_ok=True)
+            with self.lock:
+                self._total_bytes = 0
+            logger.info("Audit result cache cleared")
+            return True
+        except OSError as e:
+            logger.error(f"Audit cache clear error: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self.lock:
+            if self._total_bytes is None and self.cache_dir.exists():
+                self._total_bytes = self._scan_total_bytes()
+            total_requests = self.stats["hits"] + self.stats["misses"]
+            hit_rate = (self.stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+            return {
+                "cache_dir": str(self.cache_dir),
+                "max_bytes": self.max_bytes,
+                "size_bytes": self._total_bytes or 0,
+                "hit_rate": f"{hit_rate:.2f}%",
+                **self.stats,
+            }
@@ -0,0 +1,141 @@
+"""
+Slither JSON Result Parser
+
+Maps the detector results of ``slither --json -`` to auditor findings with
+real source locations, instead of searching the raw console output for
+vulnerability keywords.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Slither detector IDs ("check") mapped to the auditor's vulnerability types,
+# so Slither findings line up with the custom pattern rules of the same kind.
+DETECTOR_TYPES: Dict[str, str] = {
+    "reentrancy-eth": "reentrancy",
+    "reentrancy-no-eth": "reentrancy",
+    "reentrancy-benign": "reentrancy",
+    "reentrancy-events": "reentrancy",
+    "reentrancy-unlimited-gas": "reentrancy",
+    "tx-origin": "tx_origin",
+    "timestamp": "block_timestamp",
+    "weak-prng": "block_timestamp",
+    "suicidal": "suicidal",
+    "controlled-delegatecall": "delegatecall",
+    "delegatecall-loop": "delegatecall",
+    "unchecked-transfer": "unchecked_call",
+    "unchecked-lowlevel": "unchecked_call",
+    "unchecked-send": "unchecked_call",
+    "uninitialized-storage": "uninitialized_storage",
+    "uninitialized-state": "uninitialized_storage",
+    "uninitialized-local": "uninitialized_storage",
+    "arbitrary-send-eth": "unprotected_ether",
+    "arbitrary-send": "unprotected_ether",
+    "calls-loop": "gas_limit",
+    "costly-loop": "gas_limit",
+    "msg-value-loop": "gas_limit",
+}
+
+IMPACT_SEVERITY: Dict[str, str] = {
+    "high": "high",
+    "medium": "medium",
+    "low": "low",
+    "informational": "info",
+    "optimization": "info",
+}
+
+# Detectors whose impact is escalated beyond Slither's own rating
+SEVERITY_OVERRIDES: Dict[str, str] = {
+    "suicidal": "critical",
+}
+
+
+class SlitherOutputError(ValueError):
+    """Raised when Slither did not produce a usable JSON report"""
+
+
+def load_report(stdout: str) -> Dict[str, Any]:
+    """
+    Decode the JSON report from Slither's stdout.
+
+    Decoding starts at the first ``{`` so stray text printed before the
+    report does not break parsing.
+
+    Raises:
+        SlitherOutputError: If no JSON report is present or Slither failed
+    """
+    start = stdout.find("{")
+    if start == -1:
+        raise SlitherOutputError("Slither produced no JSON output")
+    try:
+        report, _ = json.JSONDecoder().raw_decode(stdout, start)
+    except json.JSONDecodeError as e:
+        raise SlitherOutputError(f"Invalid Slither JSON output: {e}") from e
+
+    if not report.get("success", True):
+        raise SlitherOutputError(report.get("error") or "Slither analysis failed")
+    return report
+
+
+def _primary_source_mapping(detector: Dict[str, Any]) -> Dict[str, Any]:
+    """Source mapping of the first element that has line information."""
+    for element in detector.get("elements", []):
+        mapping = element.get("source_mapping") or {}
+        if mapping.get("lines"):
+            return mapping
+    return {}
+
+
+def _compact_element(element: Dict[str, Any]) -> Dict[str, Any]:
+    mapping = element.get("source_mapping") or {}
+    return {
+        "type": element.get("type"),
+        "name": element.get("name"),
+        "lines": mapping.get("lines", []),
+    }
+
+
+def iter_findings(report: Dict[str, Any], contract_file: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield auditor findings for each detector result in a Slither report.
+
+    Args:
+        report: Decoded Slither JSON report
+        contract_file: Path of the audited file. Locations in it are reported
+            with ``file=None`` ("the audited contract") so they match findings
+            from tools that do not work on files.
+    """
+    for detector in report.get("results", {}).get("detectors", []):
+        check = detector.get("check", "unknown")
+        impact = str(detector.get("impact", "")).lower()
+        mapping = _primary_source_mapping(detector)
+
+        file = mapping.get("filename_absolute") or mapping.get("filename_relative")
+        if file and contract_file and os.path.basename(file) == os.path.basename(contract_file):
+            file = None
+        lines: List[int] = mapping.get("lines", [])
+        line = lines[0] if lines else None
+
+        yield {
+            "tool": "slither",
+            "type": DETECTOR_TYPES.get(check, check.replace("-", "_")),
+            "detector": check,
+            "severity": SEVERITY_OVERRIDES.get(check, IMPACT_SEVERITY.get(impact, "info")),
+            "confidence": str(detector.get("confidence", "unknown")).lower(),
+            "description": (detector.get("description") or "").strip(),
+            "file": file,
+            "line": line,
+            "lines": lines,
+            "column": mapping.get("starting_column"),
+            "location": f"{file or 'contract'}:{line}" if line else "unknown",
+            "elements": [_compact_element(e) for e in detector.get("elements", [])],
+        }
+
+
+def parse_output(stdout: str, contract_file: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Decode Slither's stdout and return the mapped findings."""
+    return list(iter_findings(load_report(stdout), contract_file))
@@ -0,0 +1,149 @@
+"""
+Buffered Background Writer for HyperKit AI Agent
+Batches high-frequency log writes off the caller's thread (and the event loop)
+"""
+
+import atexit
+import logging
+import threading
+import weakref
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[List[Any]], None]
+
+
+class BatchWriter:
+    """
+    Buffers items and hands them to a sink in batches.
+
+    write() only appends to an in-memory buffer, so callers (including
+    coroutines) never wait for disk I/O. A shared background thread
+    flushes every writer's buffer when ``flush_interval`` seconds have
+    passed or ``batch_size`` items are pending. The buffer is bounded:
+    once ``max_pending`` items are waiting, write() flushes inline, so a
+    stalled disk slows producers down instead of growing memory without
+    limit.
+
+    Items reach the sink in write order. Pending items are flushed on
+    flush(), close(), garbage collection and interpreter exit.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        flush_interval: float = 0.5,
+        batch_size: int = 256,
+        max_pending: int = 10000,
+        name: str = "batch-writer",
+    ):
+        """
+        Args:
+            sink: Called with each batch (a list of items, in write order)
+            flush_interval: Maximum seconds an item waits in the buffer
+            batch_size: Pending items that trigger an early flush
+            max_pending: Pending items at which write() flushes inline
+            name: Name used in log messages
+        """
+        self._sink = sink
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max(max_pending, batch_size)
+        self.name = name
+
+        self._pending: List[Any] = []
+        self._buffer_lock = threading.Lock()
+        # Held while a batch is taken and written, so batches never overtake each other
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        _flusher.register(self)
+
+    def write(self, item: Any) -> None:
+        """Queue an item for the sink (written synchronously after close())"""
+        if self._closed:
+            self._write_batch([item])
+            return
+        with self._buffer_lock:
+            self._pending.append(item)
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            self.flush()
+        elif pending >= self.batch_size:
+            _flusher.wake()
+
+    def flush(self) -> None:
+        """Write all pending items now"""
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                self._write_batch(batch)
+
+    def close(self) -> None:
+        """Flush pending items; later writes go straight to the sink"""
+        self._closed = True
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        """Number of items waiting to be written"""
+        return len(self._pending)
+
+    def _write_batch(self, batch: List[Any]) -> None:
+        try:
+            self._sink(batch)
+        except Exception as e:
+            logger.warning(f"{self.name}: failed to write {len(batch)} buffered items: {e}")
+
+    def __del__(self):
+        try:
+            if self._pending:
+                self.flush()
+        except Exception:
+            pass
+
+
+class _Flusher:
+    """Single daemon thread flushing every live BatchWriter"""
+
+    def __init__(self):
+        self._writers: "weakref.WeakSet[BatchWriter]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def register(self, writer: BatchWriter) -> None:
+        with self._lock:
+            self._writers.add(writer)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="batch-writer-flush", daemon=True)
+                self._thread.start()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def flush_all(self) -> None:
+        with self._lock:
+            writers = list(self._writers)
+        for writer in writers:
+            writer.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                interval = min((w.flush_interval for w in self._writers), default=1.0)
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            try:
+                self.flush_all()
+            except Exception as e:
+                logger.warning(f"Background flush failed: {e}")
+
+
+_flusher = _Flusher()
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    _flusher.flush_all()
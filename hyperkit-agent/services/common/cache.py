@@ -3,18 +3,34 @@ Caching Layer for HyperKit AI Agent
 Production-ready caching with TTL, LRU, and distributed cache support
 """
 
+import asyncio
+import os
 import time
 import hashlib
 import json
 import logging
-from typing import Any, Optional, Dict, Union, Callable
+import threading
+from typing import Any, Awaitable, Optional, Dict, Union, Callable
 from functools import wraps
 from cachetools import TTLCache, LRUCache
 from pathlib import Path
 import pickle
 
+from services.common.tiered_cache import DEFAULT_CACHE_ROOT, TieredStore
+
 logger = logging.getLogger(__name__)
 
+class _Flight:
+    """In-progress computation shared by concurrent misses for one key"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+# Cache types whose store keeps a TTL per entry
+PER_ENTRY_TTL_TYPES = ("tiered", "memory")
+
 class HyperKitCache:
     """Production-ready caching system for HyperKit"""
     
@@ -22,19 +38,38 @@ class HyperKitCache:
         self,
         max_size: int = 1000,
         ttl: int = 300,  # 5 minutes default
-        cache_type: str = "ttl"
+        cache_type: str = "ttl",
+        name: str = "default",
+        cache_dir: Optional[str] = None,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        serializer: str = "json",
+        sweep_interval: float = 60.0
     ):
         """
         Initialize cache system
         
         Args:
-            max_size: Maximum number of items in cache
+            max_size: Maximum number of items in cache (memory tier for tiered)
             ttl: Time to live in seconds
-            cache_type: Type of cache (ttl, lru, file)
+            cache_type: Type of cache (ttl, lru, file, tiered, memory). "memory" is
+                the tiered store without its disk tier; like "tiered" it honours
+                per-entry TTLs, which "ttl" and "lru" ignore
+            name: Cache name, used for the tiered disk directory
+            cache_dir: Tiered disk directory (default: hyperkit-agent/.cache/hyperkit/<name>)
+            max_memory_bytes: Tiered memory budget in serialized bytes
+            max_disk_bytes: Tiered disk budget in bytes
+            serializer: Tiered disk serializer (json or pickle)
+            sweep_interval: Seconds between tiered background expiry sweeps
         """
         self.max_size = max_size
         self.ttl = ttl
         self.cache_type = cache_type
+        self.name = name
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+        self._async_inflight: Dict[str, asyncio.Task] = {}
+        self._negative: Dict[str, tuple] = {}  # key -> (expires_at, exception type, args, attributes)
         
         if cache_type == "ttl":
             self.cache = TTLCache(maxsize=max_size, ttl=ttl)
@@ -44,6 +79,20 @@ class HyperKitCache:
             self.cache_dir = Path("cache")
             self.cache_dir.mkdir(exist_ok=True)
             self.cache = {}
+        elif cache_type in PER_ENTRY_TTL_TYPES:
+            if cache_type == "memory":
+                tier_dir = None
+            else:
+                tier_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_ROOT / name
+            self.cache = TieredStore(
+                cache_dir=tier_dir,
+                max_items=max_size,
+                max_memory_bytes=max_memory_bytes,
+                max_disk_bytes=max_disk_bytes,
+                ttl=ttl,
+                serializer=serializer,
+                sweep_interval=sweep_interval
+            )
         else:
             raise ValueError(f"Unknown cache type: {cache_type}")
         
@@ -140,7 +189,7 @@ class HyperKitCache:
             True if successful, False otherwise
         """
         cache_key = self._generate_key(key)
-        cache_ttl = ttl or self.ttl
+        cache_ttl = self.ttl if ttl is None else ttl
         
         try:
             if self.cache_type == "file":
@@ -154,6 +203,8 @@ class HyperKitCache:
                 file_path.touch()
                 os.utime(file_path, (current_time, current_time))
                 
+            elif self.cache_type in PER_ENTRY_TTL_TYPES:
+                self.cache.set(cache_key, value, ttl=cache_ttl)
             else:
                 self.cache[cache_key] = value
             
@@ -165,6 +216,156 @@ class HyperKitCache:
             logger.error(f"Cache set error for key {cache_key}: {e}")
             return False
     
+    def get_or_set(self, key: Union[str, tuple], compute: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+        """
+        Get value from cache, computing and caching it on a miss
+        
+        Concurrent misses for the same key are deduplicated: one caller
+        runs compute() and the others wait for and share its result.
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            ttl: Optional TTL override
+            
+        Returns:
+            Cached or computed value (None results are not cached)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        cache_key = self._generate_key(key)
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = compute()
+            if flight.result is not None:
+                self.set(key, flight.result, ttl=ttl)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            flight.done.set()
+    
+    async def aget_or_set(
+        self,
+        key: Union[str, tuple],
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        negative_ttl: int = 0
+    ) -> Any:
+        """
+        Async get-or-compute with in-flight deduplication
+        
+        Concurrent misses for the same key await one shared task, which
+        keeps running (and fills the cache) even if a caller is cancelled.
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument callable returning an awaitable value
+            ttl: Seconds a value is fresh (default: cache TTL)
+            stale_ttl: Seconds past freshness a value is still served while
+                it is refreshed in the background (stale-while-revalidate)
+            negative_ttl: Seconds an exception from compute() is cached and
+                re-raised without calling compute() again (0 disables)
+            
+        Returns:
+            Cached or computed value (None results are not cached)
+            
+        Raises:
+            ValueError: If this cache type cannot keep an entry for ttl + stale_ttl
+        """
+        fresh_ttl = self.ttl if ttl is None else ttl
+        if self.cache_type not in PER_ENTRY_TTL_TYPES and (stale_ttl > 0 or fresh_ttl > self.ttl):
+            raise ValueError(
+                f"{self.cache_type!r} caches expire every entry after {self.ttl}s; "
+                f"use a tiered or memory cache for ttl={fresh_ttl}, stale_ttl={stale_ttl}"
+            )
+        
+        cache_key = self._generate_key(key)
+        now = time.time()
+        
+        negative = self._negative.get(cache_key)
+        if negative is not None:
+            expires_at, error_type, args, state = negative
+            if expires_at > now:
+                # A fresh instance per hit, so tracebacks do not pile up on
+                # one shared exception object
+                error = error_type.__new__(error_type, *args)
+                error.args = args
+                error.__dict__.update(state)
+                raise error
+            self._negative.pop(cache_key, None)
+        
+        entry = self.get(("async", key))
+        if entry is not None:
+            if entry["fresh_until"] <= now:
+                # Serve the stale value; refresh once in the background
+                refresh = self._start_async_flight(cache_key, key, compute, ttl, stale_ttl, negative_ttl)
+                refresh.add_done_callback(self._log_refresh_failure)
+            return entry["value"]
+        
+        return await asyncio.shield(
+            self._start_async_flight(cache_key, key, compute, ttl, stale_ttl, negative_ttl)
+        )
+    
+    def _start_async_flight(self, cache_key, key, compute, ttl, stale_ttl, negative_ttl) -> asyncio.Task:
+        """Return the in-flight task for a key, starting one if needed"""
+        loop = asyncio.get_running_loop()
+        task = self._async_inflight.get(cache_key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return task
+        
+        task = loop.create_task(self._compute_async(cache_key, key, compute, ttl, stale_ttl, negative_ttl))
+        self._async_inflight[cache_key] = task
+        
+        def _finished(done: asyncio.Task) -> None:
+            if self._async_inflight.get(cache_key) is done:
+                del self._async_inflight[cache_key]
+        
+        task.add_done_callback(_finished)
+        return task
+    
+    async def _compute_async(self, cache_key, key, compute, ttl, stale_ttl, negative_ttl) -> Any:
+        try:
+            value = await compute()
+        except Exception as e:
+            if negative_ttl > 0:
+                now = time.time()
+                if len(self._negative) >= self.max_size:
+                    self._negative = {k: v for k, v in self._negative.items() if v[0] > now}
+                self._negative[cache_key] = (now + negative_ttl, type(e), e.args, dict(e.__dict__))
+            raise
+        
+        if value is not None:
+            fresh_ttl = self.ttl if ttl is None else ttl
+            self.set(
+                ("async", key),
+                {"value": value, "fresh_until": time.time() + fresh_ttl},
+                ttl=fresh_ttl + stale_ttl
+            )
+        return value
+    
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
+    
     def delete(self, key: Union[str, tuple]) -> bool:
         """
         Delete value from cache
@@ -176,14 +377,17 @@ class HyperKitCache:
             True if successful, False otherwise
         """
         cache_key = self._generate_key(key)
+        # aget_or_set() stores its entry under a separate key
+        async_key = self._generate_key(("async", key))
         
         try:
-            if self.cache_type == "file":
-                file_path = self._get_file_path(cache_key)
-                if file_path.exists():
-                    file_path.unlink()
-            else:
-                self.cache.pop(cache_key, None)
+            for entry_key in (cache_key, async_key):
+                if self.cache_type == "file":
+                    file_path = self._get_file_path(entry_key)
+                    if file_path.exists():
+                        file_path.unlink()
+                else:
+                    self.cache.pop(entry_key, None)
             
             logger.debug(f"Cache delete: {cache_key}")
             return True
@@ -200,6 +404,7 @@ class HyperKitCache:
                     file_path.unlink()
             else:
                 self.cache.clear()
+            self._negative.clear()
             
             self.stats["size"] = 0
             logger.info("Cache cleared")
@@ -214,7 +419,7 @@ class HyperKitCache:
         total_requests = self.hit_count + self.miss_count
         hit_rate = (self.hit_count / total_requests * 100) if total_requests > 0 else 0
         
-        return {
+        stats = {
             "cache_type": self.cache_type,
             "max_size": self.max_size,
             "ttl": self.ttl,
@@ -224,6 +429,11 @@ class HyperKitCache:
             "size": self.stats["size"],
             "evictions": self.stats["evictions"]
         }
+        if self.cache_type in PER_ENTRY_TTL_TYPES:
+            tier_stats = self.cache.get_stats()
+            stats["evictions"] = tier_stats["evictions"]
+            stats["tiers"] = tier_stats
+        return stats
     
     def reset_stats(self):
         """Reset cache statistics"""
@@ -237,65 +447,70 @@ class HyperKitCache:
         }
 
 # Global cache instances
-rpc_cache = HyperKitCache(max_size=500, ttl=300, cache_type="ttl")
-ai_cache = HyperKitCache(max_size=200, ttl=600, cache_type="ttl")  # 10 minutes for AI responses
+# Decorator caches honour per-call TTLs and stale-while-revalidate, so they need
+# per-entry expiry; they stay in memory (opt into disk with cache_type="tiered")
+rpc_cache = HyperKitCache(max_size=500, ttl=300, cache_type="memory", name="rpc")
+ai_cache = HyperKitCache(max_size=200, ttl=600, cache_type="memory", name="ai")  # 10 minutes for AI responses
 config_cache = HyperKitCache(max_size=50, ttl=3600, cache_type="ttl")  # 1 hour for config
 
-def cached_rpc_call(cache_ttl: int = 300):
+def _cache_decorator(
+    cache: HyperKitCache,
+    cache_ttl: int,
+    stale_ttl: int = 0,
+    negative_ttl: int = 0
+) -> Callable:
     """
-    Decorator for caching RPC calls
+    Build a caching decorator for sync and async functions
     
-    Args:
-        cache_ttl: TTL for cached RPC calls in seconds
+    Coroutine functions get an async wrapper that caches the awaited result
+    (not the coroutine object) via HyperKitCache.aget_or_set.
     """
     def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                # Generate cache key from function name and arguments
+                cache_key = (func.__name__, str(args), str(sorted(kwargs.items())))
+                return await cache.aget_or_set(
+                    cache_key,
+                    lambda: func(*args, **kwargs),
+                    ttl=cache_ttl,
+                    stale_ttl=stale_ttl,
+                    negative_ttl=negative_ttl
+                )
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key from function name and arguments
             cache_key = (func.__name__, str(args), str(sorted(kwargs.items())))
             
-            # Try to get from cache
-            cached_result = rpc_cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"RPC cache hit for {func.__name__}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            rpc_cache.set(cache_key, result, ttl=cache_ttl)
-            logger.debug(f"RPC cache set for {func.__name__}")
-            
-            return result
+            # Concurrent misses for the same call execute the function once
+            return cache.get_or_set(cache_key, lambda: func(*args, **kwargs), ttl=cache_ttl)
         return wrapper
     return decorator
 
-def cached_ai_response(cache_ttl: int = 600):
+def cached_rpc_call(cache_ttl: int = 300, stale_ttl: int = 0, negative_ttl: int = 0):
+    """
+    Decorator for caching RPC calls
+    
+    Args:
+        cache_ttl: TTL for cached RPC calls in seconds
+        stale_ttl: Async only; seconds a stale result is served while refreshing
+        negative_ttl: Async only; seconds a raised error is cached
+    """
+    return _cache_decorator(rpc_cache, cache_ttl, stale_ttl, negative_ttl)
+
+def cached_ai_response(cache_ttl: int = 600, stale_ttl: int = 0, negative_ttl: int = 0):
     """
     Decorator for caching AI responses
     
     Args:
         cache_ttl: TTL for cached AI responses in seconds
+        stale_ttl: Async only; seconds a stale result is served while refreshing
+        negative_ttl: Async only; seconds a raised error is cached
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = (func.__name__, str(args), str(sorted(kwargs.items())))
-            
-            # Try to get from cache
-            cached_result = ai_cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"AI cache hit for {func.__name__}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            ai_cache.set(cache_key, result, ttl=cache_ttl)
-            logger.debug(f"AI cache set for {func.__name__}")
-            
-            return result
-        return wrapper
-    return decorator
+    return _cache_decorator(ai_cache, cache_ttl, stale_ttl, negative_ttl)
 
 def cached_config(cache_ttl: int = 3600):
     """
@@ -304,26 +519,7 @@ def cached_config(cache_ttl: int = 3600):
     Args:
         cache_ttl: TTL for cached configuration in seconds
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = (func.__name__, str(args), str(sorted(kwargs.items())))
-            
-            # Try to get from cache
-            cached_result = config_cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Config cache hit for {func.__name__}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            config_cache.set(cache_key, result, ttl=cache_ttl)
-            logger.debug(f"Config cache set for {func.__name__}")
-            
-            return result
-        return wrapper
-    return decorator
+    return _cache_decorator(config_cache, cache_ttl)
 
 def get_cache_stats() -> Dict[str, Any]:
     """Get statistics for all cache instances"""
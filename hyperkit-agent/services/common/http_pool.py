@@ -0,0 +1,89 @@
+"""
+Loop-Bound HTTP Client Pool for HyperKit AI Agent
+Pooled httpx.AsyncClients that are closed on the event loop that created them
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class LoopBoundClients:
+    """
+    Pooled async HTTP clients for the running event loop.
+
+    httpx clients (and their sockets) belong to the loop that created
+    them. When a different loop asks for a client (the CLI starts a new
+    loop per asyncio.run), a fresh set is created and the old set is
+    closed on its own loop: a watcher task on each loop closes the loop's
+    clients when it is cancelled, which asyncio.run does at shutdown and
+    this pool does when it moves to another loop or is closed.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._closer: Optional[asyncio.Task] = None
+
+    def get(self, key: str, factory: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+        """
+        Client for ``key`` on the running loop, created with ``factory`` if needed.
+
+        Args:
+            key: Client name (e.g. provider)
+            factory: Zero-argument callable building a new client
+
+        Returns:
+            Open client bound to the running loop
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._retire()
+            self._loop = loop
+            self._clients = {}
+            self._closer = loop.create_task(self._close_at_shutdown(self._clients))
+
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = factory()
+            self._clients[key] = client
+        return client
+
+    def _retire(self):
+        """Have the previous loop close its clients"""
+        closer, loop = self._closer, self._loop
+        if closer is None or closer.done():
+            return
+        if loop.is_closed():
+            # The loop ended without cancelling its tasks; nothing can close the sockets now
+            logger.debug(f"Dropping {len(self._clients)} HTTP client(s) of a closed event loop")
+        else:
+            loop.call_soon_threadsafe(closer.cancel)
+
+    @staticmethod
+    async def _close_at_shutdown(clients: Dict[str, httpx.AsyncClient]):
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            for client in list(clients.values()):
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.debug(f"Error closing HTTP client: {e}")
+            clients.clear()
+
+    async def aclose(self):
+        """Close the pooled clients"""
+        closer, loop = self._closer, self._loop
+        self._loop, self._clients, self._closer = None, {}, None
+        if closer is None or closer.done():
+            return
+        if loop is asyncio.get_running_loop():
+            closer.cancel()
+            await asyncio.gather(closer, return_exceptions=True)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(closer.cancel)
@@ -0,0 +1,154 @@
+"""
+Async Subprocess Runner for HyperKit AI Agent
+Runs external tools (Slither, Mythril, EDB, ...) without blocking the event loop
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+LineCallback = Callable[[str], None]
+
+# Size of each read from the child's pipes. Slither emits its whole JSON
+# report on a single line, so pipes are read in chunks rather than with
+# readline() and its 64 KiB line limit.
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _pump_stream(
+    stream: asyncio.StreamReader,
+    chunks: List[str],
+    encoding: str,
+    on_line: Optional[LineCallback],
+):
+    """Drain a pipe into ``chunks``, emitting complete lines to ``on_line``."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+
+    while True:
+        data = await stream.read(_READ_CHUNK_SIZE)
+        text = decoder.decode(data, final=not data)
+        if text:
+            chunks.append(text)
+            if on_line:
+                pending += text
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    _emit(on_line, line)
+        if not data:
+            break
+
+    if on_line and pending:
+        _emit(on_line, pending)
+
+
+def _emit(on_line: LineCallback, line: str):
+    """Call an output callback, never letting it break the runner."""
+    try:
+        on_line(line.rstrip("\r"))
+    except Exception as e:
+        logger.debug(f"Output callback failed: {e}")
+
+
+async def _terminate(process: asyncio.subprocess.Process, grace_period: float = 2.0):
+    """Stop a child process: SIGTERM first, SIGKILL if it does not exit."""
+    if process.returncode is not None:
+        return
+    try:
+        process.terminate()
+        await asyncio.wait_for(process.wait(), timeout=grace_period)
+    except ProcessLookupError:
+        return
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            return
+        await process.wait()
+
+
+async def run_process(
+    cmd: Sequence[str],
+    timeout: Optional[float] = None,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    encoding: str = "utf-8",
+    on_stdout_line: Optional[LineCallback] = None,
+    on_stderr_line: Optional[LineCallback] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command asynchronously and capture its output.
+
+    Drop-in replacement for ``subprocess.run(cmd, capture_output=True,
+    text=True, timeout=...)`` inside coroutines: the event loop keeps
+    running while the tool works. Output lines can be streamed to
+    callbacks as they arrive.
+
+    On timeout the child is terminated and ``subprocess.TimeoutExpired``
+    is raised (with the output captured so far), so existing
+    ``except subprocess.TimeoutExpired`` handlers keep working. If the
+    calling task is cancelled, the child is terminated before the
+    cancellation propagates.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds before the process is killed (None = no limit)
+        cwd: Working directory for the process
+        env: Environment variables (merged over os.environ)
+        encoding: Output text encoding
+        on_stdout_line: Called with each stdout line as it is produced
+        on_stderr_line: Called with each stderr line as it is produced
+
+    Returns:
+        CompletedProcess with decoded stdout/stderr
+
+    Raises:
+        FileNotFoundError: If the executable does not exist
+        subprocess.TimeoutExpired: If the timeout elapses
+    """
+    cmd = [str(part) for part in cmd]
+    process_env = {**os.environ, **env} if env else None
+    start_time = time.monotonic()
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        env=process_env,
+    )
+
+    stdout_chunks: List[str] = []
+    stderr_chunks: List[str] = []
+    communicate = asyncio.gather(
+        _pump_stream(process.stdout, stdout_chunks, encoding, on_stdout_line),
+        _pump_stream(process.stderr, stderr_chunks, encoding, on_stderr_line),
+        process.wait(),
+    )
+
+    try:
+        await asyncio.wait_for(communicate, timeout=timeout)
+    except asyncio.TimeoutError:
+        await _terminate(process)
+        logger.warning(f"Command timed out after {timeout}s: {cmd[0]}")
+        raise subprocess.TimeoutExpired(
+            cmd, timeout, output="".join(stdout_chunks), stderr="".join(stderr_chunks)
+        )
+    except asyncio.CancelledError:
+        await _terminate(process)
+        raise
+
+    logger.debug(
+        f"Command {cmd[0]} exited with {process.returncode} "
+        f"in {time.monotonic() - start_time:.2f}s"
+    )
+    return subprocess.CompletedProcess(
+        cmd, process.returncode, "".join(stdout_chunks), "".join(stderr_chunks)
+    )
@@ -0,0 +1,380 @@
+"""
+Tiered Memory + Disk Store for HyperKit Cache
+In-process LRU front backed by a size-bounded on-disk store
+"""
+
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ROOT = Path(__file__).resolve().parent.parent.parent / ".cache" / "hyperkit"
+
+_FORMAT_VERSION = 1
+_MISSING = object()
+
+
+class _Serializer(ABC):
+    """Encodes cache values for the disk tier"""
+
+    name = "base"
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value"""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Decode a value written by dumps()"""
+
+
+class JSONSerializer(_Serializer):
+    """JSON serializer; values JSON cannot represent stay memory-only"""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PickleSerializer(_Serializer):
+    """Pickle serializer; only use for trusted cache directories"""
+
+    name = "pickle"
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+SERIALIZERS = {
+    "json": JSONSerializer,
+    "pickle": PickleSerializer,
+}
+
+
+class _MemoryEntry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+class _DiskEntry(NamedTuple):
+    expires_at: float
+    size: int
+
+
+class TieredStore:
+    """
+    Two-tier key/value store with per-entry expiry
+
+    Reads hit the in-memory LRU first and fall back to disk, promoting disk
+    hits into memory. Writes go to both tiers. Each tier is bounded: memory
+    by entry count and bytes, disk by bytes, evicting least recently used
+    entries. A background thread sweeps expired entries from both tiers.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_items: int = 1000,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl: int = 300,
+        serializer: str = "json",
+        sweep_interval: float = 60.0,
+    ):
+        """
+        Initialize tiered store
+
+        Args:
+            cache_dir: Directory of the disk tier (None disables the disk tier)
+            max_items: Maximum number of entries held in memory
+            max_memory_bytes: Maximum serialized bytes held in memory
+            max_disk_bytes: Maximum bytes held on disk
+            ttl: Default time to live in seconds
+            serializer: Disk serializer name ("json" or "pickle")
+            sweep_interval: Seconds between background expiry sweeps (0 disables)
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown serializer: {serializer}")
+
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_items = max_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.serializer = SERIALIZERS[serializer]()
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._disk: "OrderedDict[str, _DiskEntry]" = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expired": 0,
+            "unserializable": 0,
+        }
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    # ------------------------------------------------------------------
+    # Disk layout
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.entry"
+
+    def _load_disk_index(self) -> None:
+        """Rebuild the disk index from entry headers, oldest access first"""
+        entries = []
+        for path in self.cache_dir.glob("*/*.entry"):
+            try:
+                with open(path, "rb") as f:
+                    header = json.loads(f.readline())
+                stat = path.stat()
+            except (OSError, ValueError):
+                continue
+            if header.get("v") != _FORMAT_VERSION or header.get("serializer") != self.serializer.name:
+                continue
+            entries.append((stat.st_mtime, path.stem, _DiskEntry(header["expires_at"], stat.st_size)))
+
+        for _, key, entry in sorted(entries):
+            self._disk[key] = entry
+            self.disk_bytes += entry.size
+
+    def _read_disk(self, key: str) -> Any:
+        try:
+            with open(self._path(key), "rb") as f:
+                f.readline()
+                return self.serializer.loads(f.read())
+        except (OSError, ValueError, pickle.UnpicklingError) as e:
+            logger.debug(f"Unreadable cache entry {key}: {e}")
+            return _MISSING
+
+    def _write_disk(self, key: str, payload: bytes, expires_at: float) -> int:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        header = json.dumps(
+            {"v": _FORMAT_VERSION, "serializer": self.serializer.name, "expires_at": expires_at}
+        ).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header + b"\n" + payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return len(header) + 1 + len(payload)
+
+    def _remove_disk(self, key: str) -> None:
+        entry = self._disk.pop(key, None)
+        if entry is None:
+            return
+        self.disk_bytes -= entry.size
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _remove_memory(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= entry.size
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, promoting disk hits into memory"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry.value
+                self._expire(key)
+
+            disk_entry = self._disk.get(key)
+            if disk_entry is None or disk_entry.expires_at <= now:
+                if disk_entry is not None:
+                    self._expire(key)
+                self.stats["misses"] += 1
+                return default
+
+        value = self._read_disk(key)
+
+        with self._lock:
+            if value is _MISSING:
+                self._remove_disk(key)
+                self.stats["misses"] += 1
+                return default
+            self.stats["disk_hits"] += 1
+            # Promote unless the key was rewritten while reading
+            if self._disk.get(key) is disk_entry:
+                self._disk.move_to_end(key)
+                self._put_memory(key, _MemoryEntry(value, disk_entry.expires_at, disk_entry.size))
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value in both tiers"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        try:
+            payload = self.serializer.dumps(value)
+            size = len(payload)
+        except (TypeError, ValueError, pickle.PicklingError, AttributeError):
+            payload = None
+            size = sys.getsizeof(value)
+
+        with self._lock:
+            self._remove_disk(key)
+            self._put_memory(key, _MemoryEntry(value, expires_at, size))
+            if payload is None:
+                self.stats["unserializable"] += 1
+
+        if payload is not None and self.cache_dir:
+            disk_size = self._write_disk(key, payload, expires_at)
+            with self._lock:
+                previous = self._disk.pop(key, None)
+                if previous is not None:
+                    self.disk_bytes -= previous.size
+                self._disk[key] = _DiskEntry(expires_at, disk_size)
+                self.disk_bytes += disk_size
+                self._evict_disk()
+
+        self._ensure_sweeper()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove a key from both tiers, returning its in-memory value if any"""
+        with self._lock:
+            entry = self._memory.get(key)
+            self._remove_memory(key)
+            self._remove_disk(key)
+        return default if entry is None else entry.value
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        with self._lock:
+            for key in list(self._disk):
+                self._remove_disk(key)
+            self._memory.clear()
+            self.memory_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory.keys() | self._disk.keys())
+
+    def __contains__(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key) or self._disk.get(key)
+            return entry is not None and entry.expires_at > now
+
+    def _put_memory(self, key: str, entry: _MemoryEntry) -> None:
+        self._remove_memory(key)
+        self._memory[key] = entry
+        self.memory_bytes += entry.size
+        while self._memory and (
+            len(self._memory) > self.max_items or self.memory_bytes > self.max_memory_bytes
+        ):
+            # Evicted entries stay available from the disk tier
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self.memory_bytes -= evicted.size
+            if evicted_key not in self._disk:
+                self.stats["evictions"] += 1
+
+    def _evict_disk(self) -> None:
+        while self._disk and self.disk_bytes > self.max_disk_bytes:
+            key = next(iter(self._disk))
+            self._remove_disk(key)
+            if key not in self._memory:
+                self.stats["evictions"] += 1
+
+    def _expire(self, key: str) -> None:
+        self._remove_memory(key)
+        self._remove_disk(key)
+        self.stats["expired"] += 1
+
+    # ------------------------------------------------------------------
+    # Expiry sweeping
+    # ------------------------------------------------------------------
+
+    def sweep(self) -> int:
+        """Remove expired entries from both tiers; returns the number removed"""
+        now = time.time()
+        with self._lock:
+            expired = {k for k, e in self._memory.items() if e.expires_at <= now}
+            expired.update(k for k, e in self._disk.items() if e.expires_at <= now)
+            for key in expired:
+                self._expire(key)
+        if expired:
+            logger.debug(f"Cache sweep removed {len(expired)} expired entries")
+        return len(expired)
+
+    def _ensure_sweeper(self) -> None:
+        if self.sweep_interval <= 0 or self._sweeper is not None:
+            return
+        with self._lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop, name="hyperkit-cache-sweeper", daemon=True
+                )
+                self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background sweeper"""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tier statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self.memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self.disk_bytes,
+                "serializer": self.serializer.name,
+            }
@@ -0,0 +1,14 @@
+"""Incremental Compilation Service"""
+from .incremental_compiler import ForgeBackend, IncrementalCompiler, load_remappings, parse_imports, resolve_import
+from .solc_backend import SolcNotFoundError, SolcStandardJsonBackend, find_solc
+
+__all__ = [
+    'ForgeBackend',
+    'IncrementalCompiler',
+    'SolcNotFoundError',
+    'SolcStandardJsonBackend',
+    'find_solc',
+    'load_remappings',
+    'parse_imports',
+    'resolve_import',
+]
@@ -0,0 +1,549 @@
+"""
+Incremental Compilation Service
+Compiles a single contract and its import closure, caching artifacts by source hash
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from services.common.process_runner import run_process
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    try:
+        import toml as tomllib
+    except ImportError:
+        tomllib = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUILD_CACHE = Path(__file__).resolve().parent.parent.parent / ".cache" / "compilation"
+
+# Bump when the artifact layout or key derivation changes
+BUILD_CACHE_VERSION = 1
+
+_IMPORT_RE = re.compile(
+    r"""^\s*import\s+(?:[^"';]*?\bfrom\s+)?["']([^"']+)["']""",
+    re.MULTILINE,
+)
+_COMMENT_RE = re.compile(r"/\*.*?\*/|//[^\n]*", re.DOTALL)
+
+# foundry.toml settings that change compiler output
+_SETTING_KEYS = ("solc", "solc_version", "optimizer", "optimizer_runs", "via_ir", "evm_version", "remappings")
+
+
+def parse_imports(source: str) -> List[str]:
+    """Import paths of a Solidity source, in order, ignoring commented-out imports."""
+    return _IMPORT_RE.findall(_COMMENT_RE.sub("", source))
+
+
+def load_foundry_profile(project_dir: Path, profile: str = "default") -> Dict[str, Any]:
+    """Read a profile from the project's foundry.toml (empty if unavailable)."""
+    foundry_toml = Path(project_dir) / "foundry.toml"
+    if not foundry_toml.exists():
+        return {}
+    if tomllib is None:
+        logger.warning("No TOML parser available; foundry.toml settings are not part of build cache keys")
+        return {}
+    try:
+        if tomllib.__name__ == "tomllib":
+            with open(foundry_toml, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            data = tomllib.loads(foundry_toml.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"Could not parse {foundry_toml}: {e}")
+        return {}
+    return data.get("profile", {}).get(profile, {})
+
+
+def load_remappings(project_dir: Path, profile: Optional[Dict[str, Any]] = None) -> List[Tuple[str, str]]:
+    """
+    Collect remappings from remappings.txt and foundry.toml.
+
+    Returns:
+        (prefix, target) pairs, longest prefix first
+    """
+    project_dir = Path(project_dir)
+    entries: List[str] = []
+    remappings_txt = project_dir / "remappings.txt"
+    if remappings_txt.exists():
+        entries.extend(remappings_txt.read_text(encoding="utf-8").splitlines())
+    if profile is None:
+        profile = load_foundry_profile(project_dir)
+    entries.extend(profile.get("remappings", []))
+
+    remappings: Dict[str, str] = {}
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith("#") or "=" not in entry:
+            continue
+        prefix, target = entry.split("=", 1)
+        # Drop an optional "context:" qualifier
+        prefix = prefix.split(":", 1)[-1]
+        remappings.setdefault(prefix, target)
+    return sorted(remappings.items(), key=lambda item: len(item[0]), reverse=True)
+
+
+def resolve_import(
+    import_path: str,
+    importing_file: Path,
+    project_dir: Path,
+    remappings: Sequence[Tuple[str, str]],
+    libs: Sequence[str] = ("lib",),
+) -> Optional[Path]:
+    """
+    Resolve a Solidity import to a file the way solc/forge would.
+
+    Relative imports resolve against the importing file; others go through
+    remappings, then the project root and library directories.
+    """
+    if import_path.startswith("."):
+        candidate = (importing_file.parent / import_path).resolve()
+        return candidate if candidate.exists() else None
+
+    for prefix, target in remappings:
+        if import_path.startswith(prefix):
+            candidate = (project_dir / (target + import_path[len(prefix):])).resolve()
+            if candidate.exists():
+                return candidate
+
+    for base in (project_dir, *(project_dir / lib for lib in libs)):
+        candidate = (base / import_path).resolve()
+        if candidate.exists():
+            return candidate
+    return None
+
+
+class ForgeBackend:
+    """Builds source files with ``forge build <files>``"""
+
+    name = "forge"
+
+    def __init__(self, project_dir: Path, forge_cmd: Optional[List[str]] = None, timeout: float = 120):
+        self.project_dir = Path(project_dir)
+        self.forge_cmd = forge_cmd or ["forge"]
+        self.timeout = timeout
+
+    async def build(self, sources: Sequence[Path], closure: Optional[Sequence[Path]] = None) -> subprocess.CompletedProcess:
+        """
+        Compile source files, writing artifacts to out/<file>/<Contract>.json
+
+        Args:
+            sources: Files to compile
+            closure: Every file the sources import (unused; forge resolves imports)
+
+        Returns:
+            CompletedProcess with the compiler output
+        """
+        targets = []
+        for source in sources:
+            try:
+                targets.append(source.relative_to(self.project_dir).as_posix())
+            except ValueError:
+                targets.append(str(source))
+        return await run_process(
+            self.forge_cmd + ["build", *targets],
+            timeout=self.timeout,
+            cwd=str(self.project_dir),
+        )
+
+
+class IncrementalCompiler:
+    """
+    Contract compiler with a persistent, content-addressed artifact cache.
+
+    A build key is derived from the compiler settings and the SHA-256 of
+    every file in the target's import closure. Unchanged sources return
+    their cached artifacts without invoking the compiler; otherwise only
+    the target files are built, in a single compiler invocation per batch.
+    Concurrent compile() calls that miss the cache (e.g. workflows in a
+    batch run) are coalesced: requests arriving while a build is running
+    are built together in the next one.
+    With the default forge backend, forge's own incremental cache is left
+    intact so dependencies such as OpenZeppelin are not recompiled.
+    """
+
+    def __init__(
+        self,
+        project_dir: Path,
+        cache_dir: Optional[Path] = None,
+        forge_cmd: Optional[List[str]] = None,
+        timeout: float = 120,
+        max_entries: int = 256,
+        backend: Optional[Any] = None,
+    ):
+        """
+        Initialize the compiler
+
+        Args:
+            project_dir: Foundry project root (directory containing foundry.toml)
+            cache_dir: Artifact cache directory (default: hyperkit-agent/.cache/compilation)
+            forge_cmd: Forge executable and leading arguments
+            timeout: Seconds before a build is aborted
+            max_entries: Cached builds kept before the least recently used are pruned
+            backend: Compiler backend (default: ForgeBackend)
+        """
+        self.project_dir = Path(project_dir).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_BUILD_CACHE
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.backend = backend or ForgeBackend(self.project_dir, forge_cmd, timeout)
+
+        # Created lazily on the running event loop
+        self._build_lock: Optional[asyncio.Lock] = None
+        self._batch_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch: Optional[List[Tuple[Path, str, asyncio.Future]]] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._scanned: Dict[Path, Tuple[int, int, str, List[str]]] = {}
+        self.stats = {"hits": 0, "misses": 0, "failures": 0}
+
+    # ------------------------------------------------------------------
+    # Build keys
+    # ------------------------------------------------------------------
+
+    def _locks(self) -> Tuple[asyncio.Lock, asyncio.Lock]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Locks are bound to the loop that first uses them, and the
+            # compiler outlives a single asyncio.run()
+            self._build_lock = asyncio.Lock()
+            self._batch_lock = asyncio.Lock()
+            self._batch = None
+            self._batch_tasks = set()
+            self._loop = loop
+        return self._build_lock, self._batch_lock
+
+    def _settings(self) -> Dict[str, Any]:
+        profile = load_foundry_profile(self.project_dir)
+        return {key: profile.get(key) for key in _SETTING_KEYS}
+
+    def _scan_file(self, path: Path) -> Tuple[str, List[str]]:
+        """Content hash and import paths of a file, memoized by mtime and size."""
+        stat = path.stat()
+        cached = self._scanned.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2], cached[3]
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        imports = parse_imports(data.decode("utf-8", errors="replace"))
+        self._scanned[path] = (stat.st_mtime_ns, stat.st_size, digest, imports)
+        return digest, imports
+
+    def import_closure(self, source_file: Path, remappings: Optional[Sequence[Tuple[str, str]]] = None) -> Dict[Path, str]:
+        """
+        Hash every file reachable from a source file through imports
+
+        Returns:
+            Resolved path -> SHA-256 of its content
+
+        Raises:
+            FileNotFoundError: If an import cannot be resolved
+        """
+        if remappings is None:
+            remappings = load_remappings(self.project_dir)
+        closure: Dict[Path, str] = {}
+        pending = [Path(source_file).resolve()]
+        while pending:
+            path = pending.pop()
+            if path in closure:
+                continue
+            closure[path], imports = self._scan_file(path)
+            for import_path in imports:
+                resolved = resolve_import(import_path, path, self.project_dir, remappings)
+                if resolved is None:
+                    raise FileNotFoundError(f"Cannot resolve import '{import_path}' in {path.name}")
+                pending.append(resolved)
+        return closure
+
+    def _key_for_closure(self, source_file: Path, closure: Dict[Path, str]) -> str:
+        sources = sorted(
+            (self._display_path(path), digest) for path, digest in closure.items()
+        )
+        payload = {
+            "v": BUILD_CACHE_VERSION,
+            "backend": self.backend.name,
+            "entry": self._display_path(source_file),
+            "settings": self._settings(),
+            "sources": sources,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def build_key(self, source_file: Path) -> str:
+        """Cache key for compiling a source file with the current settings"""
+        source_file = Path(source_file).resolve()
+        return self._key_for_closure(source_file, self.import_closure(source_file))
+
+    def _display_path(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.project_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def _out_path(self, source_file: Path, contract_name: str) -> Path:
+        return self.project_dir / "out" / source_file.name / f"{contract_name}.json"
+
+    async def compile(self, source_file: Path, contract_name: str) -> Dict[str, Any]:
+        """
+        Compile a contract, reusing cached artifacts for unchanged sources
+
+        Args:
+            source_file: Solidity file containing the contract
+            contract_name: Contract whose artifact is returned
+
+        Returns:
+            Result dict with success, artifact_path, abi, bytecode and cached
+            flag, or success False with error and compiler output
+        """
+        source_file = Path(source_file).resolve()
+        cached = self._lookup(source_file, contract_name)
+        if cached is not None:
+            return cached
+
+        self._locks()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._batch is None:
+            self._batch = []
+            # Keep a reference: the loop only holds tasks weakly
+            task = loop.create_task(self._compile_batch(self._batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+        self._batch.append((source_file, contract_name, future))
+        return await future
+
+    def _lookup(self, source_file: Path, contract_name: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a contract, or None if it has to be built."""
+        try:
+            key = self.build_key(source_file)
+        except (OSError, UnicodeDecodeError):
+            return None
+        cached = self._load_cached(key, source_file, contract_name)
+        if cached is not None:
+            self.stats["hits"] += 1
+            logger.info(f"⚡ Using cached build of {contract_name}")
+            cached["duration_ms"] = 0.0
+        return cached
+
+    async def _compile_batch(self, batch: List[Tuple[Path, str, asyncio.Future]]) -> None:
+        """Build a batch of compile() requests once the previous batch is done."""
+        _, batch_lock = self._locks()
+        try:
+            async with batch_lock:
+                # Stop collecting: later requests start the next batch
+                if self._batch is batch:
+                    self._batch = None
+                results = await self.compile_many([(source, name) for source, name, _ in batch])
+        except BaseException as e:
+            # Never leave a waiting compile() unresolved, even on cancellation
+            if self._batch is batch:
+                self._batch = None
+            for _, _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def compile_many(self, targets: Sequence[Tuple[Path, str]]) -> List[Dict[str, Any]]:
+        """
+        Compile several contracts, building all cache misses in one pass
+
+        If the combined build fails, the missed sources are rebuilt one at a
+        time so a single broken contract does not fail the others.
+
+        Args:
+            targets: (source file, contract name) pairs
+
+        Returns:
+            One result dict per target, in order (see compile())
+        """
+        start = time.monotonic()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        plans: Dict[Path, Tuple[Optional[str], Optional[Dict[Path, str]]]] = {}
+
+        for i, (source_file, contract_name) in enumerate(targets):
+            source_file = Path(source_file).resolve()
+            if not source_file.exists():
+                self.stats["failures"] += 1
+                results[i] = {"success": False, "contract_name": contract_name, "error": f"Source file not found: {source_file}"}
+                continue
+            if source_file not in plans:
+                try:
+                    closure = self.import_closure(source_file)
+                    plans[source_file] = (self._key_for_closure(source_file, closure), closure)
+                except (OSError, UnicodeDecodeError) as e:
+                    # Forge may still resolve what we cannot (e.g. auto-detected
+                    # library remappings); build without caching
+                    logger.debug(f"Build cache disabled for {source_file.name}: {e}")
+                    plans[source_file] = (None, None)
+            key = plans[source_file][0]
+            cached = self._load_cached(key, source_file, contract_name) if key else None
+            if cached is not None:
+                self.stats["hits"] += 1
+                logger.info(f"⚡ Using cached build of {contract_name}")
+                results[i] = cached
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            build_lock, _ = self._locks()
+            async with build_lock:
+                # Another task may have built the same sources while we waited
+                missing = []
+                for i in pending:
+                    source_file, contract_name = Path(targets[i][0]).resolve(), targets[i][1]
+                    key = plans[source_file][0]
+                    results[i] = self._load_cached(key, source_file, contract_name) if key else None
+                    if results[i] is None:
+                        missing.append(i)
+
+                sources = list(dict.fromkeys(Path(targets[i][0]).resolve() for i in missing))
+                outcomes = await self._build(sources, plans)
+                for i in missing:
+                    source_file, contract_name = Path(targets[i][0]).resolve(), targets[i][1]
+                    self.stats["misses"] += 1
+                    results[i] = self._collect(source_file, contract_name, plans[source_file][0], outcomes[source_file])
+
+        duration = (time.monotonic() - start) * 1000
+        for result in results:
+            result.setdefault("duration_ms", duration)
+        return results
+
+    async def _build(
+        self, sources: List[Path], plans: Dict[Path, Tuple[Optional[str], Optional[Dict[Path, str]]]]
+    ) -> Dict[Path, subprocess.CompletedProcess]:
+        """Build sources together, falling back to one at a time on failure."""
+        if not sources:
+            return {}
+        logger.info(f"Building {', '.join(self._display_path(s) for s in sources)} with {self.backend.name}...")
+        result = await self._run_backend(sources, plans)
+        if result.returncode == 0 or len(sources) == 1:
+            return {source: result for source in sources}
+        logger.info("Combined build failed; building sources individually")
+        return {source: await self._run_backend([source], plans) for source in sources}
+
+    async def _run_backend(self, sources: List[Path], plans) -> subprocess.CompletedProcess:
+        closure: Dict[Path, str] = {}
+        for source in sources:
+            closure.update(plans[source][1] or {})
+        return await self.backend.build(sources, sorted(closure) if closure else None)
+
+    def _collect(self, source_file: Path, contract_name: str, key: Optional[str],
+                 result: subprocess.CompletedProcess) -> Dict[str, Any]:
+        """Turn a build outcome into a result dict, caching fresh artifacts."""
+        output = result.stdout + result.stderr
+        if result.returncode != 0:
+            self.stats["failures"] += 1
+            return {
+                "success": False,
+                "contract_name": contract_name,
+                "error": f"{self.backend.name} compilation failed: {(result.stderr or result.stdout)[:500]}",
+                "forge_output": output,
+            }
+
+        artifact_dir = self._out_path(source_file, contract_name).parent
+        artifacts = sorted(artifact_dir.glob("*.json")) if artifact_dir.exists() else []
+        if not any(a.stem == contract_name for a in artifacts):
+            self.stats["failures"] += 1
+            return {
+                "success": False,
+                "contract_name": contract_name,
+                "error": f"Artifact not found after compilation: out/{source_file.name}/{contract_name}.json",
+                "found_artifacts": [a.name for a in artifacts],
+                "forge_output": output,
+            }
+
+        if key:
+            self._store(key, source_file, artifacts)
+        artifact = json.loads(self._out_path(source_file, contract_name).read_text(encoding="utf-8"))
+        return self._result(contract_name, self._out_path(source_file, contract_name), artifact, False, output)
+
+    def _store(self, key: str, source_file: Path, artifacts: List[Path]) -> None:
+        entry_dir = self._entry_dir(key)
+        tmp_dir = entry_dir.with_name(f"{key}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for artifact in artifacts:
+            shutil.copy2(artifact, tmp_dir / artifact.name)
+        (tmp_dir / "manifest.json").write_text(json.dumps({
+            "source": self._display_path(source_file),
+            "contracts": [a.stem for a in artifacts],
+            "created_at": time.time(),
+        }), encoding="utf-8")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self._prune()
+
+    def _load_cached(self, key: str, source_file: Path, contract_name: str) -> Optional[Dict[str, Any]]:
+        cached_artifact = self._entry_dir(key) / f"{contract_name}.json"
+        try:
+            data = cached_artifact.read_bytes()
+            artifact = json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+        # Restore into out/ so deployment and tests find the usual path
+        out_path = self._out_path(source_file, contract_name)
+        try:
+            if not out_path.exists() or out_path.read_bytes() != data:
+                out_path.parent.mkdir(parents=True, exist_ok=True)
+                out_path.write_bytes(data)
+        except OSError as e:
+            logger.warning(f"Could not restore cached artifact to {out_path}: {e}")
+            out_path = cached_artifact
+        os.utime(self._entry_dir(key))
+        return self._result(contract_name, out_path, artifact, True, "")
+
+    @staticmethod
+    def _result(contract_name: str, artifact_path: Path, artifact: Dict[str, Any], cached: bool, output: str) -> Dict[str, Any]:
+        bytecode = artifact.get("bytecode", {})
+        return {
+            "success": True,
+            "contract_name": contract_name,
+            "artifact_path": str(artifact_path),
+            "abi": artifact.get("abi", []),
+            "bytecode": bytecode.get("object") if isinstance(bytecode, dict) else bytecode,
+            "cached": cached,
+            "forge_output": output,
+        }
+
+    def _prune(self) -> None:
+        entries = [p for p in self.cache_dir.glob("*/*") if p.is_dir() and not p.name.endswith(".tmp")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss statistics"""
+        return dict(self.stats)
@@ -0,0 +1,213 @@
+"""
+Solc Standard-JSON Compiler Backend
+Compiles batches of contracts with a local solc binary, bypassing forge
+"""
+
+import json
+import logging
+import os
+import posixpath
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from services.common.process_runner import run_process
+from services.compilation.incremental_compiler import (
+    load_foundry_profile,
+    load_remappings,
+    parse_imports,
+    resolve_import,
+)
+
+logger = logging.getLogger(__name__)
+
+_OUTPUT_SELECTION = ["abi", "evm.bytecode.object", "evm.deployedBytecode.object", "metadata"]
+
+
+class SolcNotFoundError(FileNotFoundError):
+    """No solc binary is available for the solc backend"""
+
+
+def find_solc(version: Optional[str] = None) -> Optional[str]:
+    """
+    Locate a solc binary
+
+    Checks the solc versions managed by Foundry (~/.svm) for an exact
+    version match, then falls back to solc on PATH.
+
+    Args:
+        version: Required compiler version, e.g. "0.8.24"
+
+    Returns:
+        Path to the binary, or None if none was found
+    """
+    if version:
+        svm_dir = Path(os.getenv("SVM_HOME", Path.home() / ".svm"))
+        for name in (f"solc-{version}", f"solc-{version}.exe"):
+            candidate = svm_dir / version / name
+            if candidate.exists():
+                return str(candidate)
+    return shutil.which("solc")
+
+
+class SolcStandardJsonBackend:
+    """
+    Compiler backend driving solc through its standard-JSON interface
+
+    The binary, compiler settings and remapping table are resolved once
+    per backend and reused for every build. All sources of a batch, with
+    their import closure, are sent to a single solc invocation as inline
+    content, so solc performs no filesystem lookups of its own. Artifacts
+    are written in forge's layout (out/<file>/<Contract>.json) so callers
+    cannot tell the backends apart.
+    """
+
+    name = "solc"
+
+    def __init__(self, project_dir: Path, solc_path: Optional[str] = None, timeout: float = 120):
+        """
+        Initialize the backend
+
+        Args:
+            project_dir: Foundry project root (foundry.toml supplies settings)
+            solc_path: solc binary (default: the foundry.toml version from ~/.svm, else PATH)
+            timeout: Seconds before a compiler run is aborted
+        """
+        self.project_dir = Path(project_dir).resolve()
+        self.timeout = timeout
+
+        profile = load_foundry_profile(self.project_dir)
+        self.version = profile.get("solc") or profile.get("solc_version")
+        self.remappings = load_remappings(self.project_dir, profile)
+        self.settings: Dict[str, Any] = {
+            "optimizer": {
+                "enabled": bool(profile.get("optimizer", False)),
+                "runs": int(profile.get("optimizer_runs", 200)),
+            },
+            "remappings": [f"{prefix}={target}" for prefix, target in self.remappings],
+        }
+        if profile.get("via_ir"):
+            self.settings["viaIR"] = True
+        if profile.get("evm_version"):
+            self.settings["evmVersion"] = profile["evm_version"]
+
+        self.solc_path = solc_path or find_solc(self.version)
+
+    def _unit_name(self, path: Path) -> str:
+        """Source unit name solc derives for a file when given the remappings."""
+        try:
+            return path.relative_to(self.project_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _remap(self, import_path: str) -> str:
+        """Source unit name solc derives for a non-relative import."""
+        for prefix, target in self.remappings:
+            if import_path.startswith(prefix):
+                return posixpath.normpath(target + import_path[len(prefix):])
+        return import_path
+
+    def build_input(self, sources: Sequence[Path], closure: Sequence[Path]) -> Dict[str, Any]:
+        """
+        Standard-JSON input compiling ``sources`` with ``closure`` available for imports
+
+        Imports that only resolve through a library directory (``lib/``)
+        without a remapping would reach solc under a different name than
+        the file's source unit, so an exact remapping is added for each.
+        """
+        units = {}
+        remappings = list(self.settings["remappings"])
+        for path in dict.fromkeys([*sources, *closure]):
+            content = path.read_text(encoding="utf-8")
+            units[self._unit_name(path)] = {"content": content}
+            for import_path in parse_imports(content):
+                if import_path.startswith("."):
+                    continue
+                resolved = resolve_import(import_path, path, self.project_dir, self.remappings)
+                if resolved is None:
+                    continue
+                unit_name = self._unit_name(resolved)
+                remapping = f"{import_path}={unit_name}"
+                if self._remap(import_path) != unit_name and remapping not in remappings:
+                    remappings.append(remapping)
+        return {
+            "language": "Solidity",
+            "sources": units,
+            "settings": {
+                **self.settings,
+                "remappings": remappings,
+                "outputSelection": {
+                    self._unit_name(source): {"*": _OUTPUT_SELECTION} for source in sources
+                },
+            },
+        }
+
+    async def build(self, sources: Sequence[Path], closure: Optional[Sequence[Path]] = None) -> subprocess.CompletedProcess:
+        """
+        Compile source files, writing artifacts to out/<file>/<Contract>.json
+
+        Args:
+            sources: Files to compile
+            closure: Every file the sources import (required; solc is given no filesystem access)
+
+        Returns:
+            CompletedProcess with a summary on stdout and diagnostics on stderr
+
+        Raises:
+            SolcNotFoundError: If no solc binary is available
+        """
+        if not self.solc_path:
+            raise SolcNotFoundError(f"solc {self.version or ''} not found (install it with 'svm install' or set solc_path)")
+        cmd = [self.solc_path, "--standard-json"]
+        if closure is None:
+            return subprocess.CompletedProcess(cmd, 1, "", "Import closure could not be resolved for solc backend")
+
+        sources = [Path(s).resolve() for s in sources]
+        fd, input_path = tempfile.mkstemp(suffix=".json", prefix="solc-input-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.build_input(sources, [Path(p) for p in closure]), f)
+            result = await run_process(cmd + [input_path], timeout=self.timeout, cwd=str(self.project_dir))
+        finally:
+            os.unlink(input_path)
+
+        try:
+            output = json.loads(result.stdout)
+        except ValueError:
+            return subprocess.CompletedProcess(cmd, result.returncode or 1, "", result.stderr or result.stdout)
+
+        diagnostics = [
+            e.get("formattedMessage") or e.get("message", "")
+            for e in output.get("errors", [])
+            if e.get("severity") != "info"
+        ]
+        errors = [e for e in output.get("errors", []) if e.get("severity") == "error"]
+        if errors:
+            return subprocess.CompletedProcess(cmd, 1, "", "\n".join(diagnostics))
+
+        written = self._write_artifacts(sources, output.get("contracts", {}))
+        summary = f"Compiled {written} contracts from {len(sources)} files with solc {self.version or ''}".rstrip()
+        return subprocess.CompletedProcess(cmd, 0, summary, "\n".join(diagnostics))
+
+    def _write_artifacts(self, sources: Sequence[Path], contracts: Dict[str, Dict[str, Any]]) -> int:
+        written = 0
+        for source in sources:
+            out_dir = self.project_dir / "out" / source.name
+            for contract_name, data in contracts.get(self._unit_name(source), {}).items():
+                evm = data.get("evm", {})
+                artifact = {
+                    "abi": data.get("abi", []),
+                    "bytecode": {"object": _hex(evm.get("bytecode", {}).get("object", ""))},
+                    "deployedBytecode": {"object": _hex(evm.get("deployedBytecode", {}).get("object", ""))},
+                    "metadata": data.get("metadata"),
+                }
+                out_dir.mkdir(parents=True, exist_ok=True)
+                (out_dir / f"{contract_name}.json").write_text(json.dumps(artifact), encoding="utf-8")
+                written += 1
+        return written
+
+
+def _hex(value: str) -> str:
+    return value if not value or value.startswith("0x") else f"0x{value}"
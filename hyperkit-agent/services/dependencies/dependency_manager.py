@@ -4,6 +4,7 @@ Automatically detects and installs dependencies for contracts, tools, and librar
 Self-healing: No manual dependency installation required.
 """
 
+import asyncio
 import re
 import os
 import sys
@@ -13,6 +14,8 @@ from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple, Any
 from dataclasses import dataclass
 
+from services.common.process_runner import run_process
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +56,10 @@ class DependencyManager:
         self.installed_npm: Set[str] = set()
         self.installed_python: Set[str] = set()
         
+        # One install at a time per dependency, so concurrent workflows
+        # needing the same library do not run duplicate installs
+        self._install_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        
         logger.info(f"DependencyManager initialized - workspace: {self.workspace_dir}")
     
     def detect_dependencies(self, contract_code: str, file_path: Optional[str] = None) -> List[Dependency]:
@@ -276,14 +283,16 @@ class DependencyManager:
         # CRITICAL: Ensure lib directory exists before installation
         self.foundry_lib_dir.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Ensured lib directory exists: {self.foundry_lib_dir}")
-        if dep.source_type == "solidity":
-            return await self._install_solidity_dependency(dep, retry_count)
-        elif dep.source_type == "npm":
-            return await self._install_npm_dependency(dep, retry_count)
-        elif dep.source_type == "python":
-            return await self._install_python_dependency(dep, retry_count)
-        else:
-            return False, f"Unknown dependency type: {dep.source_type}"
+        lock = self._install_locks.setdefault((dep.source_type, dep.name), asyncio.Lock())
+        async with lock:
+            if dep.source_type == "solidity":
+                return await self._install_solidity_dependency(dep, retry_count)
+            elif dep.source_type == "npm":
+                return await self._install_npm_dependency(dep, retry_count)
+            elif dep.source_type == "python":
+                return await self._install_python_dependency(dep, retry_count)
+            else:
+                return False, f"Unknown dependency type: {dep.source_type}"
     
     async def _install_solidity_dependency(self, dep: Dependency, retry_count: int) -> Tuple[bool, str]:
         """Install Solidity dependency using forge install"""
@@ -311,7 +320,7 @@ class DependencyManager:
         
         # Check if forge is available
         try:
-            result = subprocess.run(['forge', '--version'], capture_output=True, text=True, timeout=10)
+            result = await run_process(['forge', '--version'], timeout=10)
             if result.returncode != 0:
                 return False, "Forge not found - please install Foundry"
         except (subprocess.TimeoutExpired, FileNotFoundError):
@@ -440,11 +449,9 @@ class DependencyManager:
                                     has_valid_contracts = contracts_dir.exists() and any(contracts_dir.rglob("*.sol"))
                                     
                                     # Try to verify if it's actually broken via git submodule
-                                    test_result = subprocess.run(
+                                    test_result = await run_process(
                                         ['git', 'submodule', 'status', f'lib/{lib_name}'],
-                                        cwd=self.foundry_project_dir,
-                                        capture_output=True,
-                                        text=True,
+                                        cwd=str(self.foundry_project_dir),
                                         timeout=5
                                     )
                                     is_broken_submodule = test_result.returncode != 0 or 'fatal' in test_result.stderr.lower()
@@ -463,21 +470,17 @@ class DependencyManager:
                             # 4. Also try git submodule deinit from root repo (where .gitmodules is)
                             try:
                                 # Try from hyperkit-agent first
-                                deinit_result = subprocess.run(
+                                deinit_result = await run_process(
                                     ['git', 'submodule', 'deinit', '-f', f'lib/{lib_name}'],
-                                    cwd=self.foundry_project_dir,
-                                    capture_output=True,
-                                    text=True,
+                                    cwd=str(self.foundry_project_dir),
                                     timeout=5
                                 )
                                 # Also try from root repo with full path
                                 if deinit_result.returncode != 0:
                                     root_repo_dir = self.foundry_project_dir.parent
-                                    root_deinit_result = subprocess.run(
+                                    root_deinit_result = await run_process(
                                         ['git', 'submodule', 'deinit', '-f', f'hyperkit-agent/lib/{lib_name}'],
-                                        cwd=root_repo_dir,
-                                        capture_output=True,
-                                        text=True,
+                                        cwd=str(root_repo_dir),
                                         timeout=5
                                     )
                                     if root_deinit_result.returncode == 0:
@@ -497,11 +500,9 @@ class DependencyManager:
                         install_cmd.extend(['--tag', dep.version])
                     
                     # Run forge install
-                    result = subprocess.run(
+                    result = await run_process(
                         install_cmd,
-                        cwd=self.foundry_project_dir,
-                        capture_output=True,
-                        text=True,
+                        cwd=str(self.foundry_project_dir),
                         timeout=180  # Increased timeout for large repos
                     )
                     
@@ -525,11 +526,9 @@ class DependencyManager:
                             # Direct git clone instead of submodule
                             clone_cmd = ['git', 'clone', f'https://github.com/{repo_name}.git', str(lib_path)]
                             logger.info(f"📦 Cloning {repo_name} directly (bypassing git submodule)...")
-                            clone_result = subprocess.run(
+                            clone_result = await run_process(
                                 clone_cmd,
                                 cwd=str(self.foundry_project_dir),
-                                capture_output=True,
-                                text=True,
                                 timeout=180
                             )
                             
@@ -706,8 +705,10 @@ class DependencyManager:
         
         # Check npm
         try:
-            subprocess.run(['npm', '--version'], capture_output=True, check=True, timeout=10)
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
+            result = await run_process(['npm', '--version'], timeout=10)
+            if result.returncode != 0:
+                return False, "npm not found - please install Node.js"
+        except (subprocess.TimeoutExpired, FileNotFoundError):
             return False, "npm not found - please install Node.js"
         
         logger.info(f"📦 Installing npm dependency: {dep.name}")
@@ -715,11 +716,9 @@ class DependencyManager:
         for attempt in range(retry_count + 1):
             try:
                 cmd = ['npm', 'install', dep.name]
-                result = subprocess.run(
+                result = await run_process(
                     cmd,
-                    cwd=self.workspace_dir,
-                    capture_output=True,
-                    text=True,
+                    cwd=str(self.workspace_dir),
                     timeout=300
                 )
                 
@@ -747,8 +746,10 @@ class DependencyManager:
         
         # Check pip
         try:
-            subprocess.run(['pip', '--version'], capture_output=True, check=True, timeout=10)
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
+            result = await run_process(['pip', '--version'], timeout=10)
+            if result.returncode != 0:
+                return False, "pip not found - please install Python"
+        except (subprocess.TimeoutExpired, FileNotFoundError):
             return False, "pip not found - please install Python"
         
         logger.info(f"📦 Installing Python dependency: {dep.name}")
@@ -756,10 +757,8 @@ class DependencyManager:
         for attempt in range(retry_count + 1):
             try:
                 cmd = ['pip', 'install', dep.name]
-                result = subprocess.run(
+                result = await run_process(
                     cmd,
-                    capture_output=True,
-                    text=True,
                     timeout=300
                 )
                 
@@ -0,0 +1,258 @@
+"""
+Generation Cache
+Reuses generated contracts for prompts that parse to the same specification
+"""
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from services.common.cache import HyperKitCache
+from services.generation.prompt_parser import ContractSpec, PromptParser, TokenSpec
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key normalization or entry layout changes
+CACHE_VERSION = 1
+
+# Filler words that do not change what contract is being asked for
+_STOPWORDS = {
+    "a", "an", "the", "and", "with", "for", "of", "to", "that", "which", "is", "it",
+    "please", "create", "generate", "build", "make", "write", "me", "my", "new",
+    "called", "named", "name", "contract", "smart", "solidity",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9_.%]+")
+
+# Identifiers used to check that a cached contract can be re-filled
+_PROBE_SPEC = ContractSpec(
+    contract_name="HyperKitCacheProbe",
+    token_spec=TokenSpec(name="HyperKitCacheProbe", symbol="HKCPROBE"),
+)
+
+
+@dataclass
+class CachedGeneration:
+    """Contract code served from the generation cache"""
+    contract_code: str
+    method: str
+    provider: str
+    refilled: bool
+
+
+class GenerationCache:
+    """
+    Prompt -> contract cache for the generation stage
+
+    Keys are built from the prompt's ContractSpec (contract type, features,
+    parameters and token economics) with the contract and token names
+    masked out, plus the remaining prompt terms, the model that would serve
+    the request and a hash of the RAG context. The prompt terms keep
+    requests the parser cannot tell apart from sharing an entry.
+
+    A contract whose names are fully replaced by
+    ``PromptParser.validate_and_fix_contract`` is stored once for all
+    names and re-filled for each request. Other contracts are only reused
+    for the exact same names.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 86400,
+        max_entries: int = 500,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        parser: Optional[PromptParser] = None
+    ):
+        """
+        Initialize generation cache
+
+        Args:
+            ttl: Seconds a generated contract stays reusable
+            max_entries: Maximum number of entries held in memory
+            max_disk_bytes: Maximum bytes held on disk
+            cache_dir: Disk directory (default: hyperkit-agent/.cache/hyperkit/generation)
+            parser: Prompt parser used to build specifications
+        """
+        self.ttl = ttl
+        self.parser = parser or PromptParser()
+        self.cache = HyperKitCache(
+            max_size=max_entries,
+            ttl=ttl,
+            cache_type="tiered",
+            name="generation",
+            cache_dir=cache_dir,
+            max_disk_bytes=max_disk_bytes
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["GenerationCache"]:
+        """Create the cache from agent configuration (None when disabled)"""
+        if not config.get('generation_cache_enabled', True):
+            return None
+        return cls(
+            ttl=int(config.get('generation_cache_ttl', 86400)),
+            max_entries=int(config.get('generation_cache_max_entries', 500)),
+            max_disk_bytes=int(config.get('generation_cache_max_bytes', 64 * 1024 * 1024)),
+            cache_dir=config.get('generation_cache_dir')
+        )
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _identifiers(spec: ContractSpec) -> Dict[str, Optional[str]]:
+        return {
+            "contract_name": spec.contract_name,
+            "token_name": spec.token_spec.name if spec.token_spec else None,
+            "token_symbol": spec.token_spec.symbol if spec.token_spec else None,
+        }
+
+    def normalize(self, prompt: str, spec: ContractSpec) -> Dict[str, Any]:
+        """
+        Name-independent description of what a prompt asks for
+
+        Args:
+            prompt: Natural language request
+            spec: Specification parsed from the prompt
+
+        Returns:
+            JSON-serializable normalized specification
+        """
+        names = {n.lower() for n in self._identifiers(spec).values() if n}
+        terms = sorted({
+            word.strip(".") for word in _WORD_RE.findall(prompt.lower())
+            if word.strip(".") and word.strip(".") not in names and word.strip(".") not in _STOPWORDS
+        })
+        token = spec.token_spec
+        return {
+            "contract_type": spec.contract_type,
+            "features": sorted(set(spec.features or [])),
+            "parameters": {k: spec.parameters[k] for k in sorted(spec.parameters or {})},
+            "token": {
+                "decimals": token.decimals,
+                "max_supply": token.max_supply,
+                "initial_supply": token.initial_supply,
+            } if token else None,
+            "terms": terms,
+        }
+
+    def make_key(self, prompt: str, spec: ContractSpec, model: str, context: str = "",
+                 identifiers: Optional[Dict[str, Optional[str]]] = None) -> str:
+        """
+        Cache key for a request
+
+        Args:
+            prompt: Natural language request
+            spec: Specification parsed from the prompt
+            model: Model (or generation path) that would serve the request
+            context: RAG context passed to the model
+            identifiers: Names to pin the key to (None for the name-independent key)
+        """
+        payload = {
+            "v": CACHE_VERSION,
+            "spec": self.normalize(prompt, spec),
+            "model": model,
+            "context": hashlib.sha256(context.encode("utf-8")).hexdigest(),
+            "identifiers": identifiers,
+        }
+        return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def _leftover_names(self, code: str, old: Dict[str, Optional[str]], new: Dict[str, Optional[str]]) -> Set[str]:
+        """Old names still present in re-filled code"""
+        replaced = {v for v in new.values() if v}
+        leftovers = set()
+        for name in old.values():
+            if name and name not in replaced and re.search(rf"\b{re.escape(name)}\b", code):
+                leftovers.add(name)
+        return leftovers
+
+    def is_parameterizable(self, contract_code: str, spec: ContractSpec) -> bool:
+        """True when re-filling replaces every name the contract was generated with"""
+        identifiers = self._identifiers(spec)
+        if not any(identifiers.values()):
+            return False
+        probe = self.parser.validate_and_fix_contract(contract_code, _PROBE_SPEC)
+        return not self._leftover_names(probe, identifiers, self._identifiers(_PROBE_SPEC))
+
+    def lookup(self, prompt: str, model: str, context: str = "",
+               spec: Optional[ContractSpec] = None) -> Optional[CachedGeneration]:
+        """
+        Find a reusable contract for a request
+
+        Args:
+            prompt: Natural language request
+            model: Model (or generation path) that would serve the request
+            context: RAG context passed to the model
+            spec: Parsed specification (parsed from the prompt when omitted)
+
+        Returns:
+            Cached contract re-filled for this request's names, or None
+        """
+        spec = spec or self.parser.parse_prompt(prompt)
+        identifiers = self._identifiers(spec)
+
+        entry = self.cache.get(self.make_key(prompt, spec, model, context))
+        if entry is not None:
+            code = entry["contract_code"]
+            refilled = entry["identifiers"] != identifiers
+            if refilled:
+                code = self.parser.validate_and_fix_contract(code, spec)
+                leftovers = self._leftover_names(code, entry["identifiers"], identifiers)
+                if leftovers:
+                    logger.debug(f"Generation cache entry not re-fillable (left {sorted(leftovers)})")
+                    entry = None
+            if entry is not None:
+                logger.info(f"♻️ Generation cache hit for {spec.contract_name} (refilled: {refilled})")
+                return CachedGeneration(code, entry["method"], entry["provider"], refilled)
+
+        entry = self.cache.get(self.make_key(prompt, spec, model, context, identifiers))
+        if entry is not None:
+            logger.info(f"♻️ Generation cache hit for {spec.contract_name}")
+            return CachedGeneration(entry["contract_code"], entry["method"], entry["provider"], False)
+        return None
+
+    def store(self, prompt: str, model: str, context: str, contract_code: str,
+              method: str, provider: str, spec: Optional[ContractSpec] = None) -> bool:
+        """
+        Store a generated contract
+
+        Args:
+            prompt: Natural language request
+            model: Model (or generation path) the request was keyed on
+            context: RAG context passed to the model
+            contract_code: Cleaned contract code
+            method: Generation method that produced the contract
+            provider: Provider that produced the contract
+            spec: Parsed specification (parsed from the prompt when omitted)
+
+        Returns:
+            True when the entry can be re-filled for other names
+        """
+        spec = spec or self.parser.parse_prompt(prompt)
+        identifiers = self._identifiers(spec)
+        parameterizable = self.is_parameterizable(contract_code, spec)
+        key = self.make_key(prompt, spec, model, context, None if parameterizable else identifiers)
+        self.cache.set(key, {
+            "contract_code": contract_code,
+            "identifiers": identifiers,
+            "method": method,
+            "provider": provider,
+        })
+        return parameterizable
+
+    def clear(self) -> None:
+        """Drop all cached generations"""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return self.cache.get_stats()
@@ -28,6 +28,7 @@ class ContractSpec:
     token_spec: Optional[TokenSpec] = None
     features: List[str] = None
     parameters: Dict[str, Any] = None
+    contract_type: Optional[str] = None
 
 
 class PromptParser:
@@ -65,6 +66,14 @@ class PromptParser:
             'vesting': [r'vesting', r'vest', r'lock.*period'],
         }
         
+        # Checked in order; NFT keywords first so "NFT token" is an NFT
+        self.contract_type_keywords = {
+            'nft': ['nft', 'erc721', 'erc1155', 'non-fungible', 'collectible'],
+            'defi_vault': ['vault', 'defi', 'yield', 'staking'],
+            'governance': ['governance', 'governor', 'dao', 'voting'],
+            'token': ['token', 'erc20', 'fungible'],
+        }
+        
         self.parameter_patterns = {
             'max_supply': r'max.*supply.*?(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:million|billion|k|m|b)?',
             'initial_supply': r'initial.*supply.*?(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:million|billion|k|m|b)?',
@@ -97,13 +106,17 @@ class PromptParser:
             # Extract parameters
             parameters = self._extract_parameters(prompt)
             
+            # Classify contract type
+            contract_type = self._extract_contract_type(prompt)
+            
             logger.info(f"Parsed prompt: contract='{contract_name}', token='{token_spec.name if token_spec else 'None'}'")
             
             return ContractSpec(
                 contract_name=contract_name,
                 token_spec=token_spec,
                 features=features,
-                parameters=parameters
+                parameters=parameters,
+                contract_type=contract_type
             )
             
         except Exception as e:
@@ -202,6 +215,16 @@ class PromptParser:
         
         return features
 
+    def _extract_contract_type(self, prompt: str) -> str:
+        """Classify the contract type (nft, defi_vault, governance or token)."""
+        prompt_lower = prompt.lower()
+        
+        for contract_type, keywords in self.contract_type_keywords.items():
+            if any(keyword in prompt_lower for keyword in keywords):
+                return contract_type
+        
+        return "token"  # Default to token
+
     def _extract_parameters(self, prompt: str) -> Dict[str, Any]:
         """Extract numerical parameters from prompt."""
         parameters = {}
@@ -21,12 +21,16 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
-from collections import deque
 import threading
 import queue
 
+from services.monitoring.timeseries import TimeSeriesStore
+
 logger = logging.getLogger(__name__)
 
+# Points per metric in /api/dashboard responses; longer ranges use rollup buckets
+DASHBOARD_MAX_POINTS = 720
+
 @dataclass
 class MetricData:
     """Represents a metric data point."""
@@ -60,46 +64,73 @@ class Alert:
     resolved_at: Optional[datetime] = None
 
 class MetricsCollector:
-    """Collects and stores metrics data."""
+    """
+    Collects and stores metrics data.
+    
+    Points are kept in a TimeSeriesStore: a fixed-size ring buffer of
+    (timestamp, value, interned tags) per metric plus per-minute and
+    per-hour rollups, so memory per metric is constant and time-range
+    reads binary search instead of scanning.
+    """
     
     def __init__(self, max_size: int = 10000):
-        self.metrics: Dict[str, deque] = {}
         self.max_size = max_size
-        self.lock = threading.Lock()
+        self.store = TimeSeriesStore(capacity=max_size)
     
     def add_metric(self, metric: MetricData):
         """Add a metric data point."""
-        with self.lock:
-            if metric.name not in self.metrics:
-                self.metrics[metric.name] = deque(maxlen=self.max_size)
-            
-            self.metrics[metric.name].append(metric)
+        self.store.add(metric.name, metric.timestamp.timestamp(), metric.value, metric.tags)
     
     def get_metrics(self, name: str, since: Optional[datetime] = None) -> List[MetricData]:
         """Get metrics for a specific name."""
-        with self.lock:
-            if name not in self.metrics:
-                return []
-            
-            metrics = list(self.metrics[name])
-            
-            if since:
-                metrics = [m for m in metrics if m.timestamp >= since]
+        points = self.store.range(name, since.timestamp() if since else None)
+        return [
+            MetricData(
+                timestamp=datetime.fromtimestamp(ts),
+                name=name,
+                value=float(value),
+                tags=self.store.tags(tag_id)
+            )
+            for ts, value, tag_id in zip(points["timestamp"].tolist(), points["value"].tolist(), points["tags"].tolist())
+        ]
+    
+    def get_series(self, name: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   max_points: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get a metric as columns, downsampled to rollup buckets if needed.
+        
+        Args:
+            name: Metric name
+            since: Start of the range
+            until: End of the range
+            max_points: Return at most this many points (bucket means beyond it)
             
-            return metrics
+        Returns:
+            Dict with 'timestamp' (POSIX seconds), 'value' and 'tags' lists
+            (tags are empty for rollup buckets)
+        """
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        if max_points:
+            points = self.store.downsample(name, since_ts, until_ts, max_points=max_points)
+        else:
+            points = self.store.range(name, since_ts, until_ts)
+        timestamps = points["timestamp"].tolist()
+        tags = [self.store.tags(t) for t in points["tags"].tolist()] if "tags" in points else [{}] * len(timestamps)
+        return {"timestamp": timestamps, "value": points["value"].tolist(), "tags": tags}
     
     def get_latest_metric(self, name: str) -> Optional[MetricData]:
         """Get the latest metric for a specific name."""
-        with self.lock:
-            if name not in self.metrics or not self.metrics[name]:
-                return None
-            
-            return self.metrics[name][-1]
+        latest = self.store.latest(name)
+        if latest is None:
+            return None
+        
+        timestamp, value, tags = latest
+        return MetricData(timestamp=datetime.fromtimestamp(timestamp), name=name, value=value, tags=tags)
     
     def get_metric_names(self) -> List[str]:
         """Get all metric names."""
-        with self.lock:
-            return list(self.metrics.keys())
+        return self.store.names()
 
 class AlertManager:
     """Manages alerts and alert rules."""
@@ -583,15 +614,15 @@ class MonitoringDashboard:
         metrics_data = {}
         
         for name in self.metrics_collector.get_metric_names():
-            metrics = self.metrics_collector.get_metrics(name, since)
-            if metrics:
+            series = self.metrics_collector.get_series(name, since, max_points=DASHBOARD_MAX_POINTS)
+            if series['timestamp']:
                 metrics_data[name] = [
                     {
-                        'timestamp': m.timestamp.isoformat(),
-                        'value': m.value,
-                        'tags': m.tags
+                        'timestamp': datetime.fromtimestamp(ts).isoformat(),
+                        'value': value,
+                        'tags': tags
                     }
-                    for m in metrics
+                    for ts, value, tags in zip(series['timestamp'], series['value'], series['tags'])
                 ]
         
         # Get alerts
@@ -5,15 +5,25 @@ Real-time transaction and contract monitoring with analytics
 
 import asyncio
 import json
+import os
 import time
 import logging
 from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
+
+from web3 import Web3
+
+from services.monitoring.event_indexer import EventIndexer, EventStore
+from services.monitoring.head_tracker import HeadTracker, get_head_tracker
+from services.monitoring.rpc_batch import JsonRpcBatchClient, hex_to_int
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EVENT_STORE_PATH = Path(__file__).resolve().parent.parent.parent / "logs" / "contract_events.sqlite3"
+
 class MonitorType(Enum):
     TRANSACTION = "transaction"
     CONTRACT = "contract"
@@ -30,6 +40,9 @@ class MonitorConfig:
     duration: Optional[int] = None  # None for indefinite
     gas_threshold: Optional[float] = None
     event_filters: Optional[List[str]] = None
+    start_block: Optional[int] = None  # events: first block to index (default: current head)
+    abi: Optional[List[Dict[str, Any]]] = None  # events: contract ABI for decoding
+    follow_head: bool = True  # use the shared head tracker when the network has an RPC endpoint
 
 @dataclass
 class MonitorEvent:
@@ -43,7 +56,17 @@ class MonitorEvent:
 class EnhancedMonitor:
     """Enhanced monitoring system for transactions and contracts"""
     
-    def __init__(self):
+    def __init__(self, rpc_urls: Optional[Dict[str, str]] = None, event_store_path: Optional[Path] = None):
+        """
+        Args:
+            rpc_urls: RPC endpoint per network (default: <NETWORK>_RPC_URL env vars)
+            event_store_path: SQLite file for indexed contract events
+                (default: hyperkit-agent/logs/contract_events.sqlite3)
+        """
+        self.rpc_urls = rpc_urls or {}
+        self.event_store_path = Path(event_store_path) if event_store_path else DEFAULT_EVENT_STORE_PATH
+        self._event_store: Optional[EventStore] = None
+        self.event_indexers: Dict[str, EventIndexer] = {}
         self.active_monitors: Dict[str, MonitorConfig] = {}
         self.monitor_tasks: Dict[str, asyncio.Task] = {}
         self.event_handlers: List[Callable] = []
@@ -90,15 +113,70 @@ class EnhancedMonitor:
             self.monitor_tasks[monitor_id].cancel()
             del self.monitor_tasks[monitor_id]
             del self.active_monitors[monitor_id]
+            self.event_indexers.pop(monitor_id, None)
             logger.info(f"Stopped monitoring {monitor_id}")
             return True
         return False
     
+    def _head_tracker(self, network: str) -> Optional[HeadTracker]:
+        """Shared head tracker for a network (None without an RPC endpoint)"""
+        rpc_url = self.rpc_urls.get(network) or os.getenv(f"{network.upper()}_RPC_URL")
+        return get_head_tracker(network, rpc_url) if rpc_url else None
+    
+    @property
+    def event_store(self) -> EventStore:
+        """Store of indexed contract events (opened on first use)"""
+        if self._event_store is None:
+            self._event_store = EventStore(self.event_store_path)
+        return self._event_store
+    
+    def _event_indexer(self, monitor_id: str, config: MonitorConfig, client: JsonRpcBatchClient) -> EventIndexer:
+        indexer = self.event_indexers.get(monitor_id)
+        if indexer is None:
+            topics = self._event_topics(config.event_filters)
+            indexer = EventIndexer(
+                config.network, config.target, client, self.event_store,
+                abi=config.abi,
+                topics=sorted(topics) if topics else None,
+                start_block=config.start_block
+            )
+            self.event_indexers[monitor_id] = indexer
+        return indexer
+    
+    def get_contract_events(self, network: str, address: str, event: Optional[str] = None,
+                            from_block: Optional[int] = None, to_block: Optional[int] = None,
+                            limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Query indexed events of a monitored contract, newest first.
+        
+        Args:
+            network: Network name
+            address: Contract address
+            event: Only events with this name (requires the monitor's ABI)
+            from_block: Lowest block number
+            to_block: Highest block number
+            limit: Maximum events returned
+            
+        Returns:
+            Stored events
+        """
+        return self.event_store.query_events(
+            network, address, event=event, from_block=from_block, to_block=to_block, limit=limit
+        )
+    
     async def _monitor_loop(self, monitor_id: str, config: MonitorConfig):
         """Main monitoring loop"""
         start_time = time.time()
         
         try:
+            # Transaction and event monitors follow new blocks through the shared tracker
+            tracker = None
+            if config.follow_head and config.monitor_type in (MonitorType.TRANSACTION, MonitorType.EVENTS):
+                tracker = self._head_tracker(config.network)
+            if tracker is not None:
+                await self._follow_head(monitor_id, config, tracker)
+                return
+            
             while True:
                 # Check if monitoring should stop
                 if config.duration and (time.time() - start_time) > config.duration:
@@ -129,6 +207,133 @@ class EnhancedMonitor:
                 del self.monitor_tasks[monitor_id]
             if monitor_id in self.active_monitors:
                 del self.active_monitors[monitor_id]
+            self.event_indexers.pop(monitor_id, None)
+    
+    async def _follow_head(self, monitor_id: str, config: MonitorConfig, tracker: HeadTracker):
+        """Handle new blocks from the tracker until the duration ends or the monitor is stopped"""
+        if config.monitor_type == MonitorType.TRANSACTION:
+            lookup = {"receipt": None, "checked": False}
+            
+            async def on_block(block, logs):
+                await self._on_transaction_block(config, tracker, lookup, block)
+            addresses = None
+        else:
+            # The tracker fetches the contract's logs with the block; the indexer stores them.
+            # Catching up on older blocks runs in its own task so the shared tracker's
+            # delivery to other subscribers is not held up by a range walk.
+            indexer = self._event_indexer(monitor_id, config, tracker.client)
+            catch_up: Dict[str, Optional[asyncio.Task]] = {"task": None}
+            
+            async def on_block(block, logs):
+                if catch_up["task"] and not catch_up["task"].done():
+                    return  # the next block resumes from the walk's cursor
+                number = hex_to_int(block.get("number"))
+                if indexer.needs_range_walk(number):
+                    catch_up["task"] = asyncio.create_task(self._catch_up(config, indexer, number, block))
+                    return
+                await self._report_events(config, await indexer.ingest_block(block, logs))
+            addresses = [config.target]
+        
+        subscription_id = tracker.subscribe(on_block, addresses=addresses)
+        try:
+            if config.duration:
+                await asyncio.sleep(config.duration)
+                logger.info(f"Monitoring duration reached for {monitor_id}")
+            else:
+                await asyncio.Event().wait()
+        finally:
+            tracker.unsubscribe(subscription_id)
+            if config.monitor_type != MonitorType.TRANSACTION and catch_up["task"]:
+                catch_up["task"].cancel()
+    
+    async def _catch_up(self, config: MonitorConfig, indexer: EventIndexer, number: int, block: Dict[str, Any]):
+        """Index from the indexer's cursor up to ``block``"""
+        try:
+            await self._report_events(config, await indexer.index_once(head=number, headers={number: block}))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Event catch-up failed for {config.target}: {e}")
+    
+    async def _on_transaction_block(self, config: MonitorConfig, tracker: HeadTracker,
+                                    lookup: Dict[str, Any], block: Dict[str, Any]):
+        """Report a watched transaction's status; its receipt is fetched once it is mined"""
+        block_hashes = {h.lower() for h in block.get("transactions") or [] if isinstance(h, str)}
+        # Look the receipt up on the first block (it may already be mined), then only
+        # when the transaction shows up in a block
+        if lookup["receipt"] is None and (not lookup["checked"] or config.target.lower() in block_hashes):
+            lookup["checked"] = True
+            lookup["receipt"] = await tracker.client.call("eth_getTransactionReceipt", [config.target])
+        
+        receipt = lookup["receipt"]
+        head = max(tracker.head or 0, hex_to_int(block.get("number")) or 0)
+        event_data = {
+            "transaction_hash": config.target,
+            "status": "pending",
+            "confirmations": 0,
+            "gas_used": 0,
+            "gas_price": 0,
+            "block_number": None
+        }
+        if receipt:
+            block_number = hex_to_int(receipt.get("blockNumber"))
+            event_data.update({
+                "status": "failed" if hex_to_int(receipt.get("status")) == 0 else "confirmed",
+                "confirmations": max(0, head - block_number + 1),
+                "gas_used": hex_to_int(receipt.get("gasUsed")) or 0,
+                "gas_price": hex_to_int(receipt.get("effectiveGasPrice")) or 0,
+                "block_number": block_number
+            })
+        
+        await self._emit_event(MonitorEvent(
+            timestamp=datetime.now(),
+            event_type="transaction_update",
+            data=event_data,
+            network=config.network,
+            target=config.target
+        ))
+        self.metrics["transactions_monitored"] += 1
+    
+    async def _report_events(self, config: MonitorConfig, events: List[Dict[str, Any]]):
+        """Emit newly indexed contract events"""
+        if not events:
+            return
+        
+        await self._emit_event(MonitorEvent(
+            timestamp=datetime.now(),
+            event_type="events_update",
+            data={
+                "events_found": len(events),
+                "recent_events": [
+                    {k: e[k] for k in ("block_number", "transaction_hash", "log_index", "event", "args")}
+                    for e in events[-10:]
+                ],
+                "event_types": config.event_filters or [],
+                "block_number": events[-1]["block_number"]
+            },
+            network=config.network,
+            target=config.target
+        ))
+        self.metrics["events_captured"] += len(events)
+    
+    @staticmethod
+    def _event_topics(event_filters: Optional[List[str]]) -> Optional[set]:
+        """
+        topic0 values for event filters given as signatures ("Transfer(address,address,uint256)")
+        or topic hashes. Returns None (no filtering) if any filter is a bare name.
+        """
+        if not event_filters:
+            return None
+        topics = set()
+        for event_filter in event_filters:
+            event_filter = event_filter.replace(" ", "")
+            if event_filter.startswith("0x") and len(event_filter) == 66:
+                topics.add(event_filter.lower())
+            elif "(" in event_filter:
+                topics.add(Web3.to_hex(Web3.keccak(text=event_filter)))
+            else:
+                return None
+        return topics
     
     async def _monitor_transaction(self, monitor_id: str, config: MonitorConfig):
         """Monitor transaction status and details"""
@@ -215,26 +420,15 @@ class EnhancedMonitor:
             logger.error(f"Gas monitoring error: {e}")
     
     async def _monitor_events(self, monitor_id: str, config: MonitorConfig):
-        """Monitor contract events"""
+        """Index contract events up to the current head (polling mode)"""
         try:
-            # TODO: Implement actual event monitoring
-            # This would listen for specific contract events
-            
-            event_data = {
-                "events_found": 0,
-                "recent_events": [],
-                "event_types": config.event_filters or []
-            }
-            
-            await self._emit_event(MonitorEvent(
-                timestamp=datetime.now(),
-                event_type="events_update",
-                data=event_data,
-                network=config.network,
-                target=config.target
-            ))
+            tracker = self._head_tracker(config.network)
+            if tracker is None:
+                logger.warning(f"No RPC endpoint for {config.network}; cannot index events of {config.target}")
+                return
             
-            self.metrics["events_captured"] += 1
+            indexer = self._event_indexer(monitor_id, config, tracker.client)
+            await self._report_events(config, await indexer.index_once())
             
         except Exception as e:
             logger.error(f"Event monitoring error: {e}")
@@ -0,0 +1,433 @@
+"""
+Contract Event Indexer
+Walks block ranges with eth_getLogs and persists decoded events to SQLite.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eth_abi import decode as abi_decode
+from web3 import Web3
+
+from services.monitoring.rpc_batch import JsonRpcBatchClient, hex_to_int
+
+logger = logging.getLogger(__name__)
+
+
+# --- logsBloom ---------------------------------------------------------------
+
+def bloom_bits(value: bytes) -> Tuple[Tuple[int, int], ...]:
+    """(byte index, mask) of the three bloom bits set by ``value`` (an address or topic)."""
+    digest = Web3.keccak(value)
+    bits = []
+    for i in (0, 2, 4):
+        bit = ((digest[i] << 8) | digest[i + 1]) & 2047
+        bits.append((255 - bit // 8, 1 << (bit % 8)))
+    return tuple(bits)
+
+
+def bloom_contains(bloom: Optional[str], bits: Tuple[Tuple[int, int], ...]) -> bool:
+    """
+    Whether a block's logsBloom may contain an item.
+
+    False means the block certainly has no matching log. A missing or
+    malformed bloom never rules a block out.
+    """
+    if not bloom:
+        return True
+    try:
+        data = bytes.fromhex(bloom[2:] if bloom.startswith("0x") else bloom)
+    except ValueError:
+        return True
+    if len(data) != 256:
+        return True
+    return all(data[index] & mask for index, mask in bits)
+
+
+# --- ABI decoding ------------------------------------------------------------
+
+def _canonical_type(param: Dict[str, Any]) -> str:
+    abi_type = param["type"]
+    if abi_type.startswith("tuple"):
+        return "(" + ",".join(_canonical_type(c) for c in param.get("components", [])) + ")" + abi_type[5:]
+    return abi_type
+
+
+def _is_dynamic(abi_type: str) -> bool:
+    return abi_type in ("string", "bytes") or abi_type.endswith("]") or abi_type.startswith("(")
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def event_abis_by_topic(abi: Optional[Sequence[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Map topic0 -> event ABI entry for the non-anonymous events of a contract ABI."""
+    events = {}
+    for entry in abi or []:
+        if entry.get("type") != "event" or entry.get("anonymous"):
+            continue
+        signature = f"{entry['name']}({','.join(_canonical_type(p) for p in entry.get('inputs', []))})"
+        events[Web3.to_hex(Web3.keccak(text=signature))] = entry
+    return events
+
+
+def decode_log(log: Dict[str, Any], events: Dict[str, Dict[str, Any]]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Decode a raw log against known event ABIs.
+
+    Indexed dynamic values (strings, bytes, arrays) are only present as
+    their hash and are returned as the raw topic.
+
+    Returns:
+        (event name, arguments), or (None, None) if the event is unknown
+        or the log does not match its ABI
+    """
+    topics = log.get("topics") or []
+    event = events.get(topics[0].lower()) if topics else None
+    if event is None:
+        return None, None
+
+    inputs = event.get("inputs", [])
+    indexed = [p for p in inputs if p.get("indexed")]
+    plain = [p for p in inputs if not p.get("indexed")]
+    try:
+        args = {}
+        for i, (param, topic) in enumerate(zip(indexed, topics[1:])):
+            abi_type = _canonical_type(param)
+            name = param.get("name") or f"arg{i}"
+            if _is_dynamic(abi_type):
+                args[name] = topic
+            else:
+                args[name] = _plain(abi_decode([abi_type], bytes.fromhex(topic[2:]))[0])
+        data = log.get("data") or "0x"
+        values = abi_decode([_canonical_type(p) for p in plain], bytes.fromhex(data[2:]))
+        for i, (param, value) in enumerate(zip(plain, values)):
+            args[param.get("name") or f"data{i}"] = _plain(value)
+    except Exception as e:
+        logger.debug(f"Could not decode {event.get('name')} log: {e}")
+        return None, None
+    return event["name"], args
+
+
+# --- Storage -----------------------------------------------------------------
+
+class EventStore:
+    """
+    SQLite store of indexed contract events plus a resume cursor per
+    (network, contract, topic filter).
+
+    Events are keyed by (network, transaction hash, log index), so
+    re-indexing a range never duplicates them. A batch of events and the
+    cursor that follows it are committed together, so an interrupted
+    indexer resumes exactly where it stopped.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS events (
+                network TEXT NOT NULL,
+                address TEXT NOT NULL,
+                block_number INTEGER NOT NULL,
+                tx_hash TEXT NOT NULL,
+                log_index INTEGER NOT NULL,
+                topic0 TEXT,
+                event_name TEXT,
+                args TEXT,
+                log TEXT NOT NULL,
+                PRIMARY KEY (network, tx_hash, log_index)
+            );
+            CREATE INDEX IF NOT EXISTS events_contract ON events (network, address, block_number);
+            CREATE INDEX IF NOT EXISTS events_topic ON events (network, address, topic0, block_number);
+            CREATE TABLE IF NOT EXISTS cursors (
+                network TEXT NOT NULL,
+                address TEXT NOT NULL,
+                topics TEXT NOT NULL,
+                next_block INTEGER NOT NULL,
+                PRIMARY KEY (network, address, topics)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_cursor(self, network: str, address: str, topics: str = "") -> Optional[int]:
+        """Next block to index for a contract and topic filter (None if never indexed)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_block FROM cursors WHERE network = ? AND address = ? AND topics = ?",
+                (network, address.lower(), topics)
+            ).fetchone()
+        return row[0] if row else None
+
+    def record(self, network: str, address: str, events: Iterable[Dict[str, Any]], next_block: int,
+               topics: str = ""):
+        """Store events and advance the cursor of a contract and topic filter in one transaction"""
+        rows = [
+            (network, address.lower(), e["block_number"], e["transaction_hash"], e["log_index"],
+             e["topic0"], e["event"], json.dumps(e["args"]) if e["args"] is not None else None,
+             json.dumps(e["log"]))
+            for e in events
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute(
+                    "INSERT INTO cursors (network, address, topics, next_block) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (network, address, topics) DO UPDATE SET next_block = MAX(next_block, excluded.next_block)",
+                    (network, address.lower(), topics, next_block)
+                )
+
+    def query_events(
+        self,
+        network: str,
+        address: str,
+        event: Optional[str] = None,
+        topic0: Optional[str] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query stored events for a contract, newest first.
+
+        Args:
+            network: Network name
+            address: Contract address
+            event: Only events with this decoded name
+            topic0: Only events with this signature hash
+            from_block: Lowest block number (inclusive)
+            to_block: Highest block number (inclusive)
+            limit: Maximum events returned
+
+        Returns:
+            Events as dicts (block_number, transaction_hash, log_index, event, args, topic0, log)
+        """
+        sql = "SELECT block_number, tx_hash, log_index, topic0, event_name, args, log FROM events " \
+              "WHERE network = ? AND address = ?"
+        params: List[Any] = [network, address.lower()]
+        for clause, value in (("event_name = ?", event), ("topic0 = ?", topic0 and topic0.lower()),
+                              ("block_number >= ?", from_block), ("block_number <= ?", to_block)):
+            if value is not None:
+                sql += f" AND {clause}"
+                params.append(value)
+        sql += " ORDER BY block_number DESC, log_index DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"block_number": block, "transaction_hash": tx_hash, "log_index": log_index, "topic0": topic0,
+             "event": name, "args": json.loads(args) if args else None, "log": json.loads(log)}
+            for block, tx_hash, log_index, topic0, name, args, log in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- Indexer -----------------------------------------------------------------
+
+class EventIndexer:
+    """
+    Indexes one contract's events into an EventStore.
+
+    index_once() walks from the stored cursor to the head in eth_getLogs
+    windows. The window halves when the node rejects a range (too many
+    results, range too large, timeout) or returns more than
+    ``target_logs`` logs, and doubles while results stay sparse. When the
+    headers of a range are already at hand (e.g. the new block delivered
+    by a HeadTracker), their logsBloom is checked first. A block whose
+    bloom cannot contain the contract (and one of the wanted topics) is
+    skipped without an eth_getLogs call. Headers are never fetched just
+    for screening: that costs one request per block to save a single
+    eth_getLogs.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        address: str,
+        client: JsonRpcBatchClient,
+        store: EventStore,
+        abi: Optional[Sequence[Dict[str, Any]]] = None,
+        topics: Optional[Sequence[str]] = None,
+        start_block: Optional[int] = None,
+        confirmations: int = 0,
+        initial_window: int = 500,
+        max_window: int = 5000,
+        target_logs: int = 1000,
+    ):
+        """
+        Args:
+            network: Network name
+            address: Contract address
+            client: Batch JSON-RPC client for the network
+            store: Where events and the cursor are kept
+            abi: Contract ABI used to decode events (raw logs are stored without it)
+            topics: Only index logs whose topic0 is one of these
+            start_block: First block to index when there is no cursor yet
+                (default: the head at the first run)
+            confirmations: Blocks to stay behind the head
+            initial_window: Blocks per eth_getLogs call to start with
+            max_window: Largest window the indexer grows to
+            target_logs: Logs per call above which the window shrinks
+        """
+        self.network = network
+        self.address = address.lower()
+        self.client = client
+        self.store = store
+        self.events = event_abis_by_topic(abi)
+        self.topics = sorted({t.lower() for t in topics}) if topics else None
+        # Indexers with different topic filters cover different logs, so each keeps its own cursor
+        self._cursor_key = ",".join(self.topics or [])
+        self.start_block = start_block
+        self.confirmations = max(0, int(confirmations))
+        self.max_window = max(1, int(max_window))
+        self.window = min(max(1, int(initial_window)), self.max_window)
+        self.target_logs = max(1, int(target_logs))
+
+        self._address_bits = bloom_bits(bytes.fromhex(self.address[2:]))
+        self._topic_bits = [bloom_bits(bytes.fromhex(t[2:])) for t in self.topics or []]
+        self.stats = {"get_logs_calls": 0, "blocks_screened": 0, "blocks_skipped": 0}
+
+    async def index_once(
+        self,
+        head: Optional[int] = None,
+        headers: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Index everything from the cursor up to the (confirmed) head.
+
+        Args:
+            head: Current head block (fetched if not given)
+            headers: Block headers already at hand, by number (used for
+                bloom screening without fetching them again)
+
+        Returns:
+            The newly indexed events, oldest first
+        """
+        if head is None:
+            head = hex_to_int(await self.client.call("eth_blockNumber"))
+        target = head - self.confirmations
+        next_block = self.store.get_cursor(self.network, self.address, self._cursor_key)
+        if next_block is None:
+            next_block = self.start_block if self.start_block is not None else target
+
+        indexed = []
+        while next_block <= target:
+            end = min(next_block + self.window - 1, target)
+            try:
+                logs = await self._fetch_range(next_block, end, headers or {})
+            except Exception as e:
+                if self.window == 1:
+                    raise
+                self.window = max(1, self.window // 2)
+                logger.debug(f"eth_getLogs {next_block}-{end} failed ({e}); window -> {self.window}")
+                continue
+
+            events = [self._event(log) for log in logs]
+            self.store.record(self.network, self.address, events, next_block=end + 1, topics=self._cursor_key)
+            indexed.extend(events)
+            next_block = end + 1
+
+            if len(logs) > self.target_logs:
+                self.window = max(1, self.window // 2)
+            elif len(logs) < self.target_logs // 4:
+                self.window = min(self.max_window, self.window * 2)
+
+        if indexed:
+            logger.info(f"Indexed {len(indexed)} events for {self.address} on {self.network}")
+        return indexed
+
+    async def ingest_block(self, block: Dict[str, Any], logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Index a new block whose logs were already fetched (e.g. by a HeadTracker).
+
+        Falls back to a range walk when the cursor is behind this block or
+        confirmations are required.
+
+        Args:
+            block: Block header
+            logs: The block's logs for this contract
+
+        Returns:
+            The newly indexed events, oldest first
+        """
+        number = hex_to_int(block.get("number"))
+        cursor = self._cursor(number)
+        if cursor > number:
+            return []
+        if self.needs_range_walk(number):
+            return await self.index_once(head=number, headers={number: block})
+
+        logs = [log for log in logs if (log.get("address") or "").lower() == self.address]
+        if self.topics is not None:
+            logs = [log for log in logs if log.get("topics") and log["topics"][0].lower() in self.topics]
+        events = [self._event(log) for log in logs]
+        self.store.record(self.network, self.address, events, next_block=number + 1, topics=self._cursor_key)
+        return events
+
+    def needs_range_walk(self, number: int) -> bool:
+        """Whether indexing up to block ``number`` takes more than that block's own logs"""
+        return self._cursor(number) < number or bool(self.confirmations)
+
+    def _cursor(self, number: int) -> int:
+        cursor = self.store.get_cursor(self.network, self.address, self._cursor_key)
+        if cursor is None:
+            cursor = self.start_block if self.start_block is not None else number
+        return cursor
+
+    async def _fetch_range(self, first: int, last: int, headers: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        numbers = list(range(first, last + 1))
+        if all(n in headers for n in numbers):
+            candidates = [n for n in numbers if self._may_contain(headers[n])]
+            self.stats["blocks_screened"] += len(numbers)
+            self.stats["blocks_skipped"] += len(numbers) - len(candidates)
+            if not candidates:
+                return []
+            first, last = candidates[0], candidates[-1]
+
+        query: Dict[str, Any] = {"fromBlock": hex(first), "toBlock": hex(last), "address": self.address}
+        if self.topics is not None:
+            query["topics"] = [self.topics]
+        self.stats["get_logs_calls"] += 1
+        logs = await self.client.call("eth_getLogs", [query])
+        return [log for log in logs or [] if not log.get("removed")]
+
+    def _may_contain(self, header: Dict[str, Any]) -> bool:
+        bloom = header.get("logsBloom")
+        if not bloom_contains(bloom, self._address_bits):
+            return False
+        return not self._topic_bits or any(bloom_contains(bloom, bits) for bits in self._topic_bits)
+
+    def _event(self, log: Dict[str, Any]) -> Dict[str, Any]:
+        name, args = decode_log(log, self.events)
+        topics = log.get("topics") or []
+        return {
+            "block_number": hex_to_int(log.get("blockNumber")),
+            "transaction_hash": log.get("transactionHash"),
+            "log_index": hex_to_int(log.get("logIndex")),
+            "topic0": topics[0].lower() if topics else None,
+            "event": name,
+            "args": args,
+            "log": log,
+        }
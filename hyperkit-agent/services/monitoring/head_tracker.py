@@ -0,0 +1,181 @@
+"""
+Shared Chain Head Tracker
+Fetches each new block once per network and fans it out to every monitor.
+"""
+
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from services.monitoring.rpc_batch import JsonRpcBatchClient, JsonRpcError, hex_to_int
+
+logger = logging.getLogger(__name__)
+
+# callback(block, logs) - sync or async; logs are already filtered to the subscription's addresses
+BlockCallback = Callable[[Dict[str, Any], List[Dict[str, Any]]], Any]
+
+
+@dataclass
+class _Subscription:
+    callback: BlockCallback
+    addresses: Optional[Set[str]]  # None: no logs wanted
+
+
+class HeadTracker:
+    """
+    Follows the chain head of one network for any number of subscribers.
+
+    A single poller asks for the block number every ``poll_interval``
+    seconds. When the head moves, the new blocks (headers plus transaction
+    hashes) and, if any subscriber watches contract addresses, their logs
+    are fetched in one JSON-RPC batch and handed to every subscriber. N
+    monitors on the same network therefore cost one poll, not N.
+
+    The poller starts with the first subscription and stops after the
+    last one is removed. After a long stall only the most recent
+    ``max_catchup_blocks`` blocks are delivered.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        client: JsonRpcBatchClient,
+        poll_interval: float = 2.0,
+        max_catchup_blocks: int = 32,
+    ):
+        """
+        Args:
+            network: Network name (for logging)
+            client: Batch JSON-RPC client for the network
+            poll_interval: Seconds between head checks
+            max_catchup_blocks: Most blocks delivered after a gap
+        """
+        self.network = network
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_catchup_blocks = max(1, int(max_catchup_blocks))
+        self.head: Optional[int] = None
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: BlockCallback, addresses: Optional[Sequence[str]] = None) -> int:
+        """
+        Register a callback for new blocks.
+
+        Must be called from a running event loop (the poller starts on it).
+
+        Args:
+            callback: Called with (block, logs) for every new block
+            addresses: Contract addresses whose logs the callback wants
+
+        Returns:
+            Subscription ID for unsubscribe()
+        """
+        subscription_id = next(self._ids)
+        self._subscriptions[subscription_id] = _Subscription(
+            callback=callback,
+            addresses={a.lower() for a in addresses} if addresses is not None else None,
+        )
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int):
+        """Remove a subscription; the poller stops when none are left."""
+        self._subscriptions.pop(subscription_id, None)
+        if not self._subscriptions and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Head tracking error on {self.network}: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        """
+        Check the head once and deliver any new blocks.
+
+        The first poll only records the current head; blocks are delivered
+        from the next one on.
+
+        Returns:
+            The blocks delivered
+        """
+        latest = hex_to_int(await self.client.call("eth_blockNumber"))
+        if self.head is None:
+            self.head = latest
+            return []
+        if latest <= self.head:
+            return []
+
+        first = max(self.head + 1, latest - self.max_catchup_blocks + 1)
+        calls = [("eth_getBlockByNumber", [hex(n), False]) for n in range(first, latest + 1)]
+        addresses = set()
+        for subscription in self._subscriptions.values():
+            addresses |= subscription.addresses or set()
+        if addresses:
+            calls.append(("eth_getLogs", [{
+                "fromBlock": hex(first), "toBlock": hex(latest), "address": sorted(addresses)
+            }]))
+
+        results = await self.client.batch(calls)
+        for result in results:
+            if isinstance(result, JsonRpcError):
+                raise result
+        blocks = [block for block in results[:latest - first + 1] if block]
+        logs = results[-1] if addresses else []
+
+        self.head = latest
+        for block in blocks:
+            number = block.get("number")
+            await self._dispatch(block, [log for log in logs or [] if log.get("blockNumber") == number])
+        return blocks
+
+    async def _dispatch(self, block: Dict[str, Any], logs: List[Dict[str, Any]]):
+        for subscription in list(self._subscriptions.values()):
+            if subscription.addresses is None:
+                matched = []
+            else:
+                matched = [log for log in logs if (log.get("address") or "").lower() in subscription.addresses]
+            try:
+                result = subscription.callback(block, matched)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Block subscriber error on {self.network}: {e}")
+
+
+_trackers: Dict[tuple, HeadTracker] = {}
+
+
+def get_head_tracker(network: str, rpc_url: str, **kwargs) -> HeadTracker:
+    """
+    Shared tracker for a network endpoint (created on first use).
+
+    Args:
+        network: Network name
+        rpc_url: HTTP(S) RPC endpoint
+        **kwargs: HeadTracker options, used when the tracker is created
+
+    Returns:
+        The HeadTracker every monitor of this endpoint shares
+    """
+    key = (network, rpc_url)
+    tracker = _trackers.get(key)
+    if tracker is None:
+        tracker = HeadTracker(network, JsonRpcBatchClient(rpc_url), **kwargs)
+        _trackers[key] = tracker
+    return tracker
@@ -5,13 +5,15 @@ Production-ready metrics collection with Prometheus support
 
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from threading import Lock
 import json
 from pathlib import Path
 
+from services.monitoring.sketches import Distribution
+
 # Try to import Prometheus client, fallback to basic metrics if not available
 try:
     from prometheus_client import Counter, Histogram, Gauge, Summary, CollectorRegistry, generate_latest
@@ -23,49 +25,94 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Performance data is kept as one Distribution per operation per hour, for a week
+PERFORMANCE_BUCKET_SECONDS = 3600
+PERFORMANCE_RETENTION_BUCKETS = 168
+# Most recent performance records (with their metadata) kept per operation
+PERFORMANCE_RECENT_RECORDS = 100
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _label_key(name: str, labels: Optional[Dict[str, str]]) -> LabelKey:
+    """Structured, order-independent key for a metric and its label set"""
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def _format_key(key: LabelKey) -> str:
+    name, labels = key
+    return f"{name}:{dict(labels)}"
+
+
 class BasicMetrics:
-    """Basic metrics implementation when Prometheus is not available"""
+    """
+    Basic metrics implementation when Prometheus is not available.
+    
+    Histograms and summaries keep a bounded Distribution per label set
+    (fixed buckets plus a quantile sketch) instead of every observation.
+    """
     
     def __init__(self):
-        self.counters = defaultdict(int)
-        self.histograms = defaultdict(list)
-        self.gauges = defaultdict(float)
-        self.summaries = defaultdict(list)
+        self.counters: Dict[LabelKey, float] = defaultdict(int)
+        self.histograms: Dict[LabelKey, Distribution] = defaultdict(Distribution)
+        self.gauges: Dict[LabelKey, float] = defaultdict(float)
+        self.summaries: Dict[LabelKey, Distribution] = defaultdict(Distribution)
         self.lock = Lock()
     
     def counter_inc(self, name: str, value: float = 1.0, labels: Dict[str, str] = None):
         """Increment counter"""
         with self.lock:
-            key = f"{name}:{labels or {}}"
-            self.counters[key] += value
+            self.counters[_label_key(name, labels)] += value
     
     def histogram_observe(self, name: str, value: float, labels: Dict[str, str] = None):
         """Record histogram value"""
         with self.lock:
-            key = f"{name}:{labels or {}}"
-            self.histograms[key].append(value)
+            self.histograms[_label_key(name, labels)].observe(value)
     
     def gauge_set(self, name: str, value: float, labels: Dict[str, str] = None):
         """Set gauge value"""
         with self.lock:
-            key = f"{name}:{labels or {}}"
-            self.gauges[key] = value
+            self.gauges[_label_key(name, labels)] = value
     
     def summary_observe(self, name: str, value: float, labels: Dict[str, str] = None):
         """Record summary value"""
         with self.lock:
-            key = f"{name}:{labels or {}}"
-            self.summaries[key].append(value)
+            self.summaries[_label_key(name, labels)].observe(value)
+    
+    def get_quantile(self, name: str, q: float, labels: Dict[str, str] = None) -> Optional[float]:
+        """
+        Approximate quantile of a histogram or summary.
+        
+        Args:
+            name: Metric name
+            q: Quantile (0..1)
+            labels: Label set; None merges every label set of the metric
+            
+        Returns:
+            The quantile (within 1%), or None without observations
+        """
+        with self.lock:
+            if labels is not None:
+                key = _label_key(name, labels)
+                distribution = self.histograms.get(key) or self.summaries.get(key)
+                return distribution.quantile(q) if distribution else None
+            
+            merged = Distribution()
+            for store in (self.histograms, self.summaries):
+                for (metric, _), distribution in store.items():
+                    if metric == name:
+                        merged.merge(distribution)
+            return merged.quantile(q)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get all metrics"""
         with self.lock:
             return {
-                "counters": dict(self.counters),
-                "histograms": {k: {"count": len(v), "sum": sum(v), "avg": sum(v)/len(v) if v else 0} 
+                "counters": {_format_key(k): v for k, v in self.counters.items()},
+                "histograms": {_format_key(k): {**v.summary(), "buckets": v.buckets()}
                              for k, v in self.histograms.items()},
-                "gauges": dict(self.gauges),
-                "summaries": {k: {"count": len(v), "sum": sum(v), "avg": sum(v)/len(v) if v else 0} 
+                "gauges": {_format_key(k): v for k, v in self.gauges.items()},
+                "summaries": {_format_key(k): v.summary()
                             for k, v in self.summaries.items()}
             }
 
@@ -79,8 +126,10 @@ class HyperKitMetrics:
         # Initialize metrics
         self._init_metrics()
         
-        # Performance tracking
-        self.performance_data = defaultdict(list)
+        # Performance tracking: operation -> (bucket start, Distribution) per hour
+        self.performance_data = defaultdict(lambda: deque(maxlen=PERFORMANCE_RETENTION_BUCKETS))
+        # operation -> latest individual records, metadata included
+        self.performance_records = defaultdict(lambda: deque(maxlen=PERFORMANCE_RECENT_RECORDS))
         self.performance_lock = Lock()
         
         # Health tracking
@@ -229,14 +278,31 @@ class HyperKitMetrics:
             self.basic_metrics.gauge_set('cache_hit_rate', hit_rate, labels={'cache_type': cache_type})
     
     def record_performance(self, operation: str, duration: float, **metadata):
-        """Record performance metrics"""
+        """
+        Record performance metrics
+        
+        The duration feeds the hourly distribution; the record with its
+        metadata is kept among the operation's most recent records.
+        """
+        now = time.time()
+        bucket_start = now - now % PERFORMANCE_BUCKET_SECONDS
         with self.performance_lock:
-            self.performance_data[operation].append({
-                'timestamp': time.time(),
+            buckets = self.performance_data[operation]
+            if not buckets or buckets[-1][0] != bucket_start:
+                buckets.append((bucket_start, Distribution()))
+            buckets[-1][1].observe(duration)
+            self.performance_records[operation].append({
+                'timestamp': now,
                 'duration': duration,
                 'metadata': metadata
             })
     
+    def get_recent_performance(self, operation: str, limit: int = PERFORMANCE_RECENT_RECORDS) -> List[Dict[str, Any]]:
+        """Most recent performance records of an operation (timestamp, duration, metadata), oldest first"""
+        with self.performance_lock:
+            records = list(self.performance_records.get(operation, ()))
+        return records[-limit:] if limit > 0 else []
+    
     def record_health_status(self, status: str, component: str, details: Dict[str, Any]):
         """Record health status"""
         with self.health_lock:
@@ -248,32 +314,39 @@ class HyperKitMetrics:
             })
     
     def get_performance_summary(self, operation: Optional[str] = None, hours: int = 24) -> Dict[str, Any]:
-        """Get performance summary"""
+        """
+        Get performance summary.
+        
+        Merges the hourly distributions overlapping the time range, so the
+        range is rounded out to whole hours and percentiles are within 1%.
+        """
         cutoff_time = time.time() - (hours * 3600)
         
         with self.performance_lock:
             if operation:
-                data = [d for d in self.performance_data[operation] if d['timestamp'] > cutoff_time]
+                series = [self.performance_data.get(operation, ())]
             else:
-                data = []
-                for op_data in self.performance_data.values():
-                    data.extend([d for d in op_data if d['timestamp'] > cutoff_time])
-            
-            if not data:
-                return {"message": "No performance data available"}
+                series = list(self.performance_data.values())
             
-            durations = [d['duration'] for d in data]
-            
-            return {
-                "operation": operation or "all",
-                "time_range_hours": hours,
-                "total_operations": len(data),
-                "avg_duration": sum(durations) / len(durations),
-                "min_duration": min(durations),
-                "max_duration": max(durations),
-                "p95_duration": sorted(durations)[int(len(durations) * 0.95)] if durations else 0,
-                "p99_duration": sorted(durations)[int(len(durations) * 0.99)] if durations else 0
-            }
+            merged = Distribution()
+            for buckets in series:
+                for bucket_start, distribution in buckets:
+                    if bucket_start + PERFORMANCE_BUCKET_SECONDS > cutoff_time:
+                        merged.merge(distribution)
+        
+        if not merged.count:
+            return {"message": "No performance data available"}
+        
+        return {
+            "operation": operation or "all",
+            "time_range_hours": hours,
+            "total_operations": merged.count,
+            "avg_duration": merged.sum / merged.count,
+            "min_duration": merged.min,
+            "max_duration": merged.max,
+            "p95_duration": merged.quantile(0.95),
+            "p99_duration": merged.quantile(0.99)
+        }
     
     def get_health_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get health summary"""
@@ -0,0 +1,154 @@
+"""
+Batched JSON-RPC Client
+Sends many JSON-RPC calls per HTTP request over a pooled async connection.
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+import httpx
+
+from services.common.http_pool import LoopBoundClients
+
+logger = logging.getLogger(__name__)
+
+# (method, params) pair
+RpcCall = Tuple[str, List[Any]]
+
+
+class JsonRpcError(Exception):
+    """Error returned by the node for a single call in a batch."""
+
+    def __init__(self, code: Optional[int], message: str):
+        super().__init__(f"JSON-RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+
+
+class JsonRpcBatchClient:
+    """
+    Async JSON-RPC client that groups calls into batch requests.
+
+    batch() splits the calls into chunks of ``max_batch_size`` and sends
+    the chunks concurrently over one pooled HTTP client. Results come back
+    in call order; a call the node rejected is returned as a JsonRpcError
+    instance in its slot instead of failing the whole batch. Transport
+    errors (timeouts, HTTP errors) raise.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        timeout: float = 10.0,
+        max_batch_size: int = 100,
+        max_connections: int = 4,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            rpc_url: HTTP(S) endpoint of the node
+            timeout: Seconds allowed per HTTP request
+            max_batch_size: Calls per HTTP request (nodes often cap this)
+            max_connections: Concurrent HTTP requests to the endpoint
+            transport: Optional httpx transport (e.g. for proxies or tests)
+        """
+        self.rpc_url = rpc_url
+        self.timeout = float(timeout)
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_connections = max(1, int(max_connections))
+        self.transport = transport
+        self._ids = itertools.count(1)
+        # Created lazily on the running event loop
+        self._clients = LoopBoundClients()
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _resources(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores are bound to the loop that created them (the client
+            # pool closes the previous loop's client itself)
+            self._limit = asyncio.Semaphore(self.max_connections)
+            self._loop = loop
+        client = self._clients.get("rpc", lambda: httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            transport=self.transport
+        ))
+        return client, self._limit
+
+    async def call(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        """
+        Make a single JSON-RPC call.
+
+        Raises:
+            JsonRpcError: If the node returned an error
+        """
+        [result] = await self.batch([(method, params or [])])
+        if isinstance(result, JsonRpcError):
+            raise result
+        return result
+
+    async def batch(self, calls: Sequence[RpcCall]) -> List[Any]:
+        """
+        Make many JSON-RPC calls in as few HTTP requests as possible.
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            One result per call, in call order (JsonRpcError for failed calls)
+        """
+        if not calls:
+            return []
+        chunks = [calls[i:i + self.max_batch_size] for i in range(0, len(calls), self.max_batch_size)]
+        results = await asyncio.gather(*(self._send(chunk) for chunk in chunks))
+        return [item for chunk in results for item in chunk]
+
+    async def _send(self, calls: Sequence[RpcCall]) -> List[Any]:
+        client, limit = self._resources()
+        ids = [next(self._ids) for _ in calls]
+        payload = [
+            {"jsonrpc": "2.0", "id": call_id, "method": method, "params": list(params)}
+            for call_id, (method, params) in zip(ids, calls)
+        ]
+        async with limit:
+            response = await client.post(self.rpc_url, json=payload)
+        response.raise_for_status()
+        body = response.json()
+
+        if isinstance(body, dict):
+            # Some nodes answer a rejected batch with a single error object
+            error = body.get("error") or {}
+            raise JsonRpcError(error.get("code"), error.get("message", "invalid batch response"))
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        results = []
+        for call_id in ids:
+            item = by_id.get(call_id)
+            if item is None:
+                results.append(JsonRpcError(None, "missing response"))
+            elif item.get("error"):
+                error = item["error"]
+                results.append(JsonRpcError(error.get("code"), error.get("message", "")))
+            else:
+                results.append(item.get("result"))
+        return results
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        await self._clients.aclose()
+
+
+def hex_to_int(value: Any) -> Optional[int]:
+    """Decode a JSON-RPC quantity ("0x1a") to int; None passes through."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
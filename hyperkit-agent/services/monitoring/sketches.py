@@ -0,0 +1,178 @@
+"""
+Streaming Distribution Sketches
+Bounded-memory histograms and mergeable quantile sketches for metrics.
+"""
+
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+# Prometheus client default buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees (DDSketch).
+
+    Values fall into logarithmic buckets, so any quantile is returned
+    within ``relative_accuracy`` of the true value (1% by default),
+    whatever the number of observations. Memory is bounded by
+    ``max_buckets`` per sign; when exceeded, the lowest buckets are
+    collapsed, which only affects accuracy of the smallest values.
+    Sketches with the same accuracy merge exactly.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(1, int(max_buckets))
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        """Record ``value`` ``count`` times"""
+        if value > 0:
+            store = self._positive
+            index = self._index(value)
+        elif value < 0:
+            store = self._negative
+            index = self._index(-value)
+        else:
+            self.zero_count += count
+            self.count += count
+            return
+        store[index] = store.get(index, 0) + count
+        self.count += count
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def _collapse(self, store: Dict[int, int]):
+        indexes = sorted(store)
+        excess = indexes[:len(indexes) - self.max_buckets + 1]
+        target = indexes[len(excess) - 1]
+        total = sum(store.pop(i) for i in excess)
+        store[target] = total
+
+    def merge(self, other: "DDSketch"):
+        """Add all observations of another sketch (same accuracy) to this one"""
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+            while len(mine) > self.max_buckets:
+                self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile ``q`` (0..1), or None if empty"""
+        if self.count == 0:
+            return None
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self._positive)) if self._positive else 0.0
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self._positive) + len(self._negative)
+
+
+class Distribution:
+    """
+    Bounded summary of a stream of observations.
+
+    Tracks exact count, sum, min and max, cumulative-ready counts for a
+    fixed set of histogram bucket bounds, and a DDSketch for quantiles.
+    Memory does not grow with the number of observations, and two
+    distributions with the same bounds merge exactly.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, relative_accuracy: float = 0.01):
+        """
+        Args:
+            buckets: Upper bounds of the histogram buckets (+Inf is implied)
+            relative_accuracy: Quantile accuracy of the sketch
+        """
+        self.bounds = tuple(sorted(buckets))
+        self.bucket_counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.sketch = DDSketch(relative_accuracy)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        """Record an observation"""
+        value = float(value)
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.sketch.add(value)
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Distribution"):
+        """Add all observations of another distribution (same bounds) to this one"""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge distributions with different buckets")
+        self.bucket_counts = [a + b for a, b in zip(self.bucket_counts, other.bucket_counts)]
+        self.sketch.merge(other.sketch)
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile, clamped to the observed min/max"""
+        value = self.sketch.quantile(q)
+        if value is None:
+            return None
+        return min(max(value, self.min), self.max)
+
+    def buckets(self) -> Dict[str, int]:
+        """Cumulative bucket counts keyed by upper bound (Prometheus 'le' style)"""
+        cumulative, total = {}, 0
+        for bound, count in zip(list(self.bounds) + [math.inf], self.bucket_counts):
+            total += count
+            cumulative["+Inf" if bound == math.inf else str(bound)] = total
+        return cumulative
+
+    def summary(self, quantiles: Sequence[float] = (0.5, 0.9, 0.95, 0.99)) -> Dict[str, float]:
+        """count, sum, avg, min, max and the requested quantiles (as p50, p95, ...)"""
+        result = {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0,
+            "min": self.min if self.min is not None else 0,
+            "max": self.max if self.max is not None else 0,
+        }
+        for q in quantiles:
+            value = self.quantile(q)
+            result[f"p{q * 100:g}"] = value if value is not None else 0
+        return result
@@ -0,0 +1,286 @@
+"""
+Columnar Time-Series Store
+Fixed-size NumPy ring buffers per metric series with time-range queries and rollups.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (resolution in seconds, buckets kept): one day of minutes, thirty days of hours
+DEFAULT_ROLLUPS = ((60, 1440), (3600, 720))
+
+RAW_COLUMNS = {"timestamp": np.float64, "value": np.float64, "tags": np.int32}
+ROLLUP_COLUMNS = {
+    "timestamp": np.float64, "count": np.int64, "sum": np.float64,
+    "min": np.float64, "max": np.float64, "last": np.float64,
+}
+
+
+def _empty(columns: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in columns.items()}
+
+
+class _Ring:
+    """Parallel preallocated columns used as a ring buffer, oldest row first."""
+
+    def __init__(self, capacity: int, columns: Dict[str, Any]):
+        self.capacity = max(1, int(capacity))
+        self.columns = {name: np.zeros(self.capacity, dtype=dtype) for name, dtype in columns.items()}
+        self.start = 0
+        self.count = 0
+
+    def push(self) -> int:
+        """Claim the next row (overwriting the oldest when full) and return its index"""
+        index = (self.start + self.count) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        return index
+
+    @property
+    def last(self) -> int:
+        return (self.start + self.count - 1) % self.capacity
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        end = self.start + self.count
+        if end <= self.capacity:
+            return [(self.start, end)]
+        return [(self.start, self.capacity), (0, end - self.capacity)]
+
+    def select(self, key: str, since: Optional[float], until: Optional[float]) -> Dict[str, np.ndarray]:
+        """
+        Copy the rows whose ``key`` column lies in [since, until].
+
+        The key column must be non-decreasing in insertion order, so each
+        of the (at most two) contiguous segments is binary searched and
+        only the matching rows are copied.
+        """
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in self.columns}
+        for low, high in self._segments():
+            keys = self.columns[key][low:high]
+            first = 0 if since is None else int(np.searchsorted(keys, since, side="left"))
+            last = len(keys) if until is None else int(np.searchsorted(keys, until, side="right"))
+            if first < last:
+                for name, column in self.columns.items():
+                    parts[name].append(column[low + first:low + last])
+        return {
+            name: np.concatenate(chunks) if chunks else np.empty(0, dtype=self.columns[name].dtype)
+            for name, chunks in parts.items()
+        }
+
+
+class _Series:
+    def __init__(self, capacity: int, rollups: Sequence[Tuple[int, int]]):
+        self.raw = _Ring(capacity, RAW_COLUMNS)
+        self.rollups = {int(resolution): _Ring(buckets, ROLLUP_COLUMNS) for resolution, buckets in rollups}
+
+    def add(self, timestamp: float, value: float, tag_id: int) -> Optional[int]:
+        """Record a point; returns the tag set ID of the raw point it overwrote, if any"""
+        raw = self.raw
+        if raw.count:
+            # Keep timestamps non-decreasing so range reads can binary search
+            timestamp = max(timestamp, raw.columns["timestamp"][raw.last])
+        evicted = int(raw.columns["tags"][raw.start]) if raw.count == raw.capacity else None
+        row = raw.push()
+        raw.columns["timestamp"][row] = timestamp
+        raw.columns["value"][row] = value
+        raw.columns["tags"][row] = tag_id
+
+        for resolution, ring in self.rollups.items():
+            bucket = timestamp - timestamp % resolution
+            cols = ring.columns
+            if ring.count and cols["timestamp"][ring.last] == bucket:
+                row = ring.last
+                cols["count"][row] += 1
+                cols["sum"][row] += value
+                cols["min"][row] = min(cols["min"][row], value)
+                cols["max"][row] = max(cols["max"][row], value)
+                cols["last"][row] = value
+            else:
+                row = ring.push()
+                cols["timestamp"][row] = bucket
+                cols["count"][row] = 1
+                cols["sum"][row] = cols["min"][row] = cols["max"][row] = cols["last"][row] = value
+        return evicted
+
+
+class TimeSeriesStore:
+    """
+    In-memory metric store with constant memory per series.
+
+    Each series keeps the last ``capacity`` raw points as (timestamp,
+    value, tag set ID) in preallocated NumPy columns used as a ring
+    buffer. Every point also updates rollup tiers holding count, sum,
+    min, max and last per fixed time bucket (per minute and per hour by
+    default), so long ranges stay queryable after their raw points are
+    overwritten. Tag dicts are interned: each distinct tag set is stored
+    once and points refer to it by ID. A tag set stays interned while a
+    raw point refers to it; up to ``max_idle_tag_sets`` unreferenced ones
+    are kept (least recently used dropped first), so the tag table never
+    outgrows the raw points held.
+
+    Timestamps are POSIX seconds. A point older than the series' latest
+    one is recorded at the latest timestamp, which keeps every column
+    sorted; range reads are then two binary searches plus a copy of the
+    matching rows. Thread-safe.
+    """
+
+    def __init__(self, capacity: int = 10000, rollups: Sequence[Tuple[int, int]] = DEFAULT_ROLLUPS,
+                 max_idle_tag_sets: int = 1024):
+        """
+        Args:
+            capacity: Raw points kept per series
+            rollups: (bucket seconds, buckets kept) per rollup tier
+            max_idle_tag_sets: Tag sets kept interned after no raw point refers to them
+        """
+        self.capacity = capacity
+        self.rollup_tiers = tuple((int(r), int(n)) for r, n in rollups)
+        self.max_idle_tag_sets = max(0, int(max_idle_tag_sets))
+        self._series: Dict[str, _Series] = {}
+        self._tag_ids: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        self._tag_keys: List[Optional[Tuple[Tuple[str, str], ...]]] = []
+        self._tag_refs: List[int] = []
+        self._idle_tags = OrderedDict()  # unreferenced tag IDs, least recently used first
+        self._free_tag_ids: List[int] = []
+        self._lock = threading.Lock()
+
+    def _intern(self, tags: Optional[Dict[str, str]]) -> int:
+        """ID of a tag set, taking a reference to it"""
+        key = tuple(sorted((tags or {}).items()))
+        tag_id = self._tag_ids.get(key)
+        if tag_id is None:
+            if self._free_tag_ids:
+                tag_id = self._free_tag_ids.pop()
+                self._tag_keys[tag_id] = key
+            else:
+                tag_id = len(self._tag_keys)
+                self._tag_keys.append(key)
+                self._tag_refs.append(0)
+            self._tag_ids[key] = tag_id
+        else:
+            self._idle_tags.pop(tag_id, None)
+        self._tag_refs[tag_id] += 1
+        return tag_id
+
+    def _release(self, tag_id: int):
+        """Drop a reference; unreferenced tag sets are freed once too many are idle"""
+        self._tag_refs[tag_id] -= 1
+        if self._tag_refs[tag_id]:
+            return
+        self._idle_tags[tag_id] = None
+        while len(self._idle_tags) > self.max_idle_tag_sets:
+            stale, _ = self._idle_tags.popitem(last=False)
+            del self._tag_ids[self._tag_keys[stale]]
+            self._tag_keys[stale] = None
+            self._free_tag_ids.append(stale)
+
+    def tag_set_count(self) -> int:
+        """Number of tag sets currently interned"""
+        with self._lock:
+            return len(self._tag_ids)
+
+    def add(self, name: str, timestamp: float, value: float, tags: Optional[Dict[str, str]] = None):
+        """Record a point"""
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series(self.capacity, self.rollup_tiers)
+            evicted = series.add(float(timestamp), float(value), self._intern(tags))
+            if evicted is not None:
+                self._release(evicted)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._series)
+
+    def tags(self, tag_id: int) -> Dict[str, str]:
+        """
+        Tag set for an ID returned by range()
+
+        IDs of tag sets no longer referenced by any point are eventually
+        reused, so resolve them soon after the range() call.
+        """
+        with self._lock:
+            return dict(self._tag_keys[tag_id] or ())
+
+    def latest(self, name: str) -> Optional[Tuple[float, float, Dict[str, str]]]:
+        """(timestamp, value, tags) of the newest point, or None"""
+        with self._lock:
+            series = self._series.get(name)
+            if series is None or not series.raw.count:
+                return None
+            cols, row = series.raw.columns, series.raw.last
+            return float(cols["timestamp"][row]), float(cols["value"][row]), dict(self._tag_keys[cols["tags"][row]])
+
+    def range(self, name: str, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Raw points of a series in [since, until], oldest first.
+
+        Returns:
+            Dict of equal-length arrays: timestamp, value, tags (tag set IDs; see tags())
+        """
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                return _empty(RAW_COLUMNS)
+            return series.raw.select("timestamp", since, until)
+
+    def rollup(self, name: str, resolution: int, since: Optional[float] = None,
+               until: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Aggregated buckets of a series in [since, until], oldest first.
+
+        Args:
+            resolution: Bucket size in seconds; must be one of the configured tiers
+
+        Returns:
+            Dict of equal-length arrays: timestamp (bucket start), count, sum, min, max, last, mean
+        """
+        with self._lock:
+            series = self._series.get(name)
+            if resolution not in dict(self.rollup_tiers):
+                raise ValueError(f"No {resolution}s rollup tier (have {[r for r, _ in self.rollup_tiers]})")
+            if series is None:
+                data = _empty(ROLLUP_COLUMNS)
+            else:
+                bucket_since = None if since is None else since - since % resolution
+                data = series.rollups[resolution].select("timestamp", bucket_since, until)
+        data["mean"] = data["sum"] / np.maximum(data["count"], 1)
+        return data
+
+    def downsample(self, name: str, since: Optional[float] = None, until: Optional[float] = None,
+                   max_points: int = 1000) -> Dict[str, np.ndarray]:
+        """
+        A series in [since, until] with at most ``max_points`` points.
+
+        Raw points are returned if they fit and still cover the whole range;
+        otherwise the finest rollup tier that fits, with value = bucket mean
+        (the coarsest tier is thinned out if none fits).
+
+        Returns:
+            Dict with timestamp and value arrays (plus tags for raw points)
+        """
+        raw = self.range(name, since, until)
+        if len(raw["timestamp"]) <= max_points and self._raw_covers(name, since):
+            return raw
+        data = None
+        for resolution, _ in self.rollup_tiers:
+            data = self.rollup(name, resolution, since, until)
+            if len(data["timestamp"]) <= max_points:
+                break
+        if data is None:
+            data = {"timestamp": raw["timestamp"], "mean": raw["value"]}
+        step = max(1, -(-len(data["timestamp"]) // max(1, max_points)))
+        return {"timestamp": data["timestamp"][::step], "value": data["mean"][::step]}
+
+    def _raw_covers(self, name: str, since: Optional[float]) -> bool:
+        """Whether no raw point at or after ``since`` has been overwritten yet"""
+        with self._lock:
+            series = self._series.get(name)
+            if series is None or series.raw.count < series.raw.capacity:
+                return True
+            return since is not None and bool(series.raw.columns["timestamp"][series.raw.start] <= since)
@@ -17,6 +17,9 @@ import aiohttp
 from web3 import Web3
 from web3.exceptions import TransactionNotFound, BlockNotFound
 
+from services.monitoring.head_tracker import HeadTracker, get_head_tracker
+from services.monitoring.rpc_batch import JsonRpcBatchClient, JsonRpcError, hex_to_int
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -29,6 +32,9 @@ class MonitoringConfig:
     max_retries: int = 3
     timeout: int = 10  # seconds
     networks: List[str] = None
+    rpc_batch_size: int = 100  # JSON-RPC calls per HTTP request
+    max_pending_backoff: int = 60  # seconds between checks of a long-pending transaction
+    use_head_tracker: bool = True  # follow new blocks through the shared per-network tracker
     
     def __post_init__(self):
         if self.networks is None:
@@ -74,13 +80,26 @@ class TransactionMonitor:
             self.rpc_url = config.rpc_url
             self.confirmation_blocks = config.confirmation_blocks
             self.check_interval = config.check_interval
+            self.timeout = config.timeout
+            self.rpc_batch_size = config.rpc_batch_size
+            self.max_pending_backoff = config.max_pending_backoff
+            self.use_head_tracker = config.use_head_tracker
         else:
             self.networks = config.get("networks", {})
             self.rpc_url = config.get("rpc_url", "https://hyperion-testnet.metisdevops.link")
             self.confirmation_blocks = config.get("confirmation_blocks", 12)
             self.check_interval = config.get("check_interval", 5)
+            self.timeout = config.get("timeout", 10)
+            self.rpc_batch_size = config.get("rpc_batch_size", 100)
+            self.max_pending_backoff = config.get("max_pending_backoff", 60)
+            self.use_head_tracker = config.get("use_head_tracker", True)
         
         self.web3_instances = {}
+        self.rpc_clients: Dict[str, JsonRpcBatchClient] = {}
+        # Backoff for transactions that keep reporting pending: tx_hash -> (misses, next check)
+        self._pending_backoff: Dict[str, tuple] = {}
+        self.head_trackers: Dict[str, HeadTracker] = {}
+        self._head_subscriptions: Dict[str, int] = {}
         self.monitored_transactions = {}
         self.metrics = MonitoringMetrics()
         self.callbacks = []
@@ -127,12 +146,26 @@ class TransactionMonitor:
         self.running = True
         logger.info("Starting transaction monitoring service")
         
+        # Mined transactions and confirmations come from the shared head trackers
+        for network in self.web3_instances:
+            tracker = self._head_tracker(network)
+            if tracker and network not in self._head_subscriptions:
+                self._head_subscriptions[network] = tracker.subscribe(
+                    lambda block, logs, network=network: self._on_new_block(network, block)
+                )
+        
         # Start monitoring loop
         asyncio.create_task(self._monitoring_loop())
     
     async def stop_monitoring(self):
         """Stop the transaction monitoring service."""
         self.running = False
+        for network, subscription_id in self._head_subscriptions.items():
+            self.head_trackers[network].unsubscribe(subscription_id)
+        self._head_subscriptions = {}
+        for client in self.rpc_clients.values():
+            await client.aclose()
+        self.rpc_clients = {}
         logger.info("Transaction monitoring service stopped")
     
     async def add_transaction(
@@ -182,6 +215,7 @@ class TransactionMonitor:
         """Remove a transaction from monitoring."""
         if tx_hash in self.monitored_transactions:
             del self.monitored_transactions[tx_hash]
+            self._pending_backoff.pop(tx_hash, None)
             logger.info(f"Removed transaction {tx_hash} from monitoring")
             return True
         return False
@@ -209,12 +243,166 @@ class TransactionMonitor:
                 await asyncio.sleep(self.check_interval)
     
     async def _check_all_transactions(self):
-        """Check status of all monitored transactions."""
+        """
+        Check status of all monitored transactions.
+        
+        Transactions are grouped per network and polled with batched
+        JSON-RPC requests; transactions still backing off are skipped.
+        Where a head tracker is subscribed, it already counts confirmations
+        of mined transactions, so only pending ones are polled (to notice
+        drops and blocks the tracker skipped).
+        """
+        now = time.monotonic()
+        by_network: Dict[str, List[tuple]] = {}
         for tx_hash, tx_status in list(self.monitored_transactions.items()):
-            try:
-                await self._check_transaction_status(tx_hash, tx_status)
-            except Exception as e:
-                logger.error(f"Error checking transaction {tx_hash}: {e}")
+            backoff = self._pending_backoff.get(tx_hash)
+            if backoff and backoff[1] > now:
+                continue
+            if tx_status.status != "pending" and tx_status.network in self._head_subscriptions:
+                continue
+            by_network.setdefault(tx_status.network, []).append((tx_hash, tx_status))
+        
+        await asyncio.gather(*(
+            self._poll_network(network, transactions, now)
+            for network, transactions in by_network.items()
+        ))
+    
+    def _rpc_client(self, network: str) -> Optional[JsonRpcBatchClient]:
+        """Batch client for a network's HTTP endpoint (None if it has none)."""
+        client = self.rpc_clients.get(network)
+        if client is None:
+            web3 = self.web3_instances.get(network)
+            endpoint = getattr(getattr(web3, "provider", None), "endpoint_uri", None)
+            if not endpoint:
+                return None
+            client = JsonRpcBatchClient(str(endpoint), timeout=self.timeout, max_batch_size=self.rpc_batch_size)
+            self.rpc_clients[network] = client
+        return client
+    
+    def _head_tracker(self, network: str) -> Optional[HeadTracker]:
+        """Shared head tracker for a network (None if disabled or unavailable)."""
+        if not self.use_head_tracker:
+            return None
+        tracker = self.head_trackers.get(network)
+        if tracker is None:
+            client = self._rpc_client(network)
+            if client is None:
+                return None
+            tracker = get_head_tracker(network, client.rpc_url)
+            self.head_trackers[network] = tracker
+        return tracker
+    
+    async def _on_new_block(self, network: str, block: Dict[str, Any]):
+        """Pick up monitored transactions mined in a new block and count confirmations from the head."""
+        head = max(hex_to_int(block.get("number")), self.head_trackers[network].head or 0)
+        block_hashes = {h.lower() for h in block.get("transactions") or [] if isinstance(h, str)}
+        
+        mined = []
+        for tx_hash, tx_status in list(self.monitored_transactions.items()):
+            if tx_status.network != network:
+                continue
+            if tx_status.status == "pending":
+                if tx_hash.lower() in block_hashes:
+                    mined.append((tx_hash, tx_status))
+            elif tx_status.block_number is not None:
+                tx_status.confirmation_count = max(0, head - tx_status.block_number + 1)
+                if tx_status.confirmation_count >= self.max_confirmations:
+                    await self.remove_transaction(tx_hash)
+        
+        if not mined:
+            return
+        receipts = await self._rpc_client(network).batch(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash, _ in mined]
+        )
+        for (tx_hash, tx_status), receipt in zip(mined, receipts):
+            if isinstance(receipt, JsonRpcError):
+                tx_status.error_message = str(receipt)
+            elif receipt:
+                await self._apply_receipt(tx_hash, tx_status, receipt, head)
+    
+    async def _poll_network(self, network: str, transactions: List[tuple], now: float):
+        """Check a network's transactions with one block number and batched receipt lookups."""
+        client = self._rpc_client(network)
+        if client is None:
+            # No HTTP endpoint to batch against; check one by one through Web3
+            for tx_hash, tx_status in transactions:
+                try:
+                    await self._check_transaction_status(tx_hash, tx_status)
+                except Exception as e:
+                    logger.error(f"Error checking transaction {tx_hash}: {e}")
+            return
+        
+        # The tracked head saves the eth_blockNumber call
+        tracker = self.head_trackers.get(network) if network in self._head_subscriptions else None
+        current_block = tracker.head if tracker else None
+        
+        try:
+            receipt_calls = [("eth_getTransactionReceipt", [tx_hash]) for tx_hash, _ in transactions]
+            if current_block is None:
+                results = await client.batch([("eth_blockNumber", [])] + receipt_calls)
+                if isinstance(results[0], JsonRpcError):
+                    raise results[0]
+                current_block, receipts = hex_to_int(results[0]), results[1:]
+            else:
+                receipts = await client.batch(receipt_calls)
+            
+            unmined = []
+            for (tx_hash, tx_status), receipt in zip(transactions, receipts):
+                if isinstance(receipt, JsonRpcError):
+                    logger.error(f"Error checking transaction {tx_hash}: {receipt}")
+                    tx_status.error_message = str(receipt)
+                elif receipt:
+                    await self._apply_receipt(tx_hash, tx_status, receipt, current_block)
+                else:
+                    unmined.append((tx_hash, tx_status))
+            
+            if not unmined:
+                return
+            # Still in the mempool, or dropped?
+            lookups = await client.batch([("eth_getTransactionByHash", [tx_hash]) for tx_hash, _ in unmined])
+            for (tx_hash, tx_status), tx in zip(unmined, lookups):
+                if isinstance(tx, JsonRpcError):
+                    logger.error(f"Error checking transaction {tx_hash}: {tx}")
+                    tx_status.error_message = str(tx)
+                elif tx:
+                    tx_status.gas_price = hex_to_int(tx.get("gasPrice"))
+                    tx_status.status = "pending"
+                    self._back_off(tx_hash, now)
+                else:
+                    tx_status.status = "dropped"
+                    await self.remove_transaction(tx_hash)
+        
+        except Exception as e:
+            logger.error(f"Error polling transactions on {network}: {e}")
+            for _, tx_status in transactions:
+                tx_status.error_message = str(e)
+    
+    async def _apply_receipt(self, tx_hash: str, tx_status: TransactionStatus,
+                             receipt: Dict[str, Any], current_block: int):
+        """Record a mined transaction's receipt and confirmation count."""
+        newly_mined = tx_status.status == "pending"
+        tx_status.status = "failed" if hex_to_int(receipt.get("status")) == 0 else "confirmed"
+        tx_status.block_number = hex_to_int(receipt.get("blockNumber"))
+        tx_status.gas_used = hex_to_int(receipt.get("gasUsed"))
+        tx_status.effective_gas_price = hex_to_int(receipt.get("effectiveGasPrice"))
+        tx_status.receipt = receipt
+        tx_status.confirmation_count = max(0, current_block - tx_status.block_number + 1)
+        tx_status.error_message = None
+        self._pending_backoff.pop(tx_hash, None)
+        
+        if newly_mined:
+            self._update_metrics(tx_status)
+            logger.info(f"Transaction {tx_hash} {tx_status.status} in block {tx_status.block_number}")
+        
+        # Remove from monitoring if enough confirmations
+        if tx_status.confirmation_count >= self.max_confirmations:
+            await self.remove_transaction(tx_hash)
+    
+    def _back_off(self, tx_hash: str, now: float):
+        """Check a still-pending transaction less often: 1x, 2x, 4x ... the interval."""
+        misses = self._pending_backoff.get(tx_hash, (0, 0.0))[0] + 1
+        delay = min(self.check_interval * 2 ** (misses - 1), self.max_pending_backoff)
+        self._pending_backoff[tx_hash] = (misses, now + delay)
     
     async def _check_transaction_status(self, tx_hash: str, tx_status: TransactionStatus):
         """Check status of a specific transaction."""
@@ -4,6 +4,7 @@ Includes vector store and document retrieval for IPFS content.
 """
 
 from .vector_store import VectorStore
+from .vector_index import VectorIndex
 from .retriever import DocumentRetriever
 
-__all__ = ['VectorStore', 'DocumentRetriever']
+__all__ = ['VectorStore', 'VectorIndex', 'DocumentRetriever']
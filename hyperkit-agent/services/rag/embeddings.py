@@ -0,0 +1,212 @@
+"""
+Embedding backends for the RAG vector store.
+Provides offline text embeddings (a local sentence-transformers model when
+installed, otherwise feature hashing) and an on-disk embedding cache.
+"""
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+import math
+import re
+import sqlite3
+import threading
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_DIM = 384
+DEFAULT_LOCAL_MODEL = "all-MiniLM-L6-v2"
+
+# Splits identifiers such as "ReentrancyGuard" or "safeTransferFrom" into words
+_TOKEN_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+class EmbeddingBackend(ABC):
+    """Base class for embedding backends."""
+
+    #: Identifies the backend and its parameters in embedding cache keys
+    name: str = "base"
+    dim: int = DEFAULT_EMBEDDING_DIM
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One unit-length vector of size ``dim`` per text
+        """
+
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str, dim: int) -> Tuple[int, float]:
+    """Hash a feature to a (dimension, sign) pair, stable across processes."""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+    return digest % dim, (1.0 if digest >> 63 else -1.0)
+
+
+class HashingEmbedder(EmbeddingBackend):
+    """
+    Feature-hashing embedder.
+
+    Word unigrams and bigrams are hashed into ``dim`` signed buckets and
+    weighted by sublinear term frequency. Needs no model files, so it always
+    works offline; texts that share vocabulary get similar vectors.
+    """
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def _embed_one(self, text: str) -> List[float]:
+        words = [w.lower() for w in _TOKEN_RE.findall(text)]
+        counts: Dict[str, int] = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        for first, second in zip(words, words[1:]):
+            bigram = f"{first} {second}"
+            counts[bigram] = counts.get(bigram, 0) + 1
+
+        vector = [0.0] * self.dim
+        for feature, count in counts.items():
+            slot, sign = _feature_slot(feature, self.dim)
+            vector[slot] += sign * (1.0 + math.log(count))
+
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0:
+            return vector
+        return [x / norm for x in vector]
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+class SentenceTransformerEmbedder(EmbeddingBackend):
+    """
+    Local sentence-transformers model running on CPU.
+
+    Requires the optional ``sentence-transformers`` package and a model that
+    is already in the local Hugging Face cache. Nothing is downloaded unless
+    ``allow_download`` is set.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_LOCAL_MODEL, batch_size: int = 64,
+                 allow_download: bool = False):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(
+            model_name, device="cpu", local_files_only=not allow_download
+        )
+        self.batch_size = batch_size
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+
+def create_embedding_backend(config: Dict[str, Any]) -> EmbeddingBackend:
+    """
+    Create the configured embedding backend.
+
+    ``embedding_backend`` may be ``"hashing"``, ``"local"`` (sentence-
+    transformers) or ``"auto"`` (the default), which uses the local model if
+    it is installed and already cached and falls back to feature hashing
+    otherwise. Models are only fetched from the network when
+    ``embedding_allow_download`` is true.
+    """
+    backend = config.get('embedding_backend', 'auto')
+    dim = config.get('embedding_dim', DEFAULT_EMBEDDING_DIM)
+
+    if backend in ('auto', 'local'):
+        try:
+            return SentenceTransformerEmbedder(
+                config.get('embedding_model', DEFAULT_LOCAL_MODEL),
+                batch_size=config.get('embedding_batch_size', 64),
+                allow_download=config.get('embedding_allow_download', False)
+            )
+        except ImportError:
+            if backend == 'local':
+                raise
+            logger.debug("sentence-transformers not installed, using hashing embeddings")
+        except Exception as e:
+            if backend == 'local':
+                raise
+            logger.warning(f"Local embedding model unavailable ({e}), using hashing embeddings")
+    elif backend != 'hashing':
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    return HashingEmbedder(dim)
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache keyed by backend name and text content hash.
+
+    Vectors are stored as float32 blobs in a SQLite database, so bulk
+    lookups and inserts are single queries instead of one file per text.
+    """
+
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(backend_name: str, text: str) -> str:
+        """Cache key for a text embedded by a given backend."""
+        return hashlib.sha256(f"{backend_name}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors for whichever of ``keys`` are present."""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._LOOKUP_CHUNK):
+                chunk = keys[start:start + self._LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, Sequence[float]]) -> None:
+        """Store vectors by key."""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
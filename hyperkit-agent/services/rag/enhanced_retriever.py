@@ -14,6 +14,7 @@ from pathlib import Path
 
 from services.storage.ipfs_client import IPFSClient
 from core.config.loader import get_config
+from .knowledge_index import KnowledgeIndex
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,8 @@ class EnhancedRAGRetriever:
         """Initialize the enhanced RAG retriever."""
         self.config = get_config().to_dict()
         self.ipfs_storage = None
+        self.knowledge_path = Path("knowledge")
+        self._knowledge_index: Optional[KnowledgeIndex] = None
         
         # Initialize IPFS
         self._initialize_ipfs()
@@ -114,28 +117,18 @@ class EnhancedRAGRetriever:
             return ""
     
     async def _retrieve_from_local(self, query: str, max_results: int) -> str:
-        """Retrieve content from local knowledge base."""
+        """Retrieve content from local knowledge base via the BM25 index."""
         try:
             # Check for local knowledge files
-            knowledge_path = Path("knowledge")
-            if not knowledge_path.exists():
+            if not self.knowledge_path.exists():
                 return ""
             
-            content_parts = []
-            for md_file in knowledge_path.rglob("*.md"):
-                try:
-                    content = md_file.read_text(encoding='utf-8')
-                    
-                    # Simple keyword matching
-                    if any(keyword.lower() in content.lower() for keyword in query.split()):
-                        content_parts.append(f"## {md_file.name}\n{content[:1000]}...\n")
-                        
-                        if len(content_parts) >= max_results:
-                            break
-                            
-                except Exception as e:
-                    logger.warning(f"Error reading {md_file}: {e}")
-                    continue
+            if self._knowledge_index is None:
+                self._knowledge_index = KnowledgeIndex(self.knowledge_path)
+            
+            # Index refresh may read changed files, so keep it off the event loop
+            hits = await asyncio.to_thread(self._knowledge_index.search, query, max_results)
+            content_parts = [f"## {hit['name']}\n{hit['preview']}...\n" for hit in hits]
             
             return "\n".join(content_parts) if content_parts else ""
             
@@ -226,7 +219,7 @@ Note: This is fallback content. Configure IPFS Pinata storage for enhanced knowl
         
         # Test Local
         try:
-            knowledge_path = Path("knowledge")
+            knowledge_path = self.knowledge_path
             if knowledge_path.exists():
                 md_files = list(knowledge_path.rglob("*.md"))
                 results["local"] = {
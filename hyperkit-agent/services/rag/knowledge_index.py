@@ -0,0 +1,243 @@
+"""
+Persistent inverted index over the local knowledge base.
+
+Markdown files are tokenized once and their postings stored in SQLite.
+The index is refreshed incrementally: files are re-read only when their
+mtime or size changed, and re-tokenized only when their content hash
+changed. Queries are scored with BM25 using only the postings of the query
+terms, so a search never re-reads the corpus.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent.parent.parent / ".cache" / "rag"
+
+# Bump when tokenization or the schema changes; stale indexes are rebuilt
+INDEX_VERSION = 1
+
+PREVIEW_CHARS = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]{2,}")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of two or more characters."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KnowledgeIndex:
+    """
+    BM25 inverted index for a directory of markdown files.
+
+    Thread-safe; refresh and search may be called from worker threads.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_path: Optional[Path] = None,
+        pattern: str = "*.md",
+        refresh_interval: float = 2.0,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """
+        Args:
+            root: Knowledge directory to index
+            index_path: SQLite file for the index (default: one file per
+                root under hyperkit-agent/.cache/rag)
+            pattern: Glob of files to index, searched recursively
+            refresh_interval: Minimum seconds between mtime scans on search
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.root = Path(root)
+        if index_path is None:
+            root_id = hashlib.sha256(str(self.root.resolve()).encode()).hexdigest()[:16]
+            index_path = DEFAULT_INDEX_DIR / f"knowledge-{root_id}.sqlite3"
+        self.index_path = Path(index_path)
+        self.pattern = pattern
+        self.refresh_interval = refresh_interval
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            self._conn.executescript(
+                """
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS docs;
+                """
+            )
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                preview TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+            PRAGMA user_version = {INDEX_VERSION};
+            """
+        )
+        self._conn.commit()
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files on disk.
+
+        Returns:
+            Counts of added, updated and removed documents
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        on_disk = {}
+        if self.root.exists():
+            for path in self.root.rglob(self.pattern):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                on_disk[path.relative_to(self.root).as_posix()] = (path, st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            known = {
+                row[0]: row[1:]
+                for row in self._conn.execute("SELECT path, id, mtime_ns, size, sha256 FROM docs")
+            }
+
+            for rel in known.keys() - on_disk.keys():
+                self._delete(known[rel][0])
+                stats["removed"] += 1
+
+            for rel, (path, mtime_ns, size) in on_disk.items():
+                entry = known.get(rel)
+                if entry and entry[1] == mtime_ns and entry[2] == size:
+                    continue
+                try:
+                    content = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.warning(f"Error reading {path}: {e}")
+                    continue
+
+                digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                if entry and entry[3] == digest:
+                    # Touched but unchanged: record the new mtime only
+                    self._conn.execute(
+                        "UPDATE docs SET mtime_ns = ?, size = ? WHERE id = ?", (mtime_ns, size, entry[0])
+                    )
+                    continue
+
+                if entry:
+                    self._delete(entry[0])
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+                self._insert(rel, mtime_ns, size, digest, content)
+
+            self._conn.commit()
+            self._last_refresh = time.monotonic()
+
+        if stats["added"] or stats["updated"] or stats["removed"]:
+            logger.info(f"Knowledge index refreshed: {stats}")
+        return stats
+
+    def _delete(self, doc_id: int) -> None:
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def _insert(self, rel: str, mtime_ns: int, size: int, digest: str, content: str) -> None:
+        terms = Counter(tokenize(content))
+        cursor = self._conn.execute(
+            "INSERT INTO docs (path, mtime_ns, size, sha256, length, preview) VALUES (?, ?, ?, ?, ?, ?)",
+            (rel, mtime_ns, size, digest, sum(terms.values()), content[:PREVIEW_CHARS]),
+        )
+        self._conn.executemany(
+            "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+            [(term, cursor.lastrowid, tf) for term, tf in terms.items()],
+        )
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank indexed documents against a query with BM25.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of documents to return
+
+        Returns:
+            Documents with path, name, score and a content preview, best first
+        """
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+        terms = sorted(set(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            doc_count, total_length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+            ).fetchone()
+            if not doc_count:
+                return []
+            postings = self._conn.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.id = p.doc_id WHERE p.term IN ({placeholders})",
+                terms,
+            ).fetchall()
+
+            doc_freq = Counter(term for term, _, _, _ in postings)
+            avg_length = total_length / doc_count or 1.0
+            scores: Dict[int, float] = {}
+            for term, doc_id, tf, length in postings:
+                df = doc_freq[term]
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            results = []
+            for doc_id, score in top:
+                path, preview = self._conn.execute(
+                    "SELECT path, preview FROM docs WHERE id = ?", (doc_id,)
+                ).fetchone()
+                results.append({
+                    "path": path,
+                    "name": Path(path).name,
+                    "score": score,
+                    "preview": preview,
+                })
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
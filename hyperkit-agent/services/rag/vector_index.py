@@ -0,0 +1,299 @@
+"""
+In-memory vector index for the RAG vector store.
+Keeps embeddings as one contiguous float32 matrix of pre-normalized rows so
+cosine similarity for a query is a single matrix-vector product.
+"""
+
+import heapq
+import logging
+import math
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = np is not None
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    """Scale a vector to unit length (zero vectors are returned unchanged)."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return [0.0] * len(vector)
+    return [x / norm for x in vector]
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index over fixed-size embeddings.
+
+    Rows are normalized on insert, so a search is one matrix-vector product
+    followed by an ``argpartition`` top-k. Metadata filters are evaluated
+    against boolean masks that are built once per ``(key, value)`` and kept
+    up to date as documents are added.
+
+    For large corpora an IVF (inverted file) approximate index can be
+    enabled: rows are clustered with spherical k-means and a query only
+    scores the rows of the ``nprobe`` closest clusters. Rows added after the
+    clusters were built are always scored exactly, and the clusters are
+    rebuilt once those rows grow past a quarter of the indexed corpus.
+
+    Without numpy the index falls back to a pure-Python linear scan.
+    """
+
+    def __init__(self, dim: int, ann_min_docs: int = 0, nprobe: int = 8, initial_capacity: int = 256):
+        """
+        Args:
+            dim: Embedding dimension
+            ann_min_docs: Corpus size from which the IVF index is used
+                (0 disables approximate search)
+            nprobe: Number of IVF clusters scored per query
+            initial_capacity: Number of rows to preallocate
+        """
+        self.dim = dim
+        self.ann_min_docs = ann_min_docs
+        self.nprobe = max(1, nprobe)
+
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._masks: Dict[Tuple[str, Hashable], Any] = {}
+
+        if NUMPY_AVAILABLE:
+            capacity = max(1, initial_capacity)
+            self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+            self._alive = np.zeros(capacity, dtype=bool)
+        else:
+            self._rows: List[Optional[List[float]]] = []
+
+        self._ivf_centroids = None
+        self._ivf_lists: List[Any] = []
+        self._ivf_size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._positions
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def add(self, doc_id: str, embedding: Sequence[float], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add or replace a document vector.
+
+        Replacing an existing ID retires its old row and appends a new one,
+        so IVF cluster assignments never refer to stale vectors.
+        """
+        if len(embedding) != self.dim:
+            raise ValueError(f"Embedding has dimension {len(embedding)}, expected {self.dim}")
+
+        self.remove(doc_id)
+        if NUMPY_AVAILABLE and len(self._ids) >= 64 and len(self._positions) * 2 < len(self._ids):
+            self._compact()
+        metadata = metadata or {}
+        row = len(self._ids)
+
+        if NUMPY_AVAILABLE:
+            self._ensure_capacity(row + 1)
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            self._matrix[row] = vector / norm if norm > 0 else vector
+            self._alive[row] = True
+            for (key, value), mask in self._masks.items():
+                mask[row] = metadata.get(key) == value
+        else:
+            self._rows.append(_normalize(embedding))
+
+        self._ids.append(doc_id)
+        self._metadata.append(metadata)
+        self._positions[doc_id] = row
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document; returns False if it was not indexed."""
+        row = self._positions.pop(doc_id, None)
+        if row is None:
+            return False
+        if NUMPY_AVAILABLE:
+            self._alive[row] = False
+        else:
+            self._rows[row] = None
+        return True
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        matrix[:capacity] = self._matrix
+        self._matrix = matrix
+        self._alive = np.resize(self._alive, new_capacity)
+        self._alive[capacity:] = False
+        for key, mask in list(self._masks.items()):
+            grown = np.zeros(new_capacity, dtype=bool)
+            grown[:capacity] = mask
+            self._masks[key] = grown
+
+    def _compact(self) -> None:
+        """Drop retired rows so the matrix only holds live documents."""
+        size = len(self._ids)
+        live = np.flatnonzero(self._alive[:size])
+        if len(live) == size:
+            return
+        self._matrix[:len(live)] = self._matrix[live]
+        self._matrix[len(live):size] = 0
+        self._alive[:size] = False
+        self._alive[:len(live)] = True
+        self._ids = [self._ids[i] for i in live]
+        self._metadata = [self._metadata[i] for i in live]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._masks.clear()
+        self._ivf_centroids = None
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: Sequence[float], top_k: int, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        """
+        Return the ``top_k`` most similar documents as ``(doc_id, score)``.
+
+        Args:
+            query: Query embedding
+            top_k: Number of results to return
+            filter_metadata: Exact-match metadata filters
+
+        Returns:
+            Results sorted by descending cosine similarity
+        """
+        if top_k <= 0 or not self._positions:
+            return []
+        if not NUMPY_AVAILABLE:
+            return self._search_python(query, top_k, filter_metadata)
+
+        use_ivf = self._refresh_ivf()
+        size = len(self._ids)
+        q = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if norm > 0:
+            q = q / norm
+
+        mask = self._alive[:size].copy()
+        for key, value in (filter_metadata or {}).items():
+            mask &= self._filter_mask(key, value)[:size]
+
+        candidates = self._ivf_candidates(q, mask, top_k) if use_ivf else None
+        if candidates is None:
+            # Exact search: score every row, then knock out filtered rows
+            scores = self._matrix[:size] @ q
+            scores[~mask] = -np.inf
+            top = self._top_rows(scores, min(top_k, int(mask.sum())))
+            return [(self._ids[row], float(scores[row])) for row in top]
+
+        scores = self._matrix[candidates] @ q
+        top = self._top_rows(scores, min(top_k, len(candidates)))
+        return [(self._ids[candidates[i]], float(scores[i])) for i in top]
+
+    @staticmethod
+    def _top_rows(scores, k: int):
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k < len(scores):
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def _filter_mask(self, key: str, value: Any):
+        """Boolean mask of rows whose metadata ``key`` equals ``value``."""
+        size = len(self._ids)
+        try:
+            cache_key = (key, value)
+            hash(cache_key)
+        except TypeError:
+            # Unhashable filter values cannot be cached; evaluate directly
+            return np.fromiter((m.get(key) == value for m in self._metadata), dtype=bool, count=size)
+
+        mask = self._masks.get(cache_key)
+        if mask is None:
+            mask = np.zeros(self._matrix.shape[0], dtype=bool)
+            mask[:size] = np.fromiter((m.get(key) == value for m in self._metadata), dtype=bool, count=size)
+            self._masks[cache_key] = mask
+        return mask
+
+    def _search_python(self, query: Sequence[float], top_k: int, filter_metadata: Optional[Dict[str, Any]]) -> List[Tuple[str, float]]:
+        q = _normalize(query)
+        scored = []
+        for row, vector in enumerate(self._rows):
+            if vector is None:
+                continue
+            metadata = self._metadata[row]
+            if filter_metadata and any(metadata.get(k) != v for k, v in filter_metadata.items()):
+                continue
+            scored.append((sum(x * y for x, y in zip(q, vector)), row))
+        return [(self._ids[row], score) for score, row in heapq.nlargest(top_k, scored)]
+
+    # ------------------------------------------------------------------
+    # IVF approximate index
+    # ------------------------------------------------------------------
+
+    def _refresh_ivf(self) -> bool:
+        """(Re)build the IVF clusters when needed; False means exact search."""
+        if not self.ann_min_docs or len(self._positions) < self.ann_min_docs:
+            return False
+        if self._ivf_centroids is None or len(self._ids) - self._ivf_size > self._ivf_size // 4:
+            self._build_ivf()
+        return True
+
+    def _ivf_candidates(self, q, mask, top_k: int):
+        """
+        Candidate rows from the closest IVF clusters, or None for exact search.
+        """
+        size = len(self._ids)
+        centroid_scores = self._ivf_centroids @ q
+        nprobe = min(self.nprobe, len(self._ivf_lists))
+        probes = np.argpartition(centroid_scores, -nprobe)[-nprobe:]
+        rows = np.concatenate([self._ivf_lists[c] for c in probes] + [np.arange(self._ivf_size, size)])
+        rows = rows[mask[rows]]
+        if len(rows) < top_k:
+            # Too few filtered candidates in the probed clusters
+            return None
+        return rows
+
+    def _build_ivf(self, iterations: int = 8, chunk: int = 8192) -> None:
+        """Cluster live rows with spherical k-means."""
+        if len(self._positions) < len(self._ids):
+            self._compact()
+        size = len(self._ids)
+        matrix = self._matrix[:size]
+        nlist = max(1, int(math.sqrt(size)))
+
+        rng = np.random.default_rng(0)
+        centroids = matrix[rng.choice(size, nlist, replace=False)].copy()
+        assignment = np.zeros(size, dtype=np.intp)
+        clusters = np.arange(nlist)
+        for _ in range(iterations):
+            sums = np.zeros_like(centroids)
+            for start in range(0, size, chunk):
+                block = matrix[start:start + chunk]
+                nearest = np.argmax(block @ centroids.T, axis=1)
+                assignment[start:start + chunk] = nearest
+                # One-hot membership product sums each cluster's rows
+                sums += (nearest[:, None] == clusters).T.astype(np.float32) @ block
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            nonempty = norms[:, 0] > 0
+            centroids[nonempty] = sums[nonempty] / norms[nonempty]
+
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self._ivf_centroids = centroids
+        self._ivf_lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+        self._ivf_size = size
+        logger.debug(f"Built IVF index with {nlist} clusters over {size} vectors")
@@ -3,14 +3,16 @@ Vector store for RAG system.
 Handles embeddings and similarity search for IPFS content.
 """
 
+import asyncio
 import json
 import logging
-import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-import hashlib
 import time
 
+from .embeddings import EmbeddingCache, create_embedding_backend
+from .vector_index import VectorIndex
+
 logger = logging.getLogger(__name__)
 
 class VectorStore:
@@ -19,25 +21,82 @@ class VectorStore:
     Handles embeddings and similarity search for IPFS content.
     """
     
+    COLLECTION_NAME = "hyperkit_audits"
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.store_path = Path(config.get('store_path', 'data/vector_store'))
         self.store_path.mkdir(parents=True, exist_ok=True)
         
+        # Embedding backend and on-disk embedding cache
+        self.embedder = create_embedding_backend(config)
+        self.embedding_batch_size = config.get('embedding_batch_size', 64)
+        self.embedding_cache = None
+        if config.get('embedding_cache_enabled', True):
+            self.embedding_cache = EmbeddingCache(self.store_path / 'embeddings.sqlite3')
+        
         # Initialize ChromaDB if available
         try:
             import chromadb
             self.chroma_client = chromadb.PersistentClient(path=str(self.store_path))
-            self.collection = self.chroma_client.get_or_create_collection(
-                name="hyperkit_audits",
-                metadata={"description": "HyperKit Agent audit reports and documents"}
-            )
+            self.collection = self._open_collection()
             self.chroma_available = True
             logger.info("ChromaDB initialized successfully")
         except ImportError:
             logger.warning("ChromaDB not available, using in-memory storage")
             self.chroma_available = False
             self._in_memory_store = {}
+            self._index = VectorIndex(
+                dim=self.embedder.dim,
+                ann_min_docs=config.get('ann_min_docs', 20000),
+                nprobe=config.get('ann_nprobe', 8)
+            )
+    
+    def _open_collection(self):
+        """
+        Open the ChromaDB collection, re-embedding it if it was built by a
+        different embedding backend.
+        
+        Vectors from different backends are not comparable, so a collection
+        tagged with another embedder (or untagged, from before backends were
+        recorded) is rebuilt from its stored documents.
+        """
+        metadata = {
+            "description": "HyperKit Agent audit reports and documents",
+            "embedder": self.embedder.name
+        }
+        collection = self.chroma_client.get_or_create_collection(
+            name=self.COLLECTION_NAME, metadata=metadata
+        )
+        if (collection.metadata or {}).get("embedder") == self.embedder.name:
+            return collection
+        
+        existing = collection.get(include=["documents", "metadatas"])
+        logger.warning(
+            f"Vector store collection was embedded with "
+            f"{(collection.metadata or {}).get('embedder', 'an unknown backend')}, "
+            f"re-embedding {len(existing['ids'])} documents with {self.embedder.name}"
+        )
+        self.chroma_client.delete_collection(self.COLLECTION_NAME)
+        collection = self.chroma_client.create_collection(
+            name=self.COLLECTION_NAME, metadata=metadata
+        )
+        for start in range(0, len(existing['ids']), self.embedding_batch_size):
+            end = start + self.embedding_batch_size
+            texts = existing['documents'][start:end]
+            collection.upsert(
+                embeddings=self._embed_unique(texts),
+                documents=texts,
+                metadatas=existing['metadatas'][start:end],
+                ids=existing['ids'][start:end]
+            )
+        return collection
+    
+    def close(self) -> None:
+        """Release the embedding cache database connection."""
+        if self.embedding_cache:
+            self.embedding_cache.close()
+            self.embedding_cache = None
     
     async def add_document(self, cid: str, content: Dict[str, Any], metadata: Dict[str, Any] = None) -> bool:
         """
@@ -51,44 +110,65 @@ class VectorStore:
         Returns:
             True if successful
         """
-        try:
-            # Extract text content for embedding
-            text_content = self._extract_text(content)
+        added = await self.add_documents([{'cid': cid, 'content': content, 'metadata': metadata}])
+        if added:
+            logger.info(f"Added document to vector store: {cid}")
+        return added == 1
+    
+    async def add_documents(self, documents: List[Dict[str, Any]]) -> int:
+        """
+        Add many documents, embedding them in batches.
+        
+        Args:
+            documents: Dicts with 'cid', 'content' and optional 'metadata'
             
-            # Generate embedding
-            embedding = await self._generate_embedding(text_content)
+        Returns:
+            Number of documents added
+        """
+        if not documents:
+            return 0
+        try:
+            texts = [self._extract_text(doc['content']) for doc in documents]
+            embeddings = await self._embed_texts(texts)
             
-            # Prepare metadata
-            doc_metadata = {
-                'cid': cid,
-                'timestamp': int(time.time()),
-                'content_type': content.get('metadata', {}).get('storage_type', 'unknown'),
-                'contract_address': content.get('metadata', {}).get('contract_address', ''),
-                **(metadata or {})
-            }
+            now = int(time.time())
+            ids, metadatas = [], []
+            for doc in documents:
+                content_meta = doc['content'].get('metadata', {})
+                ids.append(doc['cid'])
+                metadatas.append({
+                    'cid': doc['cid'],
+                    'timestamp': now,
+                    'content_type': content_meta.get('storage_type', 'unknown'),
+                    'contract_address': content_meta.get('contract_address', ''),
+                    **(doc.get('metadata') or {})
+                })
             
             if self.chroma_available:
                 # Use ChromaDB
-                self.collection.add(
-                    embeddings=[embedding],
-                    documents=[text_content],
-                    metadatas=[doc_metadata],
-                    ids=[cid]
-                )
+                for start in range(0, len(ids), self.embedding_batch_size):
+                    end = start + self.embedding_batch_size
+                    self.collection.upsert(
+                        embeddings=embeddings[start:end],
+                        documents=texts[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end]
+                    )
             else:
-                # Use in-memory storage
-                self._in_memory_store[cid] = {
-                    'embedding': embedding,
-                    'content': text_content,
-                    'metadata': doc_metadata
-                }
+                # Use in-memory storage; vectors live in the index
+                for cid, text, embedding, doc_metadata in zip(ids, texts, embeddings, metadatas):
+                    self._index.add(cid, embedding, doc_metadata)
+                    self._in_memory_store[cid] = {
+                        'content': text,
+                        'metadata': doc_metadata
+                    }
             
-            logger.info(f"Added document to vector store: {cid}")
-            return True
+            logger.debug(f"Added {len(ids)} documents to vector store")
+            return len(ids)
             
         except Exception as e:
-            logger.error(f"Failed to add document to vector store: {e}")
-            return False
+            logger.error(f"Failed to add documents to vector store: {e}")
+            return 0
     
     async def search_similar(self, query: str, top_k: int = 5, filter_metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
@@ -102,36 +182,56 @@ class VectorStore:
         Returns:
             List of similar documents with scores
         """
+        return (await self.search_many([query], top_k, filter_metadata))[0]
+    
+    async def search_many(self, queries: List[str], top_k: int = 5, filter_metadata: Dict[str, Any] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar documents for several queries at once.
+        
+        Args:
+            queries: Search queries
+            top_k: Number of results to return per query
+            filter_metadata: Optional metadata filters applied to every query
+            
+        Returns:
+            One list of similar documents with scores per query
+        """
         try:
-            # Generate query embedding
-            query_embedding = await self._generate_embedding(query)
+            # Generate query embeddings in one batch
+            query_embeddings = await self._embed_texts(queries)
             
             if self.chroma_available:
                 # Use ChromaDB search
                 results = self.collection.query(
-                    query_embeddings=[query_embedding],
+                    query_embeddings=query_embeddings,
                     n_results=top_k,
                     where=filter_metadata
                 )
                 
                 # Format results
-                similar_docs = []
-                for i in range(len(results['ids'][0])):
-                    similar_docs.append({
-                        'cid': results['ids'][0][i],
-                        'content': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i],
-                        'score': 1 - results['distances'][0][i]  # Convert distance to similarity
-                    })
+                all_docs = []
+                for q in range(len(queries)):
+                    similar_docs = []
+                    for i in range(len(results['ids'][q])):
+                        similar_docs.append({
+                            'cid': results['ids'][q][i],
+                            'content': results['documents'][q][i],
+                            'metadata': results['metadatas'][q][i],
+                            'score': 1 - results['distances'][q][i]  # Convert distance to similarity
+                        })
+                    all_docs.append(similar_docs)
                 
-                return similar_docs
+                return all_docs
             else:
                 # Use in-memory search
-                return self._in_memory_search(query_embedding, top_k, filter_metadata)
+                return [
+                    self._in_memory_search(embedding, top_k, filter_metadata)
+                    for embedding in query_embeddings
+                ]
                 
         except Exception as e:
             logger.error(f"Failed to search similar documents: {e}")
-            return []
+            return [[] for _ in queries]
     
     async def get_document(self, cid: str) -> Optional[Dict[str, Any]]:
         """
@@ -200,73 +300,52 @@ class VectorStore:
     
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text."""
-        try:
-            # For demo purposes, generate a mock embedding
-            # In production, use a real embedding model like OpenAI or Sentence-BERT
-            text_hash = hashlib.md5(text.encode()).hexdigest()
-            
-            # Generate deterministic "embedding" based on text hash
-            embedding = []
-            for i in range(0, len(text_hash), 2):
-                val = int(text_hash[i:i+2], 16) / 255.0
-                embedding.append(val)
-            
-            # Pad to 384 dimensions (common embedding size)
-            while len(embedding) < 384:
-                embedding.append(0.0)
-            
-            return embedding[:384]
+        return (await self._embed_texts([text]))[0]
+    
+    async def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in batches off the event loop, reusing cached vectors.
+        
+        Args:
+            texts: Texts to embed (duplicates are embedded once)
             
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            return [0.0] * 384
+        Returns:
+            One embedding per input text
+        """
+        unique = list(dict.fromkeys(texts))
+        vectors = await asyncio.to_thread(self._embed_unique, unique)
+        by_text = dict(zip(unique, vectors))
+        return [by_text[text] for text in texts]
+    
+    def _embed_unique(self, texts: List[str]) -> List[List[float]]:
+        keys = [EmbeddingCache.make_key(self.embedder.name, text) for text in texts]
+        cached = self.embedding_cache.get_many(keys) if self.embedding_cache else {}
+        
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        computed = {}
+        for start in range(0, len(missing), self.embedding_batch_size):
+            batch = missing[start:start + self.embedding_batch_size]
+            for i, vector in zip(batch, self.embedder.embed([texts[i] for i in batch])):
+                computed[keys[i]] = vector
+        
+        if computed and self.embedding_cache:
+            self.embedding_cache.set_many(computed)
+        return [cached[key] if key in cached else computed[key] for key in keys]
     
     def _in_memory_search(self, query_embedding: List[float], top_k: int, filter_metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """In-memory similarity search."""
+        """In-memory similarity search backed by the vectorized index."""
         try:
             results = []
-            
-            for cid, doc in self._in_memory_store.items():
-                # Calculate cosine similarity
-                similarity = self._cosine_similarity(query_embedding, doc['embedding'])
-                
-                # Apply metadata filters
-                if filter_metadata:
-                    matches = True
-                    for key, value in filter_metadata.items():
-                        if doc['metadata'].get(key) != value:
-                            matches = False
-                            break
-                    if not matches:
-                        continue
-                
+            for cid, score in self._index.search(query_embedding, top_k, filter_metadata):
+                doc = self._in_memory_store[cid]
                 results.append({
                     'cid': cid,
                     'content': doc['content'],
                     'metadata': doc['metadata'],
-                    'score': similarity
+                    'score': score
                 })
-            
-            # Sort by similarity score
-            results.sort(key=lambda x: x['score'], reverse=True)
-            return results[:top_k]
+            return results
             
         except Exception as e:
             logger.error(f"In-memory search failed: {e}")
             return []
-    
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        try:
-            dot_product = sum(x * y for x, y in zip(a, b))
-            norm_a = sum(x * x for x in a) ** 0.5
-            norm_b = sum(x * x for x in b) ** 0.5
-            
-            if norm_a == 0 or norm_b == 0:
-                return 0.0
-            
-            return dot_product / (norm_a * norm_b)
-            
-        except Exception as e:
-            logger.error(f"Cosine similarity calculation failed: {e}")
-            return 0.0
@@ -0,0 +1,96 @@
+"""
+Unit tests for the content-addressed audit result cache
+"""
+
+import asyncio
+
+import pytest
+
+from services.audit.auditor import SmartContractAuditor
+from services.audit.result_cache import AuditResultCache
+
+CONTRACT = """
+pragma solidity ^0.8.0;
+contract Vault {
+    function kill() public { selfdestruct(payable(msg.sender)); }
+}
+"""
+
+
+@pytest.mark.unit
+def test_source_hash_ignores_formatting_only_changes():
+    """Line endings and trailing whitespace do not change the content address"""
+    assert AuditResultCache.hash_source(CONTRACT) == AuditResultCache.hash_source(
+        CONTRACT.replace("\n", "   \r\n") + "\n\n"
+    )
+    assert AuditResultCache.hash_source(CONTRACT) != AuditResultCache.hash_source(CONTRACT + "// x")
+
+
+@pytest.mark.unit
+def test_source_hash_keeps_leading_blank_lines():
+    """Leading blank lines shift finding line numbers, so they get their own entry"""
+    assert AuditResultCache.hash_source(CONTRACT) != AuditResultCache.hash_source("\n\n\n" + CONTRACT)
+
+
+@pytest.mark.unit
+def test_key_depends_on_tool_and_versions():
+    source_hash = AuditResultCache.hash_source(CONTRACT)
+    key = AuditResultCache.make_key(source_hash, "slither", "0.10.0", "1")
+    assert key != AuditResultCache.make_key(source_hash, "slither", "0.10.1", "1")
+    assert key != AuditResultCache.make_key(source_hash, "slither", "0.10.0", "2")
+    assert key != AuditResultCache.make_key(source_hash, "mythril", "0.10.0", "1")
+
+
+@pytest.mark.unit
+def test_get_set_and_stats(tmp_path):
+    cache = AuditResultCache(cache_dir=str(tmp_path))
+    assert cache.get("ab" * 32) is None
+
+    cache.set("ab" * 32, {"status": "success", "findings": [{"type": "x"}]})
+
+    assert cache.get("ab" * 32) == {"status": "success", "findings": [{"type": "x"}]}
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+    assert stats["size_bytes"] > 0
+
+
+@pytest.mark.unit
+def test_size_bounded_eviction_drops_least_recently_used(tmp_path):
+    cache = AuditResultCache(cache_dir=str(tmp_path), max_bytes=600)
+    payload = {"status": "success", "raw_output": "x" * 200}
+
+    cache.set("aa" * 32, payload)
+    cache.set("bb" * 32, payload)
+    cache.get("aa" * 32)  # Touch so "bb" becomes the LRU entry
+    cache.set("cc" * 32, payload)
+
+    assert cache.contains("aa" * 32)
+    assert not cache.contains("bb" * 32)
+    assert cache.contains("cc" * 32)
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+def test_repeat_audit_reuses_cached_tool_results(tmp_path):
+    """A second audit of identical source does not re-run the tools"""
+    auditor = SmartContractAuditor({"audit_cache_dir": str(tmp_path)})
+    auditor.tools_available.update(slither=True, mythril=False, alith=False)
+    auditor.tool_versions["slither"] = "0.10.0"
+
+    slither_runs = []
+
+    async def fake_slither(contract_file):
+        slither_runs.append(contract_file)
+        return {"status": "success", "findings": [{"tool": "slither", "severity": "critical",
+                                                   "type": "suicidal", "description": "selfdestruct"}]}
+
+    auditor._run_slither = fake_slither
+
+    first = asyncio.run(auditor.audit(CONTRACT))
+    second = asyncio.run(auditor.audit(CONTRACT))
+
+    assert len(slither_runs) == 1
+    assert first["cached_tools"] == []
+    assert second["cached_tools"] == ["slither", "custom"]
+    assert second["findings"] == first["findings"]
+    assert auditor.get_cache_stats()["hits"] == 2
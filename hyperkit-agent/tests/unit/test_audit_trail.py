@@ -0,0 +1,59 @@
+"""
+Unit tests for the SQLite-backed workflow audit trail
+"""
+
+import json
+
+import pytest
+
+from core.workflow.audit_trail import AuditEventType, AuditTrail
+
+
+@pytest.fixture
+def trail(tmp_path):
+    trail = AuditTrail(tmp_path)
+    yield trail
+    trail.close()
+
+
+@pytest.mark.unit
+def test_queries_return_the_most_recent_matches_first(trail):
+    for i in range(5):
+        trail.log_event(AuditEventType.GENERATION_ATTEMPTED, "wf-a", stage="generation", details={"n": i})
+        trail.log_event(AuditEventType.COMPILATION_FAILED, "wf-b", stage="compilation", error=f"e{i}")
+
+    events = trail.query_events(workflow_id="wf-a", limit=2)
+    assert [e["details"]["n"] for e in events] == [4, 3]
+
+    failed = trail.query_events(event_type=AuditEventType.COMPILATION_FAILED, stage="compilation", limit=10)
+    assert [e["error"] for e in failed] == ["e4", "e3", "e2", "e1", "e0"]
+    assert trail.query_events(workflow_id="wf-a", stage="compilation") == []
+
+
+@pytest.mark.unit
+def test_statistics_count_every_event(trail):
+    for _ in range(3):
+        trail.log_event(AuditEventType.GENERATION_SUCCESS, "wf-a")
+    trail.log_event(AuditEventType.GENERATION_FAILED, "wf-a")
+    trail.log_event(AuditEventType.ERROR_OCCURRED, "wf-b")
+
+    stats = trail.get_statistics()
+    assert stats["total_events"] == 5
+    assert stats["success_count"] == 3 and stats["error_count"] == 2
+    assert trail.get_statistics("wf-a")["event_counts"] == {"generation_success": 3, "generation_failed": 1}
+    assert trail.get_statistics("missing")["total_events"] == 0
+
+
+@pytest.mark.unit
+def test_legacy_jsonl_is_imported_once(tmp_path):
+    legacy = tmp_path / "logs" / "audit_trail.jsonl"
+    legacy.parent.mkdir()
+    old = {"timestamp": "2025-01-01T00:00:00", "event_type": "prompt_received", "workflow_id": "old",
+           "stage": None, "details": {}, "error": None, "metadata": {}}
+    legacy.write_text(json.dumps(old) + "\nnot json\n" + '{"partial": ')
+
+    AuditTrail(tmp_path).close()
+    trail = AuditTrail(tmp_path)
+    assert trail.query_events(workflow_id="old") == [old]
+    assert trail.get_statistics()["total_events"] == 1
+    trail.close()
@@ -0,0 +1,155 @@
+"""
+Unit tests for concurrent batch auditing
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.audit.batch_auditor import BatchAuditor
+from services.audit.report_aggregator import ReportAggregator
+
+
+class SlowAuditor:
+    """Stand-in auditor whose audits take a fixed amount of wall-clock time"""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+
+    async def audit(self, contract_code: str):
+        if "broken" in contract_code:
+            raise RuntimeError("compiler exploded")
+        await asyncio.sleep(self.delay)
+        return {
+            "severity": "medium",
+            "tools_used": ["custom"],
+            "findings": [{"type": "reentrancy", "severity": "medium"}],
+        }
+
+
+@pytest.fixture
+def batch_auditor():
+    auditor = BatchAuditor.__new__(BatchAuditor)
+    auditor.config = {}
+    auditor.auditor = SlowAuditor()
+    auditor.exporters = {}
+    return auditor
+
+
+@pytest.mark.unit
+def test_audit_batch_runs_concurrently(batch_auditor, tmp_path):
+    """Workers overlap audits so wall-clock time does not scale with contract count"""
+    contracts = [{"name": f"C{i}", "code": "contract C {}"} for i in range(4)]
+
+    start = time.monotonic()
+    results = asyncio.run(batch_auditor.audit_batch(
+        contracts, export_formats=[], output_dir=str(tmp_path), max_workers=4
+    ))
+    elapsed = time.monotonic() - start
+
+    assert results["successful"] == 4
+    assert results["workers"] == 4
+    assert elapsed < 0.2 * 4 * 0.75
+
+
+@pytest.mark.unit
+def test_audit_batch_isolates_failures_and_keeps_order(batch_auditor, tmp_path):
+    """A failing contract is recorded without affecting the others"""
+    contracts = [
+        {"name": "Good1", "code": "contract A {}"},
+        {"name": "Bad", "code": "broken"},
+        {"name": "Missing", "path": str(tmp_path / "nope.sol")},
+        {"name": "Good2", "code": "contract B {}"},
+    ]
+
+    results = asyncio.run(batch_auditor.audit_batch(
+        contracts, export_formats=[], output_dir=str(tmp_path), max_workers=3
+    ))
+
+    assert [c["contract_name"] for c in results["contracts"]] == ["Good1", "Bad", "Missing", "Good2"]
+    assert results["successful"] == 2
+    assert results["failed"] == 2
+    assert {f["error_type"] for f in results["failures"]} == {"RuntimeError", "FileNotFoundError"}
+    assert results["summary"]["total_contracts"] == 2
+    assert results["summary"]["total_findings"] == 2
+
+
+@pytest.mark.unit
+def test_overlapping_batches_keep_separate_summaries(batch_auditor, tmp_path):
+    """Two batches running at once on one auditor do not mix their summaries"""
+    small = [{"name": "A", "code": "contract A {}"}]
+    large = [{"name": f"C{i}", "code": "contract C {}"} for i in range(3)]
+
+    async def main():
+        return await asyncio.gather(
+            batch_auditor.audit_batch(small, export_formats=[], output_dir=str(tmp_path / "a"), max_workers=1),
+            batch_auditor.audit_batch(large, export_formats=[], output_dir=str(tmp_path / "b"), max_workers=3),
+        )
+
+    first, second = asyncio.run(main())
+    assert first["summary"]["total_contracts"] == 1
+    assert second["summary"]["total_contracts"] == 3
+
+
+@pytest.mark.unit
+def test_streaming_aggregation_matches_list_aggregation():
+    """Feeding results one by one yields the same summary as aggregating a list"""
+    audit_results = [
+        {"severity": "high", "tools_used": ["slither"], "findings": [{"type": "tx_origin"}]},
+        {"severity": "safe", "tools_used": ["custom"], "findings": []},
+    ]
+
+    streamed = ReportAggregator()
+    for result in audit_results:
+        streamed.add_result(result)
+
+    assert streamed.aggregate() == ReportAggregator().aggregate(audit_results)
+
+
+@pytest.mark.unit
+def test_findings_by_severity_counts_findings_not_contracts():
+    summary = ReportAggregator().aggregate([
+        {"severity": "critical", "findings": [{"type": "a", "severity": "critical"}] * 3 + [{"type": "b", "severity": "low"}]},
+        {"severity": "safe", "findings": []},
+    ])
+
+    assert summary["findings_by_severity"] == {"critical": 3, "low": 1}
+    assert summary["severity_distribution"] == {"critical": 1, "safe": 1}
+
+
+@pytest.mark.unit
+def test_batch_audit_command_summarizes_results(batch_auditor, tmp_path, monkeypatch):
+    """The CLI aggregates the batch results and prints the batch-level counts"""
+    from click.testing import CliRunner
+
+    from cli.commands import batch_audit
+    from services.audit import batch_auditor as batch_auditor_module
+    from services.audit import exporters
+
+    reports = []
+
+    class RecordingExporter:
+        def export(self, report, output_path):
+            reports.append(report)
+            return True
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch_auditor_module, "BatchAuditor", lambda: batch_auditor)
+    for name in ("JSONExporter", "MarkdownExporter", "HTMLExporter", "CSVExporter", "PDFExporter", "ExcelExporter"):
+        monkeypatch.setattr(exporters, name, RecordingExporter)
+    (tmp_path / "A.sol").write_text("contract A {}")
+    (tmp_path / "B.sol").write_text("broken")
+
+    result = CliRunner().invoke(batch_audit.batch_audit_group, [
+        "contracts", "-d", str(tmp_path), "-o", str(tmp_path / "out"), "-fmt", "json", "-n", "Nightly", "-w", "2",
+    ])
+
+    assert "Batch audit failed" not in result.output
+    assert "Total Contracts: 2" in result.output
+    assert "Successful: 1" in result.output and "Failed: 1" in result.output
+    assert "Total Findings: 1" in result.output
+    assert "Medium: 1" in result.output
+    [report] = reports
+    assert report["batch_name"] == "Nightly"
+    assert report["top_issues"] == [{"type": "reentrancy", "count": 1}]
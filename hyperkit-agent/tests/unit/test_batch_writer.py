@@ -0,0 +1,102 @@
+"""
+Unit tests for the buffered background writer
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from core.workflow.context_manager import WorkflowContext
+from core.workflow.state_persistence import StatePersistence
+from core.workflow.workflow_orchestrator import WorkflowOrchestrator
+from core.workflow.workflow_state import ActionResult, WorkflowState
+from services.common.batch_writer import BatchWriter
+
+
+class RecordingSink:
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def __call__(self, batch):
+        self.batches.append(list(batch))
+        self.threads.add(threading.current_thread().name)
+
+    @property
+    def items(self):
+        return [item for batch in self.batches for item in batch]
+
+
+@pytest.mark.unit
+def test_writes_are_buffered_and_flushed_in_order():
+    sink = RecordingSink()
+    writer = BatchWriter(sink, flush_interval=60, batch_size=1000)
+    for i in range(10):
+        writer.write(i)
+
+    assert sink.batches == [] and writer.pending == 10
+    writer.flush()
+    assert sink.batches == [list(range(10))]
+
+
+@pytest.mark.unit
+def test_background_thread_flushes_on_interval_and_batch_size():
+    sink = RecordingSink()
+    writer = BatchWriter(sink, flush_interval=0.05, batch_size=1000)
+    writer.write("a")
+    deadline = time.time() + 2
+    while not sink.items and time.time() < deadline:
+        time.sleep(0.01)
+    assert sink.items == ["a"]
+    assert sink.threads == {"batch-writer-flush"}
+
+    big = BatchWriter(RecordingSink(), flush_interval=60, batch_size=3)
+    for i in range(3):
+        big.write(i)
+    deadline = time.time() + 2
+    while big.pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert big.pending == 0
+
+
+@pytest.mark.unit
+def test_full_buffer_flushes_inline_and_close_flushes():
+    sink = RecordingSink()
+    writer = BatchWriter(sink, flush_interval=60, batch_size=2, max_pending=4)
+    for i in range(4):
+        writer.write(i)
+    assert sink.items == [0, 1, 2, 3]
+
+    writer.write(4)
+    writer.close()
+    writer.write(5)
+    assert sink.items == [0, 1, 2, 3, 4, 5]
+
+
+@pytest.mark.unit
+def test_workflow_log_entries_are_flushed_before_reads(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    state = WorkflowState(workflow_id="wf", user_goal="token")
+    persistence.append_log_entry(state, "plan", "first", {"tool": "generate_contract"})
+    persistence.append_log_entry(state, "act", "second")
+
+    log = persistence.get_log_path("wf").read_text()
+    assert log.index("first") < log.index("second")
+    assert "- tool: generate_contract" in log
+
+
+@pytest.mark.unit
+def test_workflow_updates_only_append_to_the_log(tmp_path):
+    orchestrator = WorkflowOrchestrator(Mock(rag=None), tmp_path)
+    persistence = orchestrator.state_persistence
+    persistence.save_full_log = Mock(side_effect=AssertionError("full log rewritten"))
+    state = WorkflowState(workflow_id="wf", user_goal="token")
+    context = WorkflowContext(workflow_id="wf", user_prompt="token")
+
+    for _ in range(3):
+        asyncio.run(orchestrator._update_workflow_state(state, ActionResult(success=True), context))
+
+    assert persistence.get_log_path("wf").read_text().count("## Update - ") == 3
@@ -0,0 +1,90 @@
+"""
+Unit tests for dependency installs running alongside the LLM stream
+"""
+
+import asyncio
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from core.llm.stream_extractor import StreamEvent
+from core.workflow.workflow_orchestrator import WorkflowOrchestrator
+from services.dependencies.dependency_manager import Dependency, DependencyManager
+
+FAKE_FORGE = """#!{python}
+import os, sys, time
+if sys.argv[1] == "--version":
+    print("forge 0.0.0-test")
+    sys.exit(0)
+time.sleep({delay})
+lib = os.path.join("lib", os.path.basename(sys.argv[2]), "src")
+os.makedirs(lib, exist_ok=True)
+with open(os.path.join(lib, "A.sol"), "w") as f:
+    f.write("contract A {{}}")
+"""
+
+
+@pytest.fixture
+def fake_forge(tmp_path, monkeypatch):
+    """Put a slow 'forge' that installs a one-file library first on PATH"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    forge = bin_dir / "forge"
+    forge.write_text(FAKE_FORGE.format(python=sys.executable, delay=0.5))
+    forge.chmod(forge.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return forge
+
+
+@pytest.mark.unit
+def test_install_does_not_block_the_event_loop(tmp_path, fake_forge):
+    manager = DependencyManager(tmp_path / "ws")
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        ticking = asyncio.create_task(ticker())
+        result = await manager.install_dependency(Dependency("acme/tokens", "solidity"))
+        ticking.cancel()
+        return result
+
+    success, message = asyncio.run(main())
+    assert success, message
+    assert (tmp_path / "ws" / "lib" / "tokens" / "src" / "A.sol").exists()
+    assert len(ticks) >= 10  # the loop kept running through the 0.5s install
+
+
+@pytest.mark.unit
+def test_prefetch_is_cancelled_when_the_workflow_stops(tmp_path, fake_forge):
+    fake_forge.write_text(FAKE_FORGE.format(python=sys.executable, delay=30))
+    orchestrator = WorkflowOrchestrator.__new__(WorkflowOrchestrator)
+    orchestrator._dependency_prefetch = {}
+    orchestrator.dep_manager = DependencyManager(tmp_path / "ws")
+    orchestrator.dep_manager.detect_dependencies = lambda code: [Dependency("acme/tokens", "solidity")]
+
+    class Context:
+        workflow_id = "wf-1"
+
+    async def main():
+        on_event = orchestrator._dependency_prefetcher(Context())
+        on_event(StreamEvent("import", "acme/tokens/Token.sol"))
+        task = orchestrator._dependency_prefetch["wf-1"]
+        await asyncio.sleep(0.3)  # forge install is running
+        assert not task.done()
+
+        start = time.monotonic()
+        orchestrator._cancel_dependency_prefetch("wf-1")
+        await asyncio.gather(task, return_exceptions=True)
+        return task, time.monotonic() - start
+
+    task, elapsed = asyncio.run(main())
+    assert task.cancelled()
+    assert elapsed < 5  # the forge child was terminated, not waited for
+    assert orchestrator._dependency_prefetch == {}
@@ -0,0 +1,158 @@
+"""
+Unit tests for offline embedding backends and bulk vector store APIs
+"""
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from services.rag.embeddings import EmbeddingCache, HashingEmbedder, create_embedding_backend
+from services.rag.vector_store import VectorStore
+
+
+def _dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+@pytest.mark.unit
+def test_hashing_embedder_is_deterministic_and_vocabulary_aware():
+    embedder = HashingEmbedder(dim=256)
+    reentrancy, guard, token = embedder.embed([
+        "reentrancy attack on withdraw function",
+        "ReentrancyGuard protects the withdraw function",
+        "ERC20 token with mint and burn",
+    ])
+
+    assert embedder.embed(["reentrancy attack on withdraw function"])[0] == reentrancy
+    assert len(reentrancy) == 256
+    assert _dot(reentrancy, reentrancy) == pytest.approx(1.0)
+    assert _dot(reentrancy, guard) > _dot(reentrancy, token)
+
+
+@pytest.mark.unit
+def test_backend_selection():
+    assert isinstance(create_embedding_backend({"embedding_backend": "hashing"}), HashingEmbedder)
+    with pytest.raises(ValueError):
+        create_embedding_backend({"embedding_backend": "md5"})
+
+
+@pytest.mark.unit
+def test_embedding_cache_roundtrip(tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite3")
+    key = EmbeddingCache.make_key("hashing-v1-4", "hello")
+    assert key != EmbeddingCache.make_key("hashing-v1-8", "hello")
+
+    cache.set_many({key: [0.5, -0.25, 0.0, 1.0]})
+
+    assert cache.get_many([key, "missing"]) == {key: [0.5, -0.25, 0.0, 1.0]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.unit
+def test_bulk_add_and_search_many_reuse_cached_embeddings(tmp_path):
+    config = {"store_path": str(tmp_path), "embedding_backend": "hashing"}
+    store = VectorStore(config)
+    if store.chroma_available:
+        pytest.skip("ChromaDB installed; in-memory path not used")
+
+    documents = [
+        {"cid": f"cid{i}", "content": {"title": title}, "metadata": {"content_type": "template"}}
+        for i, title in enumerate(["upgradeable proxy pattern", "staking rewards vault", "dao governance voting"])
+    ]
+    embedded = []
+    original = store.embedder.embed
+    store.embedder.embed = lambda texts: embedded.append(len(texts)) or original(texts)
+
+    assert asyncio.run(store.add_documents(documents)) == 3
+    assert embedded == [3]  # One batch for the whole corpus
+
+    results = asyncio.run(store.search_many(["governance voting", "staking vault"], top_k=1))
+    assert [r[0]["cid"] for r in results] == ["cid2", "cid1"]
+    assert embedded == [3, 2]
+
+    # A fresh store over the same path reuses the on-disk embeddings
+    reopened = VectorStore(config)
+    reopened.embedder.embed = lambda texts: embedded.append(len(texts)) or original(texts)
+    assert asyncio.run(reopened.add_documents(documents)) == 3
+    assert embedded == [3, 2]
+
+    store.close()
+    reopened.close()
+    assert store.embedding_cache is None
+
+
+@pytest.mark.unit
+def test_auto_backend_never_downloads_models(monkeypatch):
+    calls = []
+
+    class FakeSentenceTransformer:
+        def __init__(self, model_name, device=None, local_files_only=False):
+            calls.append(local_files_only)
+            raise OSError(f"{model_name} is not in the local cache")
+
+    monkeypatch.setitem(
+        sys.modules, "sentence_transformers",
+        types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer)
+    )
+
+    assert isinstance(create_embedding_backend({}), HashingEmbedder)
+    assert calls == [True]
+
+
+class _FakeCollection:
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.rows = {}
+
+    def get(self, include=None):
+        ids = list(self.rows)
+        return {
+            "ids": ids,
+            "documents": [self.rows[i][0] for i in ids],
+            "metadatas": [self.rows[i][1] for i in ids],
+        }
+
+    def upsert(self, embeddings, documents, metadatas, ids):
+        for cid, document, metadata, embedding in zip(ids, documents, metadatas, embeddings):
+            self.rows[cid] = (document, metadata, embedding)
+
+
+class _FakeChromaClient:
+    collections = {}
+
+    def __init__(self, path):
+        pass
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self.collections.setdefault(name, _FakeCollection(metadata))
+
+    def create_collection(self, name, metadata=None):
+        self.collections[name] = _FakeCollection(metadata)
+        return self.collections[name]
+
+    def delete_collection(self, name):
+        del self.collections[name]
+
+
+@pytest.mark.unit
+def test_collection_from_another_embedder_is_re_embedded(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "chromadb", types.SimpleNamespace(PersistentClient=_FakeChromaClient))
+    monkeypatch.setattr(_FakeChromaClient, "collections", {})
+
+    legacy = _FakeCollection({"description": "HyperKit Agent audit reports and documents"})
+    legacy.rows["cid0"] = ("reentrancy guard", {"cid": "cid0"}, [0.0] * 384)
+    _FakeChromaClient.collections[VectorStore.COLLECTION_NAME] = legacy
+
+    store = VectorStore({"store_path": str(tmp_path), "embedding_backend": "hashing"})
+
+    assert store.collection is not legacy
+    assert store.collection.metadata["embedder"] == store.embedder.name
+    document, metadata, embedding = store.collection.rows["cid0"]
+    assert (document, metadata) == ("reentrancy guard", {"cid": "cid0"})
+    assert embedding == store.embedder.embed(["reentrancy guard"])[0]
+
+    # Reopening with the same backend keeps the collection as is
+    assert VectorStore({"store_path": str(tmp_path), "embedding_backend": "hashing"}).collection is store.collection
+    store.close()
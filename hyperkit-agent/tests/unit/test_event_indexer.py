@@ -0,0 +1,159 @@
+"""
+Unit tests for the contract event indexer
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from eth_abi import encode as abi_encode
+from web3 import Web3
+
+from services.monitoring.event_indexer import (
+    EventIndexer, EventStore, bloom_bits, bloom_contains, decode_log,
+    event_abis_by_topic,
+)
+from services.monitoring.rpc_batch import JsonRpcBatchClient
+
+TOKEN = "0x00000000000000000000000000000000000000aa"
+ALICE = "0x00000000000000000000000000000000000000a1"
+BOB = "0x00000000000000000000000000000000000000b0"
+TRANSFER = Web3.to_hex(Web3.keccak(text="Transfer(address,address,uint256)"))
+ABI = [{
+    "type": "event", "name": "Transfer", "anonymous": False,
+    "inputs": [
+        {"name": "from", "type": "address", "indexed": True},
+        {"name": "to", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}]
+
+
+def make_bloom(*items):
+    bloom = bytearray(256)
+    for item in items:
+        for index, mask in bloom_bits(item):
+            bloom[index] |= mask
+    return "0x" + bloom.hex()
+
+
+def transfer_log(block, index, value):
+    return {
+        "address": TOKEN, "blockNumber": hex(block), "logIndex": hex(index),
+        "transactionHash": "0x" + f"{block:04x}{index:04x}".rjust(64, "0"),
+        "topics": [TRANSFER, "0x" + "0" * 24 + ALICE[2:], "0x" + "0" * 24 + BOB[2:]],
+        "data": "0x" + abi_encode(["uint256"], [value]).hex(),
+    }
+
+
+class FakeChain:
+    """Node that rejects eth_getLogs over more than ``max_range`` blocks"""
+
+    def __init__(self, head, logs, max_range=10_000):
+        self.head = head
+        self.logs = logs
+        self.max_range = max_range
+        self.requests = []
+        token_blocks = {int(log["blockNumber"], 16) for log in logs}
+        self.blooms = {n: make_bloom(bytes.fromhex(TOKEN[2:]), bytes.fromhex(TRANSFER[2:])) if n in token_blocks
+                       else make_bloom() for n in range(head + 1)}
+
+    def handle(self, request):
+        replies = []
+        for call in json.loads(request.content):
+            method, params = call["method"], call["params"]
+            self.requests.append(method)
+            reply = {"jsonrpc": "2.0", "id": call["id"]}
+            if method == "eth_blockNumber":
+                reply["result"] = hex(self.head)
+            elif method == "eth_getBlockByNumber":
+                number = int(params[0], 16)
+                reply["result"] = {"number": params[0], "logsBloom": self.blooms[number]}
+            elif method == "eth_getLogs":
+                low, high = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+                if high - low + 1 > self.max_range:
+                    reply["error"] = {"code": -32005, "message": "query returned more than 10000 results"}
+                else:
+                    reply["result"] = [log for log in self.logs if low <= int(log["blockNumber"], 16) <= high]
+            replies.append(reply)
+        return httpx.Response(200, json=replies)
+
+    def client(self):
+        return JsonRpcBatchClient("http://node", transport=httpx.MockTransport(self.handle))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(tmp_path / "events.sqlite3")
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+def test_bloom_rules_out_absent_items():
+    token = bytes.fromhex(TOKEN[2:])
+    bloom = make_bloom(token)
+    assert bloom_contains(bloom, bloom_bits(token))
+    assert not bloom_contains(bloom, bloom_bits(bytes.fromhex(ALICE[2:])))
+    assert bloom_contains(None, bloom_bits(token)) and bloom_contains("0x12", bloom_bits(token))
+
+
+@pytest.mark.unit
+def test_decode_transfer_log():
+    name, args = decode_log(transfer_log(5, 0, 42), event_abis_by_topic(ABI))
+    assert name == "Transfer"
+    assert args == {"from": ALICE, "to": BOB, "value": 42}
+    assert decode_log({"topics": ["0x" + "1" * 64]}, event_abis_by_topic(ABI)) == (None, None)
+
+
+@pytest.mark.unit
+def test_range_walk_shrinks_window_and_resumes_from_cursor(store):
+    chain = FakeChain(head=400, logs=[transfer_log(120, 0, 1), transfer_log(350, 3, 2)], max_range=100)
+    indexer = EventIndexer("hyperion", TOKEN, chain.client(), store, abi=ABI, start_block=0, initial_window=400)
+
+    events = asyncio.run(indexer.index_once())
+    assert [(e["block_number"], e["args"]["value"]) for e in events] == [(120, 1), (350, 2)]
+    # 401 blocks in windows of at most 100, after at least one rejected 400-block query
+    assert chain.requests.count("eth_getLogs") >= 6
+    assert store.get_cursor("hyperion", TOKEN) == 401
+
+    # A new indexer resumes at the cursor; re-indexing never duplicates
+    chain.head = 410
+    chain.logs.append(transfer_log(405, 0, 3))
+    chain.blooms.update({n: make_bloom() for n in range(401, 411)})
+    chain.blooms[405] = make_bloom(bytes.fromhex(TOKEN[2:]))
+    resumed = EventIndexer("hyperion", TOKEN, chain.client(), store, abi=ABI, start_block=0)
+    assert [e["block_number"] for e in asyncio.run(resumed.index_once())] == [405]
+    store.record("hyperion", TOKEN, events, next_block=0)
+
+    stored = store.query_events("hyperion", TOKEN, event="Transfer", limit=10)
+    assert [e["block_number"] for e in stored] == [405, 350, 120]
+    assert store.query_events("hyperion", TOKEN, from_block=300, to_block=400)[0]["args"]["value"] == 2
+    assert store.get_cursor("hyperion", TOKEN) == 411
+
+
+@pytest.mark.unit
+def test_known_headers_skip_get_logs_when_bloom_rules_blocks_out(store):
+    chain = FakeChain(head=20, logs=[transfer_log(18, 0, 7)])
+    indexer = EventIndexer("hyperion", TOKEN, chain.client(), store, topics=[TRANSFER], start_block=17)
+    header = lambda n: {"number": hex(n), "logsBloom": chain.blooms[n]}
+
+    assert asyncio.run(indexer.index_once(head=17, headers={17: header(17)})) == []
+    assert chain.requests == []
+    assert indexer.stats["blocks_skipped"] == 1
+
+    [event] = asyncio.run(indexer.index_once(head=18, headers={18: header(18)}))
+    assert event["block_number"] == 18 and event["event"] is None  # no ABI: stored undecoded
+    assert chain.requests == ["eth_getLogs"]
+    # The topic-filtered cursor is separate from an unfiltered indexer's
+    assert store.get_cursor("hyperion", TOKEN) is None
+
+
+@pytest.mark.unit
+def test_short_ranges_without_headers_go_straight_to_get_logs(store):
+    chain = FakeChain(head=15, logs=[])
+    indexer = EventIndexer("hyperion", TOKEN, chain.client(), store, topics=[TRANSFER], start_block=10)
+
+    assert asyncio.run(indexer.index_once()) == []
+    assert chain.requests == ["eth_blockNumber", "eth_getLogs"]
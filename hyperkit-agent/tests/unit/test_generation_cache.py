@@ -0,0 +1,133 @@
+"""
+Unit tests for the prompt -> contract generation cache
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from services.generation.generation_cache import GenerationCache
+from services.generation.prompt_parser import ContractSpec, TokenSpec
+
+TOKEN_CODE = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+contract GameToken is ERC20 {
+    constructor() ERC20("Game", "GAME") {
+        _mint(msg.sender, 1000000 * 10 ** decimals());
+    }
+}"""
+
+
+def _spec(name, symbol):
+    return ContractSpec(
+        contract_name=f"{name}Token",
+        token_spec=TokenSpec(name=name, symbol=symbol),
+        features=["mintable"],
+        parameters={},
+        contract_type="token",
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    generation_cache = GenerationCache(ttl=60, cache_dir=str(tmp_path / "generation"))
+    yield generation_cache
+    generation_cache.cache.cache.close()
+
+
+@pytest.mark.unit
+def test_equivalent_prompts_share_an_entry(cache):
+    cache.store("Create a mintable ERC20 token with 1M supply", "router:m", "ctx", TOKEN_CODE, "router", "Gemini")
+
+    hit = cache.lookup("create a  MINTABLE erc20 token, with 1M supply.", "router:m", "ctx")
+    assert hit is not None and hit.contract_code == TOKEN_CODE
+
+    assert cache.lookup("Create a mintable ERC20 token with 2M supply", "router:m", "ctx") is None
+    assert cache.lookup("Create a mintable ERC20 token with 1M supply", "router:other", "ctx") is None
+    assert cache.lookup("Create a mintable ERC20 token with 1M supply", "router:m", "other ctx") is None
+
+
+@pytest.mark.unit
+def test_parameterizable_contract_is_refilled_for_new_names(cache):
+    prompt = "Create a mintable ERC20 token named {} with 1M supply"
+    assert cache.store(prompt.format("Game"), "alith", "", TOKEN_CODE, "alith", "Alith", spec=_spec("Game", "GAME"))
+
+    hit = cache.lookup(prompt.format("Moon"), "alith", "", spec=_spec("Moon", "MOON"))
+
+    assert hit is not None and hit.refilled
+    assert "contract MoonToken is ERC20" in hit.contract_code
+    assert 'ERC20("Moon", "MOON")' in hit.contract_code
+    assert "Game" not in hit.contract_code
+
+
+@pytest.mark.unit
+def test_contract_with_unreplaceable_names_is_only_reused_verbatim(cache):
+    code = TOKEN_CODE.replace("contract GameToken", "/// GameToken for GAME holders\ncontract GameToken")
+    prompt = "Create a mintable ERC20 token named {} with 1M supply"
+    assert not cache.store(prompt.format("Game"), "alith", "", code, "alith", "Alith", spec=_spec("Game", "GAME"))
+
+    assert cache.lookup(prompt.format("Moon"), "alith", "", spec=_spec("Moon", "MOON")) is None
+    hit = cache.lookup(prompt.format("Game"), "alith", "", spec=_spec("Game", "GAME"))
+    assert hit is not None and hit.contract_code == code and not hit.refilled
+
+
+@pytest.mark.unit
+def test_from_config_respects_disable_flag(tmp_path):
+    assert GenerationCache.from_config({"generation_cache_enabled": False}) is None
+    enabled = GenerationCache.from_config({
+        "generation_cache_ttl": 5,
+        "generation_cache_dir": str(tmp_path / "g"),
+    })
+    assert enabled.ttl == 5
+    enabled.cache.cache.close()
+
+
+@pytest.mark.unit
+def test_router_output_is_keyed_by_the_router_model(monkeypatch):
+    from core.agent import main as agent_main
+
+    monkeypatch.setattr(agent_main, "enforce_production_mode", lambda operation: None)
+    agent = agent_main.HyperKitAgent.__new__(agent_main.HyperKitAgent)
+    agent.config = {}
+    agent.ai_agent = Mock(alith_configured=True, generate_contract=AsyncMock(side_effect=RuntimeError("alith down")))
+    agent.llm_router = Mock(gemini_available=True, aroute=AsyncMock(return_value=TOKEN_CODE))
+    agent.llm_router.model_selector.auto_select_for_prompt.return_value = ("gemini-flash", None, None)
+    agent.generation_cache = Mock(lookup=Mock(return_value=None))
+    agent._process_generated_contract = AsyncMock(return_value={
+        "status": "success", "contract_code": TOKEN_CODE, "method": "intelligent_router", "provider": "Gemini/ModelSelector"
+    })
+
+    asyncio.run(agent.generate_contract("create a game token"))
+
+    assert [c.args[1] for c in agent.generation_cache.lookup.call_args_list] == ["alith", "router:gemini-flash"]
+    assert agent.generation_cache.store.call_args.args[1] == "router:gemini-flash"
+
+
+@pytest.mark.unit
+def test_router_fallback_entry_is_served_while_alith_is_configured(monkeypatch, cache):
+    from core.agent import main as agent_main
+
+    monkeypatch.setattr(agent_main, "enforce_production_mode", lambda operation: None)
+    agent = agent_main.HyperKitAgent.__new__(agent_main.HyperKitAgent)
+    agent.config = {}
+    agent.ai_agent = Mock(alith_configured=True, generate_contract=AsyncMock(side_effect=RuntimeError("alith down")))
+    agent.llm_router = Mock(gemini_available=True, aroute=AsyncMock(return_value=TOKEN_CODE))
+    agent.llm_router.model_selector.auto_select_for_prompt.return_value = ("gemini-flash", None, None)
+    agent.generation_cache = cache
+
+    async def process(code, prompt, method, provider, **kwargs):
+        return {"status": "success", "contract_code": code, "method": method, "provider": provider, "metadata": {}}
+
+    agent._process_generated_contract = process
+
+    asyncio.run(agent.generate_contract("create a game token"))
+    second = asyncio.run(agent.generate_contract("create a game token"))
+
+    assert agent.llm_router.aroute.await_count == 1
+    assert agent.ai_agent.generate_contract.await_count == 1
+    assert second["provider"] == "Gemini/ModelSelector"
+    assert second["metadata"]["generation_cache"]["original_method"] == "intelligent_router"
@@ -0,0 +1,229 @@
+"""
+Unit tests for the shared per-network head tracker
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.monitoring.head_tracker import HeadTracker
+from services.monitoring.rpc_batch import JsonRpcBatchClient
+from services.monitoring.transaction_monitor import TransactionMonitor
+
+TOKEN = "0x00000000000000000000000000000000000000aa"
+OTHER = "0x00000000000000000000000000000000000000bb"
+
+
+class FakeChain:
+    """JSON-RPC node over a list of blocks"""
+
+    def __init__(self):
+        self.blocks = {}
+        self.logs = []
+        self.receipts = {}
+        self.head = 0
+        self.requests = []
+
+    def mine(self, transactions=(), logs=()):
+        self.head += 1
+        self.blocks[self.head] = {"number": hex(self.head), "transactions": list(transactions)}
+        self.logs += [{"transactionHash": hex(self.head * 1000 + i), "logIndex": hex(i), **log,
+                       "blockNumber": hex(self.head)} for i, log in enumerate(logs)]
+        for tx_hash in transactions:
+            self.receipts[tx_hash] = {"blockNumber": hex(self.head), "gasUsed": "0x5208", "status": "0x1"}
+
+    def handle(self, request):
+        calls = json.loads(request.content)
+        self.requests.append([c["method"] for c in calls])
+        replies = []
+        for call in calls:
+            method, params = call["method"], call["params"]
+            if method == "eth_blockNumber":
+                result = hex(self.head)
+            elif method == "eth_getBlockByNumber":
+                result = self.blocks.get(int(params[0], 16))
+            elif method == "eth_getLogs":
+                query = params[0]
+                low, high = int(query["fromBlock"], 16), int(query["toBlock"], 16)
+                result = [log for log in self.logs
+                          if low <= int(log["blockNumber"], 16) <= high and log["address"] in query["address"]]
+            elif method == "eth_getTransactionReceipt":
+                result = self.receipts.get(params[0])
+            else:
+                result = None
+            replies.append({"jsonrpc": "2.0", "id": call["id"], "result": result})
+        return httpx.Response(200, json=replies)
+
+    def client(self):
+        return JsonRpcBatchClient("http://node", transport=httpx.MockTransport(self.handle))
+
+
+@pytest.mark.unit
+def test_new_blocks_and_logs_are_fetched_once_for_all_subscribers():
+    chain = FakeChain()
+    chain.mine()
+    tracker = HeadTracker("hyperion", chain.client(), poll_interval=3600)
+    seen = {"headers": [], "token": [], "other": []}
+
+    async def run():
+        tracker.subscribe(lambda block, logs: seen["headers"].append((block["number"], logs)))
+        tracker.subscribe(lambda block, logs: seen["token"].extend(logs), addresses=[TOKEN.upper()])
+        tracker.subscribe(lambda block, logs: seen["other"].extend(logs), addresses=[OTHER])
+        await tracker.poll()  # records the current head only
+
+        chain.mine(logs=[{"address": TOKEN, "topics": ["0x01"]}])
+        chain.mine(logs=[{"address": OTHER, "topics": ["0x02"]}, {"address": TOKEN, "topics": ["0x03"]}])
+        chain.requests.clear()
+        await tracker.poll()
+        await tracker.poll()  # head unchanged
+        for subscription_id in (1, 2, 3):
+            tracker.unsubscribe(subscription_id)
+
+    asyncio.run(run())
+
+    assert chain.requests == [
+        ["eth_blockNumber"],
+        ["eth_getBlockByNumber", "eth_getBlockByNumber", "eth_getLogs"],
+        ["eth_blockNumber"],
+    ]
+    assert seen["headers"] == [("0x2", []), ("0x3", [])]
+    assert [log["topics"] for log in seen["token"]] == [["0x01"], ["0x03"]]
+    assert [log["topics"] for log in seen["other"]] == [["0x02"]]
+    assert tracker.head == 3 and tracker.subscriber_count == 0
+
+
+@pytest.mark.unit
+def test_poller_runs_only_while_subscribed():
+    chain = FakeChain()
+    tracker = HeadTracker("hyperion", chain.client(), poll_interval=0.01)
+
+    async def run():
+        subscription_id = tracker.subscribe(lambda block, logs: None)
+        await asyncio.sleep(0.05)
+        tracker.unsubscribe(subscription_id)
+        polls = len(chain.requests)
+        await asyncio.sleep(0.05)
+        return polls
+
+    polls = asyncio.run(run())
+    assert polls >= 2 and len(chain.requests) == polls
+
+
+@pytest.mark.unit
+def test_transaction_monitor_uses_the_shared_head():
+    chain = FakeChain()
+    chain.mine()
+    monitor = TransactionMonitor({"networks": ["hyperion"], "confirmation_blocks": 3})
+    monitor.rpc_clients["hyperion"] = chain.client()
+    tracker = HeadTracker("hyperion", chain.client(), poll_interval=3600)
+    monitor.head_trackers["hyperion"] = tracker
+
+    async def run():
+        await monitor.add_transaction("0xabc")
+        monitor._head_subscriptions["hyperion"] = tracker.subscribe(
+            lambda block, logs: monitor._on_new_block("hyperion", block)
+        )
+        await tracker.poll()
+        chain.mine(transactions=["0xabc"])
+        await tracker.poll()
+        status = monitor.monitored_transactions["0xabc"]
+        assert status.status == "confirmed" and status.confirmation_count == 1
+
+        chain.requests.clear()
+        await monitor._check_all_transactions()  # mined: left to the tracker
+        assert chain.requests == []
+
+        chain.mine()
+        chain.mine()
+        await tracker.poll()
+        assert "0xabc" not in monitor.monitored_transactions
+        await monitor.stop_monitoring()
+
+    asyncio.run(run())
+    assert monitor.metrics.confirmed_transactions == 1
+    # No per-transaction block number lookups: confirmations come from the tracked head
+    assert all("eth_blockNumber" not in r or len(r) == 1 for r in chain.requests)
+
+
+@pytest.mark.unit
+def test_enhanced_event_monitors_share_the_tracker(monkeypatch, tmp_path):
+    from services.monitoring import enhanced_monitor as em
+
+    chain = FakeChain()
+    chain.mine()
+    tracker = HeadTracker("hyperion", chain.client(), poll_interval=3600)
+    monitor = em.EnhancedMonitor(event_store_path=tmp_path / "events.sqlite3")
+    monkeypatch.setattr(monitor, "_head_tracker", lambda network: tracker)
+    events = []
+    monitor.add_event_handler(events.append)
+    transfer = em.EnhancedMonitor._event_topics(["Transfer(address, address, uint256)"]).pop()
+
+    async def run():
+        for target in (TOKEN, OTHER):
+            await monitor.start_monitoring(em.MonitorConfig(
+                target=target, monitor_type=em.MonitorType.EVENTS, event_filters=["Transfer(address,address,uint256)"]
+            ))
+        await asyncio.sleep(0)
+        assert tracker.subscriber_count == 2
+        await tracker.poll()
+        chain.mine(logs=[{"address": TOKEN, "topics": [transfer]}, {"address": TOKEN, "topics": ["0x02"]}])
+        chain.requests.clear()
+        await tracker.poll()
+        await monitor.stop_all_monitoring()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert chain.requests[1] == ["eth_getBlockByNumber", "eth_getLogs"]
+    assert [(e.target, e.data["events_found"]) for e in events] == [(TOKEN, 1)]
+    assert tracker.subscriber_count == 0
+    assert [e["topic0"] for e in monitor.get_contract_events("hyperion", TOKEN)] == [transfer]
+
+
+@pytest.mark.unit
+def test_event_catch_up_does_not_hold_up_block_delivery(monkeypatch, tmp_path):
+    from services.monitoring import enhanced_monitor as em
+    from services.monitoring.event_indexer import EventIndexer
+
+    chain = FakeChain()
+    chain.mine(logs=[{"address": TOKEN, "topics": ["0x01"]}])
+    chain.mine()
+    tracker = HeadTracker("hyperion", chain.client(), poll_interval=3600)
+    monitor = em.EnhancedMonitor(event_store_path=tmp_path / "events.sqlite3")
+    monkeypatch.setattr(monitor, "_head_tracker", lambda network: tracker)
+    events, heads = [], []
+    monitor.add_event_handler(events.append)
+
+    gate = None
+    index_once = EventIndexer.index_once
+
+    async def slow_index_once(self, *args, **kwargs):
+        await gate.wait()
+        return await index_once(self, *args, **kwargs)
+    monkeypatch.setattr(EventIndexer, "index_once", slow_index_once)
+
+    async def run():
+        nonlocal gate
+        gate = asyncio.Event()
+        await monitor.start_monitoring(em.MonitorConfig(
+            target=TOKEN, monitor_type=em.MonitorType.EVENTS, start_block=1
+        ))
+        await asyncio.sleep(0)
+        tracker.subscribe(lambda block, logs: heads.append(block["number"]))
+        await tracker.poll()
+        chain.mine()
+        await tracker.poll()  # returns although the history walk is still blocked
+        assert heads == ["0x3"] and events == []
+
+        gate.set()
+        await asyncio.sleep(0.05)
+        assert [e.data["events_found"] for e in events] == [1]
+        chain.mine(logs=[{"address": TOKEN, "topics": ["0x02"]}])
+        await tracker.poll()  # caught up: the head block's logs are ingested directly
+        await monitor.stop_all_monitoring()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert heads == ["0x3", "0x4"]
+    assert [e["topic0"] for e in monitor.get_contract_events("hyperion", TOKEN)] == ["0x02", "0x01"]
@@ -0,0 +1,93 @@
+"""
+Unit tests for the loop-bound HTTP client pool
+"""
+
+import asyncio
+import gc
+import json
+import threading
+import warnings
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import pytest
+
+from services.common.http_pool import LoopBoundClients
+from services.monitoring.rpc_batch import JsonRpcBatchClient
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled sockets stay open
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+def test_clients_are_closed_on_their_own_loop(server_url):
+    pool = LoopBoundClients()
+    used = []
+
+    async def fetch():
+        client = pool.get("node", httpx.AsyncClient)
+        assert pool.get("node", httpx.AsyncClient) is client
+        used.append(client)
+        return (await client.get(server_url)).text
+
+    gc.collect()  # leftovers of earlier tests must not be reported here
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        # A new loop per call, as in the CLI
+        assert asyncio.run(fetch()) == "ok"
+        assert used[0].is_closed  # closed while its loop shut down
+        assert asyncio.run(fetch()) == "ok"
+        assert used[1] is not used[0] and used[1].is_closed
+
+        async def reuse_then_close():
+            client = pool.get("node", httpx.AsyncClient)
+            await client.get(server_url)
+            await pool.aclose()
+            return client
+
+        assert asyncio.run(reuse_then_close()).is_closed
+        used.clear()
+        gc.collect()
+
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+@pytest.mark.unit
+def test_rpc_client_gets_a_fresh_connection_per_loop():
+    seen = []
+
+    def handle(request):
+        [call] = json.loads(request.content)
+        return httpx.Response(200, json=[{"jsonrpc": "2.0", "id": call["id"], "result": "0x10"}])
+
+    client = JsonRpcBatchClient("http://node", transport=httpx.MockTransport(handle))
+
+    async def call():
+        http_client, _ = client._resources()
+        seen.append(http_client)
+        return await client.call("eth_blockNumber")
+
+    assert asyncio.run(call()) == "0x10"
+    assert asyncio.run(call()) == "0x10"
+    assert seen[0] is not seen[1]
+    assert all(c.is_closed for c in seen)
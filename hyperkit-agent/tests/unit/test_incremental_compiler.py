@@ -0,0 +1,117 @@
+"""
+Unit tests for the incremental compilation service
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from services.compilation import IncrementalCompiler, load_remappings
+
+# Stands in for "forge build <file>": writes an artifact per contract and
+# records each invocation
+FAKE_FORGE = r'''
+import json, pathlib, re, sys
+source = pathlib.Path(sys.argv[2])
+with open("builds.log", "a") as log:
+    log.write(source.name + "\n")
+text = source.read_text()
+if "syntax error" in text:
+    print("Error: ParserError", file=sys.stderr)
+    sys.exit(1)
+out = pathlib.Path("out") / source.name
+out.mkdir(parents=True, exist_ok=True)
+for name in re.findall(r"contract\s+(\w+)", text):
+    artifact = {"abi": [{"name": name}], "bytecode": {"object": "0x" + text.encode().hex()[:16]}}
+    (out / (name + ".json")).write_text(json.dumps(artifact))
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "contracts").mkdir(parents=True)
+    oz = root / "lib" / "openzeppelin-contracts" / "contracts" / "token"
+    oz.mkdir(parents=True)
+    (oz / "ERC20.sol").write_text('import "./IERC20.sol";\ncontract ERC20 {}\n')
+    (oz / "IERC20.sol").write_text("interface IERC20 {}\n")
+    (root / "foundry.toml").write_text(
+        '[profile.default]\nsolc = "0.8.24"\n'
+        'remappings = ["@openzeppelin/contracts/=lib/openzeppelin-contracts/contracts/"]\n'
+    )
+    (root / "fake_forge.py").write_text(FAKE_FORGE)
+    (root / "contracts" / "Token.sol").write_text(
+        '// import "ignored/Commented.sol";\n'
+        'import {ERC20} from "@openzeppelin/contracts/token/ERC20.sol";\n'
+        "contract Token is ERC20 {}\n"
+    )
+    return root
+
+
+def _compiler(project, tmp_path):
+    return IncrementalCompiler(
+        project,
+        cache_dir=tmp_path / "build-cache",
+        forge_cmd=[sys.executable, str(project / "fake_forge.py")],
+    )
+
+
+def _builds(project):
+    log = project / "builds.log"
+    return log.read_text().split() if log.exists() else []
+
+
+@pytest.mark.unit
+def test_remappings_and_import_closure(project, tmp_path):
+    assert load_remappings(project) == [
+        ("@openzeppelin/contracts/", "lib/openzeppelin-contracts/contracts/")
+    ]
+    closure = _compiler(project, tmp_path).import_closure(project / "contracts" / "Token.sol")
+    assert sorted(path.name for path in closure) == ["ERC20.sol", "IERC20.sol", "Token.sol"]
+
+
+@pytest.mark.unit
+def test_unchanged_sources_are_served_from_cache(project, tmp_path):
+    source = project / "contracts" / "Token.sol"
+    first = asyncio.run(_compiler(project, tmp_path).compile(source, "Token"))
+    assert first["success"] and not first["cached"]
+    assert first["abi"] == [{"name": "Token"}]
+
+    # A new compiler (new process) still hits the persistent cache, and
+    # restores the artifact into out/ if it was removed
+    (project / "out" / "Token.sol" / "Token.json").unlink()
+    second = asyncio.run(_compiler(project, tmp_path).compile(source, "Token"))
+    assert second["success"] and second["cached"]
+    assert second["bytecode"] == first["bytecode"]
+    assert json.loads((project / "out" / "Token.sol" / "Token.json").read_text())["abi"] == first["abi"]
+    assert _builds(project) == ["Token.sol"]
+
+
+@pytest.mark.unit
+def test_changes_in_the_import_closure_trigger_a_rebuild(project, tmp_path):
+    compiler = _compiler(project, tmp_path)
+    source = project / "contracts" / "Token.sol"
+    asyncio.run(compiler.compile(source, "Token"))
+
+    interface = project / "lib" / "openzeppelin-contracts" / "contracts" / "token" / "IERC20.sol"
+    interface.write_text("interface IERC20 { function totalSupply() external; }\n")
+    result = asyncio.run(compiler.compile(source, "Token"))
+
+    assert result["success"] and not result["cached"]
+    assert _builds(project) == ["Token.sol", "Token.sol"]
+
+
+@pytest.mark.unit
+def test_failed_builds_are_reported_and_not_cached(project, tmp_path):
+    compiler = _compiler(project, tmp_path)
+    broken = project / "contracts" / "Broken.sol"
+    broken.write_text("contract Broken { syntax error }\n")
+
+    for _ in range(2):
+        result = asyncio.run(compiler.compile(broken, "Broken"))
+        assert not result["success"]
+        assert "ParserError" in result["forge_output"]
+    assert compiler.get_stats()["failures"] == 2
+    assert _builds(project) == ["Broken.sol", "Broken.sol"]
@@ -0,0 +1,59 @@
+"""
+Unit tests for the persistent BM25 knowledge index
+"""
+
+import os
+
+import pytest
+
+from services.rag.knowledge_index import KnowledgeIndex
+
+
+@pytest.fixture
+def knowledge(tmp_path):
+    root = tmp_path / "knowledge"
+    (root / "security").mkdir(parents=True)
+    (root / "security" / "reentrancy.md").write_text(
+        "# Reentrancy\nUse ReentrancyGuard and checks-effects-interactions. Reentrancy drains funds."
+    )
+    (root / "tokens.md").write_text("# ERC20\nMint and burn tokens with OpenZeppelin ERC20.")
+    (root / "deploy.md").write_text("# Deploy\nDeploy contracts with forge to Hyperion.")
+    return root
+
+
+def _index(root, tmp_path):
+    return KnowledgeIndex(root, index_path=tmp_path / "index.sqlite3", refresh_interval=0)
+
+
+@pytest.mark.unit
+def test_bm25_ranks_documents_by_query_terms(knowledge, tmp_path):
+    index = _index(knowledge, tmp_path)
+
+    hits = index.search("reentrancy guard for tokens", limit=5)
+
+    assert [h["path"] for h in hits] == ["security/reentrancy.md", "tokens.md"]
+    assert hits[0]["name"] == "reentrancy.md"
+    assert hits[0]["preview"].startswith("# Reentrancy")
+    assert index.search("nonexistentterm") == []
+
+
+@pytest.mark.unit
+def test_refresh_is_incremental_and_persistent(knowledge, tmp_path):
+    index = _index(knowledge, tmp_path)
+    assert index.refresh() == {"added": 3, "updated": 0, "removed": 0}
+    index.close()
+
+    reopened = _index(knowledge, tmp_path)
+    assert reopened.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+    tokens = knowledge / "tokens.md"
+    os.utime(tokens, ns=(0, 10**18))  # Touch without changing content
+    assert reopened.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+    tokens.write_text("# Governance\nDAO voting with timelock.")
+    (knowledge / "deploy.md").unlink()
+    (knowledge / "staking.md").write_text("Staking rewards vault")
+    assert reopened.refresh() == {"added": 1, "updated": 1, "removed": 1}
+
+    assert [h["path"] for h in reopened.search("timelock voting")] == ["tokens.md"]
+    assert reopened.search("forge hyperion") == []
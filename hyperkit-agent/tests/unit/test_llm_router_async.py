@@ -0,0 +1,90 @@
+"""
+Unit tests for the async, connection-pooled LLM routing path
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.llm import router as router_module
+from core.llm.router import HybridLLMRouter
+
+
+def _gemini_reply(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Route the router's AsyncClients through an in-process transport."""
+    state = {"clients": 0, "in_flight": 0, "peak": 0, "delay": 0.02, "urls": []}
+
+    async def handler(request):
+        state["urls"].append(str(request.url))
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(state["delay"])
+        finally:
+            state["in_flight"] -= 1
+        if "openai" in request.url.host:
+            return httpx.Response(200, json={"choices": [{"message": {"content": "openai says hi"}}]})
+        return httpx.Response(200, json=_gemini_reply("gemini says hi"))
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        state["clients"] += 1
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(router_module.httpx, "AsyncClient", client_factory)
+    return state
+
+
+def _router(**config):
+    return HybridLLMRouter({"GOOGLE_API_KEY": "test-google-key", "OPENAI_API_KEY": "test-openai-key", **config})
+
+
+@pytest.mark.unit
+def test_aroute_reuses_one_client_and_limits_concurrency(mock_http):
+    router = _router(llm_max_concurrency=2)
+
+    async def main():
+        results = await asyncio.gather(*(router.aroute("write a token", task_type="code") for _ in range(6)))
+        await router.aclose()
+        return results
+
+    assert asyncio.run(main()) == ["gemini says hi"] * 6
+    assert mock_http["clients"] == 1
+    assert mock_http["peak"] == 2
+    assert all("generativelanguage.googleapis.com" in url for url in mock_http["urls"])
+
+
+@pytest.mark.unit
+def test_cancellation_releases_provider_slot(mock_http):
+    router = _router(llm_max_concurrency=1)
+    mock_http["delay"] = 10
+
+    async def main():
+        task = asyncio.create_task(router.aroute("slow prompt"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        mock_http["delay"] = 0
+        result = await router.aroute("fast prompt")
+        await router.aclose()
+        return result
+
+    assert asyncio.run(main()) == "gemini says hi"
+
+
+@pytest.mark.unit
+def test_timeouts_fall_back_and_then_fail(mock_http):
+    router = _router(llm_timeout=0.01)
+    router.openai_available = False
+    mock_http["delay"] = 1
+
+    with pytest.raises(Exception, match="No cloud-based AI providers"):
+        asyncio.run(router.aroute("prompt"))
@@ -0,0 +1,126 @@
+"""
+Unit tests for bounded metric histograms and quantile sketches
+"""
+
+import random
+
+import pytest
+
+from services.monitoring import metrics as metrics_module
+from services.monitoring.metrics import BasicMetrics, HyperKitMetrics
+from services.monitoring.sketches import DDSketch, Distribution
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.unit
+def test_sketch_quantiles_are_within_relative_accuracy_in_bounded_memory():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 2) for _ in range(50_000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.01, 0.5, 0.95, 0.99, 0.999):
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.011)
+    assert sketch.bucket_count < 2048
+    assert DDSketch().quantile(0.5) is None
+
+
+@pytest.mark.unit
+def test_sketch_collapses_lowest_buckets_past_the_limit():
+    sketch = DDSketch(relative_accuracy=0.01, max_buckets=64)
+    for exponent in range(-20, 20):
+        sketch.add(10.0 ** exponent)
+    assert sketch.bucket_count == 40
+    for _ in range(3):
+        for i in range(200):
+            sketch.add(1.0 + i / 10)
+    assert sketch.bucket_count <= 64
+    assert sketch.count == 640
+    # Large values keep their accuracy
+    assert sketch.quantile(1.0) == pytest.approx(1e19, rel=0.011)
+
+
+@pytest.mark.unit
+def test_distributions_merge_exactly():
+    left, right, whole = Distribution(), Distribution(), Distribution()
+    for i in range(1, 1001):
+        (left if i % 2 else right).observe(i / 100)
+        whole.observe(i / 100)
+
+    left.merge(right)
+    assert left.count == whole.count == 1000
+    assert left.sum == pytest.approx(whole.sum)
+    assert (left.min, left.max) == (0.01, 10.0)
+    assert left.buckets() == whole.buckets()
+    assert left.buckets()["+Inf"] == 1000 and left.buckets()["0.1"] == 10
+    assert left.quantile(0.5) == whole.quantile(0.5) == pytest.approx(5.0, rel=0.011)
+
+    with pytest.raises(ValueError):
+        left.merge(Distribution(buckets=(1, 2)))
+
+
+@pytest.mark.unit
+def test_basic_metrics_key_by_label_set_not_order():
+    basic = BasicMetrics()
+    for i in range(100):
+        basic.histogram_observe("latency", i / 100, {"network": "hyperion", "op": "deploy"})
+        basic.histogram_observe("latency", 1.0, {"op": "deploy", "network": "hyperion"})
+        basic.summary_observe("latency", 2.0, {"network": "metis"})
+
+    snapshot = basic.get_metrics()
+    [(key, histogram)] = snapshot["histograms"].items()
+    assert key == "latency:{'network': 'hyperion', 'op': 'deploy'}"
+    assert histogram["count"] == 200 and histogram["max"] == 1.0
+    assert histogram["buckets"]["+Inf"] == 200
+    assert histogram["p99"] == pytest.approx(1.0, rel=0.011)
+
+    assert basic.get_quantile("latency", 0.5, {"op": "deploy", "network": "hyperion"}) == pytest.approx(0.99, rel=0.02)
+    assert basic.get_quantile("latency", 0.99) == pytest.approx(2.0, rel=0.011)  # all label sets
+    assert basic.get_quantile("missing", 0.5) is None
+
+
+@pytest.mark.unit
+def test_performance_summary_merges_hourly_buckets(monkeypatch):
+    monkeypatch.setattr(metrics_module, "PROMETHEUS_AVAILABLE", False)
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(metrics_module.time, "time", lambda: now[0])
+    perf = HyperKitMetrics()
+
+    for i in range(1, 1001):
+        perf.record_performance("deploy", i / 1000, network="hyperion")
+    now[0] += 5 * 3600
+    for i in range(1, 101):
+        perf.record_performance("deploy", 10 + i / 100)
+        perf.record_performance("audit", 0.5)
+
+    assert len(perf.performance_data["deploy"]) == 2
+    recent = perf.get_performance_summary("deploy", hours=1)
+    assert recent["total_operations"] == 100
+    assert recent["min_duration"] == pytest.approx(10.01)
+
+    day = perf.get_performance_summary("deploy", hours=24)
+    assert day["total_operations"] == 1100
+    assert day["max_duration"] == 11.0
+    assert day["p95_duration"] == pytest.approx(10.45, rel=0.011)
+    assert perf.get_performance_summary(hours=24)["total_operations"] == 1200
+    assert "message" in perf.get_performance_summary("unknown")
+
+
+@pytest.mark.unit
+def test_recent_performance_records_keep_their_metadata(monkeypatch):
+    monkeypatch.setattr(metrics_module, "PROMETHEUS_AVAILABLE", False)
+    perf = HyperKitMetrics()
+
+    for i in range(metrics_module.PERFORMANCE_RECENT_RECORDS + 5):
+        perf.record_performance("deploy", 0.1, success=i % 2 == 0, attempt=i)
+
+    records = perf.get_recent_performance("deploy")
+    assert len(records) == metrics_module.PERFORMANCE_RECENT_RECORDS
+    assert records[-1]["metadata"] == {"success": True, "attempt": metrics_module.PERFORMANCE_RECENT_RECORDS + 4}
+    assert [r["metadata"]["attempt"] for r in perf.get_recent_performance("deploy", limit=2)] == [103, 104]
+    assert perf.get_recent_performance("audit") == []
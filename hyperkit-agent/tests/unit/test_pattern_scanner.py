@@ -0,0 +1,69 @@
+"""
+Unit tests for the precompiled single-pass pattern scanner
+"""
+
+import pytest
+
+from services.audit.pattern_scanner import scan_source
+
+CONTRACT = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/access/Ownable.sol";
+
+contract Bank {
+    event Withdrawn(address who, uint256 amount);
+
+    function withdraw(uint256 amount) external {
+        require(tx.origin == msg.sender);
+        msg.sender.call(abi.encode(amount));
+        unchecked { total -= amount; }
+    }
+
+    function destroy() public {
+        selfdestruct(payable(msg.sender));
+    }
+}
+"""
+
+
+def _by_pattern(findings):
+    return {f["pattern"]: f for f in findings}
+
+
+@pytest.mark.unit
+def test_scan_reports_line_and_column_locations():
+    findings = _by_pattern(scan_source(CONTRACT))
+
+    assert findings["tx_origin"]["line"] == 10
+    assert findings["tx_origin"]["column"] == 17
+    assert findings["suicidal"]["severity"] == "critical"
+    assert findings["suicidal"]["locations"][0] == {
+        "line": 16, "column": 9, "snippet": "selfdestruct(",
+    }
+
+
+@pytest.mark.unit
+def test_shared_anchor_feeds_every_rule():
+    """One `.call(` occurrence is evaluated by all rules registered for it"""
+    findings = _by_pattern(scan_source(CONTRACT))
+
+    assert findings["reentrancy"]["locations"][0]["line"] == 11
+    assert findings["unchecked_call"]["locations"][0]["line"] == 11
+    assert findings["integer_overflow"]["line"] == 12
+
+
+@pytest.mark.unit
+def test_best_practices_are_case_sensitive_and_info_only():
+    findings = _by_pattern(scan_source(CONTRACT))
+
+    assert findings["uses_openzeppelin"]["severity"] == "info"
+    assert findings["has_events"]["matches"] == 1
+    assert "has_events" not in _by_pattern(scan_source("contract A { Event x; }"))
+
+
+@pytest.mark.unit
+def test_plain_checked_arithmetic_is_not_flagged():
+    """Solidity >=0.8 arithmetic outside unchecked blocks is not reported as overflow"""
+    source = "pragma solidity ^0.8.0;\ncontract A { function f(uint a) public { a = a * 2 + 1; } }"
+    assert "integer_overflow" not in _by_pattern(scan_source(source))
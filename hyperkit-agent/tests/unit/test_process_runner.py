@@ -0,0 +1,55 @@
+"""
+Unit tests for the async subprocess runner
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+
+from services.common.process_runner import run_process
+
+
+@pytest.mark.unit
+def test_run_process_captures_and_streams_output():
+    """stdout/stderr are captured and stdout lines are streamed as they arrive"""
+    lines = []
+    script = "import sys; print('one'); print('two'); sys.stderr.write('warn'); sys.exit(3)"
+
+    result = asyncio.run(run_process([sys.executable, "-c", script], on_stdout_line=lines.append))
+
+    assert result.returncode == 3
+    assert result.stdout.splitlines() == ["one", "two"]
+    assert result.stderr == "warn"
+    assert lines == ["one", "two"]
+
+
+@pytest.mark.unit
+def test_run_process_timeout_raises_timeout_expired():
+    """Timeouts kill the child and surface as subprocess.TimeoutExpired"""
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_process([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5))
+
+
+@pytest.mark.unit
+def test_run_process_does_not_block_event_loop():
+    """Several slow tools run side by side instead of one after another"""
+    cmd = [sys.executable, "-c", "import time; time.sleep(0.5)"]
+
+    async def run_three():
+        return await asyncio.gather(*(run_process(cmd, timeout=10) for _ in range(3)))
+
+    start = time.monotonic()
+    results = asyncio.run(run_three())
+
+    assert all(r.returncode == 0 for r in results)
+    assert time.monotonic() - start < 1.4
+
+
+@pytest.mark.unit
+def test_run_process_missing_executable():
+    """A missing tool raises FileNotFoundError like subprocess.run does"""
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(run_process(["definitely-not-a-real-tool-xyz"]))
@@ -0,0 +1,85 @@
+"""
+Unit tests for structured Slither JSON parsing and consensus deduplication
+"""
+
+import json
+
+import pytest
+
+from services.audit import slither_parser
+from services.audit.auditor import SmartContractAuditor
+
+CONTRACT_FILE = "/tmp/tmpab12cd.sol"
+
+
+def _detector(check, impact, lines, filename=CONTRACT_FILE, confidence="Medium"):
+    return {
+        "check": check,
+        "impact": impact,
+        "confidence": confidence,
+        "description": f"{check} found\n",
+        "elements": [{
+            "type": "function",
+            "name": "withdraw",
+            "source_mapping": {"filename_absolute": filename, "lines": lines, "starting_column": 5},
+        }],
+    }
+
+
+def _report(*detectors):
+    return json.dumps({"success": True, "error": None, "results": {"detectors": list(detectors)}})
+
+
+@pytest.mark.unit
+def test_detectors_map_to_typed_located_findings():
+    stdout = "Compiling...\n" + _report(
+        _detector("reentrancy-eth", "High", [9, 10, 11, 12]),
+        _detector("suicidal", "High", [15, 16]),
+        _detector("naming-convention", "Informational", [3], filename="/lib/Other.sol"),
+    )
+
+    findings = slither_parser.parse_output(stdout, CONTRACT_FILE)
+
+    assert [(f["type"], f["severity"], f["file"], f["line"]) for f in findings] == [
+        ("reentrancy", "high", None, 9),
+        ("suicidal", "critical", None, 15),
+        ("naming_convention", "info", "/lib/Other.sol", 3),
+    ]
+    assert findings[0]["detector"] == "reentrancy-eth"
+    assert findings[0]["location"] == "contract:9"
+    assert findings[0]["description"] == "reentrancy-eth found"
+
+
+@pytest.mark.unit
+def test_failed_or_missing_report_raises():
+    with pytest.raises(slither_parser.SlitherOutputError, match="compilation failed"):
+        slither_parser.parse_output(json.dumps({"success": False, "error": "compilation failed"}))
+    with pytest.raises(slither_parser.SlitherOutputError):
+        slither_parser.parse_output("Traceback (most recent call last): ...")
+
+
+@pytest.mark.unit
+def test_deduplication_keys_on_type_file_and_line():
+    """Slither and custom hits on the same lines agree; one tool never agrees with itself"""
+    auditor = SmartContractAuditor.__new__(SmartContractAuditor)
+    auditor.severity_weights = {"critical": 10, "high": 7, "medium": 4, "low": 1, "info": 0.5}
+
+    slither_findings = slither_parser.parse_output(_report(
+        _detector("reentrancy-eth", "High", [9, 10, 11, 12]),
+        _detector("reentrancy-events", "Low", [9, 10, 11, 12]),
+        _detector("tx-origin", "Medium", [20]),
+    ), CONTRACT_FILE)
+    custom_findings = [
+        {"tool": "custom", "type": "reentrancy", "severity": "high",
+         "locations": [{"line": 11, "column": 9}]},
+        {"tool": "custom", "type": "tx_origin", "severity": "medium",
+         "locations": [{"line": 30, "column": 17}]},
+    ]
+
+    consensus = auditor._deduplicate_and_score(slither_findings + custom_findings, {})
+
+    assert len(consensus) == 1
+    reentrancy = consensus[0]
+    assert reentrancy["detector"] == "reentrancy-eth"
+    assert reentrancy["tools_found"] == ["slither", "custom"]
+    assert reentrancy["tool_agreement"] == 2
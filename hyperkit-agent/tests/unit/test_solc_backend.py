@@ -0,0 +1,200 @@
+"""
+Unit tests for the solc standard-JSON backend and batch compilation
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from services.compilation import IncrementalCompiler, SolcNotFoundError, SolcStandardJsonBackend
+
+# Stands in for "solc --standard-json <input>": checks that every import is
+# present as an inline source and records each invocation
+FAKE_SOLC = r'''
+import json, pathlib, re, sys
+request = json.loads(pathlib.Path(sys.argv[2]).read_text())
+with open("solc.log", "a") as log:
+    log.write(json.dumps(sorted(request["settings"]["outputSelection"])) + "\n")
+sources = request["sources"]
+remappings = [r.split("=", 1) for r in request["settings"]["remappings"]]
+errors, contracts = [], {}
+for unit, source in sources.items():
+    for path in re.findall(r'import\s+(?:\{[^}]*\}\s+from\s+)?"([^"]+)"', source["content"]):
+        if path.startswith("."):
+            target = str(pathlib.PurePosixPath(unit).parent / path)
+        else:
+            matches = [(p, t) for p, t in remappings if path.startswith(p)]
+            p, t = max(matches, key=lambda m: len(m[0])) if matches else ("", "")
+            target = t + path[len(p):]
+        target = str(pathlib.PurePosixPath(*[part for part in target.split("/") if part != "."]))
+        if target not in sources:
+            errors.append({"severity": "error", "formattedMessage": "Source " + target + " not found"})
+for unit in request["settings"]["outputSelection"]:
+    text = sources[unit]["content"]
+    if "syntax error" in text:
+        errors.append({"severity": "error", "formattedMessage": "ParserError in " + unit})
+    contracts[unit] = {
+        name: {"abi": [{"name": name}], "evm": {"bytecode": {"object": "6080"}, "deployedBytecode": {"object": "60"}}}
+        for name in re.findall(r"contract\s+(\w+)", text)
+    }
+print(json.dumps({"errors": errors} if any(e["severity"] == "error" for e in errors) else {"errors": errors, "contracts": contracts}))
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "contracts").mkdir(parents=True)
+    oz = root / "lib" / "openzeppelin-contracts" / "contracts" / "token"
+    oz.mkdir(parents=True)
+    (oz / "ERC20.sol").write_text('import "./IERC20.sol";\ncontract ERC20 {}\n')
+    (oz / "IERC20.sol").write_text("interface IERC20 {}\n")
+    (root / "foundry.toml").write_text(
+        '[profile.default]\nsolc = "0.8.24"\noptimizer = true\noptimizer_runs = 200\n'
+        'remappings = ["@openzeppelin/contracts/=lib/openzeppelin-contracts/contracts/"]\n'
+    )
+    (root / "contracts" / "Token.sol").write_text(
+        'import {ERC20} from "@openzeppelin/contracts/token/ERC20.sol";\ncontract Token is ERC20 {}\n'
+    )
+    (root / "contracts" / "Vault.sol").write_text('import "./Token.sol";\ncontract Vault {}\n')
+    fake = tmp_path / "fake_solc.py"
+    fake.write_text(FAKE_SOLC)
+    solc = tmp_path / "solc"
+    solc.write_text(f"#!/bin/sh\nexec {sys.executable} {fake} \"$@\"\n")
+    solc.chmod(0o755)
+    return root, str(solc)
+
+
+def _compiler(project, tmp_path):
+    root, solc = project
+    backend = SolcStandardJsonBackend(root, solc_path=solc)
+    return IncrementalCompiler(root, cache_dir=tmp_path / "build-cache", backend=backend)
+
+
+def _invocations(root):
+    log = root / "solc.log"
+    return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+
+@pytest.mark.unit
+def test_backend_reads_settings_and_remappings_once(project):
+    root, solc = project
+    backend = SolcStandardJsonBackend(root, solc_path=solc)
+    assert backend.version == "0.8.24"
+    assert backend.settings["optimizer"] == {"enabled": True, "runs": 200}
+
+    request = backend.build_input([root / "contracts" / "Token.sol"], [
+        root / "lib" / "openzeppelin-contracts" / "contracts" / "token" / "ERC20.sol",
+    ])
+    assert sorted(request["sources"]) == [
+        "contracts/Token.sol",
+        "lib/openzeppelin-contracts/contracts/token/ERC20.sol",
+    ]
+    assert request["settings"]["remappings"] == [
+        "@openzeppelin/contracts/=lib/openzeppelin-contracts/contracts/"
+    ]
+    assert list(request["settings"]["outputSelection"]) == ["contracts/Token.sol"]
+
+
+@pytest.mark.unit
+def test_batch_compiles_all_misses_in_one_invocation(project, tmp_path):
+    root, _ = project
+    compiler = _compiler(project, tmp_path)
+    targets = [(root / "contracts" / "Token.sol", "Token"), (root / "contracts" / "Vault.sol", "Vault")]
+
+    results = asyncio.run(compiler.compile_many(targets))
+
+    assert [r["success"] for r in results] == [True, True]
+    assert results[0]["bytecode"] == "0x6080"
+    assert json.loads((root / "out" / "Vault.sol" / "Vault.json").read_text())["abi"] == [{"name": "Vault"}]
+    assert _invocations(root) == [["contracts/Token.sol", "contracts/Vault.sol"]]
+
+    again = asyncio.run(compiler.compile_many(targets))
+    assert all(r["cached"] for r in again)
+    assert len(_invocations(root)) == 1
+
+
+@pytest.mark.unit
+def test_concurrent_compiles_share_one_invocation(project, tmp_path):
+    root, _ = project
+    compiler = _compiler(project, tmp_path)
+
+    async def compile_all():
+        return await asyncio.gather(
+            compiler.compile(root / "contracts" / "Token.sol", "Token"),
+            compiler.compile(root / "contracts" / "Vault.sol", "Vault"),
+        )
+
+    results = asyncio.run(compile_all())
+
+    assert [r["success"] for r in results] == [True, True]
+    assert _invocations(root) == [["contracts/Token.sol", "contracts/Vault.sol"]]
+
+    assert asyncio.run(compiler.compile(root / "contracts" / "Vault.sol", "Vault"))["cached"]
+    assert len(_invocations(root)) == 1
+
+
+@pytest.mark.unit
+def test_library_imports_without_remappings_keep_their_import_names(project, tmp_path):
+    root, _ = project
+    solmate = root / "lib" / "solmate" / "tokens"
+    solmate.mkdir(parents=True)
+    (solmate / "ERC721.sol").write_text("contract ERC721 {}\n")
+    (root / "contracts" / "Nft.sol").write_text('import "solmate/tokens/ERC721.sol";\ncontract Nft {}\n')
+    compiler = _compiler(project, tmp_path)
+
+    [result] = asyncio.run(compiler.compile_many([(root / "contracts" / "Nft.sol", "Nft")]))
+
+    assert result["success"], result.get("forge_output")
+    request = compiler.backend.build_input([root / "contracts" / "Nft.sol"], [solmate / "ERC721.sol"])
+    assert "solmate/tokens/ERC721.sol=lib/solmate/tokens/ERC721.sol" in request["settings"]["remappings"]
+
+
+@pytest.mark.unit
+def test_one_broken_contract_does_not_fail_the_batch(project, tmp_path):
+    root, _ = project
+    (root / "contracts" / "Broken.sol").write_text("contract Broken { syntax error }\n")
+    compiler = _compiler(project, tmp_path)
+
+    results = asyncio.run(compiler.compile_many([
+        (root / "contracts" / "Broken.sol", "Broken"),
+        (root / "contracts" / "Token.sol", "Token"),
+    ]))
+
+    assert [r["success"] for r in results] == [False, True]
+    assert "ParserError" in results[0]["forge_output"]
+    assert _invocations(root) == [
+        ["contracts/Broken.sol", "contracts/Token.sol"],
+        ["contracts/Broken.sol"],
+        ["contracts/Token.sol"],
+    ]
+
+
+@pytest.mark.unit
+def test_missing_solc_is_reported(project):
+    root, _ = project
+    backend = SolcStandardJsonBackend(root, solc_path=None)
+    backend.solc_path = None
+    with pytest.raises(SolcNotFoundError):
+        asyncio.run(backend.build([root / "contracts" / "Token.sol"], []))
+
+
+@pytest.mark.unit
+def test_compiler_is_reusable_across_event_loops(project, tmp_path):
+    root, _ = project
+    compiler = _compiler(project, tmp_path)
+    token, vault = root / "contracts" / "Token.sol", root / "contracts" / "Vault.sol"
+
+    async def compile_all():
+        return await asyncio.gather(compiler.compile(token, "Token"), compiler.compile(vault, "Vault"))
+
+    assert all(r["success"] for r in asyncio.run(compile_all()))
+    vault.write_text('import "./Token.sol";\ncontract Vault { }\n')
+    results = asyncio.run(compile_all())
+
+    assert [r["success"] for r in results] == [True, True]
+    assert results[0]["cached"] and not results[1]["cached"]
+    assert len(_invocations(root)) == 2
+    assert not compiler._batch_tasks
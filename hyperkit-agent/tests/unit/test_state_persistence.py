@@ -0,0 +1,165 @@
+"""
+Unit tests for snapshot/delta workflow state persistence
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+import yaml
+
+from core.workflow import state_persistence as sp
+from core.workflow.context_manager import WorkflowContext
+from core.workflow.state_persistence import StatePersistence
+from core.workflow.workflow_orchestrator import WorkflowOrchestrator
+from core.workflow.workflow_state import ActionResult, LoopStep, WorkflowState
+
+
+def make_state(workflow_id="wf-1"):
+    state = WorkflowState(workflow_id=workflow_id, user_goal="create ERC20 token")
+    state.add_reasoning(LoopStep.PLAN, "need a token", ["generate", "compile"], confidence=0.9)
+    state.add_tool_invocation("generate_contract", {"prompt": "token"}, result={"status": "success"})
+    return state
+
+
+def deltas(persistence, workflow_id):
+    path = persistence.states_dir / workflow_id / sp.DELTAS_FILE
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.unit
+def test_round_trip_restores_nested_objects(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    state = make_state()
+    persistence.save_state(state)
+
+    loaded = StatePersistence(tmp_path).load_state("wf-1")
+    assert loaded.to_dict() == state.to_dict()
+    assert loaded.reasoning_history[0].step is LoopStep.PLAN
+    assert persistence.get_state_path("wf-1").name == sp.SNAPSHOT_FILE
+
+
+@pytest.mark.unit
+def test_saves_append_only_the_changes(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    state = make_state()
+    persistence.save_state(state)
+    snapshot = persistence.get_state_path("wf-1").read_text()
+
+    state.add_tool_invocation("compile_contract", {"source": "x"}, result={"success": True})
+    state.current_step = LoopStep.UPDATE
+    persistence.save_state(state)
+    persistence.save_state(state)  # nothing changed: no delta
+
+    assert persistence.get_state_path("wf-1").read_text() == snapshot
+    [delta] = deltas(persistence, "wf-1")
+    assert [t["tool_name"] for t in delta["append"]["tool_invocations"]] == ["compile_contract"]
+    assert "reasoning_history" not in delta["append"]
+    assert delta["set"]["current_step"] == "update"
+    assert StatePersistence(tmp_path).load_state("wf-1").to_dict() == state.to_dict()
+
+
+@pytest.mark.unit
+def test_deltas_are_compacted_into_a_new_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(sp, "COMPACT_AFTER_DELTAS", 3)
+    persistence = StatePersistence(tmp_path)
+    state = make_state()
+    persistence.save_state(state)
+    for i in range(4):
+        state.increment_retry(f"stage{i}")
+        persistence.save_state(state)
+
+    # Three deltas, then the fourth change triggers a fresh snapshot
+    assert deltas(persistence, "wf-1") == []
+    assert StatePersistence(tmp_path).load_state("wf-1").to_dict() == state.to_dict()
+
+
+@pytest.mark.unit
+def test_load_ignores_stale_and_torn_deltas(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    state = make_state()
+    persistence.save_state(state)
+    state.mark_complete()
+    persistence.save_state(state)
+
+    path = persistence.states_dir / "wf-1" / sp.DELTAS_FILE
+    stale = {"snapshot_id": "old", "set": {"user_goal": "stale"}, "append": {}}
+    path.write_text(json.dumps(stale) + "\n" + path.read_text() + '{"snapshot_id": ')
+
+    loaded = StatePersistence(tmp_path).load_state("wf-1")
+    assert loaded.user_goal == "create ERC20 token"
+    assert loaded.is_complete
+
+
+@pytest.mark.unit
+def test_saves_after_a_torn_delta_are_not_lost(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    state = make_state()
+    persistence.save_state(state)
+    state.user_goal = "g2"
+    persistence.save_state(state)
+    with open(persistence.states_dir / "wf-1" / sp.DELTAS_FILE, "a") as f:
+        f.write('{"snapshot_id": ')
+
+    resumed = StatePersistence(tmp_path)
+    state = resumed.load_state("wf-1")
+    assert state.user_goal == "g2"
+    state.user_goal = "g3"
+    resumed.save_state(state)
+    state.user_goal = "g4"
+    resumed.save_state(state)
+
+    assert StatePersistence(tmp_path).load_state("wf-1").user_goal == "g4"
+
+
+@pytest.mark.unit
+def test_external_changes_force_a_snapshot(tmp_path):
+    first, second = StatePersistence(tmp_path), StatePersistence(tmp_path)
+    state = make_state()
+    first.save_state(state)
+    state.add_reasoning(LoopStep.ACT, "compile", ["compile"])
+    second.save_state(state)
+
+    # first's view of the files is stale, so it must not append a delta
+    state.metadata["network"] = "hyperion"
+    first.save_state(state)
+    assert deltas(first, "wf-1") == []
+    assert StatePersistence(tmp_path).load_state("wf-1").to_dict() == state.to_dict()
+
+
+@pytest.mark.unit
+def test_legacy_yaml_state_loads_and_yaml_export(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    state = make_state("legacy")
+    legacy_dir = persistence.states_dir / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / sp.YAML_FILE).write_text(yaml.dump(state.to_dict()))
+
+    assert persistence.load_state("legacy").to_dict() == state.to_dict()
+
+    exporting = StatePersistence(tmp_path, yaml_export=True)
+    exporting.save_state(make_state("wf-2"))
+    exported = yaml.safe_load((exporting.states_dir / "wf-2" / sp.YAML_FILE).read_text())
+    assert exported["workflow_id"] == "wf-2"
+
+
+@pytest.mark.unit
+def test_workflow_updates_append_deltas_without_rewriting(tmp_path):
+    orchestrator = WorkflowOrchestrator(Mock(rag=None), tmp_path)
+    persistence = orchestrator.state_persistence
+    state = make_state()
+    persistence.save_state(state)
+    snapshot = persistence.get_state_path("wf-1").read_text()
+    context = WorkflowContext(workflow_id="wf-1", user_prompt="token")
+
+    for i in range(3):
+        state.add_tool_invocation(f"tool_{i}", {}, result={"success": True})
+        asyncio.run(orchestrator._update_workflow_state(state, ActionResult(success=True), context))
+
+    assert persistence.get_state_path("wf-1").read_text() == snapshot
+    assert len(deltas(persistence, "wf-1")) == 3
+    assert "# Workflow Log" not in persistence.get_log_path("wf-1").read_text()
+    assert StatePersistence(tmp_path).load_state("wf-1").to_dict() == state.to_dict()
@@ -0,0 +1,157 @@
+"""
+Unit tests for streamed contract generation: the incremental Solidity
+extractor and the router's server-sent event streaming
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.llm import router as router_module
+from core.llm.router import HybridLLMRouter
+from core.llm.stream_extractor import SolidityStreamExtractor
+
+RESPONSE = (
+    "Here is your token contract:\n"
+    "```solidity\n"
+    "// SPDX-License-Identifier: MIT\n"
+    "pragma solidity ^0.8.20;\n"
+    "\n"
+    'import "@openzeppelin/contracts/token/ERC20/ERC20.sol";\n'
+    "import {Ownable} from '@openzeppelin/contracts/access/Ownable.sol';\n"
+    "\n"
+    "interface IHook { function run() external; }\n"
+    "contract MyToken is ERC20, Ownable {\n"
+    "}\n"
+    "```\n"
+    "Let me know if you need changes.\n"
+)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("size", [1, 7, 1000])
+def test_extractor_is_independent_of_chunking(size):
+    extractor = SolidityStreamExtractor()
+    events = []
+    for chunk in _chunks(RESPONSE, size):
+        events.extend(extractor.feed(chunk))
+    events.extend(extractor.finish())
+
+    assert extractor.raw == RESPONSE
+    assert extractor.code.startswith("// SPDX-License-Identifier: MIT")
+    assert extractor.code.endswith("}")
+    assert "```" not in extractor.code and "Let me know" not in extractor.code
+    assert extractor.pragma == "^0.8.20"
+    assert extractor.imports == [
+        "@openzeppelin/contracts/token/ERC20/ERC20.sol",
+        "@openzeppelin/contracts/access/Ownable.sol",
+    ]
+    assert extractor.contract_name == "MyToken"
+    assert [e.kind for e in events if e.kind != "code"] == [
+        "pragma", "import", "import", "contract", "contract", "complete"
+    ]
+
+
+@pytest.mark.unit
+def test_extractor_reports_imports_before_stream_ends():
+    extractor = SolidityStreamExtractor()
+    cut = RESPONSE.index("interface")
+    events = extractor.feed(RESPONSE[:cut])
+
+    assert [e.value for e in events if e.kind == "import"][0].endswith("ERC20.sol")
+    assert not extractor.complete
+
+
+@pytest.mark.unit
+def test_extractor_handles_unfenced_code_and_skips_other_blocks():
+    extractor = SolidityStreamExtractor()
+    extractor.feed("Run this first:\n```bash\nforge init\n```\npragma solidity 0.8.19;\n")
+    extractor.feed("contract Plain {}")
+    extractor.finish()
+
+    assert extractor.code == "pragma solidity 0.8.19;\ncontract Plain {}"
+    assert extractor.contract_name == "Plain"
+    assert extractor.complete
+
+
+def _sse(events):
+    return "".join(f"data: {json.dumps(event)}\n\n" for event in events).encode()
+
+
+@pytest.fixture
+def mock_stream(monkeypatch):
+    """Serve streamed responses from an in-process transport."""
+    state = {"urls": [], "fail_gemini": False}
+
+    async def handler(request):
+        state["urls"].append(str(request.url))
+        if "openai" in request.url.host:
+            body = _sse([{"choices": [{"delta": {"content": part}}]} for part in ["open", "ai"]])
+            return httpx.Response(200, content=body + b"data: [DONE]\n\n")
+        if state["fail_gemini"]:
+            return httpx.Response(503, json={"error": "unavailable"})
+        body = _sse([{"candidates": [{"content": {"parts": [{"text": part}]}}]} for part in _chunks(RESPONSE, 40)])
+        return httpx.Response(200, content=body)
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(router_module.httpx, "AsyncClient", client_factory)
+    return state
+
+
+def _router():
+    return HybridLLMRouter({"GOOGLE_API_KEY": "test-google-key", "OPENAI_API_KEY": "test-openai-key"})
+
+
+async def _collect(router, prompt):
+    chunks = [chunk async for chunk in router.astream(prompt, task_type="code")]
+    await router.aclose()
+    return chunks
+
+
+@pytest.mark.unit
+def test_astream_yields_gemini_chunks(mock_stream):
+    chunks = asyncio.run(_collect(_router(), "write a token"))
+
+    assert "".join(chunks) == RESPONSE
+    assert len(chunks) > 1
+    assert ":streamGenerateContent?alt=sse" in mock_stream["urls"][0]
+
+
+@pytest.mark.unit
+def test_astream_falls_back_before_first_chunk(mock_stream):
+    mock_stream["fail_gemini"] = True
+    chunks = asyncio.run(_collect(_router(), "write a token"))
+
+    assert chunks == ["open", "ai"]
+    assert "chat/completions" in mock_stream["urls"][-1]
+
+
+@pytest.mark.unit
+def test_streamed_generation_returns_the_extracted_code(mock_stream):
+    from core.agent.main import HyperKitAgent
+
+    agent = HyperKitAgent.__new__(HyperKitAgent)
+    agent.llm_router = _router()
+    events = []
+
+    async def generate():
+        code = await agent._stream_router_generation("write a token", 2500, events.append)
+        await agent.llm_router.aclose()
+        return code
+
+    code = asyncio.run(generate())
+
+    assert code.startswith("// SPDX-License-Identifier: MIT")
+    assert code.endswith("contract MyToken is ERC20, Ownable {\n}")
+    assert "```" not in code and "Let me know" not in code
+    assert ("contract", "MyToken") in events
@@ -0,0 +1,229 @@
+"""
+Unit tests for the tiered cache, single-flight lookups and async caching decorators
+"""
+
+import asyncio
+import threading
+import time
+import traceback
+
+import pytest
+
+from services.common.cache import HyperKitCache
+from services.common.tiered_cache import TieredStore
+
+
+@pytest.mark.unit
+def test_disk_tier_survives_restart_and_promotes(tmp_path):
+    store = TieredStore(cache_dir=tmp_path, sweep_interval=0)
+    store.set("k1", {"gas_price": 12})
+
+    reopened = TieredStore(cache_dir=tmp_path, sweep_interval=0)
+    assert reopened.get("k1") == {"gas_price": 12}
+    assert reopened.get("k1") == {"gas_price": 12}
+    assert (reopened.stats["disk_hits"], reopened.stats["memory_hits"]) == (1, 1)
+    assert not list(tmp_path.glob("*/*.cache"))  # No pickle files
+
+
+@pytest.mark.unit
+def test_unserializable_values_stay_in_memory(tmp_path):
+    store = TieredStore(cache_dir=tmp_path, sweep_interval=0)
+    value = object()
+    store.set("obj", value)
+
+    assert store.get("obj") is value
+    assert store.get_stats()["disk_entries"] == 0
+    assert store.stats["unserializable"] == 1
+
+
+@pytest.mark.unit
+def test_memory_and_disk_budgets_evict_lru(tmp_path):
+    store = TieredStore(cache_dir=tmp_path, max_items=2, max_disk_bytes=400, sweep_interval=0)
+    for key in ("a", "b", "c"):
+        store.set(key, "x" * 100)
+
+    stats = store.get_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["disk_bytes"] <= 400
+    assert "a" not in store  # Evicted from memory and, as oldest, from disk
+    assert store.get("c") == "x" * 100
+
+
+@pytest.mark.unit
+def test_per_entry_ttl_and_sweep(tmp_path):
+    store = TieredStore(cache_dir=tmp_path, ttl=60, sweep_interval=0)
+    store.set("short", 1, ttl=0.05)
+    store.set("long", 2)
+    time.sleep(0.1)
+
+    assert store.sweep() == 1
+    assert store.get("short") is None
+    assert store.get("long") == 2
+    assert store.get_stats()["disk_entries"] == 1
+
+    # An explicit zero TTL is not the default
+    store.set("zero", 3, ttl=0)
+    assert store.get("zero") is None
+
+
+@pytest.mark.unit
+def test_get_or_set_deduplicates_concurrent_misses(tmp_path):
+    cache = HyperKitCache(cache_type="tiered", cache_dir=str(tmp_path), sweep_interval=0)
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"answer": 42}
+
+    def worker(results):
+        barrier.wait()
+        results.append(cache.get_or_set("question", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"answer": 42}] * 8
+    assert cache.get_stats()["tiers"]["disk_entries"] == 1
+
+
+def _async_cache(tmp_path):
+    return HyperKitCache(cache_type="tiered", cache_dir=str(tmp_path), sweep_interval=0)
+
+
+@pytest.mark.unit
+def test_async_decorator_caches_awaited_results(tmp_path, monkeypatch):
+    from services.common import cache as cache_module
+
+    monkeypatch.setattr(cache_module, "rpc_cache", _async_cache(tmp_path))
+    calls = []
+
+    @cache_module.cached_rpc_call(cache_ttl=60)
+    async def gas_price(network):
+        calls.append(network)
+        await asyncio.sleep(0.05)
+        return 25_000_000_000
+
+    async def main():
+        results = await asyncio.gather(*(gas_price("hyperion") for _ in range(10)))
+        results.append(await gas_price("hyperion"))
+        return results
+
+    assert asyncio.run(main()) == [25_000_000_000] * 11
+    assert calls == ["hyperion"]
+
+
+@pytest.mark.unit
+def test_stale_while_revalidate_serves_stale_value(tmp_path):
+    cache = _async_cache(tmp_path)
+    values = iter([1, 2])
+
+    async def compute():
+        return next(values)
+
+    async def main():
+        first = await cache.aget_or_set("k", compute, ttl=0.05, stale_ttl=60)
+        await asyncio.sleep(0.1)
+        stale = await cache.aget_or_set("k", compute, ttl=0.05, stale_ttl=60)
+        await asyncio.sleep(0)  # Let the background refresh run
+        await asyncio.sleep(0)
+        fresh = await cache.aget_or_set("k", compute, ttl=60)
+        return first, stale, fresh
+
+    assert asyncio.run(main()) == (1, 1, 2)
+
+
+@pytest.mark.unit
+def test_rpc_decorator_serves_stale_values_past_the_cache_ttl():
+    from services.common import cache as cache_module
+
+    assert cache_module.rpc_cache.cache.cache_dir is None  # memory only
+    values = iter([1, 2])
+
+    @cache_module.cached_rpc_call(cache_ttl=0.05, stale_ttl=60)
+    async def block_number(network):
+        return next(values)
+
+    async def main():
+        first = await block_number("swr-test")
+        await asyncio.sleep(0.1)
+        stale = await block_number("swr-test")
+        await asyncio.sleep(0)  # Let the background refresh run
+        await asyncio.sleep(0)
+        return first, stale, await block_number("swr-test")
+
+    try:
+        assert asyncio.run(main()) == (1, 1, 2)
+    finally:
+        cache_module.rpc_cache.clear()
+
+
+@pytest.mark.unit
+def test_ttl_caches_reject_stale_windows_they_cannot_hold():
+    cache = HyperKitCache(ttl=60, cache_type="ttl")
+
+    async def compute():
+        return 1
+
+    assert asyncio.run(cache.aget_or_set("k", compute, ttl=30)) == 1
+    with pytest.raises(ValueError):
+        asyncio.run(cache.aget_or_set("k", compute, ttl=30, stale_ttl=60))
+    with pytest.raises(ValueError):
+        asyncio.run(cache.aget_or_set("k", compute, ttl=120))
+
+
+@pytest.mark.unit
+def test_delete_drops_async_entries(tmp_path):
+    cache = _async_cache(tmp_path)
+    values = iter([1, 2])
+
+    async def compute():
+        return next(values)
+
+    async def main():
+        first = await cache.aget_or_set("k", compute, ttl=60)
+        assert cache.delete("k")
+        return first, await cache.aget_or_set("k", compute, ttl=60)
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+@pytest.mark.unit
+def test_negative_caching_and_cancelled_waiter(tmp_path):
+    cache = _async_cache(tmp_path)
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        raise ConnectionError("rpc down")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        errors = []
+        for _ in range(3):
+            with pytest.raises(ConnectionError) as raised:
+                await cache.aget_or_set("rpc", failing, negative_ttl=60)
+            errors.append(raised.value)
+        # Each hit raises its own copy with a fresh traceback
+        assert len({id(error) for error in errors}) == 3
+        assert [error.args for error in errors] == [("rpc down",)] * 3
+        assert len(traceback.extract_tb(errors[2].__traceback__)) == len(traceback.extract_tb(errors[1].__traceback__))
+
+        # Cancelling one waiter does not cancel the shared computation
+        waiter = asyncio.ensure_future(cache.aget_or_set("slow", slow))
+        other = asyncio.ensure_future(cache.aget_or_set("slow", slow))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await other
+
+    assert asyncio.run(main()) == "ok"
+    assert len(attempts) == 1
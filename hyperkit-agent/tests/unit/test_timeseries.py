@@ -0,0 +1,72 @@
+"""
+Unit tests for the ring-buffer time-series store
+"""
+
+import pytest
+
+from services.monitoring.timeseries import TimeSeriesStore
+
+
+@pytest.mark.unit
+def test_ring_keeps_the_newest_points_and_ranges_across_the_wrap():
+    store = TimeSeriesStore(capacity=5, rollups=())
+    for i in range(8):
+        store.add("cpu", 1000.0 + i, float(i), {"host": "a" if i % 2 else "b"})
+
+    points = store.range("cpu")
+    assert points["value"].tolist() == [3, 4, 5, 6, 7]
+    assert store.range("cpu", since=1004.5, until=1006)["value"].tolist() == [5, 6]
+    assert store.range("cpu", since=2000)["value"].tolist() == []
+    assert store.range("missing")["value"].tolist() == []
+
+    # Two distinct tag sets, interned
+    assert [store.tags(t) for t in points["tags"].tolist()[:2]] == [{"host": "a"}, {"host": "b"}]
+    assert store.latest("cpu") == (1007.0, 7.0, {"host": "a"})
+
+
+@pytest.mark.unit
+def test_out_of_order_points_keep_the_series_sorted():
+    store = TimeSeriesStore(capacity=10, rollups=())
+    store.add("m", 100, 1)
+    store.add("m", 90, 2)  # clock went backwards
+    store.add("m", 101, 3)
+    assert store.range("m")["timestamp"].tolist() == [100, 100, 101]
+
+
+@pytest.mark.unit
+def test_rollups_outlive_raw_points_and_drive_downsampling():
+    store = TimeSeriesStore(capacity=100, rollups=((60, 10), (600, 10)))
+    for second in range(0, 1200, 3):
+        store.add("latency", second, second % 60)
+
+    minutes = store.rollup("latency", 60, since=600)
+    assert minutes["timestamp"].tolist() == [600.0 + 60 * i for i in range(10)]  # 10 buckets kept
+    assert minutes["count"].tolist() == [20] * 10
+    assert minutes["min"][0] == 0 and minutes["max"][0] == 57 and minutes["mean"][0] == 28.5
+
+    # Raw points serve recent windows; the ring only covers the last 300s, so older ones use rollups
+    recent = store.downsample("latency", since=1020, max_points=100)
+    assert "tags" in recent and len(recent["timestamp"]) == 60
+    older = store.downsample("latency", since=600, max_points=20)
+    assert older["timestamp"].tolist() == minutes["timestamp"].tolist()
+    coarse = store.downsample("latency", since=0, max_points=5)
+    assert coarse["timestamp"].tolist() == [0.0, 600.0]
+
+    with pytest.raises(ValueError):
+        store.rollup("latency", 5)
+
+
+@pytest.mark.unit
+def test_tag_table_stays_bounded_as_tag_sets_churn():
+    store = TimeSeriesStore(capacity=4, rollups=(), max_idle_tag_sets=2)
+    for i in range(1000):
+        store.add("requests", 1000.0 + i, 1.0, {"request_id": str(i)})
+
+    # Four tag sets referenced by live points plus at most two idle ones
+    assert store.tag_set_count() <= 6
+    points = store.range("requests")
+    assert [store.tags(t) for t in points["tags"].tolist()] == [{"request_id": str(i)} for i in range(996, 1000)]
+
+    # A released tag set can be interned again
+    store.add("requests", 2000.0, 1.0, {"request_id": "995"})
+    assert store.latest("requests")[2] == {"request_id": "995"}
@@ -0,0 +1,119 @@
+"""
+Unit tests for batched JSON-RPC transaction polling
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.monitoring.rpc_batch import JsonRpcBatchClient, JsonRpcError
+from services.monitoring.transaction_monitor import TransactionMonitor
+
+
+class FakeNode:
+    """Answers JSON-RPC batches from in-memory receipts and mempool"""
+
+    def __init__(self, block=100):
+        self.block = block
+        self.receipts = {}
+        self.mempool = {}
+        self.requests = []
+
+    def handle(self, request):
+        calls = json.loads(request.content)
+        self.requests.append([c["method"] for c in calls])
+        replies = []
+        for call in reversed(calls):  # order must not matter
+            method, params = call["method"], call["params"]
+            reply = {"jsonrpc": "2.0", "id": call["id"]}
+            if method == "eth_blockNumber":
+                reply["result"] = hex(self.block)
+            elif method == "eth_getTransactionReceipt":
+                reply["result"] = self.receipts.get(params[0])
+            elif method == "eth_getTransactionByHash":
+                reply["result"] = self.mempool.get(params[0])
+            else:
+                reply["error"] = {"code": -32601, "message": "method not found"}
+            replies.append(reply)
+        return httpx.Response(200, json=replies)
+
+    def client(self, **kwargs):
+        return JsonRpcBatchClient("http://node", transport=httpx.MockTransport(self.handle), **kwargs)
+
+
+def make_monitor(node, **config):
+    monitor = TransactionMonitor({"networks": ["hyperion"], "confirmation_blocks": 12, **config})
+    monitor.rpc_clients["hyperion"] = node.client(max_batch_size=config.get("rpc_batch_size", 100))
+    return monitor
+
+
+@pytest.mark.unit
+def test_batch_client_keeps_call_order_and_per_call_errors():
+    node = FakeNode(block=7)
+    node.receipts["0xa"] = {"status": "0x1"}
+
+    async def run():
+        client = node.client(max_batch_size=2)
+        results = await client.batch([
+            ("eth_blockNumber", []), ("eth_getTransactionReceipt", ["0xa"]), ("eth_bogus", []),
+        ])
+        with pytest.raises(JsonRpcError):
+            await client.call("eth_bogus")
+        await client.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert results[:2] == ["0x7", {"status": "0x1"}]
+    assert isinstance(results[2], JsonRpcError) and results[2].code == -32601
+    assert node.requests[:2] == [["eth_blockNumber", "eth_getTransactionReceipt"], ["eth_bogus"]]
+
+
+@pytest.mark.unit
+def test_one_batch_per_tick_updates_every_transaction():
+    node = FakeNode(block=100)
+    node.receipts["0x1"] = {"blockNumber": hex(95), "gasUsed": hex(21000), "status": "0x1"}
+    node.receipts["0x2"] = {"blockNumber": hex(80), "gasUsed": hex(50000), "status": "0x0"}
+    node.mempool["0x3"] = {"gasPrice": hex(10)}
+    monitor = make_monitor(node)
+
+    async def run():
+        for tx_hash in ("0x1", "0x2", "0x3", "0x4"):
+            await monitor.add_transaction(tx_hash)
+        await monitor._check_all_transactions()
+        await monitor._check_all_transactions()
+
+    asyncio.run(run())
+
+    # blockNumber + 4 receipts, then one mempool lookup for the two unmined hashes
+    assert node.requests[0] == ["eth_blockNumber"] + ["eth_getTransactionReceipt"] * 4
+    assert node.requests[1] == ["eth_getTransactionByHash"] * 2
+
+    first = monitor.monitored_transactions["0x1"]
+    assert first.status == "confirmed" and first.confirmation_count == 6 and first.gas_used == 21000
+    assert "0x2" not in monitor.monitored_transactions  # failed, already past 12 confirmations
+    assert monitor.monitored_transactions["0x3"].gas_price == 10
+    assert "0x4" not in monitor.monitored_transactions  # dropped
+    # Confirmed once, counted once
+    assert monitor.metrics.confirmed_transactions == 1 and monitor.metrics.failed_transactions == 1
+
+
+@pytest.mark.unit
+def test_pending_transactions_back_off():
+    node = FakeNode()
+    node.mempool["0xp"] = {"gasPrice": "0x1"}
+    monitor = make_monitor(node, check_interval=5, max_pending_backoff=20)
+
+    async def run():
+        await monitor.add_transaction("0xp")
+        await monitor._check_all_transactions()
+        await monitor._check_all_transactions()  # within the backoff window
+
+    asyncio.run(run())
+    assert len(node.requests) == 2
+
+    for _ in range(5):
+        monitor._back_off("0xp", 0.0)
+    misses, next_check = monitor._pending_backoff["0xp"]
+    assert misses == 6 and next_check == 20
@@ -0,0 +1,98 @@
+"""
+Unit tests for the vectorized in-memory RAG index
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from services.rag import vector_index
+from services.rag.vector_index import VectorIndex
+from services.rag.vector_store import VectorStore
+
+
+def _vectors(count, dim=16, seed=7):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(count)]
+
+
+def _brute_force(vectors, query, top_k):
+    def cosine(a, b):
+        dot = sum(x * y for x, y in zip(a, b))
+        return dot / ((sum(x * x for x in a) ** 0.5) * (sum(x * x for x in b) ** 0.5))
+    scored = sorted(((cosine(v, query), f"doc{i}") for i, v in enumerate(vectors)), reverse=True)
+    return [doc_id for _, doc_id in scored[:top_k]]
+
+
+@pytest.mark.unit
+def test_exact_search_matches_brute_force_cosine():
+    vectors = _vectors(300)
+    index = VectorIndex(dim=16, initial_capacity=4)
+    for i, vector in enumerate(vectors):
+        index.add(f"doc{i}", vector, {"kind": "even" if i % 2 == 0 else "odd"})
+
+    query = _vectors(1, seed=99)[0]
+    results = index.search(query, 5)
+
+    assert [doc_id for doc_id, _ in results] == _brute_force(vectors, query, 5)
+    assert results[0][1] >= results[-1][1]
+
+
+@pytest.mark.unit
+def test_filters_replacement_and_removal():
+    index = VectorIndex(dim=3)
+    index.add("a", [1, 0, 0], {"content_type": "audit_report"})
+    index.add("b", [0.9, 0.1, 0], {"content_type": "template"})
+    index.add("c", [0, 1, 0], {"content_type": "audit_report"})
+
+    assert [d for d, _ in index.search([1, 0, 0], 5, {"content_type": "audit_report"})] == ["a", "c"]
+
+    # Masks built by the previous query must track later inserts and replacements
+    index.add("d", [0.95, 0.05, 0], {"content_type": "audit_report"})
+    index.add("a", [0, 0, 1], {"content_type": "template"})
+    assert [d for d, _ in index.search([1, 0, 0], 5, {"content_type": "audit_report"})] == ["d", "c"]
+
+    assert index.remove("d")
+    assert not index.remove("d")
+    assert len(index) == 3
+    assert [d for d, _ in index.search([1, 0, 0], 1)] == ["b"]
+
+
+@pytest.mark.unit
+def test_ivf_index_finds_nearest_neighbours():
+    vectors = _vectors(400)
+    index = VectorIndex(dim=16, ann_min_docs=100, nprobe=6)
+    for i, vector in enumerate(vectors):
+        index.add(f"doc{i}", vector)
+
+    # Querying with a stored vector must return that document first
+    for i in (0, 123, 399):
+        assert index.search(vectors[i], 1)[0][0] == f"doc{i}"
+    assert index._ivf_centroids is not None
+
+
+@pytest.mark.unit
+def test_pure_python_fallback(monkeypatch):
+    monkeypatch.setattr(vector_index, "NUMPY_AVAILABLE", False)
+    vectors = _vectors(50)
+    index = VectorIndex(dim=16)
+    for i, vector in enumerate(vectors):
+        index.add(f"doc{i}", vector)
+
+    query = _vectors(1, seed=3)[0]
+    assert [d for d, _ in index.search(query, 4)] == _brute_force(vectors, query, 4)
+
+
+@pytest.mark.unit
+def test_vector_store_in_memory_search(tmp_path):
+    store = VectorStore({"store_path": str(tmp_path)})
+    if store.chroma_available:
+        pytest.skip("ChromaDB installed; in-memory path not used")
+
+    content = {"metadata": {"storage_type": "audit_report"}, "audit_results": {"contract_info": {"name": "Vault"}}}
+    assert asyncio.run(store.add_document("cid1", content))
+
+    results = asyncio.run(store.search_similar("Contract: Vault", top_k=3, filter_metadata={"content_type": "audit_report"}))
+    assert [r["cid"] for r in results] == ["cid1"]
+    assert results[0]["score"] == pytest.approx(1.0, abs=1e-5)
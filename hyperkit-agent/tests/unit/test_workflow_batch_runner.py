@@ -0,0 +1,168 @@
+"""
+Unit tests for the workflow batch runner
+"""
+
+import asyncio
+import json
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from core.workflow.batch_runner import WorkflowBatchRunner, load_prompts
+from services.dependencies.dependency_manager import Dependency, DependencyManager
+
+# Slow stand-in for 'forge install <repo>' that logs each install and creates a one-file library
+FAKE_FORGE = """#!{python}
+import os, sys, time
+if sys.argv[1] == "--version":
+    sys.exit(0)
+with open({log!r}, "a") as f:
+    f.write(sys.argv[2] + "\\n")
+time.sleep(0.5)
+lib = os.path.join("lib", os.path.basename(sys.argv[2]), "src")
+os.makedirs(lib, exist_ok=True)
+with open(os.path.join(lib, "A.sol"), "w") as f:
+    f.write("contract A {{}}")
+"""
+
+
+class FakeOrchestrator:
+    """Records how many workflows run at once"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    async def run_complete_workflow(self, user_prompt, **options):
+        self.calls.append((user_prompt, options))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            # Later prompts finish first, so results arrive out of order
+            await asyncio.sleep(0.05 / (len(self.calls)))
+            if "crash" in user_prompt:
+                raise RuntimeError("boom")
+            return {"status": "success", "workflow_id": f"wf{len(self.calls)}"}
+        finally:
+            self.running -= 1
+
+
+class FakeAgent:
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.orchestrator = FakeOrchestrator()
+
+    def _get_orchestrator(self):
+        return self.orchestrator
+
+
+@pytest.mark.unit
+def test_load_prompts_formats(tmp_path):
+    txt = tmp_path / "prompts.txt"
+    txt.write_text("# tokens\ncreate ERC20 token\n\ncreate NFT collection\n")
+    assert load_prompts(txt) == [{"prompt": "create ERC20 token"}, {"prompt": "create NFT collection"}]
+
+    jsonl = tmp_path / "prompts.jsonl"
+    jsonl.write_text('"create vault"\n{"prompt": "create DAO", "test_only": true}\n')
+    assert load_prompts(jsonl) == [{"prompt": "create vault"}, {"prompt": "create DAO", "test_only": True}]
+
+    bad = tmp_path / "prompts.json"
+    bad.write_text(json.dumps([{"test_only": True}]))
+    with pytest.raises(ValueError):
+        load_prompts(bad)
+
+
+@pytest.mark.unit
+def test_batch_respects_concurrency_and_keeps_input_order(tmp_path):
+    agent = FakeAgent({"workflow_batch_concurrency": 2})
+    prompts = ["create token", {"prompt": "create nft", "test_only": False}, "crash please", "create dao"]
+
+    summary = asyncio.run(WorkflowBatchRunner(agent).run_batch(
+        prompts, output_path=tmp_path / "out" / "batch.json", test_only=True
+    ))
+
+    assert agent.orchestrator.peak == 2
+    assert [r["prompt"] for r in summary["results"]] == [
+        "create token", "create nft", "crash please", "create dao"
+    ]
+    assert summary["successful"] == 3 and summary["failed"] == 1
+    assert summary["results"][2]["error"] == "boom"
+
+    options = dict(agent.orchestrator.calls)
+    assert options["create token"] == {"test_only": True}
+    assert options["create nft"] == {"test_only": False}
+
+    saved = json.loads((tmp_path / "out" / "batch.json").read_text())
+    assert saved["total"] == 4 and saved["concurrency"] == 2
+
+
+class InstallingOrchestrator:
+    """Workflows that need a library install it; the others just do async work"""
+
+    def __init__(self, dep_manager):
+        self.dep_manager = dep_manager
+        self.finished = {}
+
+    async def run_complete_workflow(self, user_prompt, **options):
+        if user_prompt.startswith("install"):
+            success, message = await self.dep_manager.install_dependency(Dependency("acme/tokens", "solidity"))
+            assert success, message
+        else:
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+        self.finished[user_prompt] = time.monotonic()
+        return {"status": "success"}
+
+
+@pytest.mark.unit
+def test_batch_runs_keep_progressing_during_a_dependency_install(tmp_path, monkeypatch):
+    bin_dir, log = tmp_path / "bin", tmp_path / "forge.log"
+    bin_dir.mkdir()
+    forge = bin_dir / "forge"
+    forge.write_text(FAKE_FORGE.format(python=sys.executable, log=str(log)))
+    forge.chmod(forge.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    agent = FakeAgent({"workflow_batch_concurrency": 3})
+    agent.orchestrator = InstallingOrchestrator(DependencyManager(tmp_path / "ws"))
+    summary = asyncio.run(WorkflowBatchRunner(agent).run_batch(
+        ["install tokens", "install tokens again", "create dao"], output_path=tmp_path / "batch.json"
+    ))
+
+    assert summary["successful"] == 3
+    finished = agent.orchestrator.finished
+    # The other workflow finished while the install was still in flight
+    assert finished["create dao"] < min(finished["install tokens"], finished["install tokens again"]) - 0.3
+    # Both workflows needing the library shared one install
+    assert log.read_text().splitlines() == ["acme/tokens"]
+
+
+@pytest.mark.unit
+def test_runs_with_the_same_contract_name_keep_separate_artifacts(tmp_path, monkeypatch):
+    from unittest.mock import Mock
+
+    from core.agent.main import HyperKitAgent
+    from core.config.paths import PathManager
+
+    monkeypatch.setattr(PathManager, "get_workflow_dir", lambda self: tmp_path / "workflows")
+    agent = HyperKitAgent.__new__(HyperKitAgent)
+    # Another workflow holds contracts/GameToken.sol, so the shared Foundry copy is not written
+    agent.contract_lock = lambda name: Mock(locked=lambda: True)
+    code = "// SPDX-License-Identifier: MIT\npragma solidity ^0.8.20;\n\ncontract GameToken {\n    uint256 public supply%s;\n}\n"
+
+    async def generate_both():
+        return await asyncio.gather(*(
+            agent._process_generated_contract(code % i, "create a game token", run_id=f"wf-{i}")
+            for i in (1, 2)
+        ))
+
+    first, second = asyncio.run(generate_both())
+
+    assert first["path"] != second["path"]
+    assert "wf-1" in first["path"] and "wf-2" in second["path"]
+    assert "supply1" in open(first["path"]).read()
+    assert "supply2" in open(second["path"]).read()